@@ -18,6 +18,11 @@ from .parallel import ParallelEnergy
 # Added by Milan
 from .scatter import ScatterBrush
 from .energy_quad import EnergyQuad
+from .store import DataStore
+from .linking import link, link_views, LinkGroup
+from .facet import facet, FacetGrid
+from .geo import resolve_iso3
+from .sources import DataSource, ArrowSource, ParquetSource, SQLSource
 
 
 __all__ = [
@@ -33,4 +38,15 @@ __all__ = [
     "LinkedEnergyDashboard",
     "WorldRenewable",
     "EnergyQuad",
+    "DataStore",
+    "link",
+    "link_views",
+    "LinkGroup",
+    "facet",
+    "FacetGrid",
+    "resolve_iso3",
+    "DataSource",
+    "ArrowSource",
+    "ParquetSource",
+    "SQLSource",
 ]
@@ -0,0 +1,643 @@
+"""
+Vectorised analysis helpers for the Isea widgets.
+
+These helpers work directly on the "wide" tables used throughout the
+examples (one row per entity, one ``<metric>__FYYYY`` column per year)
+and return data in the shape the widgets expect, e.g. series ready for
+:meth:`Isea.trendline.D3TrendLine.set_data` or frames ready for
+:class:`Isea.heatmap.D3Heatmap`.
+"""
+import hashlib
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def _year_columns(wide_df, metric):
+    """
+    Return ``(columns, years)`` for ``<metric>__FYYYY`` columns, sorted by year.
+    """
+    pat = re.compile(rf"^{re.escape(metric)}__F(\d{{4}})$")
+    found = sorted(
+        (int(m.group(1)), c)
+        for c in wide_df.columns
+        for m in [pat.match(str(c))]
+        if m
+    )
+    return [c for _, c in found], np.array([y for y, _ in found], dtype=float)
+
+
+def trend_forecast(wide_df, metric, horizon=3, label_col="label", top_n=None,
+                   min_points=3, positive_only=True):
+    """
+    Fit a linear trend per row and forecast ``horizon`` years ahead.
+
+    Ordinary least squares is solved for all rows at once in closed form
+    over the ``<metric>__FYYYY`` matrix. Missing (and, by default,
+    non-positive) values are excluded per row with a boolean mask, so
+    each row is fitted only on its own observed years, exactly as a
+    per-row regression would, but without a Python loop over rows.
+
+    Parameters
+    ----------
+    wide_df : pandas.DataFrame
+        Wide table with one row per entity (e.g. region × mode) and one
+        column per year named ``f"{metric}__F{year}"``.
+    metric : str
+        Metric prefix, e.g. ``"SalesBEV"``.
+    horizon : int, default 3
+        Number of years to forecast after the last year column.
+    label_col : str, default "label"
+        Column used as the series label. Falls back to the row index if
+        the column is missing.
+    top_n : int or None, default None
+        If given, keep only the ``top_n`` rows with the largest value in
+        the latest year before fitting.
+    min_points : int, default 3
+        Rows with fewer usable years are skipped.
+    positive_only : bool, default True
+        Treat values ``<= 0`` as missing (useful for sales/stock series
+        where zeros mean "not reported").
+
+    Returns
+    -------
+    list[dict]
+        One dict per fitted row with the keys expected by
+        :meth:`D3TrendLine.set_data` (``label``, ``history_x``,
+        ``history_y``, ``pred_x``, ``pred_y``) plus ``growth`` (slope per
+        year), ``intercept`` and ``r2``.
+
+    Examples
+    --------
+    >>> series = trend_forecast(wide, "SalesBEV", horizon=3, top_n=5)
+    >>> D3TrendLine(series, title="SalesBEV forecast")
+    """
+    if pd is None:
+        raise ImportError("Pandas es necesario para trend_forecast")
+    if not isinstance(wide_df, pd.DataFrame):
+        raise ValueError("Data must be a pandas DataFrame")
+
+    cols, years = _year_columns(wide_df, metric)
+    if not cols:
+        return []
+
+    df = wide_df
+    if top_n is not None:
+        latest = pd.to_numeric(df[cols[-1]], errors="coerce")
+        df = df.loc[latest.nlargest(top_n).index]
+
+    Y = df[cols].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    mask = np.isfinite(Y)
+    if positive_only:
+        mask &= Y > 0
+    n = mask.sum(axis=1)
+    keep = n >= min_points
+    if not keep.any():
+        return []
+    Y, mask, n = Y[keep], mask[keep], n[keep].astype(float)
+    labels = (df[label_col] if label_col in df.columns else df.index.to_series())[keep].tolist()
+
+    # años centrados para que el sistema esté bien condicionado
+    t0 = years.mean()
+    t = np.broadcast_to(years - t0, Y.shape)
+    w = mask.astype(float)
+    Yz = np.where(mask, Y, 0.0)
+
+    sx = (w * t).sum(axis=1)
+    sy = Yz.sum(axis=1)
+    sxx = (w * t * t).sum(axis=1)
+    sxy = (Yz * t).sum(axis=1)
+    den = n * sxx - sx * sx
+    slope = np.divide(n * sxy - sx * sy, den, out=np.zeros_like(den), where=den != 0)
+    icpt = (sy - slope * sx) / n
+
+    fit = icpt[:, None] + slope[:, None] * t
+    ss_res = np.where(mask, (Y - fit) ** 2, 0.0).sum(axis=1)
+    ss_tot = np.where(mask, (Y - (sy / n)[:, None]) ** 2, 0.0).sum(axis=1)
+    r2 = 1.0 - np.divide(ss_res, ss_tot, out=np.ones_like(ss_tot), where=ss_tot > 0)
+
+    future = years.max() + np.arange(1, horizon + 1, dtype=float)
+    preds = icpt[:, None] + slope[:, None] * (future - t0)
+
+    return [
+        {
+            "label": labels[i],
+            "history_x": years[mask[i]],
+            "history_y": Y[i, mask[i]],
+            "pred_x": future,
+            "pred_y": preds[i],
+            "growth": float(slope[i]),
+            "intercept": float(icpt[i] - slope[i] * t0),
+            "r2": float(r2[i]),
+        }
+        for i in range(len(labels))
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Clustering / correlation engine
+# ---------------------------------------------------------------------------
+
+def _kmeans_pp(X, k, rng):
+    """k-means++ seeding."""
+    C = np.empty((k, X.shape[1]))
+    C[0] = X[rng.integers(len(X))]
+    d2 = ((X - C[0]) ** 2).sum(axis=1)
+    for j in range(1, k):
+        p = d2 / d2.sum() if d2.sum() > 0 else None
+        C[j] = X[rng.choice(len(X), p=p)]
+        d2 = np.minimum(d2, ((X - C[j]) ** 2).sum(axis=1))
+    return C
+
+
+def _assign(X, C):
+    """Nearest centroid per row and the squared distance to it."""
+    d2 = (X ** 2).sum(axis=1)[:, None] - 2 * X @ C.T + (C ** 2).sum(axis=1)[None, :]
+    labels = d2.argmin(axis=1)
+    return labels, np.maximum(d2[np.arange(len(X)), labels], 0.0)
+
+
+def _minibatch_kmeans(X, k, init=None, batch_size=256, max_iter=100, tol=1e-4, seed=42):
+    """
+    Mini-batch k-means in NumPy.
+
+    Each iteration assigns a random batch to the nearest centroid and moves
+    every centroid towards the mean of its batch members with a per-centroid
+    learning rate ``1 / count``. ``init`` (``k × d``) warm-starts the
+    centroids; otherwise k-means++ seeding is used. Centroids left without
+    any row (e.g. a warm start from another selection) are reseeded to
+    the rows farthest from their centroid and the fit resumes.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, float]
+        ``labels``, ``centroids`` and ``inertia`` (sum of squared distances).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    C = np.array(init, dtype=float) if init is not None else _kmeans_pp(X, k, rng)
+    counts = np.zeros(k)
+    bs = min(batch_size, n)
+    it = 0
+    for _ in range(k + 1):
+        labels, d2 = _assign(X, C)
+        empty = np.flatnonzero(np.bincount(labels, minlength=k) == 0)
+        if empty.size:
+            # un centroide sin filas nunca gana un lote: pasa a las filas peor servidas
+            C[empty] = X[np.argsort(d2)[::-1][:empty.size]]
+            counts[empty] = 0
+        elif it:
+            break
+        while it < max_iter:
+            it += 1
+            B = X[rng.choice(n, bs, replace=False)] if bs < n else X
+            lab, _ = _assign(B, C)
+            m = np.bincount(lab, minlength=k).astype(float)
+            sums = np.zeros_like(C)
+            np.add.at(sums, lab, B)
+            counts += m
+            hit = m > 0
+            prev = C.copy()
+            C[hit] += (sums[hit] - m[hit, None] * C[hit]) / counts[hit, None]
+            if np.abs(C - prev).max() < tol:
+                break
+    labels, d2 = _assign(X, C)
+    return labels, C, float(d2.sum())
+
+
+# por encima de estas filas la silueta se estima sobre una muestra (matriz n × n)
+_SILHOUETTE_MAX_ROWS = 2000
+
+
+def _silhouette(X, labels, max_rows=_SILHOUETTE_MAX_ROWS, seed=42):
+    """
+    Mean silhouette coefficient (0 when there is a single cluster).
+
+    Above ``max_rows`` rows it is computed on a random sample of
+    ``max_rows`` rows, which bounds the pairwise distance matrix.
+    """
+    if len(X) > max_rows:
+        idx = np.random.default_rng(seed).choice(len(X), max_rows, replace=False)
+        X, labels = X[idx], labels[idx]
+    ks = np.unique(labels)
+    if len(ks) < 2 or len(ks) >= len(X):
+        return 0.0
+    sq = (X ** 2).sum(axis=1)
+    D = np.sqrt(np.maximum(sq[:, None] + sq[None, :] - 2 * X @ X.T, 0.0))
+    onehot = labels[:, None] == ks[None, :]
+    sums = D @ onehot
+    cnt = onehot.sum(axis=0).astype(float)
+    own = onehot.argmax(axis=1)
+    own_cnt = cnt[own]
+    a = np.divide(sums[np.arange(len(X)), own], own_cnt - 1,
+                  out=np.zeros(len(X)), where=own_cnt > 1)
+    other = sums / cnt
+    other[np.arange(len(X)), own] = np.inf
+    b = other.min(axis=1)
+    s = np.divide(b - a, np.maximum(a, b), out=np.zeros(len(X)), where=np.maximum(a, b) > 0)
+    s[own_cnt <= 1] = 0.0
+    return float(s.mean())
+
+
+def _davies_bouldin(X, labels):
+    """Davies-Bouldin index (lower is better)."""
+    ks = np.unique(labels)
+    if len(ks) < 2:
+        return 0.0
+    C = np.array([X[labels == k].mean(axis=0) for k in ks])
+    S = np.array([np.sqrt(((X[labels == k] - C[i]) ** 2).sum(axis=1)).mean() for i, k in enumerate(ks)])
+    M = np.sqrt(((C[:, None, :] - C[None, :, :]) ** 2).sum(axis=2))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        R = (S[:, None] + S[None, :]) / M
+    np.fill_diagonal(R, -np.inf)
+    return float(np.nanmax(R, axis=1).mean())
+
+
+def _sweep_one(args):
+    """Worker for the k-sweep (module level so it can be pickled)."""
+    X, k, seed = args
+    labels, _, inertia = _minibatch_kmeans(X, k, seed=seed)
+    return k, inertia, _silhouette(X, labels, seed=seed)
+
+
+class AnalysisEngine:
+    """
+    Cached clustering / correlation engine for a wide table.
+
+    The engine is built once per table (e.g. the ``wide`` frame behind a
+    :class:`~Isea.scatter.ScatterBrush`) and then queried with the current
+    selection keys. Results are cached (LRU) by a hash of the selected
+    keys and the call parameters, so re-running the analysis on an
+    unchanged selection is free.
+
+    - :meth:`clusters` standardises the features of the selected rows and
+      runs mini-batch k-means. Centroids of the previous fit (kept in
+      original units) warm-start the next one, so small selection changes
+      converge in a few iterations.
+    - :meth:`k_sweep` computes inertia and silhouette for a range of ``k``
+      (the elbow curve), fanning the fits out over a process pool. The
+      pool is created on first use and reused; :meth:`close` shuts it
+      down (so does garbage collection of the engine).
+    - :meth:`correlation` returns the Pearson correlation matrix.
+
+    Heatmap outputs are returned as ``{"df", "title", "cmap"}`` dicts that
+    can be passed straight to :class:`~Isea.heatmap.D3Heatmap`::
+
+        engine = AnalysisEngine(wide, features=["SalesBEV", "StockBEV"])
+        res = engine.clusters(w.selection.get("keys", []), n_clusters=4)
+        D3Heatmap(**res["heatmap"], height=300)
+
+    The cache is thread-safe, so the engine can be queried from a
+    selection observer through :class:`Isea.background.LatestTask`
+    without blocking the kernel.
+
+    Parameters
+    ----------
+    wide_df : pandas.DataFrame
+        Table with one row per entity.
+    features : list[str]
+        Numeric columns used for clustering and correlation.
+    key_col : str, default "id"
+        Column matched against the selection keys. Both are compared as
+        strings, so ``["3", "7"]`` from a view and ``[3, 7]`` select the
+        same rows of an integer column; ``labels`` are indexed by the
+        string keys.
+    max_cache : int, default 32
+        Number of cached results kept.
+    workers : int or None, default None
+        Process pool size for :meth:`k_sweep`. ``0`` or ``1`` runs the
+        sweep in-process; ``None`` lets :mod:`concurrent.futures` decide.
+        The pool lives until :meth:`close`.
+    random_state : int, default 42
+        Seed for k-means++ seeding and batch sampling.
+    """
+
+    def __init__(self, wide_df, features, key_col="id", max_cache=32, workers=None, random_state=42):
+        if pd is None:
+            raise ImportError("Pandas es necesario para AnalysisEngine")
+        self.features = [f for f in features if f in wide_df.columns]
+        if not self.features:
+            raise ValueError("None of the requested features are columns of wide_df")
+        self.key_col = key_col
+        # claves como texto, igual que llegan de las vistas (y que la clave de caché)
+        self.keys = wide_df[key_col].astype(str).to_numpy(dtype=object)
+        self.values = wide_df[self.features].apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+        self.max_cache = int(max_cache)
+        self.workers = workers
+        self.random_state = random_state
+        self._cache = OrderedDict()
+        self._centroids = {}
+        self._pool = None
+        self._pool_finalizer = None
+        # las consultas pueden llegar desde hilos (Isea.background.LatestTask)
+        self._lock = threading.Lock()
+
+    # -- helpers ----------------------------------------------------------
+
+    def _cache_key(self, kind, keys, params):
+        h = hashlib.sha1(kind.encode())
+        for k in sorted(map(str, keys)) if keys else ():
+            h.update(b"\0" + k.encode())
+        h.update(repr(sorted(params.items())).encode())
+        return h.hexdigest()
+
+    def _cached(self, kind, keys, params, compute):
+        key = self._cache_key(kind, keys, params)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        out = compute()
+        with self._lock:
+            self._cache[key] = out
+            while len(self._cache) > self.max_cache:
+                self._cache.popitem(last=False)
+        return out
+
+    def _executor(self):
+        """The k-sweep process pool, created on first use."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                # se cierra con el motor aunque nadie llame a close()
+                self._pool_finalizer = weakref.finalize(self, self._pool.shutdown, wait=False)
+            return self._pool
+
+    def _rows(self, keys):
+        """Row mask for the selection (all rows when ``keys`` is empty)."""
+        if not keys:
+            return np.ones(len(self.keys), dtype=bool)
+        return np.isin(self.keys, [str(k) for k in keys])
+
+    def _scaled(self, keys):
+        X = self.values[self._rows(keys)]
+        mu = X.mean(axis=0)
+        sd = X.std(axis=0)
+        sd[sd == 0] = 1.0
+        return X, (X - mu) / sd, mu, sd
+
+    # -- public API -------------------------------------------------------
+
+    def clusters(self, keys=None, n_clusters=4):
+        """
+        Cluster the selected rows with warm-started mini-batch k-means.
+
+        Parameters
+        ----------
+        keys : iterable or None
+            Selected keys (``None``/empty means all rows).
+        n_clusters : int, default 4
+
+        Returns
+        -------
+        dict or None
+            ``labels`` (Series indexed by key), ``stats`` (cluster means
+            in original units), ``stats_norm`` (z-scored stats),
+            ``quality`` (``silhouette``, sampled above 2000 rows, and
+            ``davies``) and ``heatmap``
+            (:class:`D3Heatmap` kwargs). ``None`` if fewer rows than
+            clusters are selected.
+        """
+        keys = list(keys or [])
+
+        def compute():
+            X, Z, mu, sd = self._scaled(keys)
+            if len(X) < n_clusters:
+                return None
+            with self._lock:
+                prev = self._centroids.get(n_clusters)
+            init = (prev - mu) / sd if prev is not None else None
+            labels, C, _ = _minibatch_kmeans(Z, n_clusters, init=init, seed=self.random_state)
+            with self._lock:
+                self._centroids[n_clusters] = C * sd + mu
+
+            sel_keys = self.keys[self._rows(keys)]
+            frame = pd.DataFrame(X, columns=self.features)
+            frame["Cluster"] = labels
+            stats = frame.groupby("Cluster")[self.features].mean()
+            stats_norm = (stats - stats.mean()) / stats.std(ddof=1).replace(0, 1)
+            return {
+                "labels": pd.Series(labels, index=sel_keys, name="Cluster"),
+                "stats": stats,
+                "stats_norm": stats_norm,
+                "quality": {"silhouette": _silhouette(Z, labels, seed=self.random_state),
+                            "davies": _davies_bouldin(Z, labels)},
+                "heatmap": {"df": stats_norm, "title": "Cluster Characteristics (Z-Score Normalized)",
+                            "cmap": "viridis"},
+            }
+
+        return self._cached("clusters", keys, {"k": n_clusters}, compute)
+
+    def k_sweep(self, keys=None, k_range=range(2, 8)):
+        """
+        Elbow / silhouette curve over ``k_range`` for the selected rows.
+
+        Returns
+        -------
+        dict
+            ``{"inertias": {k: float}, "silhouette_scores": {k: float}}``
+            (the same shape as the notebook's ``calculate_elbow_curve``).
+        """
+        keys = list(keys or [])
+        ks = [int(k) for k in k_range]
+
+        def compute():
+            _, Z, _, _ = self._scaled(keys)
+            jobs = [(Z, k, self.random_state) for k in ks if k < len(Z)]
+            if self.workers in (0, 1) or len(jobs) < 2:
+                results = list(map(_sweep_one, jobs))
+            else:
+                results = list(self._executor().map(_sweep_one, jobs))
+            return {
+                "inertias": {k: inertia for k, inertia, _ in results},
+                "silhouette_scores": {k: sil for k, _, sil in results},
+            }
+
+        return self._cached("k_sweep", keys, {"ks": tuple(ks)}, compute)
+
+    def correlation(self, keys=None):
+        """
+        Pearson correlation between the features for the selected rows.
+
+        Returns
+        -------
+        dict
+            ``corr`` (DataFrame) and ``heatmap`` (:class:`D3Heatmap`
+            kwargs using the diverging ``"coolwarm"`` map).
+        """
+        keys = list(keys or [])
+
+        def compute():
+            X = self.values[self._rows(keys)]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                corr = pd.DataFrame(np.corrcoef(X, rowvar=False), index=self.features, columns=self.features)
+            return {"corr": corr, "heatmap": {"df": corr, "title": "Metric Correlations", "cmap": "coolwarm"}}
+
+        return self._cached("correlation", keys, {}, compute)
+
+    def clear_cache(self):
+        """Drop cached results and the warm-start centroids."""
+        with self._lock:
+            self._cache.clear()
+            self._centroids.clear()
+
+    def close(self):
+        """Shut down the :meth:`k_sweep` process pool (recreated if needed)."""
+        with self._lock:
+            pool, finalizer = self._pool, self._pool_finalizer
+            self._pool = self._pool_finalizer = None
+        if pool is not None:
+            finalizer.detach()
+            pool.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# Incremental correlation
+# ---------------------------------------------------------------------------
+
+class RunningCorrelation:
+    """
+    Pearson correlation over a changing subset of rows, updated incrementally.
+
+    The accumulator keeps the running moments of the selected rows
+    (count, column sums and the cross-product matrix, whose diagonal holds
+    the sums of squares). Adding or removing rows costs
+    ``O(Δrows × metrics²)``, so brushing a selection only pays for the rows
+    that entered or left it instead of recomputing the whole matrix.
+    Values are centred on the full-table column means to keep the
+    moment formulas numerically stable.
+
+    Parameters
+    ----------
+    wide_df : pandas.DataFrame
+        Table with one row per entity.
+    features : list[str]
+        Numeric columns to correlate (NaN is treated as 0).
+    key_col : str, default "id"
+        Column matched against selection keys (as strings). A key shared
+        by several rows selects all of them, as in
+        :class:`AnalysisEngine`.
+
+    Examples
+    --------
+    >>> rc = RunningCorrelation(wide, ["SalesBEV", "StockBEV", "ChargingStations"])
+    >>> hm = D3Heatmap(rc.set_selection(w.selection.get("keys", [])), cmap="coolwarm")
+    >>> rc.link(w, hm)   # brushing `w` now updates only the changed cells of `hm`
+    """
+
+    def __init__(self, wide_df, features, key_col="id"):
+        if pd is None:
+            raise ImportError("Pandas es necesario para RunningCorrelation")
+        self.features = [f for f in features if f in wide_df.columns]
+        if not self.features:
+            raise ValueError("None of the requested features are columns of wide_df")
+        X = wide_df[self.features].apply(pd.to_numeric, errors="coerce").fillna(0.0).to_numpy(dtype=float)
+        self._X = X - X.mean(axis=0)
+        # clave -> posiciones de todas sus filas
+        self._row = pd.Series(np.arange(len(X))).groupby(wide_df[key_col].astype(str).to_numpy()).indices
+        m = len(self.features)
+        self._n = 0
+        self._s = np.zeros(m)
+        self._q = np.zeros((m, m))
+        self._selected = set()
+
+    def _apply(self, rows, sign):
+        if not rows:
+            return
+        B = self._X[sorted(rows)]
+        self._n += sign * len(rows)
+        self._s += sign * B.sum(axis=0)
+        self._q += sign * (B.T @ B)
+
+    def _rows_of(self, keys):
+        """Row positions of ``keys`` (unknown keys are ignored)."""
+        rows = set()
+        for k in map(str, keys):
+            if k in self._row:
+                rows.update(self._row[k].tolist())
+        return rows
+
+    def add(self, keys):
+        """Add rows (by key) to the accumulated subset."""
+        rows = self._rows_of(keys) - self._selected
+        self._apply(rows, +1)
+        self._selected |= rows
+
+    def remove(self, keys):
+        """Remove rows (by key) from the accumulated subset."""
+        rows = self._rows_of(keys) & self._selected
+        self._apply(rows, -1)
+        self._selected -= rows
+
+    def set_selection(self, keys):
+        """
+        Move the subset to exactly ``keys`` (empty means all rows).
+
+        Only the rows entering or leaving the subset are processed.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The updated correlation matrix (see :meth:`corr`).
+        """
+        rows = self._rows_of(keys) if keys else set(range(len(self._X)))
+        self._apply(rows - self._selected, +1)
+        self._apply(self._selected - rows, -1)
+        self._selected = rows
+        return self.corr()
+
+    def corr(self):
+        """
+        Current correlation matrix as a features × features DataFrame.
+
+        Cells involving a constant column (or fewer than two rows) are NaN.
+        """
+        m = len(self.features)
+        if self._n < 2:
+            c = np.full((m, m), np.nan)
+        else:
+            mu = self._s / self._n
+            cov = self._q / self._n - np.outer(mu, mu)
+            sd = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+            den = np.outer(sd, sd)
+            c = np.divide(cov, den, out=np.full((m, m), np.nan), where=den > 1e-12)
+            np.clip(c, -1.0, 1.0, out=c)
+        return pd.DataFrame(c, index=self.features, columns=self.features)
+
+    def link(self, source, heatmap, tol=1e-6):
+        """
+        Drive ``heatmap`` from the ``selection`` trait of ``source``.
+
+        Parameters
+        ----------
+        source : widget
+            Any Isea widget with a ``selection`` dict holding ``"keys"``
+            (e.g. :class:`~Isea.scatter.ScatterBrush` or
+            :class:`~Isea.parallel.ParallelEnergy`).
+        heatmap : Isea.heatmap.D3Heatmap
+            Heatmap showing this correlation matrix; it receives only the
+            cells that changed (see :meth:`D3Heatmap.update_cells`).
+        tol : float, default 1e-6
+            Cells that moved less than this are not sent.
+
+        Returns
+        -------
+        callable
+            The observer, so it can be removed with
+            ``source.unobserve(handler, names="selection")``.
+        """
+        def handler(change):
+            sel = change["new"] or {}
+            heatmap.update_cells(self.set_selection(sel.get("keys", [])), tol=tol)
+
+        source.observe(handler, names="selection")
+        return handler
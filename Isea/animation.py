@@ -0,0 +1,89 @@
+"""
+Year animation driven in the browser.
+
+:class:`~Isea.scatter.ScatterBrush`, :class:`~Isea.parallel.ParallelEnergy`,
+:class:`~Isea.energy_quad.EnergyQuad` and
+:class:`~Isea.worldmaplinechart.WorldMapLineChart` have a year slider
+with a play button next to it. Playing runs on ``requestAnimationFrame``
+in the view (``assets/anim.js``), not from the kernel. The view walks
+through the years it has already prepared and blends each pair of
+consecutive years with an easing curve, so the points, lines and colours
+move smoothly instead of jumping.
+
+From Python, :meth:`Animated.play`, :meth:`Animated.pause` and
+:meth:`Animated.seek` each send one control message::
+
+    world.play(fps=2, easing="linear", loop=True)
+    ...
+    world.pause()
+    world.anim_year        # year shown when the animation stopped
+    world.seek(2015)
+
+``fps`` is measured in years per second.
+"""
+from pathlib import Path
+
+import traitlets as T
+
+_ANIM_JS = Path(__file__).parent / "assets" / "anim.js"
+
+EASINGS = ("linear", "quad-in-out", "cubic-in-out", "sine-in-out", "step")
+
+
+def _anim_esm(js_text):
+    """Prepend the animation driver (``assets/anim.js``) to a view module."""
+    return _ANIM_JS.read_text(encoding="utf-8") + js_text
+
+
+class Animated(T.HasTraits):
+    """
+    Mixin for widgets whose year slider can be animated in the browser.
+
+    ``anim_year`` is written by the view when an animation stops (pause,
+    end or seek). It stays ``None`` until then.
+    """
+
+    anim_year = T.Int(default_value=None, allow_none=True).tag(sync=True)
+
+    def play(self, fps=None, easing=None, loop=None):
+        """
+        Start the year animation in every displayed view.
+
+        Parameters
+        ----------
+        fps : float, optional
+            Years per second (default 1).
+        easing : {"linear", "quad-in-out", "cubic-in-out", "sine-in-out", "step"}, optional
+            Curve used between two years (default ``"cubic-in-out"``).
+            ``"step"`` jumps from year to year without blending.
+        loop : bool, optional
+            Start again from the first year after the last one.
+
+        Settings not given keep their previous value in the view.
+        Playing from the last year starts again from the first.
+        """
+        if fps is not None and not fps > 0:
+            raise ValueError("fps must be > 0")
+        if easing is not None and easing not in EASINGS:
+            raise ValueError(f"easing must be one of {EASINGS}")
+        msg = {"type": "anim", "action": "play"}
+        if fps is not None:
+            msg["fps"] = float(fps)
+        if easing is not None:
+            msg["easing"] = easing
+        if loop is not None:
+            msg["loop"] = bool(loop)
+        self.send(msg)
+
+    def pause(self):
+        """Stop the animation at the nearest year."""
+        self.send({"type": "anim", "action": "pause"})
+
+    def seek(self, year):
+        """
+        Show ``year`` (stops a running animation).
+
+        ``year`` is a number (``2015``) or a year label (``"F2015"``).
+        Years the view does not have are ignored.
+        """
+        self.send({"type": "anim", "action": "seek", "year": str(year)})
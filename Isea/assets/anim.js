@@ -0,0 +1,130 @@
+// Isea/assets/anim.js
+// Animación de años en el navegador (se antepone al módulo de las vistas, ver Isea/animation.py).
+//
+// Un reloj requestAnimationFrame recorre los fotogramas de la vista (sus años ya calculados) e
+// interpola entre dos años con la curva elegida, sin pasar por el kernel. Python solo manda un
+// mensaje de control ({type: "anim", action: "play" | "pause" | "seek", ...}) y recibe el año
+// final en `anim_year` cuando la animación se detiene.
+//   const player = iseaPlayer(model);
+//   player.bind(years, apply)   // apply(pos): pos en [0, years.length - 1], fraccionario al interpolar
+//   player.at(i)                // la vista cambió de año por su cuenta (slider): se detiene ahí
+//   player.button()             // <button> ▶ / ⏸
+
+const ISEA_EASINGS = {
+  linear: t => t,
+  "quad-in-out": t => (t < 0.5 ? 2 * t * t : 1 - 2 * (1 - t) * (1 - t)),
+  "cubic-in-out": t => (t < 0.5 ? 4 * t * t * t : 1 - 4 * (1 - t) ** 3),
+  "sine-in-out": t => (1 - Math.cos(Math.PI * t)) / 2,
+  step: () => 0,   // sin interpolación: salta de año en año
+};
+
+// "F2020", "2020" o 2020 -> 2020
+const iseaYearNum = (y) => +String(y).replace(/^F/, "");
+
+function iseaPlayer(model) {
+  let years = [], apply = null;
+  let pos = 0, shown = null, playing = false, raf = null, last = 0;
+  const cfg = { fps: 1, easing: "cubic-in-out", loop: false };
+  const buttons = new Set();
+
+  function show(p) {
+    const i = Math.floor(p), t = ISEA_EASINGS[cfg.easing] || ISEA_EASINGS.linear;
+    const at = i >= years.length - 1 ? years.length - 1 : i + t(p - i);
+    if (at === shown || !apply) return;
+    shown = at;
+    apply(at);
+  }
+
+  function frame(now) {
+    raf = null;
+    if (!playing) return;
+    pos += Math.max(0, now - last) * cfg.fps / 1000;
+    last = now;
+    const end = years.length - 1;
+    if (pos >= end) {
+      if (!cfg.loop || end <= 0) { pos = end; stop(); return; }
+      pos %= end;
+      // al dar la vuelta el último año también se ve un fotograma
+      if (shown !== end) { show(end); raf = requestAnimationFrame(frame); return; }
+    }
+    show(pos);
+    raf = requestAnimationFrame(frame);
+  }
+
+  function report() {
+    const y = years[Math.round(pos)];
+    if (y === undefined) return;
+    model.set("anim_year", iseaYearNum(y));
+    model.save_changes();
+  }
+
+  function halt() {
+    playing = false;
+    if (raf != null) { cancelAnimationFrame(raf); raf = null; }
+    buttons.forEach(b => { b.textContent = "▶"; });
+  }
+
+  function stop() {
+    halt();
+    // se queda en un año exacto, no a medio camino
+    pos = Math.round(pos);
+    show(pos);
+    report();
+  }
+
+  const player = {
+    bind(y, f) {
+      years = y || []; apply = f; shown = null;
+      pos = Math.min(pos, Math.max(0, years.length - 1));
+      buttons.forEach(b => { if (!b.isConnected) buttons.delete(b); });   // vista redibujada
+    },
+    play(opts = {}) {
+      for (const k of ["fps", "easing", "loop"]) if (opts[k] != null) cfg[k] = opts[k];
+      if (playing || years.length < 2) return;
+      if (pos >= years.length - 1) pos = 0;   // al final: empieza de nuevo
+      playing = true;
+      last = performance.now();
+      buttons.forEach(b => { b.textContent = "⏸"; });
+      raf = requestAnimationFrame(frame);
+    },
+    pause() { if (playing) stop(); },
+    toggle() { playing ? player.pause() : player.play(); },
+    seek(i) {
+      if (!(i >= 0 && i < years.length)) return;
+      halt();
+      pos = i;
+      show(pos);
+      report();
+    },
+    at(i) {
+      halt();
+      pos = i; shown = i;
+    },
+    button() {
+      const b = document.createElement("button");
+      b.textContent = playing ? "⏸" : "▶";
+      b.title = "Play / pause";
+      b.style.cssText = "padding:2px 8px;border-radius:6px;border:1px solid #cbd5e1;background:#f8fafc;" +
+        "color:#0f172a;font:12px sans-serif;cursor:pointer;";
+      b.addEventListener("click", () => player.toggle());
+      buttons.add(b);
+      return b;
+    },
+    dispose() {
+      halt();
+      model.off("msg:custom", onMsg);
+    },
+  };
+
+  const onMsg = (msg) => {
+    if (!msg || msg.type !== "anim") return;
+    if (msg.action === "play") player.play(msg);
+    else if (msg.action === "pause") player.pause();
+    else if (msg.action === "seek") {
+      const i = years.findIndex(y => iseaYearNum(y) === iseaYearNum(msg.year));
+      player.seek(i);
+    }
+  };
+  model.on("msg:custom", onMsg);
+  return player;
+}
@@ -16,11 +16,20 @@ export async function render({ model, el }) {
     `;
     document.body.appendChild(tooltip);
 
+    // Option keys applied to the drawn chart: labels (restyle) and the Python layout
+    // domains (rescale). Size and margins rebuild it.
+    const RESTYLE = new Set(["title", "xLabel", "yLabel", "zLabel"]);
+    const RESCALE = new Set(["layout"]);
+    let updateOptions = null;
+    let drawnOptions = {};
+
     function draw() {
         const data = model.get("data");
-        const opts = model.get("options");
+        let opts = model.get("options");
+        drawnOptions = opts;
         
         container.innerHTML = "";
+        updateOptions = null;
         
         if (!data || data.length === 0) {
             container.innerHTML = `<div style="padding:20px; color:#888">No data for bubbles</div>`;
@@ -43,26 +52,24 @@ export async function render({ model, el }) {
             .attr("transform", `translate(${margin.left},${margin.top})`);
 
         // Title
-        if (opts.title) {
-            svg.append("text")
-                .attr("x", width / 2)
-                .attr("y", margin.top / 2)
-                .attr("text-anchor", "middle")
-                .style("fill", "#e5e7eb")
-                .style("font-weight", "bold")
-                .text(opts.title);
-        }
+        const drawTitle = () => svg.selectAll("text.title")
+            .data(opts.title ? [opts.title] : [])
+            .join("text")
+            .attr("class", "title")
+            .attr("x", width / 2)
+            .attr("y", margin.top / 2)
+            .attr("text-anchor", "middle")
+            .style("fill", "#e5e7eb")
+            .style("font-weight", "bold")
+            .text(d => d);
+        drawTitle();
 
         // Scales
         // Use Log scale if data spans many orders of magnitude (common in EV stats)
         // Checking range to decide, but defaulting to Linear for simplicity unless specified
-        const xMax = d3.max(data, d => d.x) || 100;
-        const yMax = d3.max(data, d => d.y) || 100;
-        const rMax = d3.max(data, d => d.r) || 10;
-
-        const x = d3.scaleLinear().domain([0, xMax * 1.1]).range([0, innerW]);
-        const y = d3.scaleLinear().domain([0, yMax * 1.1]).range([innerH, 0]);
-        const r = d3.scaleSqrt().domain([0, rMax]).range([4, 25]); // Sqrt for area sizing
+        const x = d3.scaleLinear().range([0, innerW]);
+        const y = d3.scaleLinear().range([innerH, 0]);
+        const r = d3.scaleSqrt().range([4, 25]); // Sqrt for area sizing
 
         const color = d3.scaleOrdinal(d3.schemeTableau10);
 
@@ -70,13 +77,11 @@ export async function render({ model, el }) {
         const xAxis = d3.axisBottom(x).ticks(5).tickFormat(d3.format(".2s"));
         const yAxis = d3.axisLeft(y).ticks(5).tickFormat(d3.format(".2s"));
 
-        g.append("g").attr("transform", `translate(0,${innerH})`)
-            .call(xAxis).attr("color", "#9ca3af").select(".domain").remove();
-        
-        g.append("g").call(yAxis).attr("color", "#9ca3af").select(".domain").remove();
+        const gx = g.append("g").attr("transform", `translate(0,${innerH})`).attr("color", "#9ca3af");
+        const gy = g.append("g").attr("color", "#9ca3af");
 
         // Labels
-        g.append("text")
+        const xLabel = g.append("text")
             .attr("x", innerW)
             .attr("y", innerH - 5)
             .attr("text-anchor", "end")
@@ -84,7 +89,7 @@ export async function render({ model, el }) {
             .style("font-size", "11px")
             .text(opts.xLabel);
 
-        g.append("text")
+        const yLabel = g.append("text")
             .attr("transform", "rotate(-90)")
             .attr("y", 10)
             .attr("dy", ".71em")
@@ -94,16 +99,13 @@ export async function render({ model, el }) {
             .text(opts.yLabel);
 
         // Grid
-        g.append("g").attr("class", "grid").call(d3.axisLeft(y).tickSize(-innerW).tickFormat("")).style("opacity", 0.1);
-        g.append("g").attr("class", "grid").attr("transform", `translate(0,${innerH})`).call(d3.axisBottom(x).tickSize(-innerH).tickFormat("")).style("opacity", 0.1);
+        const gridY = g.append("g").attr("class", "grid").style("opacity", 0.1);
+        const gridX = g.append("g").attr("class", "grid").attr("transform", `translate(0,${innerH})`).style("opacity", 0.1);
 
         // Bubbles
-        g.selectAll("circle")
+        const bubbles = g.selectAll("circle")
             .data(data)
             .join("circle")
-            .attr("cx", d => x(d.x))
-            .attr("cy", d => y(d.y))
-            .attr("r", d => r(d.r))
             .style("fill", d => color(d.group))
             .style("opacity", 0.7)
             .style("stroke", "#fff")
@@ -129,11 +131,48 @@ export async function render({ model, el }) {
                 d3.select(this).style("opacity", 0.7).style("stroke-width", 1);
                 tooltip.style.opacity = 0;
             });
+
+        // Domains, axes, grid and positions. With a Python-side layout, domains and
+        // final positions arrive precomputed
+        function place() {
+            const pre = opts.layout || null;
+            x.domain([0, (pre ? pre.xMax : (d3.max(data, d => d.x) || 100)) * 1.1]);
+            y.domain([0, (pre ? pre.yMax : (d3.max(data, d => d.y) || 100)) * 1.1]);
+            r.domain([0, pre ? pre.rMax : (d3.max(data, d => d.r) || 10)]);
+
+            gx.call(xAxis).select(".domain").remove();
+            gy.call(yAxis).select(".domain").remove();
+            gridY.call(d3.axisLeft(y).tickSize(-innerW).tickFormat(""));
+            gridX.call(d3.axisBottom(x).tickSize(-innerH).tickFormat(""));
+
+            bubbles
+                .attr("cx", pre ? d => d.px : d => x(d.x))
+                .attr("cy", pre ? d => d.py : d => y(d.y))
+                .attr("r", pre ? d => d.pr : d => r(d.r));
+        }
+        place();
+
+        // set_data() sends the rows and their layout together; a layout-only change just rescales
+        updateOptions = (next, rescale) => {
+            opts = next;
+            drawTitle();
+            xLabel.text(opts.xLabel);
+            yLabel.text(opts.yLabel);
+            if (rescale) place();
+        };
     }
 
     draw();
     model.on("change:data", draw);
-    model.on("change:options", draw);
+    model.on("change:options", () => {
+        const next = model.get("options") || {};
+        const changed = Object.keys({ ...drawnOptions, ...next })
+            .filter(k => JSON.stringify(drawnOptions[k]) !== JSON.stringify(next[k]));
+        if (!changed.length) return;
+        if (!updateOptions || changed.some(k => !RESTYLE.has(k) && !RESCALE.has(k))) return draw();
+        drawnOptions = next;
+        updateOptions(next, changed.some(k => RESCALE.has(k)));
+    });
     
     return () => { if(tooltip.parentNode) tooltip.parentNode.removeChild(tooltip); };
 }
\ No newline at end of file
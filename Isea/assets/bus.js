@@ -0,0 +1,114 @@
+// Isea/assets/bus.js
+// Enlace entre vistas en el navegador (se antepone al módulo de cada widget, ver Isea/linking.py).
+//
+// Vistas con el mismo `link_group` intercambian, sin pasar por el kernel:
+//   "isea:select"  { group, source, keys, labels }  -> selección (keys = null para limpiar)
+//   "isea:filter"  { group, source, keys, labels }  -> subconjunto visible, p. ej. durante un brush
+// `keys` son las claves de la vista que publica (país, iso3, id...); `labels` son alias opcionales
+// (p. ej. nombres además de iso3). El receptor compara cada registro con keys ∪ labels.
+// El trait `filter_keys` (puesto desde Python por Isea.link) llega por el mismo onFilter.
+
+function iseaBus() {
+  // misma forma que el bus de Isea.widgets.ensure_bus(); el primero que llega lo crea
+  if (!window.IseaBus) {
+    window.IseaBus = new class {
+      constructor(){ this.tgt = new EventTarget(); }
+      on(t, h){ this.tgt.addEventListener(t, h); }
+      off(t, h){ this.tgt.removeEventListener(t, h); }
+      emit(t, detail){ this.tgt.dispatchEvent(new CustomEvent(t, {detail})); }
+    };
+  }
+  return window.IseaBus;
+}
+
+// Canal de una vista. La vista asigna ch.onSelect / ch.onFilter (keys: Set<string> | null)
+// y llama ch.publish(kind, keys, labels) y ch.commit(selection).
+function iseaLink(model) {
+  const bus = iseaBus();
+  // último evento por grupo: las vistas que se muestran después se ponen al día
+  const last = bus.__iseaLast || (bus.__iseaLast = new Map());
+  const frame = {};   // publicaciones agrupadas por requestAnimationFrame, por tipo
+
+  const ch = {
+    id: Math.random().toString(36).slice(2),
+    onSelect: null,
+    onFilter: null,
+    pending: null,   // última selección local, enviada a Python con commit() o pull_selection()
+    group() { return model.get("link_group") || ""; },
+
+    publish(kind, keys, labels) {
+      const group = ch.group();
+      if (!group) return;
+      const detail = {
+        group, source: ch.id,
+        keys: keys == null ? null : Array.from(keys, String),
+        labels: labels == null ? null : Array.from(labels, String),
+      };
+      last.set(group + "|" + kind, detail);
+      if (frame[kind] == null) {
+        frame[kind] = requestAnimationFrame(() => {
+          frame[kind] = null;
+          const d = last.get(group + "|" + kind);
+          if (d && d.source === ch.id) bus.emit("isea:" + kind, d);
+        });
+      }
+    },
+
+    // selección hacia Python: inmediata con sync_selection, si no solo al pedirla
+    commit(selection) {
+      ch.pending = selection;
+      if (!model.get("sync_selection")) return;
+      model.set("selection", selection);
+      model.save_changes();
+    },
+
+    replay() {
+      if (model.get("filter_keys") != null) onFilterKeys();
+      const group = ch.group();
+      if (!group) return;
+      for (const kind of ["filter", "select"]) {
+        const d = last.get(group + "|" + kind);
+        if (d && d.source !== ch.id) deliver(kind, d);
+      }
+    },
+
+    dispose() {
+      bus.off("isea:select", onSelect);
+      bus.off("isea:filter", onFilter);
+      model.off("msg:custom", onMsg);
+      model.off("change:link_group", ch.replay);
+      model.off("change:filter_keys", onFilterKeys);
+      for (const k in frame) if (frame[k] != null) cancelAnimationFrame(frame[k]);
+    },
+  };
+
+  function deliver(kind, d) {
+    const f = kind === "select" ? ch.onSelect : ch.onFilter;
+    if (!f) return;
+    f(d.keys == null ? null : new Set(d.labels ? d.keys.concat(d.labels) : d.keys), d);
+  }
+  const listener = (kind) => (ev) => {
+    const d = ev.detail || {};
+    const group = ch.group();
+    if (!group || d.group !== group || d.source === ch.id) return;
+    deliver(kind, d);
+  };
+  const onSelect = listener("select"), onFilter = listener("filter");
+  const onFilterKeys = () => {
+    const keys = model.get("filter_keys");
+    if (ch.onFilter) ch.onFilter(keys == null ? null : new Set(keys.map(String)), { source: "python" });
+  };
+  const onMsg = (msg) => {
+    if (!msg || msg.type !== "pull_selection") return;
+    model.set("selection", ch.pending || {});
+    model.save_changes();
+  };
+
+  bus.on("isea:select", onSelect);
+  bus.on("isea:filter", onFilter);
+  model.on("msg:custom", onMsg);
+  model.on("change:link_group", ch.replay);
+  model.on("change:filter_keys", onFilterKeys);
+  return ch;
+}
+
@@ -0,0 +1,132 @@
+// Isea/assets/compute.js
+// Cálculo en un Web Worker compartido (se antepone al módulo de las vistas, ver Isea/compute.py).
+//
+// Los kernels trabajan sobre arrays tipados y no usan nada de fuera de su cuerpo: el mismo código
+// corre en el worker (creado desde un Blob, sin fichero aparte) o en el hilo principal.
+//   compute.now(op, args)                 -> resultado, en el hilo principal (datos pequeños)
+//   compute.run(op, args, transfer)       -> Promise; `transfer` son ArrayBuffers que se ceden
+//   compute.latest()                      -> runner que solo resuelve la última llamada (las
+//                                            anteriores resuelven null): sliders, brushes...
+// Si el navegador no permite workers desde blob: (CSP), todo se ejecuta en el hilo principal con el
+// mismo resultado. Si el worker falla a mitad, los trabajos que cedieron sus buffers resuelven null
+// y la vista sigue con su cálculo local.
+
+const ISEA_KERNELS = {
+  // min / max / mínimo positivo de cada columna (NaN e infinitos se ignoran)
+  extent({ cols }) {
+    const out = {};
+    for (const k in cols) {
+      const a = cols[k];
+      let lo = Infinity, hi = -Infinity, pos = Infinity;
+      for (let i = 0; i < a.length; i++) {
+        const v = a[i];
+        if (!(v > -Infinity && v < Infinity)) continue;
+        if (v < lo) lo = v;
+        if (v > hi) hi = v;
+        if (v > 0 && v < pos) pos = v;
+      }
+      out[k] = [lo === Infinity ? NaN : lo, hi === -Infinity ? NaN : hi, pos === Infinity ? NaN : pos];
+    }
+    return out;
+  },
+
+  // matriz año × registro (ny filas de n): extremos por año y, con normalize, la matriz min-max
+  // (un año constante usa la escala [0, 1]: se dibuja el propio valor)
+  years({ data, ny, n, normalize }) {
+    const min = new Float32Array(ny), max = new Float32Array(ny), minPos = new Float32Array(ny);
+    const norm = normalize ? new Float32Array(ny * n) : null;
+    for (let i = 0; i < ny; i++) {
+      let lo = Infinity, hi = -Infinity, pos = Infinity;
+      for (let j = i * n, e = j + n; j < e; j++) {
+        const v = data[j];
+        if (v !== v) continue;
+        if (v < lo) lo = v;
+        if (v > hi) hi = v;
+        if (v > 0 && v < pos) pos = v;
+      }
+      min[i] = lo === Infinity ? 0 : lo; max[i] = hi === -Infinity ? 0 : hi; minPos[i] = pos === Infinity ? NaN : pos;
+      if (norm) {
+        const span = max[i] - min[i];
+        for (let j = i * n, e = j + n; j < e; j++) norm[j] = span > 0 ? ((data[j] || 0) - min[i]) / span : (data[j] || 0);
+      }
+    }
+    return { min, max, minPos, norm };
+  },
+
+  // 1 = la fila cumple todos los rangos [a, b] (cols[i] con ranges[i]); NaN cuenta como 0
+  filter({ cols, ranges, n }) {
+    const mask = new Uint8Array(n).fill(1);
+    for (let c = 0; c < cols.length; c++) {
+      const a = cols[c], lo = ranges[c][0], hi = ranges[c][1];
+      for (let i = 0; i < n; i++) {
+        const v = a[i] || 0;
+        if (v < lo || v > hi) mask[i] = 0;
+      }
+    }
+    return mask;
+  },
+};
+
+// por debajo de este número de valores no compensa enviar al worker
+const ISEA_WORKER_MIN = 200000;
+
+function iseaCompute() {
+  if (window.__iseaCompute) return window.__iseaCompute;
+
+  const waiting = new Map();
+  let seq = 0, worker = null;
+  try {
+    const body = Object.values(ISEA_KERNELS).map(f => f.toString()).join(",\n");
+    const src = `const K = {${body}};
+      const buffers = r => r == null || typeof r !== "object" ? []
+        : ArrayBuffer.isView(r) ? [r.buffer] : Object.values(r).flatMap(buffers);
+      onmessage = (ev) => {
+        const { id, op, args } = ev.data;
+        try { const result = K[op](args); postMessage({ id, result }, [...new Set(buffers(result))]); }
+        catch (err) { postMessage({ id, error: String(err) }); }
+      };`;
+    worker = new Worker(URL.createObjectURL(new Blob([src], { type: "text/javascript" })));
+    worker.onmessage = (ev) => {
+      const { id, result, error } = ev.data, job = waiting.get(id);
+      if (!job) return;
+      waiting.delete(id);
+      if (error) job.fallback(); else job.resolve(result);
+    };
+    // worker roto: lo pendiente y lo que venga se calcula en el hilo principal
+    worker.onerror = () => {
+      worker = null;
+      const jobs = [...waiting.values()]; waiting.clear();
+      jobs.forEach(job => job.fallback());
+    };
+  } catch (err) {
+    worker = null;
+  }
+
+  const api = {
+    now(op, args) { return ISEA_KERNELS[op](args); },
+
+    run(op, args, transfer = []) {
+      return new Promise((resolve) => {
+        if (!worker) { resolve(api.now(op, args)); return; }
+        const id = ++seq;
+        // sin copia de respaldo: si el worker falla, los buffers cedidos ya no están
+        const local = transfer.length ? null : args;
+        waiting.set(id, {
+          resolve,
+          fallback: () => resolve(local ? api.now(op, local) : null),
+        });
+        worker.postMessage({ id, op, args }, transfer);
+      });
+    },
+
+    latest() {
+      let last = 0;
+      return (op, args, transfer) => {
+        const mine = ++last;
+        return api.run(op, args, transfer).then(r => (mine === last ? r : null));
+      };
+    },
+  };
+  window.__iseaCompute = api;
+  return api;
+}
@@ -0,0 +1,34 @@
+// Isea/assets/datastore.js
+// Vista mínima de un Isea.DataStore: filas × columnas y versión.
+export function render({ model, el }) {
+  const box = document.createElement("div");
+  box.style.cssText = "font:12px system-ui;color:#475569;padding:4px 0;";
+  el.appendChild(box);
+
+  let rows = 0, cols = 0;
+  function load() {
+    const t = model.get("table") || {};
+    rows = t.n || 0; cols = (t.order || []).length;
+    update();
+  }
+  function update() {
+    box.textContent = `DataStore — ${rows} rows × ${cols} columns (v${model.get("version")})`;
+  }
+  // los parches no reenvían `table`: contar filas/columnas desde el mensaje
+  function onMsg(msg) {
+    if (!msg || msg.type !== "patch") return;
+    rows = msg.n;
+    cols += Object.values(msg.cols || {}).filter(m => m.op === "replace" && m.new).length;
+    update();
+  }
+
+  model.on("change:table", load);
+  model.on("change:version", update);
+  model.on("msg:custom", onMsg);
+  load();
+  return () => {
+    model.off("change:table", load);
+    model.off("change:version", update);
+    model.off("msg:custom", onMsg);
+  };
+}
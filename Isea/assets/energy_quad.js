@@ -1,5 +1,12 @@
 // Isea/assets/energy_quad.js
 export function render({ model, el }) {
+  // {e, d} -> valores: suma acumulada de enteros escalados por 10^e (null = sin dato)
+  const decodeSeries = (s) => {
+    if (!s || Array.isArray(s)) return s;
+    const f = Math.pow(10, Math.abs(s.e));
+    let acc = 0;
+    return s.d.map(v => v == null ? null : (acc += v, s.e >= 0 ? acc / f : acc * f));
+  };
   // -------- helper to create nodes --------
   const h = (t, p = {}, parent) => {
     const n = document.createElement(t);
@@ -7,19 +14,34 @@ export function render({ model, el }) {
     if (parent) parent.appendChild(n);
     return n;
   };
+  // selections and brush filters shared with the link_group (IseaBus)
+  const link = iseaLink(model);
+  // extents, normalisation and brush filtering on the shared worker (compute.js)
+  const compute = iseaCompute();
+  // year animation (anim.js): play / pause / seek without kernel round-trips
+  const player = iseaPlayer(model);
+
+  // option keys applied to the built view (scales and year only; colors and fonts are fixed here).
+  // Any other key (sizes, reorder...) rebuilds.
+  const RESCALE = new Set(["log_axes", "normalize", "year_start"]);
+  let view = null, drawnOptions = {};
 
   async function draw() {
     // hard cleanup of host
     el.innerHTML = "";
+    view = null;
+    player.bind([], null);
 
     // ---------- data and options ----------
     const pack = model.get("data") ?? {};
     const opts = model.get("options") ?? {};
+    drawnOptions = opts;
     const YEARS = pack.years || [];
     let DIMS = (pack.dims || []).slice();
-    const R = pack.records || [];
+    // series por año: listas o {e, d} delta-codificadas (Isea.encoding)
+    const R = (pack.records || []).map(r => { const o = { ...r }; for (const k of DIMS) o[k] = decodeSeries(r[k]); return o; });
     if (!YEARS.length || !DIMS.length || !R.length) {
-      el.textContent = "No data.";
+      el.textContent = model.get("loading") ? "Loading…" : "No data.";
       return;
     }
 
@@ -42,47 +64,122 @@ export function render({ model, el }) {
     const row1H = +opts.left_height || 460;
     const row2H = Math.max(+opts.table_height || 180, +opts.mini_height || 260);
 
-    const useLog       = !!opts.log_axes;
-    const normalize    = !!opts.normalize;
+    let useLog         = !!opts.log_axes;
+    let normalize      = !!opts.normalize;
     const allowReorder = !!opts.reorder;
 
     let idxYear = YEARS.indexOf(opts.year_start ?? YEARS[YEARS.length - 1]);
     if (idxYear < 0) idxYear = YEARS.length - 1;
 
+    // ---------- year-indexed columns (built once per data load) ----------
+    // COLS[k][i] is a Float32Array over records for dimension k and year i
+    // (a view into one year × record matrix per dimension);
+    // EXT[k] holds per-year min / max / smallest positive value (log-safe);
+    // NORM[k] is the min-max normalised matrix.
+    // For large packs EXT and NORM come back from the worker; until then the
+    // scales use the year's data and normalisation is done per year here.
+    const DIMS0 = DIMS.slice();
+    const NREC = R.length, NY = YEARS.length;
+    const COLS = {}, EXT = {}, NORM = {};
+    const inWorker = NY * NREC * DIMS0.length >= ISEA_WORKER_MIN;
+    for (const k of DIMS0) {
+      const mat = new Float32Array(NY * NREC);
+      const cols = [];
+      for (let i = 0; i < NY; i++) cols.push(mat.subarray(i * NREC, (i + 1) * NREC));
+      R.forEach((r, j) => {
+        const s = r[k] || [];
+        for (let i = 0; i < NY; i++) cols[i][j] = +s[i] || 0;
+      });
+      COLS[k] = cols;
+
+      const e = pack.extents && pack.extents[k];
+      if (e && e.min && e.max) {
+        EXT[k] = {
+          min: Float32Array.from(e.min, v => +v || 0),
+          max: Float32Array.from(e.max, v => +v || 0),
+          minPos: Float32Array.from(e.min_pos || e.min, v => (v == null ? NaN : +v))
+        };
+      } else if (!inWorker) {
+        EXT[k] = compute.now("years", { data: mat, ny: NY, n: NREC });
+      }
+
+      if (inWorker) {
+        const data = mat.slice();   // the copy is transferred, COLS keeps the original
+        compute.run("years", { data, ny: NY, n: NREC, normalize: true }, [data.buffer]).then(res => {
+          if (!res) return;
+          if (!EXT[k]) EXT[k] = { min: res.min, max: res.max, minPos: res.minPos };
+          NORM[k] = res.norm;
+        });
+      }
+    }
+
     // ---------- data helpers ----------
+    // rows per year are materialised once and cached; scrubbing swaps references
+    const rowsCache = new Array(NY);
     function datasetFor(i) {
-      return R.map(r => {
-        const o = { Country: r.label, Year: YEARS[i] };
-        let best = DIMS[0], bestV = +r[DIMS[0]][i] || 0;
-        for (const k of DIMS) {
-          const v = +r[k][i] || 0;
+      if (rowsCache[i]) return rowsCache[i];
+      const rows = new Array(NREC);
+      for (let j = 0; j < NREC; j++) {
+        const o = { Country: R[j].label, Year: YEARS[i] };
+        let best = DIMS0[0], bestV = COLS[DIMS0[0]][i][j];
+        for (const k of DIMS0) {
+          const v = COLS[k][i][j];
           o[k] = v;
           if (v > bestV) { bestV = v; best = k; }
         }
         o.DominantTech = best;
-        return o;
-      });
+        rows[j] = o;
+      }
+      return (rowsCache[i] = rows);
     }
-    function normalizeByDim(data) {
-      const ext = {};
-      for (const k of DIMS) {
-        const vals = data.map(d => +d[k]).filter(Number.isFinite);
-        const mn = d3.min(vals), mx = d3.max(vals);
-        ext[k] = (mx > mn) ? [mn, mx] : [0, 1];
+    const normCache = new Array(NY);
+    function normalizeByDim(i) {
+      if (normCache[i]) return normCache[i];
+      // [min, max] of year i for the dimensions the worker has not normalised yet
+      const span = {};
+      for (const k of DIMS0) {
+        if (NORM[k]) continue;
+        if (EXT[k]) span[k] = [EXT[k].min[i], EXT[k].max[i]];
+        else {
+          const e = compute.now("years", { data: COLS[k][i], ny: 1, n: NREC });
+          span[k] = [e.min[0], e.max[0]];
+        }
       }
-      return data.map(d => {
+      const rows = datasetFor(i);
+      return (normCache[i] = rows.map((d, j) => {
         const o = { Country: d.Country, Year: d.Year, DominantTech: d.DominantTech };
-        for (const k of DIMS) {
-          const [mn, mx] = ext[k], v = +d[k] || 0;
-          o[k] = (mx > mn) ? (v - mn) / (mx - mn) : 0;
+        for (const k of DIMS0) {
+          if (NORM[k]) { o[k] = NORM[k][i * NREC + j]; continue; }
+          const [mn, mx] = span[k], v = +d[k] || 0;
+          // constant dimension: [0, 1] extent, the value itself is plotted
+          o[k] = (mx > mn) ? (v - mn) / (mx - mn) : v;
         }
         return o;
-      });
+      }));
     }
     function datasetYear(i) {
-      let d = datasetFor(i);
-      if (normalize) d = normalizeByDim(d);
-      return d;
+      return normalize ? normalizeByDim(i) : datasetFor(i);
+    }
+    // precomputed [min, max, minPos] for the full record set of year i
+    // (null while the worker is still computing: the parallels use the year's data)
+    function extentYear(i) {
+      if (normalize || !DIMS0.every(k => EXT[k])) return null;
+      return k => [EXT[k].min[i], EXT[k].max[i], EXT[k].minPos[i]];
+    }
+    // in-between animation frame: rows and extents of two years blended
+    // (exact years come from the caches above)
+    function blendYears(i, t) {
+      const a = datasetYear(i), b = datasetYear(i + 1);
+      return a.map((d, j) => {
+        const o = { ...d };
+        for (const k of DIMS0) o[k] = d[k] + (b[j][k] - d[k]) * t;
+        return o;
+      });
+    }
+    function blendExtent(i, t) {
+      const ea = extentYear(i), eb = extentYear(i + 1);
+      if (!ea || !eb) return null;
+      return k => { const A = ea(k), B = eb(k); return A.map((v, n) => v + (B[n] - v) * t); };
     }
 
     // ---------- colors + tooltip ----------
@@ -150,6 +247,7 @@ export function render({ model, el }) {
       textContent: YEARS[idxYear],
       style: "font:13px system-ui;color:#0f172a"
     }, header);
+    header.appendChild(player.button());
 
     // help button (popover)
     const helpBtn = h("button", { innerText: "How to interact?" }, header);
@@ -185,30 +283,75 @@ export function render({ model, el }) {
       let DATA = [];
       let selected = new Set();
 
+      // per-record y pixel cache: reordering axes only moves x
+      let yPix = new Map();
+      function cacheY() {
+        yPix = new Map();
+        for (const d of DATA) {
+          const py = {};
+          for (const k of DIMS) py[k] = y[k](+d[k]);
+          yPix.set(d, py);
+        }
+      }
+      const pathAt = (d, xs) => {
+        const py = yPix.get(d);
+        return line(DIMS.map((k, j) => [xs[j], py[k]]));
+      };
+
+      // drag updates are coalesced to one repaint per animation frame
+      let dragFrame = null;
+      function scheduleDragPaint() {
+        if (dragFrame != null) return;
+        dragFrame = requestAnimationFrame(() => {
+          dragFrame = null;
+          axis.attr("transform", d => `translate(${getX(d)},0)`);
+          const xs = DIMS.map(getX);
+          vis.attr("d", d => pathAt(d, xs));
+        });
+      }
+
       const layer = g.append("g").attr("fill", "none");
       const hit   = g.append("g").attr("fill", "none");
 
+      let EXTENT = null;
       function buildY() {
         for (const k of DIMS) {
-          const vals = DATA.map(d => +d[k]).filter(v => Number.isFinite(v) && (!useLog || v > 0));
+          let domain;
+          if (EXTENT) {
+            const [mn, mx, mp] = EXTENT(k);
+            domain = useLog ? [Math.max(1e-6, Number.isFinite(mp) ? mp : 1e-6), mx] : [mn, mx];
+          } else {
+            const vals = DATA.map(d => +d[k]).filter(v => Number.isFinite(v) && (!useLog || v > 0));
+            domain = useLog ? [Math.max(1e-6, d3.min(vals)), d3.max(vals)] : d3.extent(vals);
+          }
           y[k] = (useLog ? d3.scaleLog() : d3.scaleLinear())
-            .domain(useLog ? [Math.max(1e-6, d3.min(vals)), d3.max(vals)] : d3.extent(vals))
+            .domain(domain)
             .nice()
             .range([iH, 0]);
         }
       }
 
+      let linkFilter = null;   // keys left visible by a linked view's brush
       function applySel() {
+        const out = d => linkFilter && !linkFilter.has(String(d.Country));
         if (selected.size === 0) {
-          vis.attr("stroke-opacity", .85).attr("stroke-width", 1.2);
+          vis.attr("stroke-opacity", d => out(d) ? .04 : .85).attr("stroke-width", 1.2);
         } else {
-          vis.attr("stroke-opacity", d => selected.has(d.Country) ? 1 : .08)
+          vis.attr("stroke-opacity", d => out(d) ? .04 : selected.has(d.Country) ? 1 : .08)
              .attr("stroke-width",   d => selected.has(d.Country) ? 2.6 : .7);
         }
       }
 
       const bw = Math.min(36, Math.max(24, (iW / DIMS.length) * .5));
       const filters = {};
+      // DATA columns for the brush filter, built on the first brush after each updateData
+      let dataCols = null;
+      const colOf = k => {
+        dataCols = dataCols || {};
+        return dataCols[k] || (dataCols[k] = Float32Array.from(DATA, d => +d[k] || 0));
+      };
+      const filterLatest = compute.latest();
+
       function brushed(event) {
         g.selectAll(".brush").each(function (dim) {
           const s = d3.brushSelection(this);
@@ -219,22 +362,31 @@ export function render({ model, el }) {
           } else delete filters[dim];
         });
         const keys = Object.keys(filters);
-        const disp = d => {
-          for (const k of keys) {
-            const v = +d[k] || 0;
-            const [a, b] = filters[k];
-            if (v < a || v > b) return "none";
+        const end = !!(event && event.type === "end");
+        const sent = DATA;
+
+        // mask[i] = 1 when row i passes every brushed range (null = no brush)
+        const applyMask = mask => {
+          if (sent !== DATA) return;   // data changed (year slider) while the worker was filtering
+          const disp = mask ? (d, i) => (mask[i] ? null : "none") : null;
+          vis.style("display", disp);
+          hits.style("display", disp);
+
+          const rows = mask ? DATA.filter((d, i) => mask[i]) : DATA;
+          onFilter && onFilter(mask ? rows.map(r => r.Country) : null);
+
+          if (end) {
+            selected = new Set(rows.map(r => r.Country));
+            publish("brush");
           }
-          return null;
         };
-        vis.style("display", disp);
-        hits.style("display", disp);
 
-        if (event && event.type === "end") {
-          const rows = DATA.filter(d => disp(d) === null);
-          selected = new Set(rows.map(r => r.Country));
-          publish("brush");
-        }
+        if (!keys.length) { applyMask(null); return; }
+        const args = { cols: keys.map(colOf), ranges: keys.map(k => filters[k]), n: DATA.length };
+        if (DATA.length * keys.length < ISEA_WORKER_MIN) { applyMask(compute.now("filter", args)); return; }
+        // large data: transfer copies to the worker; while dragging only the latest answer is applied
+        args.cols = args.cols.map(c => c.slice());
+        filterLatest("filter", args, args.cols.map(c => c.buffer)).then(mask => { if (mask) applyMask(mask); });
       }
 
       let axis = null, vis = null, hits = null;
@@ -276,15 +428,15 @@ export function render({ model, el }) {
             })
             .on("drag", (ev, dim) => {
               dragging[dim] = Math.max(0, Math.min(iW, ev.x));
-              axis.attr("transform", d => `translate(${getX(d)},0)`);
-              const L = d => line(DIMS.map(k => [getX(k), y[k](+d[k])]));
-              vis.attr("d", L); hits.attr("d", L);
+              scheduleDragPaint();
             })
             .on("end", (ev, dim) => {
+              if (dragFrame != null) { cancelAnimationFrame(dragFrame); dragFrame = null; }
               DIMS.sort((a, b) => getX(a) - getX(b));
               dragging[dim] = null; delete dragging[dim];
               x.domain(DIMS);
-              const Lt = d => line(DIMS.map(k => [x(k), y[k](+d[k])]));
+              const xs = DIMS.map(k => x(k));
+              const Lt = d => pathAt(d, xs);
               axis.transition().duration(150).attr("transform", d => `translate(${x(d)},0)`);
               vis.transition().duration(150).attr("d", Lt);
               hits.transition().duration(150).attr("d", Lt);
@@ -296,9 +448,10 @@ export function render({ model, el }) {
       }
 
       function renderData() {
-        buildY(); renderAxes();
+        buildY(); cacheY(); renderAxes();
 
-        const pathD = d => line(DIMS.map(k => [x(k), y[k](+d[k])]));
+        const xs = DIMS.map(k => x(k));
+        const pathD = d => pathAt(d, xs);
 
         vis = layer.selectAll("path").data(DATA, d => d.Country).join("path")
           .attr("d", pathD)
@@ -333,26 +486,70 @@ export function render({ model, el }) {
         applySel();
         const keys = [...selected];
         const rows = DATA.filter(d => selected.has(d.Country));
-        model.set("selection", { type, keys, rows });
-        model.save_changes();
-        onSelect && onSelect();
+        link.commit({ type, keys, rows });
+        onSelect && onSelect(keys);
       }
 
       function setSelected(s) { selected = new Set(s); applySel(); }
-      function updateData(d) { DATA = d || []; renderData(); }
+      function updateData(d, ext = null) { DATA = d || []; EXTENT = ext; dataCols = null; renderData(); }
+
+      // axis order changed elsewhere: move axes and paths, y pixels stay cached
+      function setOrder(order) {
+        if (!axis || x.domain().join("\u0000") === order.join("\u0000")) return;
+        x.domain(order);
+        const xs = order.map(k => x(k));
+        axis.transition().duration(150).attr("transform", d => `translate(${x(d)},0)`);
+        vis.transition().duration(150).attr("d", d => pathAt(d, xs));
+        hits.attr("d", d => pathAt(d, xs));
+      }
 
-      let onSelect = null, onReorder = null;
+      function setLinkFilter(k) { linkFilter = k; if (vis) applySel(); }
+
+      let onSelect = null, onReorder = null, onFilter = null;
       return {
-        updateData, setSelected,
+        updateData, setSelected, setOrder, setLinkFilter,
         setOnSelection: f => (onSelect = f),
-        setOnReorder:   f => (onReorder = f)
+        setOnReorder:   f => (onReorder = f),
+        setOnFilter:    f => (onFilter = f)
       };
     }
 
     // ---------- insight (share lines) ----------
-    let updateInsightCursor = null;
-    function renderInsight(selectedKeys) {
-      rightTop.innerHTML = "";
+    // per-country totals per year, cached once; shares only visit selected rows
+    const IDX = new Map(R.map((r, j) => [r.label, j]));
+    const TOT = [];
+    for (let i = 0; i < NY; i++) {
+      const t = new Float64Array(NREC);
+      for (const k of DIMS0) { const c = COLS[k][i]; for (let j = 0; j < NREC; j++) t[j] += c[j]; }
+      TOT.push(t);
+    }
+    let allShares = null;
+    function shareSeries(keys) {
+      const sel = keys.size ? [...keys].map(k => IDX.get(k)).filter(j => j != null) : null;
+      if (!sel && allShares) return allShares;
+      const sums = {};
+      for (const k of DIMS0) sums[k] = new Float64Array(NY);
+      const sumAll = new Float64Array(NY);
+      for (let i = 0; i < NY; i++) {
+        const tot = TOT[i];
+        const visit = j => {
+          if (!(tot[j] > 0)) return;
+          sumAll[i] += tot[j];
+          for (const k of DIMS0) sums[k][i] += COLS[k][i][j];
+        };
+        if (sel) sel.forEach(visit); else for (let j = 0; j < NREC; j++) visit(j);
+      }
+      const series = DIMS0.map(dim => ({
+        dim,
+        values: YEARS.map((year, i) => ({ idx: i, year, share: (sumAll[i] > 0 ? sums[dim][i] / sumAll[i] : 0) }))
+      }));
+      if (!sel) allShares = series;
+      return series;
+    }
+
+    // static parts (axes, legend, title) are built once; series update via keyed joins
+    let updateInsightCursor = null, updateInsight = null;
+    (function buildInsight() {
       const svg = d3.select(rightTop).append("svg")
         .attr("width", rightW).attr("height", row1H).style("display", "block");
 
@@ -362,22 +559,6 @@ export function render({ model, el }) {
 
       const g = svg.append("g").attr("transform", `translate(${m.l},${m.t})`);
 
-      // data
-      const keys = new Set(selectedKeys || []);
-      const series = DIMS.map(dim => {
-        const values = YEARS.map((y, i) => {
-          let sumDim = 0, sumAll = 0;
-          for (const r of R) {
-            if (keys.size && !keys.has(r.label)) continue;
-            const v = +r[dim][i] || 0;
-            const tot = DIMS.reduce((a, k) => a + (+r[k][i] || 0), 0);
-            if (tot > 0) { sumDim += v; sumAll += tot; }
-          }
-          return { idx: i, year: y, share: (sumAll > 0 ? sumDim / sumAll : 0) };
-        });
-        return { dim, values };
-      });
-
       const x = d3.scaleLinear().domain([0, YEARS.length - 1]).range([0, w]);
       const y = d3.scaleLinear().domain([0, 1]).nice().range([h, 0]);
 
@@ -392,27 +573,33 @@ export function render({ model, el }) {
         .call(s => s.selectAll("path,line").style("stroke", "#111827").style("stroke-width", "1.05"));
 
       const l = d3.line().x(d => x(d.idx)).y(d => y(d.share));
+      const gLines = g.append("g"), gPts = g.append("g");
 
-      g.selectAll("path.s").data(series).join("path")
-        .attr("class", "s")
-        .attr("d", d => l(d.values))
-        .attr("fill", "none")
-        .attr("stroke", d => color(d.dim))
-        .attr("stroke-width", 2);
-
-      // points with tooltip
-      const pts = g.selectAll("g.pts").data(series).join("g")
-        .attr("class", "pts").attr("fill", d => color(d.dim));
+      updateInsight = (keys) => {
+        const series = shareSeries(keys);
 
-      pts.selectAll("circle").data(d => d.values.map(v => ({ ...v, dim: d.dim }))).join("circle")
-        .attr("cx", d => x(d.idx)).attr("cy", d => y(d.share)).attr("r", 3.2)
-        .on("mousemove", (ev, d) => showTip(ev, `<b>${d.dim}</b> — ${d.year}<br>${d3.format(".1%")(d.share)}`))
-        .on("mouseleave", hideTip);
+        gLines.selectAll("path.s").data(series, d => d.dim).join("path")
+          .attr("class", "s")
+          .attr("fill", "none")
+          .attr("stroke", d => color(d.dim))
+          .attr("stroke-width", 2)
+          .attr("d", d => l(d.values));
+
+        // points with tooltip
+        const pts = gPts.selectAll("g.pts").data(series, d => d.dim).join("g")
+          .attr("class", "pts").attr("fill", d => color(d.dim));
+
+        pts.selectAll("circle").data(d => d.values.map(v => ({ ...v, dim: d.dim })), d => d.idx).join(
+          enter => enter.append("circle").attr("r", 3.2)
+            .on("mousemove", (ev, d) => showTip(ev, `<b>${d.dim}</b> — ${d.year}<br>${d3.format(".1%")(d.share)}`))
+            .on("mouseleave", hideTip)
+        )
+          .attr("cx", d => x(d.idx)).attr("cy", d => y(d.share));
+      };
 
       // vertical rule linked to year
       const rule = g.append("line").attr("y1", 0).attr("y2", h)
         .attr("stroke", "#334155").attr("stroke-dasharray", "3,3");
-      rule.attr("x1", x(idxYear)).attr("x2", x(idxYear));
       updateInsightCursor = () => { rule.attr("x1", x(idxYear)).attr("x2", x(idxYear)); };
 
       // legend: top-right corner
@@ -424,7 +611,7 @@ export function render({ model, el }) {
         .attr("x", -10).attr("y", -6).attr("width", 260).attr("height", 22)
         .attr("rx", 10).attr("fill", "#f1f5f9").attr("stroke", "#e2e8f0");
 
-      const items = lg.selectAll("g.i").data(DIMS).join("g").attr("class", "i")
+      const items = lg.selectAll("g.i").data(DIMS0).join("g").attr("class", "i")
         .attr("transform", (d, i) => `translate(${i * 52},0)`);
 
       items.append("rect").attr("width", 10).attr("height", 10).attr("rx", 2)
@@ -438,7 +625,8 @@ export function render({ model, el }) {
         .text("Selected countries")
         .style("font", "600 13px system-ui")
         .style("fill", "#0f172a");
-    }
+    })();
+
     // ---------- state + synchronization ----------
     let currentData = datasetYear(idxYear);
     let currentSelection = new Set();
@@ -457,111 +645,149 @@ export function render({ model, el }) {
       `height:100%;overflow:auto;border:1px solid #e2e8f0;border-radius:12px;` +
       `background:#fff;box-shadow:0 1px 2px rgba(0,0,0,.04);`;
 
-    function renderTable(selRows) {
-      tableWrap.innerHTML = "";
-      const wrap = h("div", {}, tableWrap);
-      wrap.style.overflow = "auto";
-      wrap.style.maxWidth = "100%";
+    // table skeleton is built once; header follows axis order, rows join by country
+    const tableInner = h("div", {}, tableWrap);
+    tableInner.style.overflow = "auto";
+    tableInner.style.maxWidth = "100%";
+    const tbl = h("table", {}, tableInner);
+    Object.assign(tbl.style, {
+      borderCollapse: "separate",
+      borderSpacing: "0",
+      width: "100%"
+    });
+    const trh = tbl.createTHead().insertRow();
+    Object.assign(trh.style, {
+      position: "sticky",
+      top: "0",
+      background: "#f8fafc",
+      boxShadow: "inset 0 -1px 0 #e2e8f0"
+    });
+    const tb = tbl.createTBody();
+    const nf = new Intl.NumberFormat(undefined, { maximumFractionDigits: 3 });
+    const rowBg = i => (i % 2 ? "#f9fafb" : "#ffffff");
 
+    let tableCols = null;
+    function renderTable(selRows) {
       const rows = selRows || [];
       const cols = ["Country", "Year", ...DIMS, "DominantTech"];
 
-      const tbl = h("table", {}, wrap);
-      Object.assign(tbl.style, {
-        borderCollapse: "separate",
-        borderSpacing: "0",
-        width: "100%",
-        minWidth: `${220 + (cols.length - 1) * 140}px`
-      });
-
-      const thead = tbl.createTHead();
-      const trh = thead.insertRow();
-      Object.assign(trh.style, {
-        position: "sticky",
-        top: "0",
-        background: "#f8fafc",
-        boxShadow: "inset 0 -1px 0 #e2e8f0"
-      });
-
-      cols.forEach((c, i) => {
-        const th = document.createElement("th");
-        th.textContent = c;
-        Object.assign(th.style, {
-          padding: "10px 12px",
-          textAlign: i === 0 ? "left" : "right",
-          font: "600 12px system-ui",
-          color: "#0f172a"
-        });
-        if (i === 0) th.style.borderTopLeftRadius = "12px";
-        if (i === cols.length - 1) th.style.borderTopRightRadius = "12px";
-        trh.appendChild(th);
-      });
+      if (!tableCols || tableCols.join("\u0000") !== cols.join("\u0000")) {
+        tableCols = cols;
+        tbl.style.minWidth = `${220 + (cols.length - 1) * 140}px`;
+        d3.select(trh).selectAll("th").data(cols).join("th")
+          .text(c => c)
+          .each(function (c, i) {
+            Object.assign(this.style, {
+              padding: "10px 12px",
+              textAlign: i === 0 ? "left" : "right",
+              font: "600 12px system-ui",
+              color: "#0f172a",
+              borderTopLeftRadius: i === 0 ? "12px" : "",
+              borderTopRightRadius: i === cols.length - 1 ? "12px" : ""
+            });
+          });
+      }
 
-      const tb = tbl.createTBody();
-      const nf = new Intl.NumberFormat(undefined, { maximumFractionDigits: 3 });
-      rows.forEach((r, idx) => {
-        const tr = tb.insertRow();
-        tr.style.background = idx % 2 ? "#f9fafb" : "#ffffff";
-        tr.addEventListener("mouseenter", () => tr.style.background = "#eef2ff");
-        tr.addEventListener("mouseleave", () => tr.style.background = idx % 2 ? "#f9fafb" : "#ffffff");
-
-        cols.forEach((c, i) => {
-          const td = tr.insertCell();
-          const v = r[c];
-          const isNum = i > 1 && i < cols.length - 1 && Number.isFinite(+v);
-          td.textContent = isNum ? nf.format(+v) : (v ?? "—");
-          Object.assign(td.style, {
+      const tr = d3.select(tb).selectAll("tr").data(rows, d => d.Country).join(
+        enter => enter.append("tr")
+          .on("mouseenter", function () { this.style.background = "#eef2ff"; })
+          .on("mouseleave", function () { this.style.background = this.__bg; })
+      )
+        .order()
+        .each(function (_, i) { this.__bg = rowBg(i); this.style.background = this.__bg; });
+
+      tr.selectAll("td").data(r => cols.map(c => r[c])).join(
+        enter => enter.append("td").each(function () {
+          Object.assign(this.style, {
             padding: "10px 12px",
-            textAlign: i === 0 ? "left" : "right",
             font: "12px system-ui",
             color: "#0f172a",
             borderBottom: "1px solid #eef2f7"
           });
-          if (i === 0) td.style.fontWeight = "600";
+        })
+      )
+        .each(function (v, i) {
+          const isNum = i > 1 && i < cols.length - 1 && Number.isFinite(+v);
+          this.textContent = isNum ? nf.format(+v) : (v ?? "—");
+          this.style.textAlign = i === 0 ? "left" : "right";
+          this.style.fontWeight = i === 0 ? "600" : "";
         });
-      });
     }
 
-    function updateAll() {
-      const hNow = calcMainH();
-      const svgMain = mainContainer.querySelector("svg");
-      if (svgMain) svgMain.setAttribute("height", String(hNow));
-
-      currentData = datasetYear(idxYear);
-      main.updateData(currentData);
-
-      const subset = currentData.filter(d => currentSelection.has(d.Country));
-      mini.updateData(subset);
+    // ---------- incremental updates ----------
+    // each change only touches the quadrants that depend on it
+    const selectedRows = () => currentData.filter(d => currentSelection.has(d.Country));
 
+    function onYearChange(t = 0) {
+      currentData = t ? blendYears(idxYear, t) : datasetYear(idxYear);
+      main.updateData(currentData, t ? blendExtent(idxYear, t) : extentYear(idxYear));
       main.setSelected(currentSelection);
+      const subset = selectedRows();
+      mini.updateData(subset);
       mini.setSelected(currentSelection);
-
       renderTable(subset);
-      renderInsight([...currentSelection]);
+      updateInsightCursor();   // shares do not depend on the year
+      hideTip();
+    }
 
-      // Never leave tooltips “stuck” after update
+    function onSelectionChange() {
+      main.setSelected(currentSelection);   // restyle only
+      const subset = selectedRows();
+      mini.updateData(subset);
+      mini.setSelected(currentSelection);
+      renderTable(subset);
+      updateInsight(currentSelection);
       hideTip();
     }
 
+    function onOrderChange() {
+      main.setOrder(DIMS);
+      mini.setOrder(DIMS);
+      renderTable(selectedRows());
+    }
+
+    function updateAll() {
+      const hNow = calcMainH();
+      const svgMain = mainContainer.querySelector("svg");
+      if (svgMain) svgMain.setAttribute("height", String(hNow));
+
+      onYearChange();
+      updateInsight(currentSelection);
+    }
+
     // selection / reorder hooks
-    main.setOnSelection(() => {
-      const s = new Set((model.get("selection") || {}).keys || []);
-      currentSelection = s; updateAll();
-    });
-    mini.setOnSelection(() => {
-      const s = new Set((model.get("selection") || {}).keys || []);
-      currentSelection = s; updateAll();
-    });
-    const onReorder = (order) => { DIMS = order.slice(); updateAll(); };
+    const onSelect = (keys) => {
+      currentSelection = new Set(keys); onSelectionChange();
+      link.publish("select", keys.length ? keys : null);
+    };
+    main.setOnSelection(onSelect); mini.setOnSelection(onSelect);
+    const onFilter = (keys) => link.publish("filter", keys);
+    main.setOnFilter(onFilter); mini.setOnFilter(onFilter);
+
+    // linked views (IseaBus): highlight without a kernel round-trip
+    link.onSelect = (keys) => {
+      currentSelection = new Set(keys ? R.map(r => r.label).filter(k => keys.has(String(k))) : []);
+      onSelectionChange();
+      link.pending = { type: "link", keys: [...currentSelection], rows: selectedRows() };
+    };
+    link.onFilter = (keys) => { main.setLinkFilter(keys); mini.setLinkFilter(keys); };
+    const onReorder = (order) => { DIMS = order.slice(); onOrderChange(); };
     main.setOnReorder(onReorder); mini.setOnReorder(onReorder);
 
     // year slider
     slider.addEventListener("input", ev => {
       idxYear = +ev.target.value;
       yearLbl.textContent = YEARS[idxYear];
-      updateAll();
-      if (updateInsightCursor) updateInsightCursor();
+      player.at(idxYear);
+      onYearChange();
+    });
+    player.bind(YEARS, pos => {
+      idxYear = Math.floor(pos);
+      slider.value = String(idxYear);
+      yearLbl.textContent = YEARS[idxYear];
+      onYearChange(pos - idxYear);
     });
+    player.at(idxYear);
 
     // ---------- Help popover ----------
     const HELP_KEY = "isea_vis_help_v1";
@@ -649,9 +875,53 @@ export function render({ model, el }) {
 
     // ---------- first render ----------
     updateAll();
+    link.replay();
+    if (model.get("loading")) showLoading();
+
+    // ---------- option changes without rebuilding ----------
+    // the parallels rebuild their y scales from the new flags; selection and order are kept
+    view = {
+      update(next) {
+        useLog = !!next.log_axes;
+        normalize = !!next.normalize;
+        const i = YEARS.indexOf(next.year_start ?? YEARS[YEARS.length - 1]);
+        if (i >= 0 && i !== idxYear) {
+          idxYear = i;
+          slider.value = String(i);
+          yearLbl.textContent = YEARS[i];
+          player.at(i);
+        }
+        onYearChange();
+      }
+    };
+  }
+
+  function onOptions() {
+    const next = model.get("options") ?? {};
+    const changed = Object.keys({ ...drawnOptions, ...next })
+      .filter(k => JSON.stringify(drawnOptions[k]) !== JSON.stringify(next[k]));
+    if (!changed.length) return;
+    if (!view || changed.some(k => !RESCALE.has(k))) { draw(); return; }
+    drawnOptions = next;
+    view.update(next);
+  }
+
+  // ---------- loading overlay (build_async / update_async) ----------
+  function showLoading() {
+    const pack = model.get("data") ?? {};
+    if (!(pack.records || []).length) { draw(); return; }
+    let ov = el.querySelector(":scope > .isea-loading");
+    if (!model.get("loading")) { if (ov) ov.remove(); return; }
+    if (ov) return;
+    el.style.position = "relative";
+    ov = h("div", { className: "isea-loading", textContent: "Loading…" }, el);
+    ov.style.cssText = "position:absolute;inset:0;display:flex;align-items:center;justify-content:center;" +
+      "background:rgba(255,255,255,.55);font:600 13px sans-serif;color:#475569;z-index:50;";
   }
 
   model.on("change:data", draw);
-  model.on("change:options", draw);
+  model.on("change:options", onOptions);
+  model.on("change:loading", showLoading);
   draw();
+  return () => { link.dispose(); player.dispose(); };
 }
@@ -0,0 +1,312 @@
+// Isea/assets/facet.js
+// Small multiples (Isea.facet): N paneles en un solo widget.
+//
+// Los paneles comparten la matriz de valores (filas × años, un buffer), la escala de color o
+// las escalas x/y, y en los mapas una sola proyección y caché de Path2D (geometry.js): todos
+// se pintan en un único canvas y el hover/click se resuelve por panel con el canvas de IDs.
+//   data.panels[k] = { title, rows: [lo, hi], year }   (year = null -> sigue al slider)
+
+export async function render({ model, el }) {
+  const mod = await import("https://cdn.jsdelivr.net/npm/d3@7/+esm");
+  const d3 = mod.default ?? mod;
+
+  const data = model.get("data");
+  const opts = model.get("options");
+
+  // ------------------ Shared buffer ------------------
+  const ARR = { f4: Float32Array, f8: Float64Array };
+  function decodeValues(v){
+    const view = v.data;
+    return new ARR[v.dtype](view.buffer.slice(view.byteOffset, view.byteOffset + view.byteLength));
+  }
+  const YEARS = data.years_num;
+  const NY = YEARS.length;
+  const M = decodeValues(data.values);
+  const value = (row, yi) => M[row * NY + yi];   // NaN = sin dato
+  const PANELS = data.panels;
+  const KEYS = data.keys, NAMES = data.names;
+
+  let idx = opts.idx_now ?? NY - 1;
+  const selected = new Set();   // iso3 (mapas) o nombre (líneas), en todos los paneles
+
+  // ------------------ Layout ------------------
+  const N = PANELS.length;
+  const COLS = Math.max(1, Math.min(N, opts.cols || Math.ceil(Math.sqrt(N))));
+  const ROWS = Math.ceil(N / COLS);
+  const PW = opts.panel_width, PH = opts.panel_height, TH = 18;   // TH: franja del título
+  const W = COLS * PW, H = ROWS * PH;
+  const origin = (k) => [(k % COLS) * PW, Math.floor(k / COLS) * PH];
+
+  el.innerHTML = "";
+  const wrapper = document.createElement("div");
+  wrapper.style.cssText = `font-family:sans-serif;color:#94a3b8;width:${W}px;max-width:100%;overflow-x:auto;`;
+  el.appendChild(wrapper);
+  const root = d3.select(wrapper);
+
+  if (opts.title) {
+    root.append("div")
+      .style("font","600 16px sans-serif")
+      .style("color","#e5e7eb")
+      .style("margin","0 0 6px 6px")
+      .text(opts.title);
+  }
+  const controls = root.append("div")
+    .style("display","flex")
+    .style("align-items","center")
+    .style("gap","12px")
+    .style("margin","0 0 8px 6px")
+    .style("font","12px sans-serif");
+
+  // ------------------ Tooltip ------------------
+  const tip = document.createElement("div");
+  Object.assign(tip.style,{
+    position:"fixed", pointerEvents:"none", padding:"6px 10px",
+    background:"rgba(17,24,39,.95)", color:"#fff", font:"12px sans-serif",
+    borderRadius:"6px", zIndex:9999, opacity:0, transition:"opacity .12s"
+  });
+  document.body.appendChild(tip);
+  const fmt = d3.format(".3~s");
+  function showTip(ev, html){
+    tip.innerHTML = html;
+    tip.style.left = (ev.clientX+12)+"px";
+    tip.style.top  = (ev.clientY+12)+"px";
+    tip.style.opacity = 1;
+  }
+  function hideTip(){ tip.style.opacity = 0; }
+
+  function commitSelection(){
+    const keys = [...selected];
+    model.set("selection", !keys.length ? {} : data.kind === "map" ? { iso3s: keys } : { keys });
+    model.save_changes();
+  }
+
+  const [lo, hi] = data.domain || [0, 1];
+  const view = data.kind === "map" ? mapPanels() : linePanels();
+
+  // ======================================================================
+  // MAP PANELS — un canvas para todos
+  // ======================================================================
+  function mapPanels(){
+    const world = data.world;
+    const isoKey = (f) => (
+      f.properties?.ISO_A3 || f.id || f.properties?.ADM0_A3 || f.properties?.iso_a3 || f.properties?.ISO3
+    );
+    const feats = world.features;
+    const isos = feats.map(isoKey);
+    const MW = PW, MH = PH - TH;
+    const geo = iseaMapGeometry(d3, world, isos, MW, MH, [[4, 2], [MW - 4, MH - 4]]);
+
+    // feature -> fila de la matriz, por panel (calculado en Python, Isea.geo.world_join)
+    const rowOf = PANELS.map(p => Int32Array.from(p.feature_rows));
+
+    const col = d3.scaleSequential(d3.interpolateYlGn).domain([Math.min(0, lo), hi || 1]);
+
+    // slider solo si algún panel sigue el año actual
+    let yearLbl = null;
+    if (PANELS.some(p => p.year == null) && NY > 1) {
+      controls.append("span").style("color","#cbd5e1").text("Year:");
+      controls.append("input")
+        .attr("type","range").attr("min",0).attr("max",NY-1).attr("value",idx)
+        .style("width","220px")
+        .on("input", function(){ setYear(+this.value, true); });
+      yearLbl = controls.append("span").text(YEARS[idx]);
+    }
+    legend(controls, col);
+
+    const dpr = window.devicePixelRatio || 1;
+    const canvas = root.append("canvas")
+      .attr("width", Math.round(W * dpr))
+      .attr("height", Math.round(H * dpr))
+      .style("width", W + "px")
+      .style("height", H + "px")
+      .style("display", "block")
+      .style("cursor", "pointer")
+      .node();
+    const ctx = canvas.getContext("2d");
+
+    let frame = null;
+    function paint(){
+      frame = null;
+      ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+      ctx.clearRect(0, 0, W, H);
+      PANELS.forEach((p, k) => {
+        const [x0, y0] = origin(k);
+        const yi = p.year ?? idx;
+        ctx.setTransform(dpr, 0, 0, dpr, dpr * x0, dpr * y0);
+        ctx.fillStyle = "#cbd5e1";
+        ctx.font = "600 11px sans-serif";
+        ctx.textBaseline = "middle";
+        ctx.fillText(p.year == null ? `${p.title} · ${YEARS[yi]}` : p.title, 6, TH / 2);
+
+        ctx.translate(0, TH);
+        ctx.lineWidth = 0.2;
+        ctx.strokeStyle = "#111";
+        const rows = rowOf[k];
+        for (let i = 0; i < feats.length; i++) {
+          const path = geo.paths[i];
+          if (!path) continue;
+          const v = rows[i] < 0 ? NaN : value(rows[i], yi);
+          ctx.fillStyle = Number.isNaN(v) ? "#374151" : col(v);
+          ctx.fill(path);
+          ctx.stroke(path);
+        }
+        if (selected.size) {
+          ctx.lineWidth = 1;
+          ctx.strokeStyle = "#e5e7eb";
+          for (let i = 0; i < feats.length; i++) {
+            if (geo.paths[i] && rows[i] >= 0 && selected.has(KEYS[rows[i]])) ctx.stroke(geo.paths[i]);
+          }
+        }
+      });
+    }
+    const schedule = () => { if (frame == null) frame = requestAnimationFrame(paint); };
+
+    // panel + feature bajo el ratón
+    function hit(ev){
+      const r = canvas.getBoundingClientRect();
+      const x = ev.clientX - r.left, y = ev.clientY - r.top;
+      const k = Math.floor(y / PH) * COLS + Math.floor(x / PW);
+      if (k < 0 || k >= N || x >= W) return null;
+      const [x0, y0] = origin(k);
+      const i = geo.pick(x - x0, y - y0 - TH);
+      return i < 0 ? null : { k, i };
+    }
+    canvas.addEventListener("mousemove", ev => {
+      const h = hit(ev);
+      const row = h ? rowOf[h.k][h.i] : -1;
+      if (row < 0) { hideTip(); return; }
+      const p = PANELS[h.k], yi = p.year ?? idx, v = value(row, yi);
+      showTip(ev, `<strong>${NAMES[row]}</strong><br>${p.title}${p.year == null ? " · " + YEARS[yi] : ""}: ${Number.isNaN(v) ? "—" : fmt(v)}`);
+    });
+    canvas.addEventListener("mouseleave", hideTip);
+    canvas.addEventListener("click", ev => {
+      const h = hit(ev);
+      const row = h ? rowOf[h.k][h.i] : -1;
+      if (row < 0) return;
+      const iso = KEYS[row];
+      if (selected.has(iso)) selected.delete(iso); else selected.add(iso);
+      schedule();
+      commitSelection();
+    });
+
+    function setYear(i, fromSlider){
+      idx = i;
+      if (yearLbl) yearLbl.text(YEARS[idx]);
+      schedule();
+      if (fromSlider) {
+        model.set("options", { ...model.get("options"), idx_now: idx });
+        model.save_changes();
+      }
+    }
+
+    paint();
+    return {
+      year(i){
+        if (i === idx) return;
+        controls.select("input").property("value", i);
+        setYear(i, false);
+      },
+    };
+  }
+
+  // horizontal colour ramp with the shared domain
+  function legend(parent, col){
+    const w = 160, h = 10;
+    const svg = parent.append("svg").attr("width", w + 60).attr("height", h + 16);
+    const id = "isea-facet-grad-" + Math.random().toString(36).slice(2);
+    const grad = svg.append("defs").append("linearGradient").attr("id", id);
+    d3.range(0, 1.0001, 0.1).forEach(t => {
+      grad.append("stop").attr("offset", t).attr("stop-color", col(col.domain()[0] + t * (col.domain()[1] - col.domain()[0])));
+    });
+    svg.append("rect").attr("x", 30).attr("y", 0).attr("width", w).attr("height", h).attr("fill", `url(#${id})`);
+    svg.append("text").attr("x", 26).attr("y", h).attr("text-anchor", "end")
+      .attr("fill", "#94a3b8").style("font", "10px sans-serif").text(fmt(col.domain()[0]));
+    svg.append("text").attr("x", 34 + w).attr("y", h)
+      .attr("fill", "#94a3b8").style("font", "10px sans-serif").text(fmt(col.domain()[1]));
+  }
+
+  // ======================================================================
+  // LINE PANELS — escalas x/y compartidas
+  // ======================================================================
+  function linePanels(){
+    const m = { top: TH + 6, right: 10, bottom: 22, left: 38 };
+    const x = d3.scaleLinear().domain(d3.extent(YEARS)).range([m.left, PW - m.right]);
+    const y = d3.scaleLinear().domain([Math.min(0, lo), hi || 1]).nice().range([PH - m.bottom, m.top]);
+    const color = d3.scaleOrdinal(d3.schemeTableau10).domain([...new Set(NAMES)]);
+    const line = d3.line()
+      .defined(d => !Number.isNaN(d[1]))
+      .x(d => x(d[0]))
+      .y(d => y(d[1]));
+
+    const svg = root.append("svg").attr("width", W).attr("height", H);
+    const paths = [];
+
+    PANELS.forEach((p, k) => {
+      const [x0, y0] = origin(k);
+      const g = svg.append("g").attr("transform", `translate(${x0},${y0})`);
+      g.append("text")
+        .attr("x", 6).attr("y", TH / 2 + 4)
+        .attr("fill", "#cbd5e1")
+        .style("font", "600 11px sans-serif")
+        .text(p.title);
+      g.append("g")
+        .attr("transform", `translate(0,${PH - m.bottom})`)
+        .call(d3.axisBottom(x).ticks(3).tickFormat(d3.format("d")))
+        .call(a => a.selectAll("text").attr("fill", "#94a3b8"))
+        .call(a => a.selectAll("line,path").attr("stroke", "#475569"));
+      g.append("g")
+        .attr("transform", `translate(${m.left},0)`)
+        .call(d3.axisLeft(y).ticks(3).tickFormat(d3.format(".2~s")))
+        .call(a => a.selectAll("text").attr("fill", "#94a3b8"))
+        .call(a => a.selectAll("line,path").attr("stroke", "#475569"));
+
+      const rows = d3.range(p.rows[0], p.rows[1]);
+      paths.push(g.append("g")
+        .selectAll("path.series")
+        .data(rows)
+        .join("path")
+          .attr("class", "series")
+          .attr("fill", "none")
+          .attr("stroke", r => color(NAMES[r]))
+          .attr("stroke-width", 1.2)
+          .attr("d", r => line(YEARS.map((yr, i) => [yr, value(r, i)])))
+          .style("cursor", "pointer")
+          .on("mousemove", (ev, r) => {
+            const i = d3.minIndex(YEARS, yr => Math.abs(yr - x.invert(d3.pointer(ev, g.node())[0])));
+            const v = value(r, i);
+            showTip(ev, `<strong>${NAMES[r]}</strong><br>${p.title} · ${YEARS[i]}: ${Number.isNaN(v) ? "—" : fmt(v)}`);
+            restyle(NAMES[r]);
+          })
+          .on("mouseleave", () => { hideTip(); restyle(null); })
+          .on("click", (ev, r) => {
+            const name = NAMES[r];
+            if (selected.has(name)) selected.delete(name); else selected.add(name);
+            restyle(null);
+            commitSelection();
+          }));
+    });
+
+    // hover / selección resaltan la misma fila en todos los paneles
+    function restyle(hover){
+      const on = r => NAMES[r] === hover || selected.has(NAMES[r]);
+      const dim = hover != null || selected.size > 0;
+      paths.forEach(sel => sel
+        .attr("stroke-opacity", r => !dim || on(r) ? 1 : 0.2)
+        .attr("stroke-width", r => on(r) ? 2.2 : 1.2));
+    }
+
+    return { year(){} };
+  }
+
+  // ------------------ Python -> JS ------------------
+  const onOptions = () => {
+    const next = model.get("options");
+    if (next.idx_now != null) view.year(next.idx_now);
+  };
+  model.on("change:options", onOptions);
+
+  return () => {
+    model.off("change:options", onOptions);
+    tip.remove();
+  };
+}
@@ -0,0 +1,47 @@
+// Isea/assets/geometry.js
+// Geometría proyectada para mapas en canvas (se antepone al módulo, ver Isea/worldmaplinechart.py).
+//
+// Un Path2D por feature y un canvas fuera de pantalla con colores-ID (la feature i se pinta con
+// el color i+1) para resolver hover y click. Se comparte entre todos los mapas de la página con
+// las mismas features, tamaño y caja de proyección (window.__iseaMapGeometry): los paneles de un
+// Isea.facet y varios WorldMapLineChart del mismo tamaño proyectan una sola vez.
+//   iseaMapGeometry(d3, world, isos, W, H, box) -> { paths, pick(x, y) }
+// `box` es [[x0, y0], [x1, y1]] en píxeles CSS (geoNaturalEarth1 ajustada con fitExtent).
+
+function iseaMapGeometry(d3, world, isos, W, H, box) {
+  const cache = window.__iseaMapGeometry || (window.__iseaMapGeometry = new Map());
+  const key = `${W}x${H}|${box.flat().join(",")}|${isos.join(",")}`;
+  if (cache.has(key)) return cache.get(key);
+
+  const path = d3.geoPath(d3.geoNaturalEarth1().fitExtent(box, world));
+  const paths = world.features.map(f => {
+    const d = path(f);
+    return d ? new Path2D(d) : null;
+  });
+
+  const pickCanvas = document.createElement("canvas");
+  pickCanvas.width = W; pickCanvas.height = H;
+  const pickCtx = pickCanvas.getContext("2d", { willReadFrequently: true });
+  paths.forEach((p, i) => {
+    if (!p) return;
+    const id = i + 1;
+    pickCtx.fillStyle = `rgb(${id & 255},${(id >> 8) & 255},${(id >> 16) & 255})`;
+    pickCtx.fill(p);
+  });
+
+  const scan = (x, y) => paths.findIndex(p => p && pickCtx.isPointInPath(p, x, y));
+  const geo = {
+    paths,
+    // índice de la feature bajo (x, y) en píxeles CSS, -1 si no hay
+    pick(x, y) {
+      if (x < 0 || y < 0 || x >= W || y >= H) return -1;
+      const [r, g, b, a] = pickCtx.getImageData(x | 0, y | 0, 1, 1).data;
+      const i = (r | (g << 8) | (b << 16)) - 1;
+      // en los bordes el antialiasing mezcla dos ids: se confirma con la geometría
+      if (i < 0 || i >= paths.length || a < 255) return scan(x, y);
+      return pickCtx.isPointInPath(paths[i], x, y) ? i : scan(x, y);
+    },
+  };
+  cache.set(key, geo);
+  return geo;
+}
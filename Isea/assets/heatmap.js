@@ -24,13 +24,95 @@ export async function render({ model, el }) {
     `;
     document.body.appendChild(tooltip);
 
+    // `values` llega como DataView (bytes del traitlet) -> Float32Array sin copia si está alineado
+    function toTyped(v, Type) {
+        if (!v) return new Type(0);
+        const buf = v.buffer ?? v;
+        const off = v.byteOffset ?? 0;
+        const len = v.byteLength ?? buf.byteLength;
+        if (off % Type.BYTES_PER_ELEMENT === 0) return new Type(buf, off, len / Type.BYTES_PER_ELEMENT);
+        return new Type(buf.slice(off, off + len));
+    }
+    const toFloat32 = v => toTyped(v, Float32Array);
+
+    // Copia local de la matriz: update_cells() la parchea celda a celda
+    let values = new Float32Array(0);
+    let patchCells = null;
+    const loadValues = () => { values = Float32Array.from(toFloat32(model.get("values"))); };
+
+    function showTooltip(event, rowId, colId, value) {
+        tooltip.style.opacity = 1;
+        tooltip.innerHTML = `
+            <strong>${rowId}</strong> x <strong>${colId}</strong><br/>
+            Value: ${Number.isNaN(value) ? "N/A" : value.toFixed(2)}
+        `;
+        tooltip.style.left = (event.pageX + 10) + "px";
+        tooltip.style.top = (event.pageY - 28) + "px";
+    }
+
+    // Muestra solo ~maxTicks etiquetas cuando hay demasiadas categorías
+    function thinTicks(domain, extent) {
+        const maxTicks = Math.max(2, Math.floor(extent / 12));
+        const step = Math.ceil(domain.length / maxTicks);
+        return step <= 1 ? domain : domain.filter((_, i) => i % step === 0);
+    }
+
+    // LUT de 256 colores para no llamar a la escala d3 por celda
+    function makeLut(colorScale) {
+        const [d0, d1] = colorScale.domain();
+        const rgb = new Uint8ClampedArray(256 * 3);
+        for (let k = 0; k < 256; k++) {
+            const c = d3.rgb(colorScale(d0 + (d1 - d0) * k / 255));
+            rgb[k * 3] = c.r; rgb[k * 3 + 1] = c.g; rgb[k * 3 + 2] = c.b;
+        }
+        return { rgb, d0, span: (d1 - d0) || 1 };
+    }
+
+    // Pinta una matriz w×h (1 píxel por celda) en un canvas fuera de pantalla
+    function paintCells(values, w, h, lut) {
+        const { rgb, d0, span } = lut;
+        const img = new ImageData(w, h);
+        const px = img.data;
+        for (let i = 0; i < w * h; i++) {
+            const v = values[i], o = i * 4;
+            if (Number.isNaN(v)) {
+                px[o] = px[o + 1] = px[o + 2] = 0x33;
+            } else {
+                const k = Math.max(0, Math.min(255, Math.round((v - d0) / span * 255))) * 3;
+                px[o] = rgb[k]; px[o + 1] = rgb[k + 1]; px[o + 2] = rgb[k + 2];
+            }
+            px[o + 3] = 255;
+        }
+        const cells = document.createElement("canvas");
+        cells.width = w; cells.height = h;
+        cells.getContext("2d").putImageData(img, 0, 0);
+        return cells;
+    }
+
+    // Opciones que se aplican sin redibujar (título, colormap); dominios, tamaño,
+    // teselado y vmin/vmax (cambian con los datos) reconstruyen la vista
+    const RESTYLE = new Set(["title", "cmap"]);
+    let restyle = null, recolorCells = null, drawnOptions = {};
+
+    function scaleFor(cmap, minVal, maxVal) {
+        if (cmap === 'coolwarm') return d3.scaleSequential(d3.interpolateRdBu).domain([1, -1]);
+        return d3.scaleSequential(d3.interpolateViridis).domain([minVal, maxVal]);
+    }
+
     function draw() {
-        const data = model.get("data");
-        const opts = model.get("options");
+        let opts = model.get("options");
+        drawnOptions = opts;
+        const xDomain = opts.xDomain || [];
+        const yDomain = opts.yDomain || [];
+        const nx = xDomain.length, ny = yDomain.length;
+        const tiled = opts.tiled || null;
         
         container.innerHTML = ""; 
+        onTile = null;
+        patchCells = null;
+        restyle = recolorCells = null;
         
-        if (!data || data.length === 0) {
+        if (!nx || !ny || (!tiled && values.length !== nx * ny)) {
             container.innerHTML = `<div style="padding:20px; color:#888">No data available</div>`;
             return;
         }
@@ -40,84 +122,117 @@ export async function render({ model, el }) {
         const margin = opts.margin || { top: 40, right: 20, bottom: 100, left: 100 };
         const innerW = width - margin.left - margin.right;
         const innerH = height - margin.top - margin.bottom;
+        const useSvg = nx * ny <= (opts.svgMaxCells ?? 2500);
 
+        container.style.position = "relative";
         const svg = d3.select(container).append("svg")
             .attr("width", width)
             .attr("height", height)
+            .style("display", "block")
             .style("background", "#111827")
             .style("font-family", "sans-serif");
 
         const g = svg.append("g")
             .attr("transform", `translate(${margin.left},${margin.top})`);
 
-        if (opts.title) {
-            svg.append("text")
-                .attr("x", width / 2)
-                .attr("y", margin.top / 2)
-                .attr("text-anchor", "middle")
-                .style("fill", "#e5e7eb")
-                .style("font-weight", "bold")
-                .text(opts.title);
-        }
-
-        const xDomain = opts.xDomain || [...new Set(data.map(d => d.col_id))];
-        const yDomain = opts.yDomain || [...new Set(data.map(d => d.row_id))];
+        const drawTitle = () => svg.selectAll("text.isea-title")
+            .data(opts.title ? [opts.title] : [])
+            .join("text")
+            .attr("class", "isea-title")
+            .attr("x", width / 2)
+            .attr("y", margin.top / 2)
+            .attr("text-anchor", "middle")
+            .style("fill", "#e5e7eb")
+            .style("font-weight", "bold")
+            .text(d => d);
+        drawTitle();
 
         const x = d3.scaleBand()
             .range([0, innerW])
             .domain(xDomain)
-            .padding(0.05);
+            .padding(useSvg ? 0.05 : 0);
 
         const y = d3.scaleBand()
             .range([0, innerH])
             .domain(yDomain)
-            .padding(0.05);
+            .padding(useSvg ? 0.05 : 0);
 
-        const values = data.map(d => d.value).filter(v => v !== null);
-        const minVal = d3.min(values);
-        const maxVal = d3.max(values);
+        // en modo teselado el rango global viene de Python
+        let minVal = tiled ? opts.vmin : Infinity, maxVal = tiled ? opts.vmax : -Infinity;
+        for (let i = 0; i < values.length; i++) {
+            const v = values[i];
+            if (v < minVal) minVal = v;
+            if (v > maxVal) maxVal = v;
+        }
         
-        let colorScale;
-        if (opts.cmap === 'coolwarm') {
-            colorScale = d3.scaleSequential(d3.interpolateRdBu).domain([1, -1]); 
-        } else {
-            colorScale = d3.scaleSequential(d3.interpolateViridis).domain([minVal, maxVal]);
+        const colorScale = scaleFor(opts.cmap, minVal, maxVal);
+
+        restyle = (next, changed) => {
+            opts = next;
+            drawTitle();
+            if (changed.includes("cmap") && recolorCells) recolorCells(scaleFor(opts.cmap, minVal, maxVal));
+        };
+
+        if (tiled) {
+            drawTiled(g, tiled, xDomain, yDomain, colorScale, margin, innerW, innerH);
+            return;
         }
 
         g.append("g")
             .attr("transform", `translate(0, ${innerH})`)
-            .call(d3.axisBottom(x).tickSize(0))
+            .call(d3.axisBottom(x).tickSize(0).tickValues(thinTicks(xDomain, innerW)))
             .selectAll("text")
             .attr("transform", "translate(-10,0)rotate(-45)")
             .style("text-anchor", "end")
             .style("fill", "#9ca3af");
 
         g.append("g")
-            .call(d3.axisLeft(y).tickSize(0))
+            .call(d3.axisLeft(y).tickSize(0).tickValues(thinTicks(yDomain, innerH)))
             .selectAll("text")
             .style("fill", "#9ca3af");
 
         g.selectAll(".domain").remove();
 
-        g.selectAll("rect")
+        if (useSvg) drawSvgCells(g, x, y, values, nx, colorScale);
+        else drawCanvasCells(x, y, values, nx, ny, colorScale, margin, innerW, innerH);
+
+        // Con viridis el dominio depende de min/max: un valor fuera de rango obliga a redibujar
+        const inRange = v => opts.cmap === 'coolwarm' || Number.isNaN(v) || (v >= minVal && v <= maxVal);
+        const patch = patchCells;
+        patchCells = (idx) => idx.every(i => inRange(values[i])) && patch(idx);
+    }
+
+    // Parche parcial enviado por update_cells(): índices planos (int32) + valores (float32)
+    function onCells(buffers) {
+        const idx = toTyped(buffers[0], Int32Array);
+        const vals = toFloat32(buffers[1]);
+        if (values.length === 0) return;
+        for (let i = 0; i < idx.length; i++) values[idx[i]] = vals[i];
+        if (!patchCells || !patchCells(Array.from(idx))) draw();
+    }
+
+    // Matrices pequeñas: un rect por celda + etiquetas de valor
+    function drawSvgCells(g, x, y, values, nx, colorScale) {
+        const xDomain = x.domain(), yDomain = y.domain();
+        const data = Array.from(values, (value, i) => ({
+            i, row_id: yDomain[Math.floor(i / nx)], col_id: xDomain[i % nx], value
+        }));
+        let scale = colorScale;
+        const fill = d => Number.isNaN(d.value) ? "#333" : scale(d.value);
+
+        const rects = g.selectAll("rect")
             .data(data, d => d.row_id + ":" + d.col_id)
             .join("rect")
             .attr("x", d => x(d.col_id))
             .attr("y", d => y(d.row_id))
             .attr("width", x.bandwidth())
             .attr("height", y.bandwidth())
-            .style("fill", d => d.value === null ? "#333" : colorScale(d.value))
+            .style("fill", fill)
             .style("rx", 4)
             .style("ry", 4)
             .on("mouseover", function(event, d) {
                 d3.select(this).style("stroke", "white").style("stroke-width", 2);
-                tooltip.style.opacity = 1;
-                tooltip.innerHTML = `
-                    <strong>${d.row_id}</strong> x <strong>${d.col_id}</strong><br/>
-                    Value: ${d.value !== null ? d.value.toFixed(2) : "N/A"}
-                `;
-                tooltip.style.left = (event.pageX + 10) + "px";
-                tooltip.style.top = (event.pageY - 28) + "px";
+                showTooltip(event, d.row_id, d.col_id, d.value);
             })
             .on("mousemove", function(event) {
                 tooltip.style.left = (event.pageX + 10) + "px";
@@ -128,24 +243,263 @@ export async function render({ model, el }) {
                 tooltip.style.opacity = 0;
             });
             
+        let labels = null;
         if (x.bandwidth() > 30 && y.bandwidth() > 20) {
-             g.selectAll(".val-text")
+             labels = g.selectAll(".val-text")
                 .data(data)
                 .join("text")
                 .attr("x", d => x(d.col_id) + x.bandwidth()/2)
                 .attr("y", d => y(d.row_id) + y.bandwidth()/2)
                 .attr("dy", ".35em")
                 .attr("text-anchor", "middle")
-                .text(d => d.value !== null ? d.value.toFixed(1) : "")
+                .text(d => Number.isNaN(d.value) ? "" : d.value.toFixed(1))
                 .style("fill", d => Math.abs(d.value) > 0.5 ? "white" : "black")
                 .style("font-size", "10px")
                 .style("pointer-events", "none");
         }
+
+        patchCells = (idx) => {
+            const changed = new Set(idx);
+            idx.forEach(i => { data[i].value = values[i]; });
+            rects.filter(d => changed.has(d.i)).style("fill", fill);
+            if (labels) {
+                labels.filter(d => changed.has(d.i))
+                    .text(d => Number.isNaN(d.value) ? "" : d.value.toFixed(1))
+                    .style("fill", d => Math.abs(d.value) > 0.5 ? "white" : "black");
+            }
+            return true;
+        };
+        recolorCells = (s) => { scale = s; rects.style("fill", fill); };
+    }
+
+    // Matrices grandes: 1 píxel por celda en ImageData, escalado al área del gráfico;
+    // el hover calcula fila/columna a partir de la posición del ratón.
+    function drawCanvasCells(x, y, values, nx, ny, colorScale, margin, innerW, innerH) {
+        const xDomain = x.domain(), yDomain = y.domain();
+
+        let lut = makeLut(colorScale);
+        const cells = paintCells(values, nx, ny, lut);
+
+        const dpr = window.devicePixelRatio || 1;
+        const canvas = document.createElement("canvas");
+        canvas.width = Math.round(innerW * dpr);
+        canvas.height = Math.round(innerH * dpr);
+        canvas.style.cssText = `position:absolute; left:${margin.left}px; top:${margin.top}px; width:${innerW}px; height:${innerH}px;`;
+        const ctx = canvas.getContext("2d");
+        ctx.imageSmoothingEnabled = false;
+        ctx.drawImage(cells, 0, 0, canvas.width, canvas.height);
+        container.appendChild(canvas);
+
+        const cw = innerW / nx, ch = innerH / ny;
+        // el canvas queda encima del svg: el resaltado es un div superpuesto
+        const hl = document.createElement("div");
+        hl.style.cssText = `position:absolute; width:${cw}px; height:${ch}px; box-sizing:border-box; border:2px solid white; pointer-events:none; display:none;`;
+        container.appendChild(hl);
+
+        canvas.addEventListener("mousemove", (event) => {
+            const c = Math.min(nx - 1, Math.floor(event.offsetX / cw));
+            const r = Math.min(ny - 1, Math.floor(event.offsetY / ch));
+            hl.style.display = "block";
+            hl.style.left = (margin.left + c * cw) + "px";
+            hl.style.top = (margin.top + r * ch) + "px";
+            showTooltip(event, yDomain[r], xDomain[c], values[r * nx + c]);
+        });
+        canvas.addEventListener("mouseleave", () => {
+            hl.style.display = "none";
+            tooltip.style.opacity = 0;
+        });
+
+        // Repinta solo los píxeles de las celdas cambiadas y vuelve a escalar
+        const cctx = cells.getContext("2d");
+        const px = cctx.createImageData(1, 1);
+        patchCells = (idx) => {
+            const { rgb, d0, span } = lut;
+            idx.forEach(i => {
+                const v = values[i], p = px.data;
+                if (Number.isNaN(v)) {
+                    p[0] = p[1] = p[2] = 0x33;
+                } else {
+                    const k = Math.max(0, Math.min(255, Math.round((v - d0) / span * 255))) * 3;
+                    p[0] = rgb[k]; p[1] = rgb[k + 1]; p[2] = rgb[k + 2];
+                }
+                p[3] = 255;
+                cctx.putImageData(px, i % nx, Math.floor(i / nx));
+            });
+            ctx.drawImage(cells, 0, 0, canvas.width, canvas.height);
+            return true;
+        };
+        // otro colormap: nueva LUT y repintado de la matriz, sin tocar ejes ni eventos
+        recolorCells = (s) => {
+            lut = makeLut(s);
+            cctx.drawImage(paintCells(values, nx, ny, lut), 0, 0);
+            ctx.drawImage(cells, 0, 0, canvas.width, canvas.height);
+        };
+    }
+
+    // Matrices enormes: Python guarda una pirámide media/máx y sirve teselas bajo demanda.
+    // Solo se conservan las teselas del nivel visible; el zoom/pan pide las que faltan.
+    let onTile = null;
+    model.on("msg:custom", (msg, buffers) => {
+        if (!msg) return;
+        if (msg.type === "tile" && onTile) onTile(msg, buffers);
+        else if (msg.type === "cells") onCells(buffers);
+        else if (msg.type === "matrix") { values = Float32Array.from(toFloat32(buffers[0])); draw(); }
+    });
+
+    function drawTiled(g, tiled, xDomain, yDomain, colorScale, margin, innerW, innerH) {
+        const nx = xDomain.length, ny = yDomain.length;
+        const { tileSize, levels } = tiled;
+        let lut = makeLut(colorScale);
+        const MAX_TILES = 256;
+
+        const dpr = window.devicePixelRatio || 1;
+        const canvas = document.createElement("canvas");
+        canvas.width = Math.round(innerW * dpr);
+        canvas.height = Math.round(innerH * dpr);
+        canvas.style.cssText = `position:absolute; left:${margin.left}px; top:${margin.top}px; width:${innerW}px; height:${innerH}px; cursor:crosshair;`;
+        const ctx = canvas.getContext("2d");
+        container.appendChild(canvas);
+
+        const hl = document.createElement("div");
+        hl.style.cssText = "position:absolute; box-sizing:border-box; border:2px solid white; pointer-events:none; display:none;";
+        container.appendChild(hl);
+
+        const gx = g.append("g").attr("transform", `translate(0, ${innerH})`);
+        const gy = g.append("g");
+
+        // px por celda (nivel 0) sin zoom
+        const sx = innerW / nx, sy = innerH / ny;
+        let t = d3.zoomIdentity, level = -1, frame = null;
+        const cache = new Map(), pending = new Set();
+
+        function levelFor(k) {
+            const cellsPerPx = Math.max(1 / (k * sx), 1 / (k * sy));
+            return Math.max(0, Math.min(levels.length - 1, Math.floor(Math.log2(Math.max(1, cellsPerPx)))));
+        }
+
+        // rango visible en celdas del nivel 0
+        function view() {
+            return {
+                x0: Math.max(0, t.invertX(0) / sx), x1: Math.min(nx, t.invertX(innerW) / sx),
+                y0: Math.max(0, t.invertY(0) / sy), y1: Math.min(ny, t.invertY(innerH) / sy)
+            };
+        }
+
+        function drawAxes(v) {
+            const ax = d3.scaleLinear().domain([v.x0, v.x1]).range([t.applyX(v.x0 * sx), t.applyX(v.x1 * sx)]);
+            const ay = d3.scaleLinear().domain([v.y0, v.y1]).range([t.applyY(v.y0 * sy), t.applyY(v.y1 * sy)]);
+            const ticks = (a, b, n) => d3.ticks(a, b, n).filter(i => Number.isInteger(i) && i >= a && i < b);
+            gx.call(d3.axisBottom(ax).tickSize(0).tickValues(ticks(v.x0, v.x1, Math.max(2, innerW / 40)))
+                    .tickFormat(i => xDomain[i]))
+                .selectAll("text")
+                .attr("transform", "translate(-10,0)rotate(-45)")
+                .style("text-anchor", "end")
+                .style("fill", "#9ca3af");
+            gy.call(d3.axisLeft(ay).tickSize(0).tickValues(ticks(v.y0, v.y1, Math.max(2, innerH / 20)))
+                    .tickFormat(i => yDomain[i]))
+                .selectAll("text")
+                .style("fill", "#9ca3af");
+            g.selectAll(".domain").remove();
+        }
+
+        function paint() {
+            frame = null;
+            const L = levelFor(t.k);
+            if (L !== level) { cache.clear(); pending.clear(); level = L; }
+            const f = 2 ** L, span = tileSize * f;
+            const [lh, lw] = levels[L];
+            const v = view();
+
+            ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+            ctx.imageSmoothingEnabled = false;
+            ctx.fillStyle = "#111827";
+            ctx.fillRect(0, 0, innerW, innerH);
+
+            const missing = [];
+            const tx1 = Math.min(Math.ceil(lw / tileSize), Math.ceil(v.x1 / span));
+            const ty1 = Math.min(Math.ceil(lh / tileSize), Math.ceil(v.y1 / span));
+            for (let ty = Math.floor(v.y0 / span); ty < ty1; ty++) {
+                for (let tx = Math.floor(v.x0 / span); tx < tx1; tx++) {
+                    const key = tx + "/" + ty, tile = cache.get(key);
+                    if (!tile) {
+                        if (!pending.has(key)) { pending.add(key); missing.push([tx, ty]); }
+                        continue;
+                    }
+                    const x0 = t.applyX(tx * span * sx), y0 = t.applyY(ty * span * sy);
+                    ctx.drawImage(tile.canvas, x0, y0, tile.w * f * sx * t.k, tile.h * f * sy * t.k);
+                }
+            }
+            if (missing.length) model.send({ type: "tiles", level: L, tiles: missing });
+            drawAxes(v);
+        }
+
+        const schedule = () => { if (frame == null) frame = requestAnimationFrame(paint); };
+
+        onTile = (msg, buffers) => {
+            if (msg.level !== level) return;
+            const key = msg.tx + "/" + msg.ty;
+            pending.delete(key);
+            const [h, w] = msg.shape;
+            const vals = toFloat32(buffers[0]);
+            cache.set(key, { canvas: paintCells(vals, w, h, lut), vals, w, h });
+            // se descartan las teselas más antiguas del nivel si se acumulan demasiadas
+            while (cache.size > MAX_TILES) cache.delete(cache.keys().next().value);
+            schedule();
+        };
+
+        // las teselas en caché guardan sus valores: se repintan sin pedirlas de nuevo
+        recolorCells = (s) => {
+            lut = makeLut(s);
+            cache.forEach(tile => { tile.canvas = paintCells(tile.vals, tile.w, tile.h, lut); });
+            schedule();
+        };
+
+        const maxK = Math.max(1, 32 / Math.min(sx, sy));
+        d3.select(canvas).call(d3.zoom()
+            .scaleExtent([1, maxK])
+            .translateExtent([[0, 0], [innerW, innerH]])
+            .extent([[0, 0], [innerW, innerH]])
+            .on("zoom", ev => { t = ev.transform; hl.style.display = "none"; schedule(); }));
+
+        canvas.addEventListener("mousemove", (event) => {
+            const c = Math.min(nx - 1, Math.floor(t.invertX(event.offsetX) / sx));
+            const r = Math.min(ny - 1, Math.floor(t.invertY(event.offsetY) / sy));
+            const f = 2 ** level, lx = Math.floor(c / f), ly = Math.floor(r / f);
+            const tile = cache.get(Math.floor(lx / tileSize) + "/" + Math.floor(ly / tileSize));
+            if (!tile) return;
+            const value = tile.vals[(ly % tileSize) * tile.w + (lx % tileSize)];
+            const cw = f * sx * t.k, ch = f * sy * t.k;
+            Object.assign(hl.style, {
+                display: "block", width: cw + "px", height: ch + "px",
+                left: (margin.left + t.applyX(lx * f * sx)) + "px", top: (margin.top + t.applyY(ly * f * sy)) + "px"
+            });
+            // en niveles gruesos la celda resume un bloque f×f
+            const rowId = f > 1 ? `${yDomain[ly * f]} … ${yDomain[Math.min(ny, (ly + 1) * f) - 1]}` : yDomain[r];
+            const colId = f > 1 ? `${xDomain[lx * f]} … ${xDomain[Math.min(nx, (lx + 1) * f) - 1]}` : xDomain[c];
+            showTooltip(event, rowId, colId, value);
+        });
+        canvas.addEventListener("mouseleave", () => {
+            hl.style.display = "none";
+            tooltip.style.opacity = 0;
+        });
+
+        paint();
     }
 
+    loadValues();
     draw();
-    model.on("change:data", draw);
-    model.on("change:options", draw);
+    model.on("change:values", () => { loadValues(); draw(); });
+    model.on("change:options", () => {
+        const next = model.get("options") || {};
+        const changed = Object.keys({ ...drawnOptions, ...next })
+            .filter(k => JSON.stringify(drawnOptions[k]) !== JSON.stringify(next[k]));
+        if (!changed.length) return;
+        if (!restyle || changed.some(k => !RESTYLE.has(k))) { draw(); return; }
+        drawnOptions = next;
+        restyle(next, changed);
+    });
+    // Si hubo update_cells() antes de mostrar esta vista, Python envía la matriz actual
+    model.send({ type: "sync" });
     
     return () => {
         if(tooltip.parentNode) tooltip.parentNode.removeChild(tooltip);
@@ -1,16 +1,35 @@
 // Isea/assets/energy_quad.js
 export function render({ model, el }) {
+  // {e, d} -> valores: suma acumulada de enteros escalados por 10^e (null = sin dato)
+  const decodeSeries = (s) => {
+    if (!s || Array.isArray(s)) return s;
+    const f = Math.pow(10, Math.abs(s.e));
+    let acc = 0;
+    return s.d.map(v => v == null ? null : (acc += v, s.e >= 0 ? acc / f : acc * f));
+  };
   const h = (t, p = {}, parent) => { const n = document.createElement(t); Object.assign(n, p); parent && parent.appendChild(n); return n; };
+  const link = iseaLink(model);   // selecciones y filtros compartidos con el link_group (IseaBus)
+  const compute = iseaCompute();  // extremos, normalización y brush en el worker compartido
+  const player = iseaPlayer(model);   // animación de años (anim.js), sin pasar por el kernel
+
+  // opciones que se aplican sobre la vista ya construida; el resto (tamaños, fuentes, reorder) redibuja
+  const RESTYLE = new Set(["palette", "axis_labels", "unit"]);
+  const RESCALE = new Set(["log_axes", "normalize", "year_start"]);
+  let view = null, drawnOptions = {};
 
   async function draw() {
     el.innerHTML = "";
+    view = null;
+    player.bind([], null);
 
     const pack = model.get("data") ?? {};
-    const opts = model.get("options") ?? {};
+    let opts = model.get("options") ?? {};
+    drawnOptions = opts;
     const YEARS = pack.years || [];
     let DIMS = (pack.dims || []).slice();
-    const R = pack.records || [];
-    if (!YEARS.length || !DIMS.length || !R.length) { el.textContent = "No data."; return; }
+    // series por año: listas o {e, d} delta-codificadas (Isea.encoding)
+    const R = (pack.records || []).map(r => { const o = { ...r }; for (const k of DIMS) o[k] = decodeSeries(r[k]); return o; });
+    if (!YEARS.length || !DIMS.length || !R.length) { el.textContent = model.get("loading") ? "Loading…" : "No data."; return; }
 
     const mod = await import("https://cdn.jsdelivr.net/npm/d3@7/+esm");
     const d3 = mod.default ?? mod;
@@ -19,15 +38,16 @@ export function render({ model, el }) {
     const FS0 = opts.font || opts.fontSizes || {};
     const FS = { header: 12, axisTitle: 11, tick: 10, legend: 11, table: 12, ...FS0 };
 
-    const unit = (opts.unit ?? ""); // "" para EV
+    let unit = (opts.unit ?? ""); // "" para EV
     const axisLabel = (k) => (opts.axis_labels && opts.axis_labels[k]) || k;
 
     // paleta por dimensión (overrideable)
-    const pal = (opts.palette) || {
+    const PAL0 = {
       StockBEV:"#2563eb", StockPHEV:"#f59e0b", StockFCEV:"#a855f7",
       SalesBEV:"#ef4444", SalesPHEV:"#10b981", SalesFCEV:"#940b6bff",
       StockShare:"#22c55e", ChargingStations:"#0ea5e9"
     };
+    const pal = (opts.palette) || PAL0;
     const color = d3.scaleOrdinal(Object.keys(pal), Object.values(pal));
 
     // ---------- layout ----------
@@ -43,36 +63,84 @@ export function render({ model, el }) {
     const row1H = +opts.left_height || 440;
     const row2H = Math.max(+opts.table_height || 200, +opts.mini_height || 220);
 
-    const useLog       = !!opts.log_axes;
-    const normalize    = !!opts.normalize;
+    let useLog         = !!opts.log_axes;
+    let normalize      = !!opts.normalize;
     const allowReorder = !!opts.reorder;
 
     let idxYear = YEARS.indexOf(opts.year_start ?? YEARS[YEARS.length - 1]);
     if (idxYear < 0) idxYear = YEARS.length - 1;
 
+    // ---------- columnas por año (una vez por carga de datos) ----------
+    // COLS[k][i]: Float32Array sobre registros (vista de la matriz año × registro de k);
+    // EXT[k]: min / max / mínimo positivo (log) por año; NORM[k]: matriz normalizada min-max.
+    // Con muchos datos EXT y NORM llegan del worker; mientras tanto las escalas salen de los datos
+    // del año y la normalización se calcula por año aquí.
+    const DIMS0 = DIMS.slice(), NREC = R.length, NY = YEARS.length;
+    const COLS = {}, EXT = {}, NORM = {};
+    const inWorker = NY * NREC * DIMS0.length >= ISEA_WORKER_MIN;
+    for (const k of DIMS0) {
+      const mat = new Float32Array(NY * NREC), cols = [];
+      for (let i = 0; i < NY; i++) cols.push(mat.subarray(i * NREC, (i + 1) * NREC));
+      R.forEach((r, j) => { const s = r[k] || []; for (let i = 0; i < NY; i++) cols[i][j] = +s[i] || 0; });
+      COLS[k] = cols;
+      const e = pack.extents && pack.extents[k];
+      if (e && e.min && e.max) {
+        EXT[k] = { min: Float32Array.from(e.min, v => +v || 0), max: Float32Array.from(e.max, v => +v || 0),
+                   minPos: Float32Array.from(e.min_pos || e.min, v => (v == null ? NaN : +v)) };
+      } else if (!inWorker) {
+        EXT[k] = compute.now("years", { data: mat, ny: NY, n: NREC });
+      }
+      if (inWorker) {
+        const data = mat.slice();
+        compute.run("years", { data, ny: NY, n: NREC, normalize: true }, [data.buffer]).then(res => {
+          if (!res) return;
+          if (!EXT[k]) EXT[k] = { min: res.min, max: res.max, minPos: res.minPos };
+          NORM[k] = res.norm;
+        });
+      }
+    }
+
     // ---------- helpers de datos ----------
+    // filas por año en caché: mover el slider solo cambia referencias
+    const rowsCache = new Array(NY), normCache = new Array(NY);
     function datasetFor(i) {
-      return R.map(r => {
+      if (rowsCache[i]) return rowsCache[i];
+      return (rowsCache[i] = R.map((r, j) => {
         const o = { Country: r.label, Year: YEARS[i] };
-        let best = DIMS[0], bestV = +r[DIMS[0]][i] || 0;
-        for (const k of DIMS) { const v = +r[k][i] || 0; o[k] = v; if (v > bestV) { bestV = v; best = k; } }
+        let best = DIMS0[0], bestV = COLS[DIMS0[0]][i][j];
+        for (const k of DIMS0) { const v = COLS[k][i][j]; o[k] = v; if (v > bestV) { bestV = v; best = k; } }
         o.DominantTech = best; return o;
-      });
+      }));
     }
-    function normalizeByDim(data) {
-      const ext = {};
-      for (const k of DIMS) {
-        const vals = data.map(d => +d[k]).filter(Number.isFinite);
-        const mn = d3.min(vals), mx = d3.max(vals);
-        ext[k] = (mx > mn) ? [mn, mx] : [0, 1];
+    function normalizeByDim(i) {
+      if (normCache[i]) return normCache[i];
+      const span = {};
+      for (const k of DIMS0) {
+        if (NORM[k]) continue;
+        const e = EXT[k] || compute.now("years", { data: COLS[k][i], ny: 1, n: NREC });
+        span[k] = EXT[k] ? [e.min[i], e.max[i]] : [e.min[0], e.max[0]];
       }
-      return data.map(d => {
+      return (normCache[i] = datasetFor(i).map((d, j) => {
         const o = { Country: d.Country, Year: d.Year, DominantTech: d.DominantTech };
-        for (const k of DIMS) { const [mn, mx] = ext[k], v = +d[k] || 0; o[k] = (mx > mn) ? (v - mn) / (mx - mn) : 0; }
+        for (const k of DIMS0) {
+          if (NORM[k]) { o[k] = NORM[k][i * NREC + j]; continue; }
+          const [mn, mx] = span[k], v = +d[k] || 0; o[k] = (mx > mn) ? (v - mn) / (mx - mn) : v;
+        }
         return o;
-      });
+      }));
+    }
+    const datasetYear = (i) => (normalize ? normalizeByDim(i) : datasetFor(i));
+    const extentYear = (i) => (normalize || !DIMS0.every(k => EXT[k]) ? null : k => [EXT[k].min[i], EXT[k].max[i], EXT[k].minPos[i]]);
+    // fotograma intermedio de la animación: filas y extremos de dos años mezclados (los años exactos salen de la caché)
+    function blendYears(i, t) {
+      const a = datasetYear(i), b = datasetYear(i + 1);
+      return a.map((d, j) => { const o = { ...d }; for (const k of DIMS0) o[k] = d[k] + (b[j][k] - d[k]) * t; return o; });
+    }
+    function blendExtent(i, t) {
+      const ea = extentYear(i), eb = extentYear(i + 1);
+      if (!ea || !eb) return null;
+      return k => { const A = ea(k), B = eb(k); return A.map((v, n) => v + (B[n] - v) * t); };
     }
-    const datasetYear = (i) => (normalize ? normalizeByDim(datasetFor(i)) : datasetFor(i));
 
     // tooltip global
     const tip = document.createElement("div");
@@ -103,6 +171,7 @@ export function render({ model, el }) {
     h("span", { textContent:"Year:", style:`font:${FS.header}px system-ui;color:#0f172a` }, header);
     const slider = h("input", {}, header); slider.type="range"; slider.min="0"; slider.max=String(YEARS.length-1); slider.value=String(idxYear); slider.style.width="300px";
     const yearLbl = h("span", { textContent: YEARS[idxYear], style:`font:${FS.header}px system-ui;color:#0f172a` }, header);
+    header.appendChild(player.button());
     const helpBtn = h("button", { innerText:"How to interact?" }, header);
     Object.assign(helpBtn.style, { marginLeft:"auto", padding:"4px 9px", borderRadius:"10px", border:"1px solid #cbd5e1",
       background:"#f8fafc", color:"#0f172a", cursor:"pointer", font:`${FS.header}px system-ui` });
@@ -122,34 +191,66 @@ export function render({ model, el }) {
       const y = {}; const dragging = {}; const getX = d => (dragging[d] != null ? dragging[d] : x(d));
       const line = d3.line().defined(([, v]) => Number.isFinite(v));
       const bw = Math.min(32, Math.max(22, (iW / DIMS.length) * .5));
-      const fmt = normalize ? d3.format(".2f") : d3.format(",.0f");
-      const tickFmt = normalize ? d3.format(".2f") : (useLog ? "~g" : d3.format(",.0f"));
+      // log_axes / normalize pueden cambiar sin reconstruir: formatos según el estado actual
+      const fmt = v => (normalize ? d3.format(".2f") : d3.format(",.0f"))(v);
+      const tickFmt = () => normalize ? d3.format(".2f") : (useLog ? "~g" : d3.format(",.0f"));
 
       let DATA = []; let selected = new Set(); const layer = g.append("g").attr("fill","none"), hit = g.append("g").attr("fill","none");
       const filters = {};
 
+      // cache de y en píxeles por registro: reordenar ejes solo mueve x
+      let yPix = new Map();
+      function cacheY() { yPix = new Map(); for (const d of DATA) { const py = {}; for (const k of DIMS) py[k] = y[k](+d[k]); yPix.set(d, py); } }
+      const pathAt = (d, xs) => { const py = yPix.get(d); return line(DIMS.map((k, j) => [xs[j], py[k]])); };
+
+      // un repintado por frame durante el drag
+      let dragFrame = null;
+      function scheduleDragPaint() {
+        if (dragFrame != null) return;
+        dragFrame = requestAnimationFrame(() => { dragFrame = null; axis.attr("transform", d => `translate(${getX(d)},0)`); const xs = DIMS.map(getX); vis.attr("d", d => pathAt(d, xs)); });
+      }
+
+      let EXTENT = null;
       function buildY() {
         for (const k of DIMS) {
-          const vals = DATA.map(d => +d[k]).filter(v => Number.isFinite(v) && (!useLog || v > 0));
-          y[k] = (useLog ? d3.scaleLog() : d3.scaleLinear())
-            .domain(useLog ? [Math.max(1e-6, d3.min(vals)), d3.max(vals)] : d3.extent(vals))
-            .nice().range([iH, 0]);
+          let domain;
+          if (EXTENT) { const [mn, mx, mp] = EXTENT(k); domain = useLog ? [Math.max(1e-6, Number.isFinite(mp) ? mp : 1e-6), mx] : [mn, mx]; }
+          else { const vals = DATA.map(d => +d[k]).filter(v => Number.isFinite(v) && (!useLog || v > 0));
+            domain = useLog ? [Math.max(1e-6, d3.min(vals)), d3.max(vals)] : d3.extent(vals); }
+          y[k] = (useLog ? d3.scaleLog() : d3.scaleLinear()).domain(domain).nice().range([iH, 0]);
         }
       }
+      let linkFilter = null;   // claves visibles según el brush de una vista enlazada
       function applySel() {
-        if (!selected.size) { vis.attr("stroke-opacity", .85).attr("stroke-width", 1.1); }
-        else { vis.attr("stroke-opacity", d => selected.has(d.Country) ? 1 : .08).attr("stroke-width", d => selected.has(d.Country) ? 2.3 : .7); }
+        const out = d => linkFilter && !linkFilter.has(String(d.Country));
+        if (!selected.size) { vis.attr("stroke-opacity", d => out(d) ? .04 : .85).attr("stroke-width", 1.1); }
+        else { vis.attr("stroke-opacity", d => out(d) ? .04 : selected.has(d.Country) ? 1 : .08).attr("stroke-width", d => selected.has(d.Country) ? 2.3 : .7); }
       }
+      // columnas de DATA para el filtro del brush (se crean al primer brush tras cada updateData)
+      let dataCols = null;
+      const colOf = k => (dataCols || (dataCols = {}))[k] || (dataCols[k] = Float32Array.from(DATA, d => +d[k] || 0));
+      const filterLatest = compute.latest();
       function brushed(event) {
         g.selectAll(".brush").each(function (dim) {
           const s = d3.brushSelection(this);
           if (s) { const y0 = y[dim].invert(s[1]); const y1 = y[dim].invert(s[0]); filters[dim] = [Math.min(y0,y1), Math.max(y0,y1)]; }
           else delete filters[dim];
         });
-        const keys = Object.keys(filters);
-        const disp = d => { for (const k of keys) { const v = +d[k] || 0; const [a,b] = filters[k]; if (v<a || v>b) return "none"; } return null; };
-        vis.style("display", disp); hits.style("display", disp);
-        if (event && event.type === "end") { const rows = DATA.filter(d => disp(d) === null); selected = new Set(rows.map(r => r.Country)); publish("brush"); }
+        const keys = Object.keys(filters), end = !!(event && event.type === "end"), sent = DATA;
+        const applyMask = mask => {
+          if (sent !== DATA) return;   // los datos cambiaron (año) mientras el worker filtraba
+          const disp = mask ? (d, i) => (mask[i] ? null : "none") : null;
+          vis.style("display", disp); hits.style("display", disp);
+          const rows = mask ? DATA.filter((d, i) => mask[i]) : DATA;
+          onFilter && onFilter(mask ? rows.map(r => r.Country) : null);
+          if (end) { selected = new Set(rows.map(r => r.Country)); publish("brush"); }
+        };
+        if (!keys.length) { applyMask(null); return; }
+        const args = { cols: keys.map(colOf), ranges: keys.map(k => filters[k]), n: DATA.length };
+        if (DATA.length * keys.length < ISEA_WORKER_MIN) { applyMask(compute.now("filter", args)); return; }
+        // copias cedidas al worker; durante el drag solo cuenta la última respuesta
+        args.cols = args.cols.map(c => c.slice());
+        filterLatest("filter", args, args.cols.map(c => c.buffer)).then(mask => { if (mask) applyMask(mask); });
       }
 
       let axis=null, vis=null, hits=null;
@@ -162,7 +263,7 @@ export function render({ model, el }) {
         axis.attr("transform", d => `translate(${getX(d)},0)`)
           .each(function (d) {
             const A = d3.select(this); A.selectAll("g.tick").remove();
-            A.call(d3.axisLeft(y[d]).ticks(5).tickFormat(tickFmt));
+            A.call(d3.axisLeft(y[d]).ticks(5).tickFormat(tickFmt()));
             A.select("text.t").text(dd => axisLabel(dd));
             A.selectAll("text").style("fill","#111827").style("font", `${FS.tick}px system-ui`);
             A.selectAll("line,path").style("stroke","#111827").style("stroke-width","1.0");
@@ -175,16 +276,17 @@ export function render({ model, el }) {
         if (allowReorderHere) {
           const drag = d3.drag()
             .on("start", (ev, dim) => { dragging[dim] = getX(dim); g.selectAll(".brush").style("pointer-events","none"); })
-            .on("drag",  (ev, dim) => { dragging[dim] = Math.max(0, Math.min(iW, ev.x)); axis.attr("transform", d => `translate(${getX(d)},0)`); const L = d => line(DIMS.map(k => [getX(k), y[k](+d[k])])); vis.attr("d",L); hits.attr("d",L); })
-            .on("end",   (ev, dim) => { DIMS.sort((a,b)=>getX(a)-getX(b)); delete dragging[dim]; x.domain(DIMS);
-              const Lt = d => line(DIMS.map(k => [x(k), y[k](+d[k])])); axis.transition().duration(150).attr("transform", d => `translate(${x(d)},0)`);
+            .on("drag",  (ev, dim) => { dragging[dim] = Math.max(0, Math.min(iW, ev.x)); scheduleDragPaint(); })
+            .on("end",   (ev, dim) => { if (dragFrame != null) { cancelAnimationFrame(dragFrame); dragFrame = null; }
+              DIMS.sort((a,b)=>getX(a)-getX(b)); delete dragging[dim]; x.domain(DIMS);
+              const xs = DIMS.map(k => x(k)); const Lt = d => pathAt(d, xs); axis.transition().duration(150).attr("transform", d => `translate(${x(d)},0)`);
               vis.transition().duration(150).attr("d",Lt); hits.transition().duration(150).attr("d",Lt); g.selectAll(".brush").style("pointer-events",null); onReorder && onReorder(DIMS.slice()); });
           axis.select("text.t").style("cursor","grab").call(drag);
         }
       }
       function renderData() {
-        buildY(); renderAxes();
-        const pathD = d => line(DIMS.map(k => [x(k), y[k](+d[k])]));
+        buildY(); cacheY(); renderAxes();
+        const xs = DIMS.map(k => x(k)); const pathD = d => pathAt(d, xs);
         vis = layer.selectAll("path").data(DATA, d => d.Country).join("path")
           .attr("d", pathD).attr("fill","none").attr("stroke", d => color(d.DominantTech || DIMS[0]))
           .attr("stroke-opacity", .85).attr("stroke-width", 1.1).style("pointer-events","none");
@@ -200,36 +302,53 @@ export function render({ model, el }) {
         applySel();
       }
       function publish(type) { applySel(); const keys=[...selected]; const rows=DATA.filter(d=>selected.has(d.Country));
-        model.set("selection",{type,keys,rows}); model.save_changes(); onSelect && onSelect(); }
+        link.commit({type,keys,rows}); onSelect && onSelect(keys); }
 
       function setSelected(s){ selected=new Set(s); applySel(); }
-      function updateData(d){ DATA=d||[]; renderData(); }
-
-      let onSelect=null,onReorder=null;
-      return { updateData, setSelected, setOnSelection:f=>(onSelect=f), setOnReorder:f=>(onReorder=f) };
+      function updateData(d, ext=null){ DATA=d||[]; EXTENT=ext; dataCols=null; renderData(); }
+      // orden cambiado en la otra vista: mover ejes y paths (y en caché)
+      function setOrder(order){ if (!axis || x.domain().join("\u0000") === order.join("\u0000")) return;
+        x.domain(order); const xs = order.map(k => x(k));
+        axis.transition().duration(150).attr("transform", d => `translate(${x(d)},0)`);
+        vis.transition().duration(150).attr("d", d => pathAt(d, xs)); hits.attr("d", d => pathAt(d, xs)); }
+
+      function setLinkFilter(k){ linkFilter=k; if (vis) applySel(); }
+      // paleta / etiquetas: sin tocar escalas, brushes ni selección
+      function restyle(){ if (!vis) return; vis.attr("stroke", d => color(d.DominantTech || DIMS[0])); axis.select("text.t").text(dd => axisLabel(dd)); }
+
+      let onSelect=null,onReorder=null,onFilter=null;
+      return { updateData, setSelected, setOrder, setLinkFilter, restyle,
+               setOnSelection:f=>(onSelect=f), setOnReorder:f=>(onReorder=f), setOnFilter:f=>(onFilter=f) };
     }
 
     // ---------- insight (shares por dimensión) ----------
-    let updateInsightCursor = null;
-    function renderInsight(selectedKeys) {
-      rightTop.innerHTML = "";
+    // totales por país y año en caché; los shares solo recorren la selección
+    const IDX = new Map(R.map((r, j) => [r.label, j]));
+    const TOT = [];
+    for (let i = 0; i < NY; i++) { const t = new Float64Array(NREC); for (const k of DIMS0) { const c = COLS[k][i]; for (let j = 0; j < NREC; j++) t[j] += c[j]; } TOT.push(t); }
+    let allShares = null;
+    function shareSeries(keys) {
+      const sel = keys.size ? [...keys].map(k => IDX.get(k)).filter(j => j != null) : null;
+      if (!sel && allShares) return allShares;
+      const sums = {}; for (const k of DIMS0) sums[k] = new Float64Array(NY);
+      const sumAll = new Float64Array(NY);
+      for (let i = 0; i < NY; i++) {
+        const tot = TOT[i];
+        const visit = j => { if (!(tot[j] > 0)) return; sumAll[i] += tot[j]; for (const k of DIMS0) sums[k][i] += COLS[k][i][j]; };
+        if (sel) sel.forEach(visit); else for (let j = 0; j < NREC; j++) visit(j);
+      }
+      const series = DIMS0.map(dim => ({ dim, values: YEARS.map((year,i) => ({ idx:i, year, share:(sumAll[i]>0? sums[dim][i]/sumAll[i] : 0) })) }));
+      if (!sel) allShares = series;
+      return series;
+    }
+
+    // ejes, leyenda y título se crean una vez; las series se actualizan con joins por clave
+    let updateInsightCursor = null, updateInsight = null, restyleLegend = null;
+    (function buildInsight() {
       const svg = d3.select(rightTop).append("svg").attr("width", rightW).attr("height", row1H).style("display","block");
       const m = { t: 18, r: 12, b: 28, l: 48 }, w = rightW - m.l - m.r, h = row1H - m.t - m.b;
       const g = svg.append("g").attr("transform", `translate(${m.l},${m.t})`);
 
-      const keys = new Set(selectedKeys || []);
-      const series = DIMS.map(dim => {
-        const values = YEARS.map((y,i) => {
-          let sumDim=0, sumAll=0;
-          for (const r of R) { if (keys.size && !keys.has(r.label)) continue;
-            const v = +r[dim][i] || 0; const tot = DIMS.reduce((a,k)=>a+(+r[k][i]||0),0);
-            if (tot>0){ sumDim+=v; sumAll+=tot; }
-          }
-          return { idx:i, year:y, share:(sumAll>0? sumDim/sumAll : 0) };
-        });
-        return { dim, values };
-      });
-
       const x = d3.scaleLinear().domain([0, YEARS.length-1]).range([0,w]);
       const y = d3.scaleLinear().domain([0,1]).nice().range([h,0]);
       g.append("g").attr("transform",`translate(0,${h})`)
@@ -240,33 +359,37 @@ export function render({ model, el }) {
         .call(s=>s.selectAll("path,line").style("stroke","#111827").style("stroke-width","1.0"));
 
       const l = d3.line().x(d=>x(d.idx)).y(d=>y(d.share));
-      g.selectAll("path.s").data(series).join("path")
-        .attr("class","s").attr("d", d=>l(d.values)).attr("fill","none")
-        .attr("stroke", d=>color(d.dim)).attr("stroke-width",2);
-
-      const pts = g.selectAll("g.pts").data(series).join("g").attr("class","pts").attr("fill", d=>color(d.dim));
-      pts.selectAll("circle").data(d=>d.values.map(v=>({...v,dim:d.dim}))).join("circle")
-        .attr("cx",d=>x(d.idx)).attr("cy",d=>y(d.share)).attr("r",3)
-        .on("mousemove",(ev,d)=>showTip(ev, `<b>${axisLabel(d.dim)}</b> — ${d.year}<br>${d3.format(".1%")(d.share)}`))
-        .on("mouseleave", hideTip);
+      const gLines = g.append("g"), gPts = g.append("g");
+      updateInsight = (keys) => {
+        const series = shareSeries(keys);
+        gLines.selectAll("path.s").data(series, d=>d.dim).join("path")
+          .attr("class","s").attr("fill","none").attr("stroke", d=>color(d.dim)).attr("stroke-width",2).attr("d", d=>l(d.values));
+        const pts = gPts.selectAll("g.pts").data(series, d=>d.dim).join("g").attr("class","pts").attr("fill", d=>color(d.dim));
+        pts.selectAll("circle").data(d=>d.values.map(v=>({...v,dim:d.dim})), d=>d.idx).join(
+          e => e.append("circle").attr("r",3)
+            .on("mousemove",(ev,d)=>showTip(ev, `<b>${axisLabel(d.dim)}</b> — ${d.year}<br>${d3.format(".1%")(d.share)}`))
+            .on("mouseleave", hideTip))
+          .attr("cx",d=>x(d.idx)).attr("cy",d=>y(d.share));
+      };
 
       const rule = g.append("line").attr("y1",0).attr("y2",h).attr("stroke","#334155").attr("stroke-dasharray","3,3");
-      rule.attr("x1",x(idxYear)).attr("x2",x(idxYear)); updateInsightCursor = ()=>{ rule.attr("x1",x(idxYear)).attr("x2",x(idxYear)); };
+      updateInsightCursor = ()=>{ rule.attr("x1",x(idxYear)).attr("x2",x(idxYear)); };
 
       // Leyenda compacta multi-fila
       const perRow = Math.max(1, Math.floor((w-10)/110));
-      const rows = Math.ceil(DIMS.length / perRow);
+      const rows = Math.ceil(DIMS0.length / perRow);
       const lg = svg.append("g").attr("transform", `translate(${m.l + 4},${m.t - 10})`);
       lg.append("rect").attr("x",-6).attr("y",-4).attr("width", Math.min(w, perRow*110))
         .attr("height", rows*18 + 6).attr("rx",10).attr("fill","#f1f5f9").attr("stroke","#e2e8f0");
-      const items = lg.selectAll("g.i").data(DIMS).join("g").attr("class","i")
+      const items = lg.selectAll("g.i").data(DIMS0).join("g").attr("class","i")
         .attr("transform",(d,i)=>`translate(${(i%perRow)*110},${Math.floor(i/perRow)*18})`);
       items.append("rect").attr("width",10).attr("height",10).attr("rx",2).attr("fill", d=>color(d)).attr("y",3);
       items.append("text").attr("x",14).attr("y",12).text(d=>axisLabel(d)).style("font", `${FS.legend}px system-ui`).style("fill","#334155");
+      restyleLegend = () => { items.select("rect").attr("fill", d=>color(d)); items.select("text").text(d=>axisLabel(d)); };
 
       svg.append("text").attr("x",8).attr("y",14).text("Selected countries")
         .style("font", `600 ${FS.header}px system-ui`).style("fill","#0f172a");
-    }
+    })();
 
     // ---------- estado + sincronización ----------
     let currentData = datasetYear(idxYear);
@@ -280,36 +403,72 @@ export function render({ model, el }) {
     // tabla
     const tableWrap = h("div", {}, leftBottom);
     tableWrap.style.cssText = `height:100%;overflow:auto;border:1px solid #e2e8f0;border-radius:12px;background:#fff;box-shadow:0 1px 2px rgba(0,0,0,.04);`;
+    // esqueleto de tabla creado una vez; cabecera según orden de ejes, filas por país
+    const tableInner = h("div", {}, tableWrap); tableInner.style.overflow="auto"; tableInner.style.maxWidth="100%";
+    const tbl = h("table", {}, tableInner); Object.assign(tbl.style, { borderCollapse:"separate", borderSpacing:"0", width:"100%" });
+    const trh = tbl.createTHead().insertRow(); Object.assign(trh.style, { position:"sticky", top:"0", background:"#f8fafc", boxShadow:"inset 0 -1px 0 #e2e8f0" });
+    const tb = tbl.createTBody(); const nf = new Intl.NumberFormat(undefined,{ maximumFractionDigits:3 });
+    const rowBg = i => (i%2 ? "#f9fafb" : "#ffffff");
+    let tableOrder = null;
     function renderTable(selRows) {
-      tableWrap.innerHTML = "";
-      const wrap = h("div", {}, tableWrap); wrap.style.overflow="auto"; wrap.style.maxWidth="100%";
-      const rows = selRows || []; const cols = ["Country","Year", ...DIMS.map(axisLabel), "DominantTech"];
-      const tbl = h("table", {}, wrap); Object.assign(tbl.style, { borderCollapse:"separate", borderSpacing:"0", width:"100%", minWidth:`${220 + (cols.length-1)*130}px` });
-      const trh = tbl.createTHead().insertRow(); Object.assign(trh.style, { position:"sticky", top:"0", background:"#f8fafc", boxShadow:"inset 0 -1px 0 #e2e8f0" });
-      cols.forEach((c,i)=>{ const th=document.createElement("th"); th.textContent=c; Object.assign(th.style,{ padding:"8px 10px", textAlign:i===0?"left":"right", font:`600 ${FS.table-1}px system-ui`, color:"#0f172a" }); trh.appendChild(th); });
-      const tb = tbl.createTBody(); const nf = new Intl.NumberFormat(undefined,{ maximumFractionDigits:3 });
-      rows.forEach((r,idx)=>{ const tr=tb.insertRow(); tr.style.background=idx%2?"#f9fafb":"#ffffff"; tr.onmouseenter=()=>tr.style.background="#eef2ff"; tr.onmouseleave=()=>tr.style.background=idx%2?"#f9fafb":"#ffffff";
-        const order = ["Country","Year", ...DIMS, "DominantTech"];
-        order.forEach((key,i)=>{ const td=tr.insertCell(); const v=r[key]; const isNum=(i>1 && i<order.length-1 && Number.isFinite(+v)); td.textContent=isNum? nf.format(+v): (v??"—");
-          Object.assign(td.style,{ padding:"8px 10px", textAlign:i===0?"left":"right", font:`${FS.table}px system-ui`, color:"#0f172a", borderBottom:"1px solid #eef2f7" }); if(i===0) td.style.fontWeight="600"; });
-      });
+      const rows = selRows || []; const order = ["Country","Year", ...DIMS, "DominantTech"];
+      if (!tableOrder || tableOrder.join("\u0000") !== order.join("\u0000")) {
+        tableOrder = order; const cols = ["Country","Year", ...DIMS.map(axisLabel), "DominantTech"];
+        tbl.style.minWidth = `${220 + (cols.length-1)*130}px`;
+        d3.select(trh).selectAll("th").data(cols).join("th").text(c=>c)
+          .each(function(c,i){ Object.assign(this.style,{ padding:"8px 10px", textAlign:i===0?"left":"right", font:`600 ${FS.table-1}px system-ui`, color:"#0f172a" }); });
+      }
+      const tr = d3.select(tb).selectAll("tr").data(rows, d=>d.Country).join(
+        e => e.append("tr").on("mouseenter", function(){ this.style.background="#eef2ff"; }).on("mouseleave", function(){ this.style.background=this.__bg; }))
+        .order().each(function(_,i){ this.__bg=rowBg(i); this.style.background=this.__bg; });
+      tr.selectAll("td").data(r => order.map(k => r[k])).join(
+        e => e.append("td").each(function(){ Object.assign(this.style,{ padding:"8px 10px", font:`${FS.table}px system-ui`, color:"#0f172a", borderBottom:"1px solid #eef2f7" }); }))
+        .each(function(v,i){ const isNum=(i>1 && i<order.length-1 && Number.isFinite(+v)); this.textContent=isNum? nf.format(+v): (v??"—");
+          this.style.textAlign = i===0?"left":"right"; this.style.fontWeight = i===0?"600":""; });
     }
 
+    // ---------- actualizaciones incrementales ----------
+    // cada cambio solo toca los cuadrantes que dependen de él
+    const selectedRows = () => currentData.filter(d => currentSelection.has(d.Country));
+    function onYearChange(t = 0) {
+      currentData = t ? blendYears(idxYear, t) : datasetYear(idxYear);
+      main.updateData(currentData, t ? blendExtent(idxYear, t) : extentYear(idxYear)); main.setSelected(currentSelection);
+      const subset = selectedRows(); mini.updateData(subset); mini.setSelected(currentSelection);
+      renderTable(subset); updateInsightCursor(); hideTip();
+    }
+    function onSelectionChange() {
+      main.setSelected(currentSelection);
+      const subset = selectedRows(); mini.updateData(subset); mini.setSelected(currentSelection);
+      renderTable(subset); updateInsight(currentSelection); hideTip();
+    }
+    function onOrderChange() { main.setOrder(DIMS); mini.setOrder(DIMS); renderTable(selectedRows()); }
     function updateAll() {
       const svgMain = mainContainer.querySelector("svg");
       if (svgMain) svgMain.setAttribute("height", String(calcMainH()));
-      currentData = datasetYear(idxYear); main.updateData(currentData);
-      const subset = currentData.filter(d => currentSelection.has(d.Country)); mini.updateData(subset);
-      main.setSelected(currentSelection); mini.setSelected(currentSelection);
-      renderTable(subset); renderInsight([...currentSelection]); hideTip();
+      onYearChange(); updateInsight(currentSelection);
     }
 
-    main.setOnSelection(()=>{ const s=new Set((model.get("selection")||{}).keys||[]); currentSelection=s; updateAll(); });
-    mini.setOnSelection(()=>{ const s=new Set((model.get("selection")||{}).keys||[]); currentSelection=s; updateAll(); });
-    const onReorder = (order)=>{ DIMS = order.slice(); updateAll(); };
+    const onSelect = (keys)=>{ currentSelection=new Set(keys); onSelectionChange(); link.publish("select", keys.length ? keys : null); };
+    main.setOnSelection(onSelect); mini.setOnSelection(onSelect);
+    const onFilter = (keys)=>link.publish("filter", keys);
+    main.setOnFilter(onFilter); mini.setOnFilter(onFilter);
+
+    // vistas enlazadas (IseaBus): se resaltan sin pasar por el kernel
+    link.onSelect = (keys)=>{
+      currentSelection = new Set(keys ? R.map(r=>r.label).filter(k=>keys.has(String(k))) : []);
+      onSelectionChange();
+      link.pending = { type:"link", keys:[...currentSelection], rows:selectedRows() };
+    };
+    link.onFilter = (keys)=>{ main.setLinkFilter(keys); mini.setLinkFilter(keys); };
+    const onReorder = (order)=>{ DIMS = order.slice(); onOrderChange(); };
     main.setOnReorder(onReorder); mini.setOnReorder(onReorder);
 
-    slider.addEventListener("input", ev => { idxYear = +ev.target.value; yearLbl.textContent = YEARS[idxYear]; updateAll(); if (updateInsightCursor) updateInsightCursor(); });
+    slider.addEventListener("input", ev => { idxYear = +ev.target.value; yearLbl.textContent = YEARS[idxYear]; player.at(idxYear); onYearChange(); });
+    player.bind(YEARS, pos => {
+      idxYear = Math.floor(pos); slider.value = String(idxYear); yearLbl.textContent = YEARS[idxYear];
+      onYearChange(pos - idxYear);
+    });
+    player.at(idxYear);
 
     // Ayuda (popover)
     const HELP_KEY="isea_vis_help_v1";
@@ -351,9 +510,57 @@ export function render({ model, el }) {
 
     // primer render
     updateAll();
+    link.replay();
+    if (model.get("loading")) showLoading();
+
+    // cambios de opciones sin reconstruir: estilo (colores, textos) o escalas (log, normalización, año)
+    view = {
+      update(next, rescale) {
+        opts = next;
+        unit = opts.unit ?? "";
+        const p = opts.palette || PAL0;
+        color.domain(Object.keys(p)).range(Object.values(p));
+        main.restyle(); mini.restyle(); restyleLegend();
+        tableOrder = null;   // cabecera con las etiquetas nuevas
+        if (rescale) {
+          useLog = !!opts.log_axes; normalize = !!opts.normalize;
+          const i = YEARS.indexOf(opts.year_start ?? YEARS[YEARS.length - 1]);
+          if (i >= 0 && i !== idxYear) { idxYear = i; slider.value = String(i); yearLbl.textContent = YEARS[i]; player.at(i); }
+          onYearChange();
+        } else {
+          renderTable(selectedRows());
+        }
+        updateInsight(currentSelection);
+      },
+    };
+  }
+
+  function onOptions() {
+    const next = model.get("options") ?? {};
+    const changed = Object.keys({ ...drawnOptions, ...next })
+      .filter(k => JSON.stringify(drawnOptions[k]) !== JSON.stringify(next[k]));
+    if (!changed.length) return;
+    if (!view || changed.some(k => !RESTYLE.has(k) && !RESCALE.has(k))) { draw(); return; }
+    drawnOptions = next;
+    view.update(next, changed.some(k => RESCALE.has(k)));
+  }
+
+  // ---------- loading overlay (build_async / update_async) ----------
+  function showLoading() {
+    const pack = model.get("data") ?? {};
+    if (!(pack.records || []).length) { draw(); return; }
+    let ov = el.querySelector(":scope > .isea-loading");
+    if (!model.get("loading")) { if (ov) ov.remove(); return; }
+    if (ov) return;
+    el.style.position = "relative";
+    ov = h("div", { className: "isea-loading", textContent: "Loading…" }, el);
+    ov.style.cssText = "position:absolute;inset:0;display:flex;align-items:center;justify-content:center;" +
+      "background:rgba(255,255,255,.55);font:600 13px sans-serif;color:#475569;z-index:50;";
   }
 
   model.on("change:data", draw);
-  model.on("change:options", draw);
+  model.on("change:options", onOptions);
+  model.on("change:loading", showLoading);
   draw();
+  return () => { link.dispose(); player.dispose(); };
 }
@@ -2,6 +2,14 @@
 export async function render({ model, el }) {
   const mod = await import("https://cdn.jsdelivr.net/npm/d3@7/+esm");
   const d3 = mod.default ?? mod;
+  const link = iseaLink(model);   // selecciones compartidas con vistas del mismo link_group
+  const compute = iseaCompute();
+  const player = iseaPlayer(model);   // animación del slider de años (anim.js)
+  // filas desde un Isea.DataStore compartido, si la vista lo referencia; un redibujado por frame
+  let storeFrame = null;
+  const store = await iseaStore(model, () => {
+    if (storeFrame == null) storeFrame = requestAnimationFrame(() => { storeFrame = null; draw(); });
+  });
 
   const nowEpoch = () => Date.now();
   const h = (t, p = {}, parent) => { const n = document.createElement(t); Object.assign(n, p); if (parent) parent.appendChild(n); return n; };
@@ -13,10 +21,21 @@ export async function render({ model, el }) {
     return [head, body].filter(Boolean).join("\n");
   };
 
+  // Cambios de `options` que no necesitan reconstruir la vista; cualquier otra clave
+  // (tamaño, márgenes, columnas, leyenda, panel...) pasa por draw().
+  const RESTYLE = new Set(["opacity", "radius", "colors", "colorMap", "title", "xLabel", "yLabel"]);
+  const RESCALE = new Set(["x", "y", "xTicks", "yTicks"]);
+  let view = null, drawnOptions = {};
+  const changedKeys = (prev, next) => Object.keys({ ...prev, ...next })
+    .filter(k => JSON.stringify(prev[k]) !== JSON.stringify(next[k]));
+
   function draw() {
     el.innerHTML = "";
+    view = null;
+    player.bind([], null);
+    drawnOptions = model.get("options") || {};
 
-    const data = model.get("data") || [];
+    const data = store ? store.table().rows() : (model.get("data") || []);
     const o = Object.assign({
       x:"x", y:"y", key:"id", label:null, color:null, size:null,
       logX:false, logY:false,
@@ -37,8 +56,10 @@ export async function render({ model, el }) {
 
       function remapTechVars(year) {    // !Changed to try and fix
         if (!listVars.length || !Number.isFinite(+year)) return;
-        const tag = `F${+year}`;
-        const rows = model.get("data") || [];
+        // año fraccionario (animación): mezcla del año y el siguiente
+        const y0 = Math.floor(+year), t = +year - y0;
+        const tag = `F${y0}`, tag1 = `F${y0 + 1}`;
+        const rows = data;
 
         rows.forEach(d => {
           // ✅ ensure key/label stay present & non-empty
@@ -46,11 +67,14 @@ export async function render({ model, el }) {
           if (o.key   && (d[o.key]   == null)) d[o.key]   = d[o.label] ?? d.Country ?? "";
 
           // copy current year values into bare TechUnit fields
-          listVars.forEach(v => { d[v] = +d[`${v}__${tag}`] || 0; });
-          d.Year = +year; // handy for selection table/tooltip
+          listVars.forEach(v => {
+            const a = +d[`${v}__${tag}`] || 0;
+            d[v] = t ? a + ((+d[`${v}__${tag1}`] || 0) - a) * t : a;
+          });
+          d.Year = y0; // handy for selection table/tooltip
         });
 
-        currentYear = +year;
+        currentYear = y0;
       }
 
     const M = o.margin || {};
@@ -313,12 +337,13 @@ export async function render({ model, el }) {
 
     //todo above is new for zoom
 
-    if (o.title) {
-      gTitle.append("text")
+    function drawTitle() {
+      gTitle.selectAll("text").data(o.title ? [String(o.title)] : []).join("text")
         .attr("x", m.l).attr("y", Math.max(18, m.t - 10))
         .attr("font-family","system-ui,Segoe UI,Arial").attr("font-size",14).attr("font-weight",600).attr("fill","#111827")
-        .text(String(o.title));
+        .text(d => d);
     }
+    drawTitle();
 
     // ---- tooltip (parallel-style) ----
     const tip = document.createElement("div");
@@ -466,11 +491,13 @@ export async function render({ model, el }) {
       // If locked, skip recomputing domains unless explicitly forced
       if (axesLocked && !force) return;
 
-      const XV2 = data.map(d => +d[o.x]).filter(Number.isFinite);
-      const YV2 = data.map(d => +d[o.y]).filter(Number.isFinite);
-
-      let xMin = d3.min(XV2), xMax = d3.max(XV2);
-      let yMin = d3.min(YV2), yMax = d3.max(YV2);
+      // una pasada por columna (kernel de compute.js); en el hilo principal porque ejes y puntos
+      // se actualizan en el mismo frame
+      const ext = compute.now("extent", { cols: {
+        x: Float64Array.from(data, d => +d[o.x]), y: Float64Array.from(data, d => +d[o.y]) } });
+      const fin = v => (Number.isFinite(v) ? v : undefined);
+      let [xMin, xMax] = ext.x.map(fin);
+      let [yMin, yMax] = ext.y.map(fin);
 
       if (padMax > 0 && Number.isFinite(xMin) && Number.isFinite(xMax) && xMax > xMin) {
         const dx = xMax - xMin;
@@ -512,16 +539,17 @@ export async function render({ model, el }) {
     }
 
     // ---- Points
-    const R = +o.radius || 5, A = +o.opacity || 0.92;
+    let R = +o.radius || 5, A = +o.opacity || 0.92;
+    const pointRadius = d => (o.size && Number.isFinite(+d[o.size])) ? Math.max(1.5, Math.sqrt(+d[o.size])) : R;
+    const pointFill = d => o.color ? (cmap[String(d[o.color])] || "#888") : "#4b5563";
 
     const points = gDots.selectAll("circle")
       .data(data, keyOf)   //1 ✅ bind by key, not index
       .join("circle")
       .attr("cx", d => sx(+d[o.x]))
       .attr("cy", d => sy(+d[o.y]))
-      .attr("r", d => (o.size && Number.isFinite(+d[o.size]))
-        ? Math.max(1.5, Math.sqrt(+d[o.size])) : R)
-      .attr("fill", d => o.color ? (cmap[String(d[o.color])] || "#888") : "#4b5563")
+      .attr("r", pointRadius)
+      .attr("fill", pointFill)
       .attr("fill-opacity", A)
       .attr("stroke", "white")
       .attr("stroke-width", 0.6)
@@ -554,6 +582,7 @@ export async function render({ model, el }) {
 
     // ===== Controls: dynamic X/Y button groups (driven by o.xyVars) =====
     const xyVars = Array.isArray(o.xyVars) ? o.xyVars.filter(Boolean) : [];
+    let renderXY = null;   // botones X/Y activos, si hay controles
     if (xyVars.length) {
       const controls = el.insertBefore(document.createElement("div"), wrap);
       Object.assign(controls.style, {
@@ -638,6 +667,7 @@ export async function render({ model, el }) {
       }
 
       renderButtons();
+      renderXY = renderButtons;
       // ===== Year slider (below the X/Y button groups, only if o.yearMin & o.yearMax) =====
       if (Number.isFinite(+o.yearMin) && Number.isFinite(+o.yearMax) && +o.yearMin < +o.yearMax) {
         const yrMin = +o.yearMin;
@@ -687,12 +717,23 @@ export async function render({ model, el }) {
         });
         val.textContent = slider.value;
         bar.appendChild(slider);
+        bar.appendChild(player.button());
 
         // Event handler
         slider.addEventListener("input", () => {
-          const y = +slider.value;
+          player.at(+slider.value - yrMin);
+          showYear(+slider.value);
+        });
+        // play / pause / seek: y fraccionario entre dos años
+        player.bind(d3.range(yrMin, yrMax + 1), pos => {
+          slider.value = String(yrMin + Math.floor(pos));
+          showYear(yrMin + pos);
+        });
+        player.at(yrMax - yrMin);
+
+        function showYear(y) {
           remapTechVars(y);   // <- copy <TechUnit>__FYYYY into bare <TechUnit> for all rows
-          val.textContent = String(y);
+          val.textContent = String(Math.floor(y));
           // const col = `F${y}`;
           // if (!(data.length && col in data[0])) return;
 
@@ -703,18 +744,20 @@ export async function render({ model, el }) {
           if (typeof renderButtons === "function") renderButtons();
           updateScalesAndAxes(0.05);
           repositionPoints();
-        });
+        }
       }
 
     }
 
     // ---- Selection state
     const selectedKeys = new Set();
+    let filterKeys = null;   // subconjunto visible publicado por una vista enlazada (brush)
     const pushSelectionFromKeys = (type="set")=>{
       const keys = Array.from(selectedKeys);
       const rows = keys.map(k=>byKey.get(k)).filter(Boolean);
-      model.set("selection", { type, keys, rows, epoch: nowEpoch() });
-      model.save_changes(); updatePanel(); applySelectionStyles();
+      link.commit({ type, keys, rows, epoch: nowEpoch() });
+      link.publish("select", keys.length ? keys : null);
+      updatePanel(); applySelectionStyles();
     };
 
     //! trying to fix brush and zoom
@@ -808,11 +851,23 @@ export async function render({ model, el }) {
     //! end of trying to fix brush and zoom
 
     function applySelectionStyles(){
-      if (!selectedKeys.size){ points.attr("fill-opacity",A); return; }
-      points.attr("fill-opacity", d=> selectedKeys.has(keyOf(d)) ? 1 : 0.15);
+      const out = d => filterKeys && !filterKeys.has(String(keyOf(d)));
+      if (!selectedKeys.size){ points.attr("fill-opacity", d=> out(d) ? 0.05 : A); return; }
+      points.attr("fill-opacity", d=> out(d) ? 0.05 : selectedKeys.has(keyOf(d)) ? 1 : 0.15);
     }
     model.on("change:selection", ()=>{ updatePanel(); applySelectionStyles(); });
 
+    // ---- Linked views (IseaBus): highlight by key, no kernel round-trip
+    const known = new Map(data.map(d => [String(keyOf(d)), keyOf(d)]));
+    link.onSelect = (keys) => {
+      selectedKeys.clear();
+      if (keys) for (const k of keys) if (known.has(k)) selectedKeys.add(known.get(k));
+      const sel = Array.from(selectedKeys);
+      link.pending = { type: "link", keys: sel, rows: sel.map(k=>byKey.get(k)).filter(Boolean), epoch: nowEpoch() };
+      updatePanel(); applySelectionStyles();
+    };
+    link.onFilter = (keys) => { filterKeys = keys; applySelectionStyles(); };
+
     // ---- Legend (use existing `cats` and `cmap` from above)
     if (o.legend && cats.length){
       const gL = gLegend.append("g");
@@ -916,11 +971,54 @@ export async function render({ model, el }) {
 
     // Initial render & selection
     updatePanel(); applySelectionStyles();
-    model.set("selection", { type:null, keys:[], rows:[], epoch: nowEpoch() });
-    model.save_changes();
+    link.commit({ type:null, keys:[], rows:[], epoch: nowEpoch() });
+    link.replay();
+
+    // Actualización sin reconstruir: estilo (colores, radio, textos) y, con rescale, dominios y ejes.
+    // Mantiene selección, filtro enlazado y estado de los controles.
+    view = {
+      update(next, rescale) {
+        Object.assign(o, next);
+        R = +o.radius || 5; A = +o.opacity || 0.92;
+        if (o.color) {
+          cmap = o.colorMap || null;
+          if (!cmap){ const pal=o.colors||[]; cmap={}; cats.forEach((v,i)=>cmap[v]=pal[i%pal.length]); }
+          gLegend.selectAll("rect").attr("fill", (_, i) => cmap[String(cats[i])]);
+        }
+        points.attr("r", pointRadius).attr("fill", pointFill);
+        drawTitle();
+        if (rescale) {
+          updateScalesAndAxes(0.05, true);   // como setX/setY: un cambio de variable reinicia los ejes
+          repositionPoints();
+          if (renderXY) renderXY();
+          renderToolButtons();
+          updatePanel();
+        } else {
+          gx.select(".x-label").text(o.xLabel ?? String(o.x));
+          gy.select(".y-label").text(o.yLabel ?? String(o.y));
+        }
+        applySelectionStyles();
+      },
+    };
+  }
+
+  function onOptions() {
+    const next = model.get("options") || {};
+    const changed = changedKeys(drawnOptions, next);
+    if (!changed.length) return;
+    // claves quitadas vuelven a su valor por defecto: eso lo resuelve draw()
+    if (!view || changed.some(k => !(k in next) || !(RESTYLE.has(k) || RESCALE.has(k)))) { draw(); return; }
+    drawnOptions = next;
+    view.update(next, changed.some(k => RESCALE.has(k)));
   }
 
   model.on("change:data", draw);
-  model.on("change:options", draw);
+  model.on("change:options", onOptions);
   draw();
+  return () => {
+    link.dispose();
+    player.dispose();
+    if (store) store.dispose();
+    if (storeFrame != null) cancelAnimationFrame(storeFrame);
+  };
 }
\ No newline at end of file
@@ -0,0 +1,118 @@
+// Isea/assets/store.js
+// Lectura de un Isea.DataStore compartido (se antepone al módulo de las vistas, ver Isea/store.py).
+//
+// El store viaja una vez como columnas binarias:
+//   { kind: "f8" | "f4" | "i4" | "u1" | "dict", data: <bytes>, values?: [...] }
+// ("dict": códigos int32 sobre `values`, -1 = null). La tabla decodificada se comparte entre
+// todas las vistas de la página (window.__iseaStores) y se actualiza con los parches
+// ("patch") de DataStore.update() / append(): solo viajan las celdas o filas nuevas.
+
+const ISEA_ARRAYS = { f8: Float64Array, f4: Float32Array, i4: Int32Array, u1: Uint8Array, dict: Int32Array };
+
+// copia alineada: el DataView puede empezar en cualquier offset del buffer del mensaje
+function iseaTyped(kind, view) {
+  return new ISEA_ARRAYS[kind](view.buffer.slice(view.byteOffset, view.byteOffset + view.byteLength));
+}
+
+class IseaTable {
+  constructor(snap) {
+    this.version = snap.version || 0;
+    this.n = snap.n || 0;
+    this.names = (snap.order || []).slice();
+    this.cols = {};
+    for (const name of this.names) this.cols[name] = IseaTable.column(snap.columns[name], v => v);
+  }
+
+  static column(meta, buf) {
+    return { kind: meta.kind, data: iseaTyped(meta.kind, buf(meta.data)), values: (meta.values || []).slice() };
+  }
+
+  has(name) { return name in this.cols; }
+
+  value(name, i) {
+    const c = this.cols[name];
+    if (!c) return undefined;
+    const v = c.data[i];
+    if (c.kind === "dict") return v < 0 ? null : c.values[v];
+    if (c.kind === "u1") return !!v;
+    return Number.isNaN(v) ? null : v;
+  }
+
+  // columna como array JS (null = sin dato)
+  column(name) {
+    const out = new Array(this.n);
+    for (let i = 0; i < this.n; i++) out[i] = this.value(name, i);
+    return out;
+  }
+
+  // filas como objetos; `names` limita las columnas (por defecto todas)
+  rows(names = this.names) {
+    const use = names.filter(k => k in this.cols);
+    const out = new Array(this.n);
+    for (let i = 0; i < this.n; i++) { const r = {}; for (const k of use) r[k] = this.value(k, i); out[i] = r; }
+    return out;
+  }
+
+  // aplica un parche; devuelve { cols, rows } con las filas tocadas (rows = null: todas)
+  patch(msg, buffers) {
+    const buf = j => buffers[j];
+    const n0 = this.n, rows = new Set();
+    let all = false;
+    for (const [name, meta] of Object.entries(msg.cols || {})) {
+      const c = this.cols[name];
+      if (meta.op === "replace" || !c) {
+        this.cols[name] = IseaTable.column(meta, buf);
+        if (!this.names.includes(name)) this.names.push(name);
+        all = true;
+        continue;
+      }
+      if (meta.values_add) c.values.push(...meta.values_add);
+      const data = iseaTyped(c.kind, buf(meta.data));
+      if (meta.op === "append") {
+        const grown = new c.data.constructor(c.data.length + data.length);
+        grown.set(c.data); grown.set(data, c.data.length);
+        c.data = grown;
+      } else {
+        const idx = iseaTyped("i4", buf(meta.rows));
+        for (let j = 0; j < idx.length; j++) { c.data[idx[j]] = data[j]; rows.add(idx[j]); }
+      }
+    }
+    this.n = msg.n;
+    this.version = msg.version;
+    for (let i = n0; i < this.n; i++) rows.add(i);
+    return { cols: Object.keys(msg.cols || {}), rows: all ? null : [...rows].sort((a, b) => a - b) };
+  }
+}
+
+// Store referenciado por model.get("store"), o null si la vista trae sus propios datos.
+// onChange(table, delta) se llama tras cada parche (delta.rows = filas tocadas) o recarga (delta = null).
+async function iseaStore(model, onChange) {
+  const ref = model.get("store");
+  if (!ref) return null;
+  const id = String(ref).replace(/^IPY_MODEL_/, "");
+  const reg = window.__iseaStores || (window.__iseaStores = new Map());
+  let entry = reg.get(id);
+  if (!entry) {
+    entry = { table: null, views: new Set() };
+    entry.ready = model.widget_manager.get_model(id).then(sm => {
+      const load = () => {
+        entry.table = new IseaTable(sm.get("table") || {});
+        // copia anterior a parches ya aplicados en Python (p. ej. página recargada)
+        if (entry.table.version < (sm.get("version") || 0)) sm.send({ type: "resync" });
+      };
+      sm.on("change:table", () => { load(); entry.views.forEach(f => f(entry.table, null)); });
+      sm.on("msg:custom", (msg, buffers) => {
+        if (!msg || msg.type !== "patch" || !entry.table || msg.version <= entry.table.version) return;
+        if (msg.base !== entry.table.version) { sm.send({ type: "resync" }); return; }
+        const delta = entry.table.patch(msg, buffers || []);
+        entry.views.forEach(f => f(entry.table, delta));
+      });
+      load();
+    });
+    reg.set(id, entry);
+  }
+  await entry.ready;
+  entry.views.add(onChange);
+  return { table: () => entry.table, dispose: () => entry.views.delete(onChange) };
+}
+
@@ -29,12 +29,87 @@ export async function render({ model, el }) {
     // State for toggled series (hidden ones)
     let hiddenSeries = new Set();
 
+    // Zoom state shared across redraws; `view` holds the range data sent by Python
+    let zoomT = d3.zoomIdentity;
+    let view = null;
+    let rangeSeq = 0;
+    let rangeTimer = null;
+    let redrawLines = null;
+
+    // Option keys applied to the drawn chart: labels (restyle) and the zoom limit (rescale).
+    // Size, margins and downsampling rebuild it.
+    const RESTYLE = new Set(["title", "xLabel", "yLabel"]);
+    const RESCALE = new Set(["maxZoom"]);
+    let updateOptions = null;
+    let drawnOptions = {};
+
+    // Local copy of the series so streamed points can be appended in place
+    let series = [];
+    let appendLines = null;
+    let streaming = false;
+    // Segment arrays are plain lists or delta-encoded {e, d} (Isea.encoding)
+    const decodeSeries = s => {
+        if (!s || Array.isArray(s)) return s;
+        const f = Math.pow(10, Math.abs(s.e));
+        let acc = 0;
+        return s.d.map(v => v == null ? null : (acc += v, s.e >= 0 ? acc / f : acc * f));
+    };
+    const decodeSeg = seg => ({ x: [...(decodeSeries(seg?.x) || [])], y: [...(decodeSeries(seg?.y) || [])] });
+    const copySeries = data => (data || []).map(s => ({
+        ...s,
+        history: decodeSeg(s.history),
+        prediction: decodeSeg(s.prediction)
+    }));
+
+    function onAppend(msg) {
+        streaming = true;
+        const s = series.find(d => d.id === msg.id);
+        if (!s) {
+            // New series: needs a legend entry, so redraw everything
+            series.push({ id: msg.id, color: msg.color, history: { x: [...msg.x], y: [...msg.y] }, prediction: { x: [], y: [] } });
+            return draw();
+        }
+        const h = s.history;
+        h.x.push(...msg.x);
+        h.y.push(...msg.y);
+        // Keep the same window as the Python ring buffer
+        const extra = h.x.length - msg.window;
+        if (extra > 0) { h.x.splice(0, extra); h.y.splice(0, extra); }
+        if (!appendLines || !appendLines(s, msg.x, msg.y, extra > 0)) draw();
+    }
+
+    model.on("msg:custom", (msg) => {
+        if (!msg) return;
+        if (msg.type === "append") return onAppend(msg);
+        if (msg.type === "snapshot") { series = copySeries(msg.data); streaming = true; return draw(); }
+        if (msg.type !== "range" || msg.seq !== rangeSeq) return;
+        view = copySeries(msg.data);
+        if (redrawLines) redrawLines();
+    });
+
+    // Segments arrive as parallel arrays {x: [...], y: [...]}
+    const segLen = seg => (seg && seg.x ? seg.x.length : 0);
+    const segPoints = seg => {
+        const n = segLen(seg), pts = new Array(n);
+        for (let i = 0; i < n; i++) pts[i] = [seg.x[i], seg.y[i]];
+        return pts;
+    };
+    const bisectX = d3.bisector(v => v).center;
+
+    // Nearest point of a segment to `xv` (binary search on the sorted x array)
+    function nearest(seg, xv) {
+        const n = segLen(seg);
+        if (!n) return null;
+        const i = bisectX(seg.x, xv);
+        return { x: seg.x[i], y: seg.y[i], first: seg.x[0], last: seg.x[n - 1] };
+    }
+
     function draw() {
-        const rawData = model.get("data");
-        const opts = model.get("options");
+        let opts = model.get("options");
+        drawnOptions = opts;
         
         // Filter out hidden series for scaling, but keep structure
-        const data = rawData.map(d => ({
+        const data = series.map(d => ({
             ...d,
             visible: !hiddenSeries.has(d.id)
         }));
@@ -43,6 +118,9 @@ export async function render({ model, el }) {
 
         container.innerHTML = "";
         container.appendChild(tooltip); // Re-attach tooltip
+        redrawLines = null;
+        appendLines = null;
+        updateOptions = null;
 
         if (!data || data.length === 0) {
             container.innerHTML += `<div style="padding:20px; color:#888">No trend data available</div>`;
@@ -65,51 +143,56 @@ export async function render({ model, el }) {
             .attr("transform", `translate(${margin.left},${margin.top})`);
 
         // Title
-        if (opts.title) {
-            svg.append("text")
-                .attr("x", width / 2)
-                .attr("y", margin.top / 2)
-                .attr("text-anchor", "middle")
-                .style("fill", "#e5e7eb")
-                .style("font-weight", "bold")
-                .text(opts.title);
-        }
+        const drawTitle = () => svg.selectAll("text.title")
+            .data(opts.title ? [opts.title] : [])
+            .join("text")
+            .attr("class", "title")
+            .attr("x", width / 2)
+            .attr("y", margin.top / 2)
+            .attr("text-anchor", "middle")
+            .style("fill", "#e5e7eb")
+            .style("font-weight", "bold")
+            .text(d => d);
+        drawTitle();
 
         // --- Scales ---
-        // Collect all points to determine domains
-        let allPoints = [];
+        // Domains from the full (not zoomed) data; x arrays are sorted so ends give the extent
+        let xMin = Infinity, xMax = -Infinity, yMax = -Infinity;
         visibleData.forEach(s => {
-            allPoints = allPoints.concat(s.history, s.prediction);
+            [s.history, s.prediction].forEach(seg => {
+                const n = segLen(seg);
+                if (!n) return;
+                xMin = Math.min(xMin, seg.x[0]);
+                xMax = Math.max(xMax, seg.x[n - 1]);
+                for (let i = 0; i < n; i++) if (seg.y[i] > yMax) yMax = seg.y[i];
+            });
         });
 
-        if (allPoints.length === 0 && visibleData.length > 0) {
+        if (!Number.isFinite(xMin)) {
              // Fallback if visible series have no points
-             allPoints = [{x: 2020, y: 0}, {x: 2025, y: 100}];
+             xMin = 2020; xMax = 2025; yMax = 100;
         }
 
-        const xExtent = d3.extent(allPoints, d => d.x);
-        const yMax = d3.max(allPoints, d => d.y) || 100;
-
-        const x = d3.scaleLinear()
-            .domain(xExtent)
+        // While streaming, leave 10% headroom so axes only rescale now and then
+        const headroom = streaming ? (xMax - xMin || 1) * 0.1 : 0;
+        const x0 = d3.scaleLinear()
+            .domain([xMin, xMax + headroom])
             .range([0, innerW]);
 
         const y = d3.scaleLinear()
-            .domain([0, yMax * 1.1]) // Add 10% padding
+            .domain([0, (yMax || 100) * 1.1]) // Add 10% padding
             .range([innerH, 0]);
 
         const color = d3.scaleOrdinal(d3.schemeTableau10)
             .domain(data.map(d => d.id));
 
         // --- Axes ---
-        const xAxis = d3.axisBottom(x).tickFormat(d3.format("d")); // No commas in years
+        const xAxis = d3.axisBottom(x0).tickFormat(d3.format("d")); // No commas in years
         const yAxis = d3.axisLeft(y).ticks(5).tickFormat(d3.format(".2s")); // SI prefix (k, M)
 
-        g.append("g")
+        const gx = g.append("g")
             .attr("transform", `translate(0,${innerH})`)
-            .call(xAxis)
-            .attr("color", "#9ca3af")
-            .select(".domain").remove();
+            .attr("color", "#9ca3af");
 
         g.append("g")
             .call(yAxis)
@@ -124,41 +207,96 @@ export async function render({ model, el }) {
             .style("stroke-dasharray", "3,3")
             .style("opacity", 0.3);
 
-        // --- Line Generators ---
-        const lineGen = d3.line()
-            .x(d => x(d.x))
-            .y(d => y(d.y));
+        // Clip so zoomed lines stay inside the plot
+        const clipId = `trend-clip-${Math.random().toString(36).slice(2)}`;
+        svg.append("defs").append("clipPath").attr("id", clipId)
+            .append("rect").attr("width", innerW).attr("height", innerH);
+        const plot = g.append("g").attr("clip-path", `url(#${clipId})`);
 
         // --- Draw Series ---
-        visibleData.forEach(series => {
-            const seriesColor = series.color || color(series.id);
+        let x = zoomT.rescaleX(x0);
+
+        // Series currently drawn: range data from Python while zoomed, otherwise the model data
+        const drawnSeries = () => {
+            const byId = view ? new Map(view.map(s => [s.id, s])) : null;
+            return visibleData.map(s => (byId && byId.get(s.id)) || s);
+        };
 
-            // History Line (Solid)
-            g.append("path")
-                .datum(series.history)
-                .attr("fill", "none")
-                .attr("stroke", seriesColor)
-                .attr("stroke-width", 2)
-                .attr("d", lineGen);
-
-            // Prediction Line (Dashed)
-            g.append("path")
-                .datum(series.prediction)
-                .attr("fill", "none")
-                .attr("stroke", seriesColor)
-                .attr("stroke-width", 2)
-                .attr("stroke-dasharray", "5,5")
-                .attr("d", lineGen);
-
-            // Points (History only)
-            g.selectAll(`.point-${series.id.replace(/\s+/g, '-')}`)
-                .data(series.history)
+        const lineGen = d3.line()
+            .x(d => x(d[0]))
+            .y(d => y(d[1]));
+
+        // Points (History only) — skipped when they would overlap
+        const drawPoints = (sel, s, seriesColor) => {
+            const pts = segLen(s.history) <= innerW / 4 ? segPoints(s.history) : [];
+            sel.selectAll("circle")
+                .data(pts)
                 .join("circle")
-                .attr("cx", d => x(d.x))
-                .attr("cy", d => y(d.y))
+                .attr("cx", d => x(d[0]))
+                .attr("cy", d => y(d[1]))
                 .attr("r", 3)
                 .attr("fill", seriesColor);
-        });
+        };
+
+        redrawLines = () => {
+            x = zoomT.rescaleX(x0);
+            gx.call(xAxis.scale(x)).select(".domain").remove();
+
+            const series = drawnSeries();
+            const groups = plot.selectAll("g.series")
+                .data(series, d => d.id)
+                .join("g")
+                .attr("class", "series");
+
+            groups.each(function(s) {
+                const seriesColor = s.color || color(s.id);
+                const sel = d3.select(this);
+
+                // History Line (Solid)
+                sel.selectAll("path.hist").data([segPoints(s.history)]).join("path")
+                    .attr("class", "hist")
+                    .attr("fill", "none")
+                    .attr("stroke", seriesColor)
+                    .attr("stroke-width", 2)
+                    .attr("d", lineGen);
+
+                // Prediction Line (Dashed)
+                sel.selectAll("path.pred").data([segPoints(s.prediction)]).join("path")
+                    .attr("class", "pred")
+                    .attr("fill", "none")
+                    .attr("stroke", seriesColor)
+                    .attr("stroke-width", 2)
+                    .attr("stroke-dasharray", "5,5")
+                    .attr("d", lineGen);
+
+                drawPoints(sel, s, seriesColor);
+            });
+        };
+        redrawLines();
+
+        // Streamed points: extend the history path in place (rebuilt from the
+        // history when the window dropped old points); false means the new
+        // points fall outside the current axes and a full redraw is needed
+        appendLines = (s, xs, ys, trimmed) => {
+            if (hiddenSeries.has(s.id)) return true;
+            if (view || zoomT.k !== 1) return false;
+            const [, xHi] = x0.domain(), [yLo, yHi] = y.domain();
+            for (let i = 0; i < xs.length; i++) {
+                if (xs[i] > xHi || ys[i] < yLo || ys[i] > yHi) return false;
+            }
+            const group = plot.selectAll("g.series").filter(d => d.id === s.id);
+            const path = group.select("path.hist");
+            if (path.empty()) return false;
+            if (trimmed) {
+                path.attr("d", lineGen(segPoints(s.history)));
+            } else {
+                let d = path.attr("d") || "";
+                for (let i = 0; i < xs.length; i++) d += (d ? "L" : "M") + x(xs[i]) + "," + y(ys[i]);
+                path.attr("d", d);
+            }
+            drawPoints(group, s, s.color || color(s.id));
+            return true;
+        };
 
         // --- Legend ---
         const legend = svg.append("g")
@@ -195,8 +333,6 @@ export async function render({ model, el }) {
         });
 
         // --- Interactive Bisector (Hover Line) ---
-        const bisect = d3.bisector(d => d.x).left;
-        
         // Overlay rect to capture mouse events
         const overlay = g.append("rect")
             .attr("width", innerW)
@@ -210,6 +346,38 @@ export async function render({ model, el }) {
             .style("stroke-dasharray", "3,3")
             .style("opacity", 0);
 
+        // --- Zoom (x only) ---
+        // While zoomed with downsampling on, ask Python for the visible range at full resolution
+        const requestRange = () => {
+            if (!opts.downsample) return;
+            clearTimeout(rangeTimer);
+            rangeTimer = setTimeout(() => {
+                rangeSeq += 1;
+                if (zoomT.k === 1) { view = null; redrawLines(); return; }
+                const [a, b] = x.domain();
+                model.send({ type: "range", x0: a, x1: b, seq: rangeSeq });
+            }, 120);
+        };
+
+        const zoom = d3.zoom()
+            .scaleExtent([1, opts.maxZoom || 1000])
+            .extent([[0, 0], [innerW, innerH]])
+            .translateExtent([[0, 0], [innerW, innerH]])
+            .on("zoom", (event) => {
+                zoomT = event.transform;
+                redrawLines();
+                requestRange();
+            });
+        overlay.call(zoom).on("dblclick.zoom", null);
+        overlay.property("__zoom", zoomT);
+
+        // Labels are read on hover, so only the title needs repainting; the zoom keeps its state
+        updateOptions = (next) => {
+            opts = next;
+            drawTitle();
+            zoom.scaleExtent([1, opts.maxZoom || 1000]);
+        };
+
         overlay
             .on("mouseover", () => {
                 focusLine.style("opacity", 1);
@@ -221,11 +389,32 @@ export async function render({ model, el }) {
             })
             .on("mousemove", (event) => {
                 const [mx] = d3.pointer(event);
-                const yearVal = x.invert(mx);
-                const year = Math.round(yearVal);
-                
-                // Snap line to year
-                const snapX = x(year);
+                const xv = x.invert(mx);
+                const tol = Math.abs(x.invert(mx + 8) - xv);
+
+                // Nearest point per series (bisect); history wins over prediction on ties
+                const currentVals = [];
+                let snap = null;
+                drawnSeries().forEach(s => {
+                    const h = nearest(s.history, xv), p = nearest(s.prediction, xv);
+                    const inRange = q => q && xv >= q.first - tol && xv <= q.last + tol;
+                    let pt = inRange(h) ? h : null, type = " (Hist)";
+                    if (inRange(p) && (!pt || Math.abs(p.x - xv) < Math.abs(pt.x - xv))) {
+                        pt = p;
+                        type = " (Pred)";
+                    }
+                    if (!pt) return;
+                    if (snap === null || Math.abs(pt.x - xv) < Math.abs(snap - xv)) snap = pt.x;
+                    currentVals.push({
+                        id: s.id,
+                        val: pt.y,
+                        color: s.color || color(s.id),
+                        type: type
+                    });
+                });
+
+                // Snap line to the closest data x
+                const snapX = x(snap ?? xv);
                 focusLine
                     .attr("x1", snapX)
                     .attr("y1", 0)
@@ -233,29 +422,9 @@ export async function render({ model, el }) {
                     .attr("y2", innerH);
 
                 // Build tooltip content
-                let html = `<strong>Year: ${year}</strong><br/>`;
-                
-                // Sort series by value at this year for better readability
-                const currentVals = [];
-                visibleData.forEach(s => {
-                    // Check history
-                    let pt = s.history.find(p => p.x === year);
-                    let type = " (Hist)";
-                    if (!pt) {
-                        pt = s.prediction.find(p => p.x === year);
-                        type = " (Pred)";
-                    }
-                    
-                    if (pt) {
-                        currentVals.push({
-                            id: s.id,
-                            val: pt.y,
-                            color: s.color || color(s.id),
-                            type: type
-                        });
-                    }
-                });
+                let html = `<strong>${opts.xLabel || "Year"}: ${d3.format("d")(snap ?? xv)}</strong><br/>`;
 
+                // Sort series by value at this x for better readability
                 currentVals.sort((a, b) => b.val - a.val);
 
                 currentVals.forEach(item => {
@@ -283,9 +452,30 @@ export async function render({ model, el }) {
             });
     }
 
+    // New data resets zoom and any range view
+    function onData() {
+        series = copySeries(model.get("data"));
+        streaming = false;
+        zoomT = d3.zoomIdentity;
+        view = null;
+        rangeSeq += 1;
+        draw();
+    }
+
+    series = copySeries(model.get("data"));
     draw();
-    model.on("change:data", draw);
-    model.on("change:options", draw);
+    model.on("change:data", onData);
+    // Ask Python for the current streaming buffers (no-op if nothing was appended)
+    model.send({ type: "sync" });
+    model.on("change:options", () => {
+        const next = model.get("options") || {};
+        const changed = Object.keys({ ...drawnOptions, ...next })
+            .filter(k => JSON.stringify(drawnOptions[k]) !== JSON.stringify(next[k]));
+        if (!changed.length) return;
+        if (!updateOptions || changed.some(k => !RESTYLE.has(k) && !RESCALE.has(k))) return draw();
+        drawnOptions = next;
+        updateOptions(next);
+    });
 
     return () => { if(tooltip.parentNode) tooltip.parentNode.removeChild(tooltip); };
 }
\ No newline at end of file
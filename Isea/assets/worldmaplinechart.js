@@ -15,6 +15,25 @@
 export async function render({ model, el }) {
   const mod = await import("https://cdn.jsdelivr.net/npm/d3@7/+esm");
   const d3 = mod.default ?? mod;
+  // selections shared with the link_group (IseaBus); keys are ISO3 codes, names go as labels
+  const link = iseaLink(model);
+  // per-year colour domains computed on the shared worker (compute.js)
+  const compute = iseaCompute();
+  // year animation (anim.js): play / pause / seek from the button or from Python
+  const player = iseaPlayer(model);
+
+  // ------------------ Wait for a background build (build_async) ------------------
+  if (model.get("loading")) {
+    el.innerHTML = `<div style="padding:20px;color:#94a3b8;font:600 13px sans-serif">Loading…</div>`;
+    await new Promise(resolve => {
+      const ready = () => {
+        if (model.get("loading")) return;
+        model.off("change:loading", ready);
+        resolve();
+      };
+      model.on("change:loading", ready);
+    });
+  }
 
   // ------------------ Extract data & options ------------------
   let data = model.get("data");
@@ -22,7 +41,35 @@ export async function render({ model, el }) {
 
   const YEARS     = data.years;
   const YEARS_NUM = data.years_num;
-  let REC         = data.records;
+  // values: lista por año o {e, d} delta-codificada (Isea.encoding)
+  const decodeSeries = (s) => {
+    if (!s || Array.isArray(s)) return s;
+    const f = Math.pow(10, Math.abs(s.e));
+    let acc = 0;
+    return s.d.map(v => v == null ? null : (acc += v, s.e >= 0 ? acc / f : acc * f));
+  };
+  const decodeRecords = (recs) => (recs || []).map(r => ({ ...r, values: decodeSeries(r.values) }));
+
+  // rows from a shared Isea.DataStore when the pack names store columns instead of records
+  let storeFrame = null;
+  const store = await iseaStore(model, () => {
+    if (storeFrame == null) storeFrame = requestAnimationFrame(() => { storeFrame = null; onStoreChange(); });
+  });
+  function buildRecords(d){
+    if (!store || !d.columns) return decodeRecords(d.records);
+    const t = store.table();
+    const iso = d.iso3_col
+      ? t.column(d.iso3_col)
+      : t.column(d.region_col).map(r => (d.iso3_map || {})[r] || "UNK");
+    const names = t.column(d.label_col);
+    return iso.map((code, i) => ({
+      iso3: String(code),
+      name: String(names[i]),
+      values: d.columns.map(c => t.value(c, i) ?? null),
+    }));
+  }
+
+  let REC         = buildRecords(data);
   let world       = data.world;
 
   const totalW = opts.width;
@@ -184,17 +231,76 @@ export async function render({ model, el }) {
     );
   }
 
-  function valueAt(iso3, yearIdx){
-    const r = REC.find(d=>d.iso3===iso3);
-    if (!r) return null;
-    const v = r.values[yearIdx];
-    return (v==null || isNaN(v)) ? null : v;
+  // while the year animation plays, `tween` is the fraction of the way from
+  // YEARS[idx] to the next year; values and the colour domain are interpolated
+  let tween = 0;
+  function valueNow(r){
+    const a = r.values[idx];
+    if (a==null || isNaN(a)) return null;
+    const b = tween ? r.values[idx+1] : null;
+    return (b==null || isNaN(b)) ? a : a + (b - a) * tween;
+  }
+
+  // map feature -> record index. Python joins them against world.geojson
+  // (data.feature_rows); rows read from a store are joined here, once per REC.
+  let joinFor = null, joinRows = null;
+  function featureRows(){
+    if (joinFor !== REC) {
+      const d = model.get("data");
+      if (d.feature_rows && d.n_records === REC.length) {
+        joinRows = d.feature_rows;
+      } else {
+        const first = new Map();
+        REC.forEach((r, i) => { if (!first.has(r.iso3)) first.set(r.iso3, i); });
+        const fiso = d.feature_iso3 || world.features.map(isoKey);
+        joinRows = fiso.map(iso => first.get(iso) ?? -1);
+      }
+      joinFor = REC;
+    }
+    return joinRows;
+  }
+  function recordOf(fi){
+    const j = featureRows()[fi];
+    return j >= 0 ? REC[j] : null;
+  }
+  // key used for selection / filters: the record's code when the feature has one
+  function featureIso(fi){
+    const r = recordOf(fi);
+    return r ? r.iso3 : isoKey(world.features[fi]);
   }
 
   let selectedIso = new Set();
+  let filterIso = null;   // countries left visible by a linked view's brush
 
   // ------------------ Color scale for map (per year) ------------------
+  // Max of every year at once (year × country matrix). Large packs go to the
+  // worker; until it answers, the current year is computed directly.
+  let yearMax = null;
+  const yearMaxLatest = compute.latest();
+  function refreshYearMax(){
+    yearMax = null;
+    const n = REC.length, ny = YEARS.length;
+    const mat = new Float32Array(n * ny);
+    REC.forEach((r, j) => {
+      for (let i = 0; i < ny; i++) {
+        const v = r.values[i];
+        mat[i * n + j] = v == null ? NaN : +v;
+      }
+    });
+    if (mat.length < ISEA_WORKER_MIN) { yearMax = compute.now("years", { data: mat, ny, n }).max; return; }
+    yearMaxLatest("years", { data: mat, ny, n }, [mat.buffer]).then(res => {
+      if (!res) return;
+      yearMax = res.max;
+      if (col.domain()[1] !== computeMaxValForYear()) recolorOnSlider();
+    });
+  }
+  refreshYearMax();
+
   function computeMaxValForYear(){
+    if (yearMax) {
+      const m = tween ? yearMax[idx] + (yearMax[idx+1] - yearMax[idx]) * tween : yearMax[idx];
+      return m || 1;
+    }
     return d3.max(
       REC.map(r => r.values[idx]).filter(v => v!=null)
     ) || 1;
@@ -205,37 +311,144 @@ export async function render({ model, el }) {
               .domain([0, maxVal]);
 
   // ------------------ MAP ------------------
-  const svg = root.append("svg")
-    .attr("width", totalW)
-    .attr("height", mapH);
-
-  const gMap = svg.append("g")
-    .attr("transform","translate(20,40)");
-
-  const proj = d3.geoNaturalEarth1()
-    .fitExtent([[0,0],[totalW-40,mapH-80]], world);
-
-  const path = d3.geoPath(proj);
-
-  const countries = gMap.selectAll("path.country")
-    .data(world.features)
-    .join("path")
-      .attr("class","country")
-      .attr("d", path)
-      .attr("fill", f => {
-        const v = valueAt(isoKey(f), idx);
-        return v==null ? "#374151" : col(v);
-      })
-      .attr("stroke","#111")
-      .attr("stroke-width",0.25)
-      .on("mousemove",(ev,f)=>{
-        const iso = isoKey(f);
-        const r = REC.find(d=>d.iso3===iso);
-        if (!r) return;
-        showTip(ev, r.name, r.values[idx]);
-      })
-      .on("mouseleave", hideTip)
-      .on("click",(ev,f)=> selectCountry(isoKey(f)));
+  // Two renderers with the same interface: fill() after a year/metric change,
+  // stroke() after a selection change, opacity() after a linked filter.
+  //   "svg"    — one <path> per feature (default)
+  //   "canvas" — cached Path2D per feature and size, fills from a typed value
+  //              array, hover/click resolved on an offscreen colour-ID canvas
+  //              (geometry.js, shared with maps of the same size on the page)
+  const mapLayer = opts.map_mode === "canvas" ? canvasMap() : svgMap();
+
+  function svgMap(){
+    const proj = d3.geoNaturalEarth1()
+      .fitExtent([[0,0],[totalW-40,mapH-80]], world);
+
+    const path = d3.geoPath(proj);
+
+    const svg = root.append("svg")
+      .attr("width", totalW)
+      .attr("height", mapH);
+
+    const gMap = svg.append("g")
+      .attr("transform","translate(20,40)");
+
+    // bound to feature indices, so records come from the precomputed join
+    const fillOf = i => {
+      const r = recordOf(i);
+      const v = r ? valueNow(r) : null;
+      return v==null ? "#374151" : col(v);
+    };
+    const countries = gMap.selectAll("path.country")
+      .data(d3.range(world.features.length))
+      .join("path")
+        .attr("class","country")
+        .attr("d", i => path(world.features[i]))
+        .attr("fill", fillOf)
+        .attr("stroke","#111")
+        .attr("stroke-width",0.25)
+        .on("mousemove",(ev,i)=>{
+          const r = recordOf(i);
+          if (!r) return;
+          showTip(ev, r.name, r.values[idx]);
+        })
+        .on("mouseleave", hideTip)
+        .on("click",(ev,i)=> selectCountry(featureIso(i)));
+
+    return {
+      fill(){
+        countries.attr("fill", fillOf);
+      },
+      stroke(){
+        countries
+          .attr("stroke-width", i=>selectedIso.has(featureIso(i))?1.5:0.25)
+          .attr("stroke",      i=>selectedIso.has(featureIso(i))?"#e5e7eb":"#111");
+      },
+      opacity(){
+        countries.attr("fill-opacity", i => (filterIso && !filterIso.has(featureIso(i))) ? 0.25 : 1);
+      },
+    };
+  }
+
+  function canvasMap(){
+    const W = totalW, H = mapH, OX = 20, OY = 40;
+    const dpr = window.devicePixelRatio || 1;
+    const canvas = root.append("canvas")
+      .attr("width", Math.round(W * dpr))
+      .attr("height", Math.round(H * dpr))
+      .style("width", W + "px")
+      .style("height", H + "px")
+      .style("display", "block")
+      .style("cursor", "pointer")
+      .node();
+    const ctx = canvas.getContext("2d");
+
+    const feats = world.features;
+    const isos = feats.map(isoKey);
+    // same fit as the SVG map: the projection box shifted by the (20,40) margin
+    const geo = iseaMapGeometry(d3, world, isos, W, H, [[OX, OY], [W - OX, H - OY]]);
+
+    // feature -> record and selection key, rebuilt only when REC is replaced
+    // (metric / store change)
+    let recOf = null, keyOf = null, recFor = null;
+    function records(){
+      if (recFor !== REC) {
+        recOf = feats.map((f, i) => recordOf(i));
+        keyOf = feats.map((f, i) => featureIso(i));
+        recFor = REC;
+      }
+      return recOf;
+    }
+
+    const vals = new Float32Array(feats.length);
+    let frame = null;
+    function paint(){
+      frame = null;
+      const recs = records();
+      for (let i = 0; i < feats.length; i++) {
+        const v = recs[i] ? valueNow(recs[i]) : null;
+        vals[i] = (v == null || isNaN(v)) ? NaN : v;
+      }
+      ctx.setTransform(dpr, 0, 0, dpr, 0, 0);
+      ctx.clearRect(0, 0, W, H);
+      ctx.lineWidth = 0.25;
+      ctx.strokeStyle = "#111";
+      for (let i = 0; i < feats.length; i++) {
+        const p = geo.paths[i];
+        if (!p) continue;
+        ctx.globalAlpha = (filterIso && !filterIso.has(keyOf[i])) ? 0.25 : 1;
+        ctx.fillStyle = Number.isNaN(vals[i]) ? "#374151" : col(vals[i]);
+        ctx.fill(p);
+        ctx.globalAlpha = 1;
+        ctx.stroke(p);
+      }
+      // selected outlines last, so neighbours do not cover them
+      ctx.lineWidth = 1.5;
+      ctx.strokeStyle = "#e5e7eb";
+      for (let i = 0; i < feats.length; i++) {
+        if (geo.paths[i] && selectedIso.has(keyOf[i])) ctx.stroke(geo.paths[i]);
+      }
+    }
+    const schedule = () => { if (frame == null) frame = requestAnimationFrame(paint); };
+
+    function featureAt(ev){
+      const r = canvas.getBoundingClientRect();
+      return geo.pick(ev.clientX - r.left, ev.clientY - r.top);
+    }
+    canvas.addEventListener("mousemove", ev => {
+      const i = featureAt(ev);
+      const rec = i < 0 ? null : records()[i];
+      if (!rec) { hideTip(); return; }
+      showTip(ev, rec.name, rec.values[idx]);
+    });
+    canvas.addEventListener("mouseleave", hideTip);
+    canvas.addEventListener("click", ev => {
+      const i = featureAt(ev);
+      if (i >= 0 && records()[i]) selectCountry(keyOf[i]);
+    });
+
+    paint();
+    return { fill: schedule, stroke: schedule, opacity: schedule };
+  }
 
   // ======================================================================
   // LINE CHART
@@ -311,6 +524,7 @@ export async function render({ model, el }) {
 
   // ------------------ Y-domain logic (full time series) ------------------
   function computeYMaxForSelection(){
+    if (!selectedIso.size && yearMax) return d3.max(yearMax) || 1;
     const relevant = selectedIso.size
       ? REC.filter(r => selectedIso.has(r.iso3))
       : REC;
@@ -570,15 +784,13 @@ function drawTopLegends() {
     if (selectedIso.has(iso3)) selectedIso.delete(iso3);
     else selectedIso.add(iso3);
 
-    countries
-      .attr("stroke-width", f=>selectedIso.has(isoKey(f))?1.5:0.25)
-      .attr("stroke",      f=>selectedIso.has(isoKey(f))?"#e5e7eb":"#111");
+    mapLayer.stroke();
 
     const rows = REC.filter(r=>selectedIso.has(r.iso3))
       .map(r => ({Country:r.name, Value:r.values[idx]}));
 
-    model.set("selection",{iso3s:[...selectedIso], year:YEARS[idx], rows});
-    model.save_changes();
+    link.commit({iso3s:[...selectedIso], year:YEARS[idx], rows});
+    publishSelection();
 
     // Update Y-scale based on new selection, then lines & table
     updateYScale();
@@ -588,15 +800,50 @@ function drawTopLegends() {
 
   btnClear.onclick = () => {
     selectedIso.clear();
-    countries.attr("stroke-width",0.25).attr("stroke","#111");
-    model.set("selection",{});
-    model.save_changes();
+    mapLayer.stroke();
+    link.commit({});
+    publishSelection();
 
     updateYScale();
     redrawLines();
     renderSelPanel([]);
   };
 
+  // ======================================================================
+  // LINKED VIEWS (IseaBus) — matched by ISO3 code or country name
+  // ======================================================================
+  function publishSelection(){
+    const recs = REC.filter(r=>selectedIso.has(r.iso3));
+    link.publish("select",
+      recs.length ? recs.map(r=>r.iso3) : null,
+      recs.length ? recs.map(r=>r.name) : null);
+  }
+
+  const isoMatching = keys =>
+    new Set(REC.filter(r => keys.has(String(r.iso3)) || keys.has(String(r.name))).map(r => r.iso3));
+
+  function applyFilter(){
+    mapLayer.opacity();
+  }
+
+  link.onSelect = (keys) => {
+    selectedIso = keys ? isoMatching(keys) : new Set();
+    mapLayer.stroke();
+
+    const rows = REC.filter(r=>selectedIso.has(r.iso3))
+      .map(r => ({Country:r.name, Value:r.values[idx]}));
+    link.pending = selectedIso.size ? {iso3s:[...selectedIso], year:YEARS[idx], rows} : {};
+
+    updateYScale();
+    redrawLines();
+    renderSelPanel(rows);
+  };
+
+  link.onFilter = (keys) => {
+    filterIso = keys ? isoMatching(keys) : null;
+    applyFilter();
+  };
+
   // ======================================================================
   // RECOLOR ON SLIDER MOVE (Y-axis DO NOT change here)
   // ======================================================================
@@ -604,10 +851,7 @@ function drawTopLegends() {
     maxVal = computeMaxValForYear();
     col.domain([0,maxVal]);
 
-    countries.attr("fill", f => {
-      const v = valueAt(isoKey(f), idx);
-      return v==null ? "#374151" : col(v);
-    });
+    mapLayer.fill();
 
     yearLbl.text(YEARS[idx]);
 
@@ -623,9 +867,20 @@ function drawTopLegends() {
 
   slider.on("input", ev=>{
     idx = +ev.target.value;
+    tween = 0;
+    player.at(idx);
     recolorOnSlider();
   });
 
+  controls.node().appendChild(player.button());
+  player.bind(YEARS_NUM, pos => {
+    idx = Math.floor(pos);
+    tween = pos - idx;
+    slider.property("value", idx);
+    recolorOnSlider();
+  });
+  player.at(idx);
+
   // ======================================================================
   // METRIC SWITCHING (Python side)
   // ======================================================================
@@ -637,11 +892,12 @@ function drawTopLegends() {
 
     // get updated REC from Python
     data = model.get("data");
-    REC  = data.records;
+    REC  = buildRecords(data);
+    refreshYearMax();
 
     selectedIso.clear();
-    model.set("selection",{});
-    model.save_changes();
+    link.commit({});
+    publishSelection();
 
     // Y-scale should adapt (based on all countries now)
     updateYScale();
@@ -652,9 +908,46 @@ function drawTopLegends() {
     recolorOnSlider();
   });
 
+  // ======================================================================
+  // STORE UPDATES (DataStore.update / append) — selection is kept
+  // ======================================================================
+  function onStoreChange(){
+    REC = buildRecords(model.get("data"));
+    refreshYearMax();
+    selectedIso = new Set(REC.filter(r => selectedIso.has(r.iso3)).map(r => r.iso3));
+    updateYScale();
+    redrawLines();
+    recolorOnSlider();
+  }
+
+  // ======================================================================
+  // LOADING OVERLAY (update_async)
+  // ======================================================================
+  function showLoading(){
+    let ov = el.querySelector(":scope > .isea-loading");
+    if (!model.get("loading")) { if (ov) ov.remove(); return; }
+    if (ov) return;
+    el.style.position = "relative";
+    ov = document.createElement("div");
+    ov.className = "isea-loading";
+    ov.textContent = "Loading…";
+    ov.style.cssText = "position:absolute;inset:0;display:flex;align-items:center;justify-content:center;" +
+      "background:rgba(15,23,42,.45);font:600 13px sans-serif;color:#e5e7eb;z-index:50;";
+    el.appendChild(ov);
+  }
+  model.on("change:loading", showLoading);
+
   // ------------------ Initial draw ------------------
   updateYScale();
   drawTopLegends();
   recolorOnSlider();
   renderSelPanel([]);
+  link.replay();
+
+  return () => {
+    link.dispose();
+    player.dispose();
+    if (store) store.dispose();
+    if (storeFrame != null) cancelAnimationFrame(storeFrame);
+  };
 }
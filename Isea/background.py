@@ -0,0 +1,292 @@
+"""
+Background computation helpers for the Isea widgets.
+
+Building a widget (aggregating a long DataFrame, re-reading a metric,
+running an analysis) normally happens on the kernel thread. The notebook
+frontend stays frozen until the work returns. This module moves that work
+to an executor:
+
+- :class:`LatestTask` runs a stream of jobs where only the newest result
+  matters, e.g. a ``selection`` observer that recomputes an analysis.
+  Superseded jobs are cancelled if they have not started yet; if they
+  have, their results are dropped.
+- :class:`BackgroundBuild` is a widget mixin. It adds a synced
+  ``loading`` flag (the JavaScript views show a placeholder while it is
+  set), the ``build_async`` constructor and the bookkeeping used by the
+  widgets' ``update_async`` methods.
+
+Results are applied to the widget on the kernel's event loop, so traitlets
+are never set from a worker thread while a loop is running::
+
+    w = ParallelEnergy.build_async(df, years)   # displays "Loading..." at once
+    w                                           # show it
+    await w                                     # optional: wait for the data
+"""
+import asyncio
+import contextvars
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import traitlets as T
+
+_EXECUTOR = None
+_log = logging.getLogger(__name__)
+
+# executor activo mientras se ejecuta BackgroundBuild.build_async
+_ASYNC_BUILD = contextvars.ContextVar("isea_async_build", default=None)
+
+# lista de trabajos pendientes mientras Isea.batch.build_many construye widgets
+_BATCH = contextvars.ContextVar("isea_batch", default=None)
+
+
+def default_executor():
+    """
+    Return the shared thread pool used when no executor is given.
+
+    A thread pool suits the pandas/NumPy data preparation done by the
+    widgets, which spends most of its time in C code. For pure-Python
+    heavy work pass a :class:`concurrent.futures.ProcessPoolExecutor`
+    instead. The preparation functions are module level, so they pickle.
+    """
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="isea"
+        )
+    return _EXECUTOR
+
+
+class LatestTask:
+    """
+    Run background jobs of which only the most recent one matters.
+
+    Each :meth:`submit` supersedes the previous job. A queued job is
+    cancelled. A job that is already running cannot be interrupted, but its
+    result is ignored and ``on_done`` is not called for it. This is the
+    pattern for selection observers::
+
+        task = LatestTask()
+
+        def _sync(change):
+            keys = change["new"].get("keys", [])
+            task.submit(engine.clusters, keys, 4, on_done=show_clusters)
+
+        w.observe(_sync, names="selection")
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor, optional
+        Where jobs run. Defaults to :func:`default_executor`.
+    """
+
+    def __init__(self, executor=None):
+        self.executor = executor
+        self._gen = 0
+        self._pending = None
+
+    @property
+    def running(self):
+        """True while the latest submitted job has not finished."""
+        return self._pending is not None
+
+    def submit(self, fn, *args, on_done=None, **kwargs):
+        """
+        Run ``fn(*args, **kwargs)`` in the executor, superseding older jobs.
+
+        Parameters
+        ----------
+        fn : callable
+            Function to run. It must not touch widgets.
+        on_done : callable, optional
+            Called with the result once the job finishes, unless a newer
+            job was submitted meanwhile. When an event loop is running
+            (always the case in Jupyter) it is called on that loop, so it
+            may update widgets.
+
+        Returns
+        -------
+        asyncio.Future or concurrent.futures.Future
+            An awaitable :class:`asyncio.Future` when called with an event
+            loop running. It is cancelled if the job gets superseded.
+            Outside an event loop (plain scripts) the executor's own future
+            is returned and ``on_done`` runs in the worker thread.
+        """
+        self.cancel()
+        gen = self._gen
+        cf = (self.executor or default_executor()).submit(fn, *args, **kwargs)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None:
+            def finish_thread(f):
+                if gen != self._gen or f.cancelled():
+                    return
+                self._pending = None
+                if f.exception() is None and on_done is not None:
+                    on_done(f.result())
+
+            self._pending = (cf, None)
+            cf.add_done_callback(finish_thread)
+            return cf
+
+        out = loop.create_future()
+
+        def finish(f):
+            if out.done():
+                return
+            if gen != self._gen or f.cancelled():
+                out.cancel()
+                return
+            self._pending = None
+            exc = f.exception()
+            if exc is not None:
+                out.set_exception(exc)
+                return
+            value = f.result()
+            if on_done is not None:
+                try:
+                    on_done(value)
+                except Exception as e:
+                    out.set_exception(e)
+                    return
+            out.set_result(value)
+
+        def wake(f):
+            try:
+                loop.call_soon_threadsafe(finish, f)
+            except RuntimeError:
+                pass  # loop cerrado: nadie espera ya el resultado
+
+        self._pending = (cf, out)
+        cf.add_done_callback(wake)
+        return out
+
+    def cancel(self):
+        """Supersede the pending job, if any."""
+        self._gen += 1
+        if self._pending is None:
+            return
+        cf, out = self._pending
+        self._pending = None
+        cf.cancel()
+        if out is not None and not out.done():
+            out.cancel()
+
+
+class BackgroundBuild(T.HasTraits):
+    """
+    Mixin that lets a widget prepare its data off the kernel thread.
+
+    A widget using it splits its work into a pure preparation function
+    (DataFrame in, JSON-ready payload out) and a method that assigns the
+    payload to its traitlets. It then calls :meth:`_run_build` with both.
+    Normally the preparation runs inline. Inside :meth:`build_async`, or
+    when an ``update_async`` method passes an executor, it is submitted to
+    the executor instead. ``loading`` is set until the payload is applied,
+    and newer requests supersede older ones.
+
+    Awaiting the widget waits for the latest pending build; it returns at
+    once when nothing is pending.
+    """
+
+    loading = T.Bool(False).tag(sync=True)
+
+    @classmethod
+    def build_async(cls, *args, executor=None, **kwargs):
+        """
+        Create the widget and prepare its data in the background.
+
+        Takes the same arguments as the constructor. Cheap validation and
+        the options are done immediately; the widget returned can be
+        displayed right away and shows a loading placeholder until the data
+        arrives. ``await`` it to wait for the data.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor, optional
+            Where the preparation runs. Defaults to
+            :func:`default_executor`.
+        """
+        token = _ASYNC_BUILD.set(executor or default_executor())
+        try:
+            return cls(*args, **kwargs)
+        finally:
+            _ASYNC_BUILD.reset(token)
+
+    def _run_build(self, prepare, *args, apply, executor=None):
+        """
+        Compute ``prepare(*args)`` and hand the result to ``apply``.
+
+        Runs inline unless an executor is given or the call happens inside
+        :meth:`build_async`. Inside :func:`Isea.batch.build_many` the call
+        is only recorded; the batch runs it in a worker process. In that case the payload, all trait changes
+        made by ``apply`` and ``loading=False`` go to the frontend as a
+        single update.
+
+        A background build that fails is logged (logger ``Isea.background``)
+        and its exception stays on the returned future, so awaiting the
+        widget raises it. An inline build supersedes any pending background
+        one, whose result is then dropped.
+        """
+        batch = _BATCH.get()
+        if batch is not None:
+            batch.append((prepare, args, apply))
+            return None
+
+        executor = executor or _ASYNC_BUILD.get()
+        if executor is None:
+            task = getattr(self, "_build_task", None)
+            pending = task is not None and task.running
+            if task is not None:
+                task.cancel()
+            with self.hold_sync():
+                apply(prepare(*args))
+                if pending:
+                    self.loading = False
+            self._ready = None
+            return None
+
+        task = getattr(self, "_build_task", None)
+        if task is None or task.executor is not executor:
+            if task is not None:
+                task.cancel()
+            task = self._build_task = LatestTask(executor)
+
+        def done(payload):
+            with self.hold_sync():
+                apply(payload)
+                self.loading = False
+
+        def failed(f):
+            if f.cancelled() or task.running:
+                return
+            exc = f.exception()
+            if exc is not None:
+                _log.error("Background build of %s failed", type(self).__name__,
+                           exc_info=(type(exc), exc, exc.__traceback__))
+                self.loading = False
+
+        self.loading = True
+        fut = task.submit(prepare, *args, on_done=done)
+        fut.add_done_callback(failed)
+        self._ready = fut
+        return fut
+
+    def __await__(self):
+        while True:
+            pending = getattr(self, "_ready", None)
+            if pending is None:
+                return self
+            fut = pending if isinstance(pending, asyncio.Future) else asyncio.wrap_future(pending)
+            try:
+                yield from fut.__await__()
+            except asyncio.CancelledError:
+                # sustituido por una petición más nueva: esperar a esa
+                if getattr(self, "_ready", None) is pending:
+                    raise
+                continue
+            if getattr(self, "_ready", None) is pending:
+                return self
@@ -0,0 +1,163 @@
+"""
+Batch construction of many Isea widgets from one wide frame.
+
+Reports often need dozens of views of the same table, e.g. one
+:class:`~Isea.worldmaplinechart.WorldMapLineChart` per metric or one
+:class:`~Isea.parallel.ParallelEnergy` per year range / dimension set.
+:func:`build_many` builds them in parallel:
+
+1. Every widget is constructed without its data (validation and options
+   only); its data preparation call is recorded instead of run (see
+   :class:`Isea.background.BackgroundBuild`).
+2. The source frame is written once as an Arrow IPC file in shared memory
+   (``/dev/shm`` when available). Each worker process memory-maps it and
+   converts it to pandas once, instead of receiving a pickled copy per
+   widget. Without :mod:`pyarrow` (or for frames Arrow cannot store
+   losslessly) the frame is pickled once per worker instead.
+3. The recorded preparations run in a process pool and the resulting data
+   packs are assigned to their widgets in the calling process, so the
+   widgets come back ready to display.
+
+Example::
+
+    from Isea.batch import build_many
+    from Isea.worldmaplinechart import WorldMapLineChart
+
+    maps = build_many(wide, {
+        m: (WorldMapLineChart, {"metric": m, "title": m})
+        for m in ["StockBEV", "SalesBEV", "StockShare", "ChargingStations"]
+    }, workers=8)
+    maps["SalesBEV"]
+
+On platforms that spawn worker processes (Windows, macOS) scripts calling
+:func:`build_many` need the usual ``if __name__ == "__main__":`` guard.
+"""
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from .background import _BATCH
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+
+class _SharedFrame:
+    """Placeholder for the source frame in job arguments sent to workers."""
+
+
+_SHARED = _SharedFrame()
+
+# estado por proceso worker
+_FRAME = None
+_SOURCE = None
+
+
+def _write_frame(df):
+    """
+    Write ``df`` as an Arrow IPC file in shared memory.
+
+    Returns the file path, or ``None`` when pyarrow is missing or the
+    frame does not round-trip through Arrow (non-string column names,
+    mixed-type object columns, ...).
+    """
+    if pa is None or not all(isinstance(c, str) for c in df.columns):
+        return None
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+
+    tmpdir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    fd, path = tempfile.mkstemp(prefix="isea-", suffix=".arrow", dir=tmpdir)
+    os.close(fd)
+    try:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
+
+
+def _init_worker(path, frame):
+    global _FRAME, _SOURCE
+    if path is None:
+        _FRAME = frame
+        return
+    # el mapa se mantiene abierto: las columnas pueden apuntar a él
+    _SOURCE = pa.memory_map(path)
+    _FRAME = pa.ipc.open_file(_SOURCE).read_all().to_pandas()
+
+
+def _run(prepare, args):
+    args = tuple(_FRAME if isinstance(a, _SharedFrame) else a for a in args)
+    return prepare(*args)
+
+
+def build_many(df, specs, workers=None):
+    """
+    Build many widgets from the same frame, preparing their data in parallel.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Source frame, passed as the first argument of every widget
+        constructor.
+    specs : list or dict
+        ``(WidgetClass, kwargs)`` pairs, for example
+        ``(WorldMapLineChart, {"metric": "SalesBEV"})`` or
+        ``(ParallelEnergy, {"years": ["2019", "2020"], "dims": dims})``.
+        When a dict of pairs is given, a dict with the same keys is
+        returned. Widgets without a background build path are simply
+        constructed in the calling process.
+    workers : int or None, default None
+        Number of worker processes. ``None`` uses all cores; ``0`` or
+        ``1`` prepares everything in-process.
+
+    Returns
+    -------
+    list or dict
+        The widgets, in the order (or under the keys) of ``specs``, with
+        their data loaded.
+    """
+    named = isinstance(specs, dict)
+    keys = list(specs) if named else None
+    pairs = list(specs.values()) if named else list(specs)
+
+    jobs = []
+    token = _BATCH.set(jobs)
+    try:
+        widgets = [cls(df, **kwargs) for cls, kwargs in pairs]
+    finally:
+        _BATCH.reset(token)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+
+    if workers <= 1:
+        results = [prepare(*args) for prepare, args, _ in jobs]
+    else:
+        path = _write_frame(df)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(path, None if path else df),
+            ) as pool:
+                futures = [
+                    pool.submit(_run, prepare, tuple(_SHARED if a is df else a for a in args))
+                    for prepare, args, _ in jobs
+                ]
+                results = [f.result() for f in futures]
+        finally:
+            if path is not None:
+                os.remove(path)
+
+    for (_, _, apply), pack in zip(jobs, results):
+        apply(pack)
+
+    return dict(zip(keys, widgets)) if named else widgets
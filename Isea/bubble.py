@@ -3,6 +3,85 @@ import traitlets as T
 from pathlib import Path
 import numpy as np
 
+from .encoding import resolve_digits, round_frame
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+
+def _bubble_layout(x, y, r, inner_w, inner_h, collide=False, iterations=40, padding=1.0):
+    """
+    Compute final bubble positions and radii in plot pixels.
+
+    Uses the same encodings as ``bubble.js``: linear x/y scales over
+    ``[0, max * 1.1]`` and a square-root radius scale mapping
+    ``[0, max(r)]`` to ``[4, 25]`` px. With ``collide=True`` overlapping
+    bubbles are pushed apart by a few rounds of pairwise relaxation (with a
+    weak pull back to their data position). Candidate pairs come from a
+    sweep over the x-sorted bubbles, so only neighbours closer than two
+    maximum radii are compared and thousands of bubbles stay cheap.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray, dict]
+        ``px``, ``py``, ``pr`` and the scale domains
+        (``{"xMax", "yMax", "rMax"}``) used to compute them.
+    """
+    x_max = float(np.max(x)) if len(x) and np.max(x) > 0 else 100.0
+    y_max = float(np.max(y)) if len(y) and np.max(y) > 0 else 100.0
+    r_max = float(np.max(r)) if len(r) and np.max(r) > 0 else 10.0
+
+    px0 = x / (x_max * 1.1) * inner_w
+    py0 = inner_h - y / (y_max * 1.1) * inner_h
+    pr = 4 + np.sqrt(np.clip(r, 0, None) / r_max) * 21
+
+    px, py = px0.copy(), py0.copy()
+    if collide and len(px) > 1:
+        n = len(px)
+        cutoff = 2 * pr.max() + padding
+        for it in range(iterations):
+            # barrido por x ordenado: solo se comparan pares a menos de `cutoff` en x
+            order = np.argsort(px, kind="stable")
+            sx, sy, sr = px[order], py[order], pr[order]
+            mx = np.zeros(n)
+            my = np.zeros(n)
+            moved = False
+            for k in range(1, n):
+                near = np.flatnonzero(sx[k:] - sx[:-k] < cutoff)
+                if not len(near):
+                    break
+                i, j = near, near + k
+                dx, dy = sx[i] - sx[j], sy[i] - sy[j]
+                dist = np.hypot(dx, dy)
+                overlap = sr[i] + sr[j] + padding - dist
+                hit = overlap > 0
+                if not hit.any():
+                    continue
+                i, j, dx, dy, dist, overlap = i[hit], j[hit], dx[hit], dy[hit], dist[hit], overlap[hit]
+                # puntos coincidentes: dirección arbitraria pero determinista
+                coincident = dist < 1e-9
+                safe = np.where(coincident, 1.0, dist)
+                ux = np.where(coincident, 1.0, dx / safe) * overlap * 0.5
+                uy = np.where(coincident, 0.0, dy / safe) * overlap * 0.5
+                mx += np.bincount(i, ux, n) - np.bincount(j, ux, n)
+                my += np.bincount(i, uy, n) - np.bincount(j, uy, n)
+                moved = True
+            if not moved:
+                break
+            px[order] += mx
+            py[order] += my
+            # la atracción hacia la posición original se apaga en las últimas rondas
+            pull = 0.05 * (1 - (it + 1) / iterations)
+            px += (px0 - px) * pull
+            py += (py0 - py) * pull
+        px = np.clip(px, 0, inner_w)
+        py = np.clip(py, 0, inner_h)
+
+    return px, py, pr, {"xMax": x_max, "yMax": y_max, "rMax": r_max}
+
+
 class D3Bubble(anywidget.AnyWidget):
     """
     Interactive D3-based bubble chart widget.
@@ -12,6 +91,13 @@ class D3Bubble(anywidget.AnyWidget):
     - `data`: a list of records (dict-like objects) that define the points.
     - `options`: a dictionary with all visual and interaction settings.
 
+    With ``layout="scale"`` or ``layout="collide"`` the bubble size scale
+    (and, for ``"collide"``, a collision-free placement) is computed once
+    in Python with NumPy. Each record then carries its final pixel
+    position and radius (``px``, ``py``, ``pr``) and the JavaScript view
+    only draws them. Changing ``width``, ``height`` or ``margin`` in
+    ``options`` recomputes the layout for the new size.
+
     The actual rendering logic lives in the JavaScript module
     `assets/bubble.js`, which is loaded into the `_esm` attribute so that
     AnyWidget can connect the Python model to the JavaScript view in
@@ -20,16 +106,17 @@ class D3Bubble(anywidget.AnyWidget):
     data = T.List(default_value=[]).tag(sync=True)
     options = T.Dict(default_value={}).tag(sync=True)
     
-    def __init__(self, data=None, title="Bubble Analysis", width=700, height=500, **kwargs):
+    def __init__(self, data=None, title="Bubble Analysis", width=700, height=500,
+                 layout=None, precision=None, dtype=None, **kwargs):
         """
         Initialise a new D3Bubble widget.
 
         Parameters
         ----------
-        data : list[dict] or None, optional
-            Optional initial dataset to display. Each record should contain
-            the fields that the JavaScript code expects for the x, y and
-            bubble size encodings.
+        data : pandas.DataFrame, list[dict] or None, optional
+            Optional initial dataset to display. Each record (or row)
+            should contain the fields that the JavaScript code expects:
+            ``id``, ``x``, ``y``, ``r`` (bubble size) and ``group``.
         title : str, default "Bubble Analysis"
             Title text to be passed to the frontend and shown above or near
             the chart.
@@ -37,6 +124,17 @@ class D3Bubble(anywidget.AnyWidget):
             Width of the drawing area in pixels.
         height : int, default 500
             Height of the drawing area in pixels.
+        layout : {None, "scale", "collide"}, default None
+            Where the bubble layout is computed. ``None`` leaves scaling to
+            ``bubble.js``; ``"scale"`` precomputes pixel positions and
+            radii in Python; ``"collide"`` additionally separates
+            overlapping bubbles.
+        precision : int, optional
+            Significant digits kept for the float values sent to the
+            browser (data fields and precomputed pixel positions).
+        dtype : {None, "float64", "float32"}, optional
+            ``"float32"`` rounds float values to float32 precision
+            (7 digits). See :mod:`Isea.encoding`.
         **kwargs :
             Additional configuration options that are stored in `self.options`
             and consumed by `bubble.js`. Common examples include:
@@ -56,6 +154,9 @@ class D3Bubble(anywidget.AnyWidget):
         during development instead of failing silently.
         """
         super().__init__()
+        self._layout = layout
+        self._digits = resolve_digits(precision, dtype)
+        self._frame = None
 
         js_path = Path(__file__).parent / "assets" / "bubble.js"
         if js_path.exists():
@@ -78,28 +179,72 @@ class D3Bubble(anywidget.AnyWidget):
             **kwargs
         }
         
-        if data:
+        if data is not None:
             self.set_data(data)
 
     def set_data(self, records):
         """
         Set and sanitise the data records for the bubble chart.
 
-        This helper makes a shallow copy of each input record and replaces
-        any NaN floating-point values with 0. This is necessary because
-        NaN values are not JSON-serialisable and would otherwise cause
-        warnings or failures when syncing the data to the frontend.
+        Records are cleaned column-wise: NaN values in float columns are
+        replaced with 0, and missing values in any other column (strings,
+        nullable integers, ...) become ``None``, because NaN is not
+        JSON-serialisable and would otherwise cause warnings or failures
+        when syncing the data to the frontend.
 
-        records : iterable[dict]
-            Collection of dict-like records to be visualised. Each record
-            should contain the numeric fields referenced in the chart
-            options (for example the x, y and size variables).
+        records : pandas.DataFrame or iterable[dict]
+            Table or collection of dict-like records to be visualised. Each
+            row should contain the numeric fields referenced in the chart
+            (``x``, ``y`` and ``r``) plus ``id`` and ``group``.
+
+        When the widget was created with ``layout="scale"`` or
+        ``layout="collide"``, ``px``/``py``/``pr`` columns with the final
+        pixel coordinates and radii are added, and the scale domains are
+        stored in ``self.options["layout"]``. Float columns are rounded to
+        the widget's ``precision`` / ``dtype`` last.
         """
-        clean = []
-        for r in records:
-            item = r.copy()
-            for k, v in item.items():
-                if isinstance(v, (float, np.floating)) and np.isnan(v):
-                    item[k] = 0
-            clean.append(item)
-        self.data = clean
\ No newline at end of file
+        if pd is None:
+            raise ImportError("Pandas es necesario para D3Bubble")
+        df = records if isinstance(records, pd.DataFrame) else pd.DataFrame.from_records(list(records))
+
+        cols = {}
+        for c in df.columns:
+            col = df[c]
+            if col.dtype.kind == "f":
+                col = col.fillna(0)
+            else:
+                # texto (object o str de pandas 3), enteros con nulos...: None en JSON
+                col = col.astype(object).where(col.notna(), None)
+            cols[c] = col
+        self._frame = pd.DataFrame(cols, index=df.index)
+        self._send_frame()
+
+    def _send_frame(self):
+        """Sync ``self._frame`` and, with ``layout``, its pixel layout for the current size."""
+        df = self._frame
+        options = {k: v for k, v in self.options.items() if k != "layout"}
+        if self._layout and len(df):
+            m = options.get("margin") or {}
+            inner_w = options.get("width", 700) - m.get("left", 0) - m.get("right", 0)
+            inner_h = options.get("height", 500) - m.get("top", 0) - m.get("bottom", 0)
+            num = lambda c: pd.to_numeric(df[c], errors="coerce").fillna(0).to_numpy(dtype=float) if c in df else np.zeros(len(df))
+            px, py, pr, domains = _bubble_layout(
+                num("x"), num("y"), num("r"), inner_w, inner_h,
+                collide=(self._layout == "collide"),
+            )
+            df = df.assign(px=px, py=py, pr=pr)
+            options["layout"] = domains
+
+        # filas y layout en un solo mensaje: la vista nunca mezcla unas con el otro
+        with self.hold_sync():
+            self.data = round_frame(df, self._digits).to_dict(orient="records")
+            self.options = options
+
+    @T.observe("options")
+    def _relayout(self, change):
+        # px/py/pr están en píxeles del tamaño con el que se calcularon
+        if not self._layout or self._frame is None:
+            return
+        old, new = change["old"] or {}, change["new"] or {}
+        if any(old.get(k) != new.get(k) for k in ("width", "height", "margin")):
+            self._send_frame()
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Off-main-thread computation for the widget views.
+
+The browser side of :class:`~Isea.scatter.ScatterBrush`,
+:class:`~Isea.parallel.ParallelEnergy`, :class:`~Isea.energy_quad.EnergyQuad`
+and :class:`~Isea.worldmaplinechart.WorldMapLineChart` sends its heavier
+array work to a Web Worker shared by every view on the page:
+
+- per-year extents and min-max normalisation of the parallel-coordinate
+  columns;
+- brush filtering over the brushed axes;
+- the map's per-year colour domain.
+
+The worker is created from ``assets/compute.js`` itself (a Blob URL), so
+nothing extra is served. Columns travel as transferable typed arrays.
+Small inputs are computed on the main thread, where posting them would
+cost more than the work. Pages that forbid ``blob:`` workers fall back to
+the main thread with the same results.
+"""
+from pathlib import Path
+
+_COMPUTE_JS = Path(__file__).parent / "assets" / "compute.js"
+
+
+def _compute_esm(js_text):
+    """Prepend the shared worker helpers (``assets/compute.js``) to a view module."""
+    return _COMPUTE_JS.read_text(encoding="utf-8") + js_text
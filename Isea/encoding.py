@@ -0,0 +1,155 @@
+"""
+Compact encodings for the numbers sent to the JavaScript views.
+
+Widgets serialise their values as JSON, and Python floats go out with up
+to 17 significant digits even when the data are shares or GWh totals that
+need three or four. Every widget accepts the same two options, resolved
+by :func:`resolve_digits`:
+
+- ``precision=<int>`` rounds values to that many significant digits.
+- ``dtype="float32"`` rounds to what a float32 holds (7 digits). Binary
+  payloads (e.g. :class:`~Isea.heatmap.D3Heatmap` matrices) are shipped as
+  float32 arrays anyway.
+
+Widgets with one value per year also accept ``delta=True``, which sends
+each series as scaled-integer deltas::
+
+    {"e": k, "d": [i0, i1 - i0, i2 - i1, ...]}
+
+The views decode it as ``cumsum(d) / 10**k``; missing values stay
+``null`` and do not break the running sum. Series that cannot be written
+as exact fixed-point numbers at the requested precision are sent as
+plain lists.
+"""
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+_FLOAT32_DIGITS = 7
+
+
+def resolve_digits(precision=None, dtype=None):
+    """
+    Number of significant digits to keep, or ``None`` for full precision.
+
+    Parameters
+    ----------
+    precision : int, optional
+        Significant digits (>= 1).
+    dtype : {None, "float64", "float32"}, optional
+        ``"float32"`` caps the precision at 7 digits.
+    """
+    if dtype not in (None, "float64", "float32"):
+        raise ValueError("dtype must be None, 'float64' or 'float32'")
+    digits = None if precision is None else int(precision)
+    if digits is not None and digits < 1:
+        raise ValueError("precision must be >= 1")
+    if dtype == "float32":
+        digits = min(digits or _FLOAT32_DIGITS, _FLOAT32_DIGITS)
+    return digits
+
+
+def round_sig(values, digits):
+    """
+    Round ``values`` to ``digits`` significant digits (NaN/inf kept).
+
+    Returns a float64 array. ``digits=None`` returns the values unchanged.
+    The division by an exact power of ten gives the shortest decimal
+    representation, so ``0.123456`` with 3 digits serialises as ``0.123``.
+    """
+    a = np.asarray(values, dtype=float)
+    if digits is None or a.size == 0:
+        return a
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        mag = np.floor(np.log10(np.abs(a)))
+        k = np.clip(np.where(np.isfinite(mag), digits - 1 - mag, 0), -300, 300)
+        p = 10.0 ** np.abs(k)
+        out = np.where(k >= 0, np.round(a * p) / p, np.round(a / p) * p)
+    return np.where(np.isfinite(a), out, a)
+
+
+def to_list(values, digits=None):
+    """Rounded values as a JSON-ready list (``None`` for NaN/inf)."""
+    a = round_sig(values, digits)
+    out = a.tolist()
+    bad = ~np.isfinite(a)
+    if bad.any():
+        for i in np.flatnonzero(bad):
+            out[i] = None
+    return out
+
+
+def _fixed_point(a, digits):
+    """Decimal exponent ``e`` such that ``a * 10**e`` are integers, or None."""
+    peak = float(np.abs(a).max()) if a.size else 0.0
+    if digits is not None:
+        # el valor no nulo más pequeño fija el último dígito significativo
+        nz = np.abs(a[a != 0])
+        mag = int(np.floor(np.log10(nz.min()))) if nz.size else 0
+        e = digits - 1 - mag
+        return e if e >= -15 and peak * 10.0 ** e < 2 ** 53 else None
+    # precisión completa: solo si los valores ya son decimales exactos
+    for e in range(0, 7):
+        scaled = a * 10.0 ** e
+        if np.all(np.abs(scaled - np.round(scaled)) <= 1e-9 * np.maximum(1.0, np.abs(scaled))):
+            return e if peak * 10.0 ** e < 2 ** 53 else None
+    return None
+
+
+def encode_series(values, digits=None, delta=False):
+    """
+    Encode one series (e.g. one value per year) for the frontend.
+
+    Values are rounded with :func:`round_sig`. With ``delta=True`` the
+    series is written as scaled-integer deltas (see the module docstring)
+    whenever the rounded values have an exact fixed-point form that fits
+    in 53 bits. When ``digits`` is set, the smallest non-zero value decides
+    the fixed point, so the encoding is lossless. Full-precision series
+    qualify only when they are short decimals, such as integer years.
+    Otherwise a plain list is returned.
+    """
+    a = round_sig(values, digits)
+    if not delta:
+        return to_list(a)
+    finite = np.isfinite(a)
+    e = _fixed_point(a[finite], digits) if finite.any() else None
+    if e is None:
+        return to_list(a)
+    scaled = a[finite] * 10.0 ** e if e >= 0 else a[finite] / 10.0 ** -e
+    ints = np.round(scaled).astype(np.int64)
+    out = [None] * len(a)
+    for i, d in zip(np.flatnonzero(finite), np.diff(ints, prepend=0).tolist()):
+        out[i] = d
+    return {"e": int(e), "d": out}
+
+
+def round_frame(df, digits):
+    """
+    Round the float columns of a DataFrame to ``digits`` significant digits.
+
+    Returns a new frame; the caller's frame is never modified.
+    """
+    if digits is None or not any(dt.kind == "f" for dt in df.dtypes):
+        return df
+    parts = [
+        pd.Series(round_sig(col.to_numpy(), digits), index=col.index, name=name)
+        if col.dtype.kind == "f" else col
+        for name, col in df.items()
+    ]
+    return pd.concat(parts, axis=1)
+
+
+def round_records(records, digits):
+    """Round the float values of a list of dicts (other values untouched)."""
+    if digits is None:
+        return records
+    out = []
+    for r in records:
+        out.append({
+            k: (round_sig(v, digits).item() if isinstance(v, (float, np.floating)) else v)
+            for k, v in r.items()
+        })
+    return out
@@ -5,8 +5,15 @@ import pandas as pd
 from pathlib import Path
 from typing import Sequence, Optional
 
+from .animation import Animated, _anim_esm
+from .background import BackgroundBuild, default_executor
+from .compute import _compute_esm
+from .encoding import resolve_digits
+from .linking import LinkedSelection, _linked_esm
+from .parallel import _prepare_parallel, _project
 
-class EnergyQuad(anywidget.AnyWidget):
+
+class EnergyQuad(Animated, BackgroundBuild, LinkedSelection, anywidget.AnyWidget):
     """
     Dashboard 2x2 enlazado (solo D3):
       - Parallel principal (izquierda arriba)
@@ -14,6 +21,17 @@ class EnergyQuad(anywidget.AnyWidget):
       - Insight líneas % por tecnología (derecha arriba)
       - Parallel mini (derecha abajo) con MISMAS interacciones
     Un único slider de año sincroniza todo.
+
+    precision= / dtype="float32" / delta=True controlan cómo viajan los
+    valores al navegador, igual que en ParallelEnergy (ver Isea.encoding).
+
+    La agregación es la misma que la de ParallelEnergy (_prepare_parallel);
+    con EnergyQuad.build_async(...) / update_async(...) corre en segundo
+    plano y la vista muestra "Loading..." mientras tanto.
+
+    link_group= enlaza la selección y los brushes con otras vistas en el
+    navegador (por país); con sync_selection=False la selección solo llega
+    a Python con pull_selection() (ver Isea.linking).
     """
 
     data = T.Dict(default_value={}).tag(sync=True)
@@ -41,47 +59,28 @@ class EnergyQuad(anywidget.AnyWidget):
         log_axes: bool = False,
         normalize: bool = False,
         reorder: bool = True,
+        # Transporte (ver Isea.encoding)
+        precision: Optional[int] = None,
+        dtype: Optional[str] = None,
+        delta: bool = False,
+        # Enlace entre vistas (ver Isea.linking)
+        link_group: Optional[str] = None,
+        sync_selection: bool = True,
     ):
         super().__init__()
-        self._esm = (Path(__file__).parent / "assets" / "energy_quad.js").read_text()
+        self._esm = _anim_esm(_compute_esm(_linked_esm((Path(__file__).parent / "assets" / "energy_quad.js").read_text())))
+        self.link_group = link_group or ""
+        self.sync_selection = bool(sync_selection)
 
         years = [c for c in years if c in df.columns]
         if not years:
             raise ValueError("years no coincide con columnas del dataframe.")
 
-        dfn = df.copy()
-        for y in years:
-            dfn[y] = pd.to_numeric(dfn[y], errors="coerce")
-
-        if tech_col not in dfn.columns or label_col not in dfn.columns:
+        if tech_col not in df.columns or label_col not in df.columns:
             raise KeyError("Faltan columnas requeridas.")
 
         dims = list(dims)
-        agg = (
-            dfn[dfn[tech_col].isin(dims)]
-            .groupby([label_col, tech_col])[years]
-            .sum(min_count=1)
-            .reset_index()
-        )
-
-        recs = []
-        for country, block in agg.groupby(label_col):
-            item = {"label": country}
-            for t in dims:
-                row = block[block[tech_col] == t]
-                if row.empty:
-                    item[t] = [0.0] * len(years)
-                else:
-                    r = row.iloc[0]
-                    item[t] = [float(r[y]) if pd.notna(r[y]) else 0.0 for y in years]
-            recs.append(item)
-
-        self.data = {
-            "years": list(years),
-            "dims": list(dims),
-            "records": recs,
-            "label": label_col,
-        }
+        digits = resolve_digits(precision, dtype)
 
         self.options = {
             "year_start": year_start if (year_start in years) else years[-1],
@@ -97,13 +96,46 @@ class EnergyQuad(anywidget.AnyWidget):
             "reorder": bool(reorder),
         }
 
-        # para helpers Python
-        self._df_raw = df.copy()
+        # para helpers Python (solo las columnas necesarias, sin copia completa)
+        self._df_raw = _project(df, [label_col, tech_col, *years])
         self._years = list(years)
         self._dims = tuple(dims)
         self._label_col = label_col
+        self._tech_col = tech_col
+        self._transport = {"precision": precision, "dtype": dtype, "delta": bool(delta)}
 
         self.selection = {}
+        self._run_build(
+            _prepare_parallel, df, self._years, tech_col, label_col, self._dims, digits, bool(delta),
+            apply=self._set_pack,
+        )
+
+    def _set_pack(self, pack):
+        self.data = pack
+
+    def update_async(self, df, years=None, *, executor=None):
+        """
+        Recalcula el dashboard con un nuevo DataFrame sin bloquear el kernel.
+
+        Igual que :meth:`Isea.parallel.ParallelEnergy.update_async`: la
+        agregación corre en ``executor`` (por defecto el pool compartido),
+        una llamada nueva reemplaza a la anterior y las opciones no cambian.
+        """
+        years = [c for c in (years or self._years) if c in df.columns]
+        if not years:
+            raise ValueError("years no coincide con columnas del dataframe.")
+
+        def apply(pack):
+            self._df_raw = _project(df, [self._label_col, self._tech_col, *years])
+            self._years = list(years)
+            self._set_pack(pack)
+
+        t = self._transport
+        return self._run_build(
+            _prepare_parallel, df, years, self._tech_col, self._label_col, self._dims,
+            resolve_digits(t["precision"], t["dtype"]), t["delta"],
+            apply=apply, executor=executor or default_executor(),
+        )
 
     # -------- Helpers Python --------
     def selection_df(self) -> pd.DataFrame:
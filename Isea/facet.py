@@ -0,0 +1,274 @@
+"""
+Small multiples: many panels of one view in a single widget.
+
+Comparing years, metrics or groups of rows with several
+:class:`~Isea.worldmaplinechart.WorldMapLineChart` or
+:class:`~Isea.trendline.D3TrendLine` widgets loads the JavaScript, the
+geometry and the data once per widget, and each view builds its own
+scales. :func:`facet` builds one :class:`FacetGrid` instead::
+
+    from Isea import facet
+    from Isea.worldmaplinechart import WorldMapLineChart
+    from Isea.trendline import D3TrendLine
+
+    facet(WorldMapLineChart, wide, by="years", metric="StockShare",
+          region_col="Country", label_col="Country")
+    facet(WorldMapLineChart, wide, by="mode", metric="StockShare", ...)
+    facet(D3TrendLine, wide, by=["StockShare", "SalesShare"], label_col="Country")
+
+The panels share:
+
+- one value buffer: a row × year float matrix sent as bytes, each panel
+  being a range of its rows (a group of ``by``, or a metric) and a year;
+- one colour scale (maps) or one pair of x/y scales (lines);
+- for maps, one copy of the world GeoJSON and one projection, with the
+  projected shapes cached once (``assets/geometry.js``) and every panel
+  painted on a single canvas.
+
+So 24 mini-maps cost roughly what one map costs. Clicking a country or a
+line selects it in every panel.
+"""
+import re
+
+import anywidget
+import numpy as np
+import pandas as pd
+import traitlets as T
+from pathlib import Path
+
+from .encoding import resolve_digits, round_sig
+from .geo import resolve_iso3, world_join
+from .trendline import D3TrendLine
+from .worldmaplinechart import WorldMapLineChart, _geometry_esm, _world_geojson
+
+_KINDS = {WorldMapLineChart: "map", D3TrendLine: "line"}
+
+
+def _year_columns(columns, metric, year_prefix):
+    """``{year: column}`` for the columns of one metric."""
+    pat = re.compile(rf"^{metric}{year_prefix}(\d{{4}})$")
+    out = {}
+    for c in columns:
+        m = pat.match(str(c))
+        if m:
+            out[int(m.group(1))] = c
+    if not out:
+        raise ValueError(f"No columns found for metric: {metric}")
+    return out
+
+
+def _facet_pack(df, kind, by, metric=None, year_prefix="__F", iso3_col=None,
+                label_col="label", region_col="region", digits=None, float32=False):
+    """
+    ``data`` package for :class:`FacetGrid`.
+
+    Rows are reordered so every panel is a contiguous range of the value
+    matrix: grouped by ``by`` when it is a column, or stacked once per
+    metric when ``by`` lists metrics. Module-level so it can run in a
+    background executor like the other ``_*_pack`` builders.
+    """
+    years = None
+    if isinstance(by, str) and by in df.columns:
+        split = "column"
+    elif isinstance(by, str) and by in ("year", "years"):
+        split = "years"
+    elif isinstance(by, (list, tuple, range)) and len(by) and all(isinstance(b, str) for b in by):
+        split = "metrics"
+    elif isinstance(by, (list, tuple, range)) and len(by) and all(
+            isinstance(b, (int, np.integer)) for b in by):
+        split, years = "years", [int(b) for b in by]
+    else:
+        raise ValueError("by must be a column name, 'years', a list of years or a list of metrics")
+    if kind == "line" and split == "years":
+        raise ValueError("line panels show every year; facet D3TrendLine by a column or metrics")
+
+    if split == "metrics":
+        metrics = [str(m) for m in by]
+    elif metric is None:
+        raise ValueError("metric is required unless by is a list of metrics")
+    else:
+        metrics = [metric]
+
+    columns = {m: _year_columns(df.columns, m, year_prefix) for m in metrics}
+    all_years = sorted(set().union(*columns.values()))
+    if years is not None:
+        missing = sorted(set(years) - set(all_years))
+        if missing:
+            raise ValueError(f"No columns for years {missing} of metric: {metric}")
+
+    groups = None
+    if split == "column":
+        labels = df[by].astype(str)
+        groups = list(pd.unique(labels))
+        order = np.argsort(pd.Categorical(labels, categories=groups).codes, kind="stable")
+        df = df.iloc[order]
+        counts = labels.value_counts().reindex(groups).to_numpy()
+
+    names = df[label_col].astype(str).tolist()
+    if kind == "map":
+        iso3 = resolve_iso3(df[region_col]) if iso3_col is None else df[iso3_col]
+        keys = iso3.astype(str).tolist()
+    else:
+        keys = names
+
+    n = len(df)
+    blocks = []
+    for m in metrics:
+        block = np.full((n, len(all_years)), np.nan)
+        for j, y in enumerate(all_years):
+            c = columns[m].get(y)
+            if c is not None:
+                block[:, j] = pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float)
+        blocks.append(block)
+    mat = round_sig(np.vstack(blocks), digits)
+
+    if split == "years":
+        shown = [all_years.index(y) for y in (years or all_years)]
+        panels = [{"title": str(all_years[j]), "rows": [0, n], "year": j} for j in shown]
+        cells = mat[:, shown]
+    elif split == "metrics":
+        panels = [{"title": m, "rows": [i * n, (i + 1) * n], "year": None}
+                  for i, m in enumerate(metrics)]
+        cells = mat
+    else:
+        edges = np.concatenate([[0], np.cumsum(counts)]).astype(int).tolist()
+        panels = [{"title": g, "rows": [edges[i], edges[i + 1]], "year": None}
+                  for i, g in enumerate(groups)]
+        cells = mat
+
+    if kind == "map":
+        # map feature -> matrix row of each panel; the view never searches by ISO3
+        all_keys = keys * len(metrics)
+        for p in panels:
+            lo, hi = p["rows"]
+            rows, _ = world_join(all_keys[lo:hi])
+            p["feature_rows"] = np.where(rows >= 0, rows + lo, -1).tolist()
+
+    finite = cells[np.isfinite(cells)]
+    domain = [float(finite.min()), float(finite.max())] if finite.size else None
+
+    return {
+        "kind": kind,
+        "metric": metric if split != "metrics" else None,
+        "years_num": all_years,
+        "keys": keys * len(metrics),
+        "names": names * len(metrics),
+        "values": {
+            "dtype": "f4" if float32 else "f8",
+            "data": mat.astype(np.float32 if float32 else np.float64).tobytes(),
+        },
+        "panels": panels,
+        "domain": domain,
+    }
+
+
+class FacetGrid(anywidget.AnyWidget):
+    """
+    Grid of small-multiple panels sharing data, scales and geometry.
+
+    Built by :func:`facet`. ``data`` holds the shared value matrix and the
+    panel list (see :func:`_facet_pack`); ``options`` the layout.
+
+    Synced traitlets
+    ----------------
+    data : dict
+        ``kind`` (``"map"`` or ``"line"``), ``years_num``, per-row
+        ``keys`` / ``names``, the ``values`` matrix (bytes), ``panels``
+        (``title``, ``rows`` range, fixed ``year`` index or ``None``; for
+        maps also ``feature_rows``, the matrix row of each map feature) and
+        the shared value ``domain``.
+    options : dict
+        ``title``, ``cols``, ``panel_width``, ``panel_height`` and
+        ``idx_now``: the year shown by panels without a fixed year (maps
+        only; a slider changes it).
+    selection : dict
+        ``{"iso3s": [...]}`` for maps, ``{"keys": [...]}`` for lines
+        (names of the selected rows), as for the full views, so
+        :func:`Isea.link` can use the grid as a source. ``{}`` when empty.
+    """
+
+    data = T.Dict(default_value={}).tag(sync=True)
+    options = T.Dict(default_value={}).tag(sync=True)
+    selection = T.Dict(default_value={}).tag(sync=True)
+
+    def __init__(self, pack, title="", cols=None, panel_width=None, panel_height=None, **kwargs):
+        super().__init__(**kwargs)
+        is_map = pack["kind"] == "map"
+        js_text = (Path(__file__).parent / "assets" / "facet.js").read_text(encoding="utf-8")
+        self._esm = _geometry_esm(js_text) if is_map else js_text
+
+        self.options = {
+            "title": title,
+            "cols": cols,
+            "panel_width": panel_width or (260 if is_map else 240),
+            "panel_height": panel_height or (150 if is_map else 170),
+            "idx_now": len(pack["years_num"]) - 1,
+        }
+        self.data = {**pack, "world": _world_geojson()} if is_map else pack
+
+    @property
+    def panels(self):
+        """Panel titles, in display order."""
+        return [p["title"] for p in self.data.get("panels", [])]
+
+    def set_year(self, year):
+        """Show ``year`` in the panels that follow the year slider."""
+        years = self.data["years_num"]
+        if year not in years:
+            raise ValueError(f"year {year} not in {years}")
+        self.options = {**self.options, "idx_now": years.index(year)}
+
+
+def facet(widget, df, by, *, metric=None, year_prefix="__F", region_col="region",
+          label_col="label", iso3_col=None, title="", cols=None, panel_width=None,
+          panel_height=None, precision=None, dtype=None, **kwargs):
+    """
+    Small multiples of a view in one widget.
+
+    Parameters
+    ----------
+    widget : {WorldMapLineChart, D3TrendLine}
+        View class drawn in every panel: a choropleth map, or one line per
+        row over the years.
+    df : pandas.DataFrame
+        Wide-by-year frame, with ``f"{metric}{year_prefix}{YYYY}"``
+        columns as for :class:`~Isea.worldmaplinechart.WorldMapLineChart`.
+    by : str or list
+        How the frame is split into panels:
+
+        - a column name (e.g. ``"mode"``): one panel per value, showing
+          the rows of that group;
+        - ``"years"`` or a list of years (maps only): one panel per year
+          of ``metric``;
+        - a list of metrics: one panel per metric, all rows.
+    metric : str, optional
+        Metric shown in every panel. Required unless ``by`` lists metrics.
+    year_prefix, region_col, label_col, iso3_col :
+        As for :class:`~Isea.worldmaplinechart.WorldMapLineChart`. Line
+        panels name (and select) rows by ``label_col``.
+    title : str, optional
+        Title above the grid.
+    cols : int, optional
+        Panels per row. Defaults to a roughly square grid.
+    panel_width, panel_height : int, optional
+        Size of each panel in pixels.
+    precision : int, optional
+        Significant digits kept for the values.
+    dtype : {None, "float64", "float32"}, optional
+        ``"float32"`` sends the value matrix as float32.
+    **kwargs :
+        Forwarded to :class:`FacetGrid`.
+
+    Returns
+    -------
+    FacetGrid
+    """
+    kind = _KINDS.get(widget)
+    if kind is None:
+        raise TypeError("facet() supports WorldMapLineChart and D3TrendLine")
+    if not isinstance(df, pd.DataFrame):
+        raise ValueError("Data must be a pandas DataFrame")
+    pack = _facet_pack(df, kind, by, metric, year_prefix, iso3_col, label_col, region_col,
+                       resolve_digits(precision, dtype), dtype == "float32")
+    return FacetGrid(pack, title=title, cols=cols, panel_width=panel_width,
+                     panel_height=panel_height, **kwargs)
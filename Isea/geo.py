@@ -0,0 +1,370 @@
+"""
+Country names to ISO3 codes, and the map join.
+
+Data sources spell countries in many ways: ``"Korea"``, ``"Korea, Rep."``,
+``"Republic of Korea"``, ``"Afghanistan, Islamic Rep. of"``... A name
+that is not in :data:`~Isea.worldmaplinechart.ISO3_MAP` becomes
+``"UNK"`` and its country stays grey on the map. :func:`resolve_iso3`
+looks names up in a much larger table:
+
+- the names of ``world.geojson``;
+- ``ISO3_MAP``;
+- :data:`ALIASES`, with UN, World Bank, IMF, IEA and IRENA spellings.
+
+Names are compared without case, accents or punctuation, with the
+IMF/IRENA abbreviations expanded (``"Rep."``, ``"Dem."``, ``"P.R."``).
+Names that still do not match are tried without a parenthesis
+(``"Bolivia (Plurinational State of)"``), with the comma parts swapped
+(``"Congo, Dem. Rep."`` → ``"Dem. Rep. Congo"``) and, when the part
+after the comma is only a form of state (``"Iran, Islamic Rep. of"``),
+before the comma. Only the unique values of a column are resolved.
+Results are kept in a cache file (``~/.cache/isea/iso3.json``, or under
+``$XDG_CACHE_HOME``), so a large frame costs one lookup per distinct
+name.
+
+:func:`world_join` precomputes which record each map feature shows, so
+the map view does not search by code while drawing.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Spellings seen in UN, World Bank, IMF, IEA, IRENA and OECD tables. The
+# world.geojson names and Isea.worldmaplinechart.ISO3_MAP are added to these.
+ALIASES = {
+    # -- Americas
+    "United States": "USA", "United States of America": "USA", "US": "USA", "U.S.": "USA",
+    "U.S.A.": "USA", "America": "USA",
+    "Bahamas": "BHS", "Bahamas, The": "BHS", "The Bahamas": "BHS",
+    "Bolivia (Plurinational State of)": "BOL", "Plurinational State of Bolivia": "BOL",
+    "Venezuela (Bolivarian Republic of)": "VEN", "Venezuela, RB": "VEN",
+    "Bolivarian Republic of Venezuela": "VEN",
+    "Brasil": "BRA", "Mexique": "MEX", "Perú": "PER",
+    "Dominican Rep.": "DOM", "Trinidad & Tobago": "TTO", "Trinidad": "TTO",
+    "Antigua and Barbuda": "ATG", "Barbados": "BRB", "Dominica": "DMA", "Grenada": "GRD",
+    "Saint Kitts and Nevis": "KNA", "St. Kitts and Nevis": "KNA",
+    "Saint Lucia": "LCA", "St. Lucia": "LCA",
+    "Saint Vincent and the Grenadines": "VCT", "St. Vincent and the Grenadines": "VCT",
+    "Aruba": "ABW", "Curacao": "CUW", "Curaçao": "CUW", "Cayman Islands": "CYM",
+    "Bermuda": "BMU", "Guadeloupe": "GLP", "Martinique": "MTQ", "French Guiana": "GUF",
+    "Falkland Islands (Malvinas)": "FLK", "Malvinas": "FLK",
+    "Anguilla": "AIA", "Montserrat": "MSR", "Puerto Rico": "PRI", "Greenland": "GRL",
+    "British Virgin Islands": "VGB", "Virgin Islands (British)": "VGB", "Virgin Islands, British": "VGB",
+    "United States Virgin Islands": "VIR", "Virgin Islands (U.S.)": "VIR", "Virgin Islands, U.S.": "VIR",
+    "US Virgin Islands": "VIR",
+    "Turks and Caicos Islands": "TCA", "Turks and Caicos": "TCA",
+    "Saint Pierre and Miquelon": "SPM", "St. Pierre and Miquelon": "SPM",
+    "Sint Maarten": "SXM", "Sint Maarten (Dutch part)": "SXM",
+    "Sint Maarten, Kingdom of the Netherlands": "SXM",
+    "Saint Martin (French part)": "MAF", "St. Martin (French part)": "MAF",
+    "Bonaire, St. Eustatius and Saba": "BES", "Bonaire, Sint Eustatius and Saba": "BES",
+    "Caribbean Netherlands": "BES",
+    "Saint Barthélemy": "BLM", "Saint Helena": "SHN",
+    # -- Europe
+    "UK": "GBR", "U.K.": "GBR", "Great Britain": "GBR", "Britain": "GBR",
+    "United Kingdom of Great Britain and Northern Ireland": "GBR", "England": "GBR",
+    "Czechia": "CZE", "Czech Rep.": "CZE",
+    "Slovak Republic": "SVK",
+    "Russian Federation": "RUS",
+    "Turkey": "TUR", "Türkiye": "TUR", "Turkiye": "TUR", "Republic of Türkiye": "TUR",
+    "Moldova, Republic of": "MDA", "Republic of Moldova": "MDA", "Moldova, Rep.": "MDA",
+    "North Macedonia": "MKD", "Macedonia, FYR": "MKD", "The former Yugoslav Republic of Macedonia": "MKD",
+    "Republic of North Macedonia": "MKD", "FYROM": "MKD",
+    "Serbia": "SRB", "Republic of Serbia": "SRB",
+    "Kosovo": "XKX", "Republic of Kosovo": "XKX",
+    "Bosnia-Herzegovina": "BIH", "Bosnia & Herzegovina": "BIH", "Bosnia": "BIH",
+    "Holland": "NLD", "The Netherlands": "NLD", "Netherlands (Kingdom of the)": "NLD",
+    "Deutschland": "DEU", "España": "ESP", "Italia": "ITA", "Sverige": "SWE", "Norge": "NOR",
+    "Suisse": "CHE", "Schweiz": "CHE", "Österreich": "AUT",
+    "Malta": "MLT", "Andorra": "AND", "Monaco": "MCO", "San Marino": "SMR",
+    "Liechtenstein": "LIE", "Faroe Islands": "FRO", "Gibraltar": "GIB",
+    "Isle of Man": "IMN", "Jersey": "JEY", "Guernsey": "GGY", "Åland Islands": "ALA",
+    "Holy See": "VAT", "Vatican": "VAT", "Vatican City": "VAT",
+    # -- Middle East, North Africa
+    "Iran (Islamic Republic of)": "IRN", "Iran, Islamic Rep.": "IRN", "Islamic Republic of Iran": "IRN",
+    "Iran, Islamic Republic of": "IRN", "Persia": "IRN",
+    "Syrian Arab Republic": "SYR", "Syria, Arab Rep.": "SYR",
+    "Egypt, Arab Rep.": "EGY", "Arab Republic of Egypt": "EGY",
+    "Yemen, Rep.": "YEM", "Republic of Yemen": "YEM",
+    "UAE": "ARE", "U.A.E.": "ARE", "Emirates": "ARE",
+    "Saudi-Arabia": "SAU", "KSA": "SAU",
+    "Palestine": "PSE", "State of Palestine": "PSE", "West Bank and Gaza": "PSE",
+    "Palestinian Territories": "PSE", "Occupied Palestinian Territory": "PSE",
+    "Bahrain": "BHR", "Libyan Arab Jamahiriya": "LBY",
+    # -- Sub-Saharan Africa
+    "Côte d'Ivoire": "CIV", "Cote d'Ivoire": "CIV", "Cote dIvoire": "CIV", "Ivory Coast": "CIV",
+    "Congo, Dem. Rep.": "COD", "Democratic Republic of Congo": "COD", "DR Congo": "COD",
+    "DRC": "COD", "Congo (Kinshasa)": "COD", "Congo, Democratic Republic of the": "COD",
+    "Congo-Kinshasa": "COD", "Zaire": "COD",
+    "Congo": "COG", "Congo, Rep.": "COG", "Republic of Congo": "COG", "Congo (Brazzaville)": "COG",
+    "Congo-Brazzaville": "COG",
+    "Tanzania": "TZA", "Tanzania, United Republic of": "TZA",
+    "Gambia, The": "GMB", "The Gambia": "GMB",
+    "Guinea-Bissau": "GNB", "Guinea Bissau": "GNB",
+    "Swaziland": "SWZ", "Eswatini": "SWZ", "Kingdom of Eswatini": "SWZ",
+    "Cabo Verde": "CPV", "Cape Verde": "CPV",
+    "Sao Tome and Principe": "STP", "São Tomé and Príncipe": "STP",
+    "South Sudan": "SSD", "Republic of South Sudan": "SSD",
+    "Comoros": "COM", "Mauritius": "MUS", "Seychelles": "SYC", "Mayotte": "MYT", "Réunion": "REU",
+    "Reunion": "REU",
+    "Somaliland": "ABV",
+    # -- Asia, Pacific
+    "Korea": "KOR", "South Korea": "KOR", "Korea, Rep.": "KOR", "Republic of Korea": "KOR",
+    "Korea, Republic of": "KOR", "Korea (Republic of)": "KOR", "Korea, South": "KOR",
+    "North Korea": "PRK", "Korea, Dem. People's Rep.": "PRK", "Korea, DPR": "PRK",
+    "Democratic People's Republic of Korea": "PRK", "Korea, North": "PRK",
+    "Korea (Democratic People's Republic of)": "PRK",
+    "China, People's Republic of": "CHN", "People's Republic of China": "CHN", "PRC": "CHN",
+    "Mainland China": "CHN",
+    "Hong Kong": "HKG", "Hong Kong SAR, China": "HKG", "Hong Kong, China": "HKG",
+    "China, Hong Kong SAR": "HKG", "Hong Kong SAR": "HKG",
+    "Macao": "MAC", "Macau": "MAC", "Macao SAR, China": "MAC", "China, Macao SAR": "MAC",
+    "Taiwan": "TWN", "Chinese Taipei": "TWN", "Taiwan, China": "TWN",
+    "Taiwan Province of China": "TWN", "Republic of China": "TWN",
+    "Viet Nam": "VNM", "Vietnam": "VNM",
+    "Lao PDR": "LAO", "Lao People's Democratic Republic": "LAO", "Laos": "LAO",
+    "Brunei Darussalam": "BRN", "Brunei": "BRN",
+    "Myanmar (Burma)": "MMR", "Burma": "MMR",
+    "Timor-Leste": "TLS", "East Timor": "TLS",
+    "Kyrgyz Republic": "KGZ", "Kirghizia": "KGZ",
+    "Micronesia, Fed. Sts.": "FSM", "Micronesia (Federated States of)": "FSM", "Micronesia": "FSM",
+    "Maldives": "MDV", "Singapore": "SGP", "Bahrein": "BHR",
+    "Samoa": "WSM", "Tonga": "TON", "Kiribati": "KIR", "Tuvalu": "TUV", "Nauru": "NRU",
+    "Palau": "PLW", "Marshall Islands": "MHL", "French Polynesia": "PYF", "Guam": "GUM",
+    "Cook Islands": "COK", "Niue": "NIU", "Tokelau": "TKL", "American Samoa": "ASM",
+    "Northern Mariana Islands": "MNP", "New Caledonia": "NCL", "Wallis and Futuna": "WLF",
+    "Wallis and Futuna Islands": "WLF", "Norfolk Island": "NFK", "Pitcairn": "PCN",
+    "China, P.R.: Mainland": "CHN", "China, P.R.: Hong Kong": "HKG", "China, P.R.: Macao": "MAC",
+    "Korea, Dem. People's Rep. of": "PRK", "Korea, Rep. of": "KOR",
+    "Lao People's Dem. Rep.": "LAO", "Timor-Leste, Dem. Rep. of": "TLS",
+    "Ethiopia, The Federal Dem. Rep. of": "ETH",
+    "São Tomé and Príncipe, Dem. Rep. of": "STP",
+    "Congo, Dem. Rep. of the": "COD", "Congo, Rep. of": "COG",
+    "India": "IND", "Bharat": "IND",
+    # -- Other
+    "Northern Cyprus": "-99", "Turkish Republic of Northern Cyprus": "-99",
+    "World": "WLD", "Rest of the world": "ROW", "Rest of World": "ROW", "Others": "ROW",
+    "European Union": "EU27", "EU27": "EU27", "EU": "EU27",
+}
+
+# world.geojson ids that differ from ISO 3166 alpha-3
+_FEATURE_ISO = {"SDS": "SSD", "OSA": "XKX"}
+
+_WORLD = Path(__file__).parent / "assets" / "world.geojson"
+
+# versión de las reglas de _norm/_lookup: forma parte de la huella de la caché
+_RULES = 2
+
+# abreviaturas de IMF/IRENA ("Kyrgyz Rep.", "Lao People's Dem. Rep.")
+_ABBREV = {"rep": "republic", "dem": "democratic", "fed": "federal", "st": "saint",
+           "sts": "states"}
+
+# colas de coma que solo dan la forma de estado ("Armenia, Rep. of", "Bahamas, The").
+# "democratic" y "people s" no: distinguen países ("Korea, Dem. People's Rep. of").
+_HONORIFIC = re.compile(
+    r"(?:(?:the|of|de|and|islamic|federal|federated|united|arab|plurinational|bolivarian|"
+    r"bolivariana|socialist|union|principality|kingdom|state|states|republic|sultanate|"
+    r"commonwealth|netherlands)(?: |$))+"
+)
+
+
+def _norm(name):
+    """Comparison key: no accents, case, punctuation or leading "the"."""
+    s = unicodedata.normalize("NFKD", str(name))
+    s = "".join(c for c in s if not unicodedata.combining(c)).casefold()
+    s = s.replace("&", " and ")
+    s = re.sub(r"\bp\.\s*r\.", "peoples republic", s)
+    s = re.sub(r"[^\w,()]+", " ", s)
+    s = " ".join(_ABBREV.get(w, w) for w in s.split())
+    s = s.replace(" ,", ",").strip(" ,")
+    return re.sub(r"^the ", "", s)
+
+
+@lru_cache(maxsize=1)
+def _world_features():
+    """``(iso3, name)`` of the world.geojson features, in file order."""
+    world = json.loads(_WORLD.read_text(encoding="utf-8"))
+    return tuple((str(f.get("id")), f.get("properties", {}).get("name") or "") for f in world["features"])
+
+
+@lru_cache(maxsize=1)
+def _table():
+    """Normalised name -> ISO3 table, and its fingerprint for the cache file."""
+    from .worldmaplinechart import ISO3_MAP
+
+    table = {}
+    for fid, name in _world_features():
+        table[_norm(name)] = _FEATURE_ISO.get(fid, fid)
+    for source in (ISO3_MAP, ALIASES):
+        for name, code in source.items():
+            table[_norm(name)] = code
+    codes = {c for c in table.values() if re.fullmatch(r"[A-Z]{3}", c)}
+    for c in codes:
+        table.setdefault(_norm(c), c)
+    fingerprint = hashlib.sha1(json.dumps([_RULES, sorted(table.items())]).encode()).hexdigest()[:12]
+    return table, fingerprint
+
+
+def _lookup(name, table):
+    """ISO3 for one name, or ``None``."""
+    key = _norm(name)
+    if key in table:
+        return table[key]
+    # "Bolivia (Plurinational State of)" -> "bolivia"
+    bare = re.sub(r"\s*\([^)]*\)", "", key).strip(" ,")
+    if bare in table:
+        return table[bare]
+    if "," in bare:
+        head, _, tail = bare.partition(",")
+        head, tail = head.strip(), tail.strip()
+        # "congo, democratic republic" -> "democratic republic congo"
+        if f"{tail} {head}" in table:
+            return table[f"{tail} {head}"]
+        # "afghanistan, islamic republic of" -> "afghanistan", only when the tail
+        # names no other country ("congo, democratic republic of the" is not "congo")
+        if head in table and _HONORIFIC.fullmatch(tail):
+            return table[head]
+    return None
+
+
+# --------------------------------------------------------------- cache
+_CACHE = None   # nombre original -> iso3 (None: sin resolver), cargado una vez por proceso
+
+
+def _cache_path():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "isea" / "iso3.json"
+
+
+def _load_cache(fingerprint):
+    global _CACHE
+    if _CACHE is None:
+        try:
+            saved = json.loads(_cache_path().read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            saved = {}
+        # otra tabla de alias (otra versión de Isea): lo guardado ya no vale
+        _CACHE = saved.get("names", {}) if saved.get("table") == fingerprint else {}
+    return _CACHE
+
+
+def _save_cache(fingerprint):
+    path = _cache_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".iso3-", suffix=".json")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"table": fingerprint, "names": _CACHE}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # directorio de solo lectura: la caché en memoria sigue sirviendo
+
+
+def clear_cache():
+    """Forget the names resolved so far, in memory and on disk."""
+    global _CACHE
+    _CACHE = {}
+    try:
+        _cache_path().unlink()
+    except OSError:
+        pass
+
+
+# --------------------------------------------------------------- API
+def resolve_iso3(values, aliases=None, default="UNK", cache=True):
+    """
+    Map country names to ISO3 codes.
+
+    Parameters
+    ----------
+    values : pandas.Series or array-like
+        Country names (or ISO3 codes, which map to themselves).
+    aliases : mapping, optional
+        Extra ``name -> ISO3`` entries. They take precedence over the
+        built-in table and are not written to the cache.
+    default : str, default "UNK"
+        Code for names that cannot be resolved and for missing values.
+    cache : bool, default True
+        Read and update the cache file of resolved names.
+
+    Returns
+    -------
+    pandas.Series or numpy.ndarray
+        A Series with the same index when ``values`` is a Series,
+        otherwise an object array.
+
+    Notes
+    -----
+    The column is factorised first, so each distinct name is resolved
+    once and the codes are taken back per row.
+    """
+    s = values if isinstance(values, pd.Series) else pd.Series(np.asarray(values, dtype=object))
+    codes, uniques = pd.factorize(s)
+
+    table, fingerprint = _table()
+    extra = {_norm(k): v for k, v in (aliases or {}).items()}
+    known = _load_cache(fingerprint) if cache else {}
+    added = False
+
+    resolved = []
+    for name in uniques:
+        name = str(name)
+        key = _norm(name)
+        if key in extra:
+            resolved.append(extra[key])
+            continue
+        if name in known:
+            code = known[name]
+        else:
+            code = _lookup(name, table)
+            if cache:
+                known[name] = code
+                added = True
+        resolved.append(default if code is None else code)
+    if added:
+        _save_cache(fingerprint)
+
+    # código -1 (valor ausente) toma el último elemento: `default`
+    out = np.array(resolved + [default], dtype=object).take(codes)
+    if isinstance(values, pd.Series):
+        return pd.Series(out, index=values.index, name=values.name)
+    return out
+
+
+def feature_iso3():
+    """ISO3 code of each ``world.geojson`` feature, in file order."""
+    return [_FEATURE_ISO.get(fid, fid) for fid, _ in _world_features()]
+
+
+def world_join(iso3):
+    """
+    Join records to the features of ``world.geojson``.
+
+    Parameters
+    ----------
+    iso3 : sequence of str
+        ISO3 code of each record, in record order.
+
+    Returns
+    -------
+    feature_rows : numpy.ndarray
+        For each map feature, the index of the first record with its
+        code, or ``-1``.
+    record_features : numpy.ndarray
+        For each record, the index of its map feature, or ``-1``.
+    """
+    feats = pd.Index(feature_iso3())
+    rec = pd.Index([str(c) for c in iso3])
+    first = pd.Series(np.arange(len(rec)), index=rec)
+    first = first[~rec.duplicated()]
+    feature_rows = first.reindex(feats).fillna(-1).to_numpy(dtype=np.int32)
+    record_features = feats.get_indexer(rec).astype(np.int32)
+    return feature_rows, record_features
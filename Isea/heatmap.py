@@ -1,32 +1,85 @@
+import warnings
+
 import anywidget
+import numpy as np
 import traitlets as T
 from pathlib import Path
 
+from .encoding import resolve_digits, round_sig
+
 try:
     import pandas as pd
 except ImportError:
     pd = None
 
+# Por encima de este número de celdas el modo automático usa teselas
+_TILED_MIN_CELLS = 4_000_000
+
+
+def _block_pyramid(mat, tile_size, reduce="mean"):
+    """
+    Build a multi-resolution pyramid by 2×2 block reduction.
+
+    Level 0 is ``mat`` itself; each following level halves both axes
+    (odd edges are padded with NaN) until the whole level fits into a
+    single ``tile_size × tile_size`` tile.
+
+    Parameters
+    ----------
+    mat : numpy.ndarray
+        2D ``float32`` matrix.
+    tile_size : int
+        Tile edge length in cells.
+    reduce : {"mean", "max"}, default "mean"
+        NaN-aware reduction applied to each 2×2 block.
+
+    Returns
+    -------
+    list[numpy.ndarray]
+        Contiguous ``float32`` arrays, finest level first.
+    """
+    if reduce not in ("mean", "max"):
+        raise ValueError("reduce must be 'mean' or 'max'")
+    fn = np.nanmean if reduce == "mean" else np.nanmax
+    levels = [mat]
+    while max(levels[-1].shape) > tile_size:
+        a = levels[-1]
+        h, w = a.shape
+        if h % 2 or w % 2:
+            b = np.full((h + h % 2, w + w % 2), np.nan, dtype=np.float32)
+            b[:h, :w] = a
+            a = b
+        blocks = a.reshape(a.shape[0] // 2, 2, a.shape[1] // 2, 2)
+        # bloques todo-NaN dan NaN (y un RuntimeWarning que no aporta nada)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            levels.append(np.ascontiguousarray(fn(blocks, axis=(1, 3)), dtype=np.float32))
+    return levels
+
 class D3Heatmap(anywidget.AnyWidget):
     """
     Interactive D3-based heatmap widget driven by a pandas DataFrame.
 
-    The Python side prepares a tidy table of cells with three fields:
+    The Python side packs the DataFrame into a dense matrix:
 
-    - ``row_id``: category on the y-axis (typically the DataFrame index).
-    - ``col_id``: category on the x-axis (the DataFrame column names).
-    - ``value``: numeric value for each (row_id, col_id) combination.
+    - ``values``: cell values as a row-major ``float32`` buffer with
+      ``len(yDomain) * len(xDomain)`` entries (NaN marks a missing cell).
+    - ``xDomain``: column labels (the DataFrame column names).
+    - ``yDomain``: row labels (typically the DataFrame index).
 
-    These records are stored in ``self.data`` and consumed by the
-    JavaScript code in ``assets/heatmap.js``, which renders the actual
-    heatmap using D3.
+    The buffer is sent as binary, so no per-cell records are built or
+    serialised. The JavaScript code in ``assets/heatmap.js`` paints the
+    matrix into a canvas via ``ImageData`` and finds the hovered cell
+    arithmetically from the mouse position. Small matrices (up to
+    ``svgMaxCells`` cells) are still drawn as SVG ``rect`` elements with
+    value labels.
 
     Synced traitlets
     ----------------
-    data : list[dict]
-        One dict per cell with keys ``row_id``, ``col_id`` and ``value``.
-        Missing values (NaN) are converted to ``None`` so they can be
-        serialised to JSON and are shown as “empty” cells in the frontend.
+    values : bytes
+        Row-major ``float32`` matrix of shape
+        ``(len(yDomain), len(xDomain))``. Missing values are stored as
+        NaN and are shown as “empty” cells in the frontend.
     options : dict
         Visual configuration passed to the JS view, including:
 
@@ -36,14 +89,32 @@ class D3Heatmap(anywidget.AnyWidget):
         - ``cmap``: colour map name (``"viridis"`` or ``"coolwarm"``).
         - ``xDomain``: ordered list of column labels.
         - ``yDomain``: ordered list of row labels.
-
-        The JavaScript fallback logic uses ``xDomain`` / ``yDomain`` if
-        present; otherwise it derives them from the data.
+        - ``svgMaxCells``: largest matrix (rows × columns) drawn as SVG;
+          bigger matrices use the canvas renderer (default 2500).
+        - ``tiled``: present only in tiled mode, see below.
+
+    Tiled mode
+    ----------
+    For very large matrices (e.g. 10k × 10k similarity matrices) the
+    widget keeps the data in Python. :meth:`set_data` builds a
+    mean (or max) pyramid with NumPy 2×2 block reductions, and the
+    browser requests ``tile_size × tile_size`` tiles of the level that
+    matches the current zoom over the widget comm as the user zooms or
+    pans. ``values`` stays empty and only tiles of the visible level are
+    kept in the browser.
+
+    Cell records
+    ------------
+    ``data`` used to be a synced list of ``{row_id, col_id, value}``
+    records. It is now a read-only property built on demand from the
+    matrix (see :attr:`data`); nothing but ``values`` is sent.
     """
-    data = T.List(default_value=[]).tag(sync=True)
+    values = T.Bytes(default_value=b"").tag(sync=True)
     options = T.Dict(default_value={}).tag(sync=True)
 
-    def __init__(self, df, title="Heatmap", cmap="viridis", width=600, height=400, **kwargs):
+    def __init__(self, df, title="Heatmap", cmap="viridis", width=600, height=400,
+                 tiled=None, tile_size=256, reduce="mean", precision=None, dtype=None,
+                 **kwargs):
         """
         Create a heatmap from a 2D pandas DataFrame.
 
@@ -80,6 +151,28 @@ class D3Heatmap(anywidget.AnyWidget):
         height : int, default 400
             Total height of the SVG in pixels (including margins).
 
+        tiled : bool or None, default None
+            Serve the matrix as zoomable tiles instead of sending it
+            whole. ``None`` enables tiling automatically above
+            4 million cells.
+
+        tile_size : int, default 256
+            Tile edge length in cells (tiled mode only).
+
+        reduce : {"mean", "max"}, default "mean"
+            Block reduction used for the coarser pyramid levels. ``"max"``
+            keeps isolated peaks visible when zoomed out.
+
+        precision : int, optional
+            Significant digits kept for the cell values. Besides shorter
+            labels, it stops :meth:`update_cells` from sending changes
+            smaller than the displayed precision.
+
+        dtype : {None, "float64", "float32"}, optional
+            Accepted for consistency with the other widgets (see
+            :mod:`Isea.encoding`). The ``values`` buffer is always
+            ``float32``.
+
         **kwargs :
             Extra visual options merged into ``self.options``. These are
             forwarded directly to the JS layer and can be used to tweak
@@ -91,12 +184,20 @@ class D3Heatmap(anywidget.AnyWidget):
 
         1. Loads ``assets/heatmap.js`` into ``self._esm`` (or displays an
            error message if the file is missing).
-        2. Calls :meth:`set_data` to convert ``df`` into a list of
-           ``{row_id, col_id, value}`` records.
-        3. Sets up default ``options`` including size, title, colour map
+        2. Sets up default ``options`` including size, title, colour map
            and a margin suited for rotated x-axis labels.
+        3. Calls :meth:`set_data` to pack ``df`` into the ``values``
+           buffer and add the axis domains to ``options``.
         """
         super().__init__()
+        self._tiled = tiled
+        self._tile_size = int(tile_size)
+        self._reduce = reduce
+        self._digits = resolve_digits(precision, dtype)
+        self._levels = []
+        self._matrix = None
+        self._patched = False
+        self.on_msg(self._handle_msg)
 
         js_path = Path(__file__).parent / "assets" / "heatmap.js"
         if js_path.exists():
@@ -108,75 +209,209 @@ class D3Heatmap(anywidget.AnyWidget):
                 "}"
             )
 
-        self.set_data(df)
         self.options = {
             "title": title,
             "width": width,
             "height": height,
             "cmap": cmap,
             "margin": {"top": 50, "right": 50, "bottom": 100, "left": 100},
+            "svgMaxCells": 2500,
             **kwargs,
         }
+        self.set_data(df)
 
     def set_data(self, df):
         """
         Convert a pandas DataFrame into the internal heatmap data format.
 
-        This method is responsible for reshaping the 2D input table into
-        the cell-wise records expected by the D3 renderer.
+        The 2D input table is converted in one step into a dense
+        ``float32`` matrix; there is no melt and no per-cell Python loop,
+        so correlation matrices of a few hundred metrics or
+        country × year tables stay cheap to build and to send.
 
         Parameters
         ----------
         df : pandas.DataFrame
             The DataFrame to visualise. Requirements:
 
-            - Each **row index** label becomes a ``row_id`` (y-axis).
-            - Each **column name** becomes a ``col_id`` (x-axis).
-            - Each cell value is used as ``value`` for that
-              (row_id, col_id) pair.
-
-            The method makes a copy of the DataFrame, resets the index
-            into a column named ``"row_id"``, and then uses
-            :meth:`DataFrame.melt` to create a long-form table.
+            - Each **row index** label becomes a row (y-axis).
+            - Each **column name** becomes a column (x-axis).
+            - Each cell value must be numeric (or convertible to
+              ``float``); missing values are allowed.
 
         Behaviour
         ---------
-        - All records are stored in ``self.data`` as:
-
-          .. code-block:: python
-
-              {
-                  "row_id": <index_label>,
-                  "col_id": <column_name>,
-                  "value": <numeric_or_None>,
-              }
-
-        - Any value for which ``pandas.isna(value)`` is true is converted
-          to ``None`` so that JSON serialisation works and the frontend
-          can treat it as missing data.
-        - ``self.options["xDomain"]`` is set to the original list of
-          column names, and ``self.options["yDomain"]`` to the original
-          list of index labels. These domains control the ordering of
-          rows and columns in the JS heatmap.
+        - ``self.values`` holds the matrix as row-major ``float32``
+          bytes; missing values (NaN / ``None`` / ``pd.NA``) stay NaN
+          and are drawn as “no data” cells.
+        - ``self.options["xDomain"]`` is set to the list of column
+          names, and ``self.options["yDomain"]`` to the list of index
+          labels. These domains give the matrix shape and control the
+          ordering of rows and columns in the JS heatmap.
         """
         if pd is None:
             raise ImportError("Pandas es necesario para D3Heatmap")
         if not isinstance(df, pd.DataFrame):
             raise ValueError("Data must be a pandas DataFrame")
 
-        df_clean = df.copy()
-        df_clean.index.name = "row_id"
-        df_clean = df_clean.reset_index()
+        work = np.float32 if self._digits is None else float
+        mat = np.ascontiguousarray(self._as_float32(df.to_numpy(dtype=work, na_value=np.nan)))
+        tiled = self._tiled if self._tiled is not None else mat.size > _TILED_MIN_CELLS
+
+        options = {k: v for k, v in self.options.items() if k not in ("tiled", "vmin", "vmax")}
+        options["xDomain"] = df.columns.tolist()
+        options["yDomain"] = df.index.tolist()
+
+        self._patched = False
+        if tiled:
+            values = b""
+            self._matrix = None
+            self._levels = _block_pyramid(mat, self._tile_size, self._reduce)
+            # la escala de color usa el rango global, no el de cada tesela
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                vmin, vmax = np.nanmin(mat), np.nanmax(mat)
+            options["vmin"] = float(vmin) if np.isfinite(vmin) else 0.0
+            options["vmax"] = float(vmax) if np.isfinite(vmax) else 0.0
+            options["tiled"] = {
+                "tileSize": self._tile_size,
+                "reduce": self._reduce,
+                "levels": [list(lv.shape) for lv in self._levels],
+            }
+        else:
+            self._levels = []
+            self._matrix = mat
+            values = mat.tobytes()
+        # matriz y dominios en un solo mensaje: la vista nunca los mezcla
+        with self.hold_sync():
+            self.values = values
+            self.options = options
+
+    @property
+    def data(self):
+        """
+        Cells as ``{row_id, col_id, value}`` records (read-only).
+
+        Kept for code written against the former synced ``data`` trait,
+        and built from the current matrix on each access: in the order
+        of ``DataFrame.melt`` (column by column), with ``None`` for
+        missing cells. Values are the ``float32`` ones sent to the view.
+        To change the cells use :meth:`set_data` or :meth:`update_cells`.
+        """
+        mat = self._matrix if self._matrix is not None else (self._levels[0] if self._levels else None)
+        if mat is None:
+            return []
+        rows, cols = self.options["yDomain"], self.options["xDomain"]
+        flat = mat.T.astype(float).ravel().tolist()
+        return [
+            {"row_id": r, "col_id": c, "value": None if v != v else v}
+            for (c, r), v in zip(((c, r) for c in cols for r in rows), flat)
+        ]
+
+    def _as_float32(self, arr):
+        """Round ``arr`` to the widget precision and cast it to ``float32``."""
+        if self._digits is None:
+            return np.asarray(arr, dtype=np.float32)
+        return round_sig(arr, self._digits).astype(np.float32)
+
+    def update_cells(self, df, tol=0.0):
+        """
+        Replace the matrix values, sending only the cells that changed.
+
+        Useful for live views (e.g. a correlation matrix driven by a
+        brushing selection): instead of resending the whole ``values``
+        buffer, the changed cells travel as a small custom message
+        (flat indices as ``int32`` plus values as ``float32``) and the JS
+        view repaints only those cells.
 
-        melted = df_clean.melt(id_vars="row_id", var_name="col_id", value_name="value")
-        records = melted.to_dict(orient="records")
-        for r in records:
-            if pd.isna(r["value"]):
-                r["value"] = None
+        Parameters
+        ----------
+        df : pandas.DataFrame or numpy.ndarray
+            New values with the same shape as the current matrix. A
+            DataFrame is aligned to the current ``yDomain``/``xDomain``.
+        tol : float, default 0.0
+            Cells whose absolute change is ``<= tol`` are not sent.
 
-        self.data = records
-        self.options = {
-            **self.options,
-            "xDomain": list(df.columns),
-            "yDomain": list(df.index),
-        }
\ No newline at end of file
+        Returns
+        -------
+        int
+            Number of cells sent.
+
+        Notes
+        -----
+        The synced ``values`` trait is not reassigned, so it keeps the
+        matrix from before the patches. Live views catch up on their own
+        (a new view asks for the current matrix), but saved widget state,
+        embedded/HTML exports and frontends without a kernel still show
+        the old one. Call :meth:`flush` before saving or exporting.
+        """
+        if self._matrix is None:
+            raise ValueError("update_cells is not available in tiled mode")
+        if pd is not None and isinstance(df, pd.DataFrame):
+            df = df.reindex(index=self.options["yDomain"], columns=self.options["xDomain"])
+            new = self._as_float32(df.to_numpy(dtype=float, na_value=np.nan))
+        else:
+            new = self._as_float32(np.asarray(df, dtype=float))
+        if new.shape != self._matrix.shape:
+            raise ValueError(f"Expected shape {self._matrix.shape}, got {new.shape}")
+
+        old = self._matrix
+        nan_old, nan_new = np.isnan(old), np.isnan(new)
+        with np.errstate(invalid="ignore"):
+            moved = np.abs(new - old) > tol
+        changed = np.flatnonzero((moved & ~nan_old & ~nan_new) | (nan_old != nan_new))
+        self._matrix = np.ascontiguousarray(new)
+        if changed.size:
+            self._patched = True
+            self.send(
+                {"type": "cells", "count": int(changed.size)},
+                buffers=[changed.astype(np.int32).tobytes(), self._matrix.ravel()[changed].tobytes()],
+            )
+        return int(changed.size)
+
+    def flush(self):
+        """
+        Write the matrix patched by :meth:`update_cells` back into ``values``.
+
+        Sends the whole matrix once, so the synced state (saved notebooks,
+        HTML exports) matches what the live views show. No-op when
+        nothing was patched or in tiled mode.
+        """
+        if not self._patched or self._matrix is None:
+            return
+        self.values = self._matrix.tobytes()
+        self._patched = False
+
+    def _handle_msg(self, _widget, content, _buffers):
+        """
+        Answer tile requests (tiled mode) and sync requests from the JS view.
+
+        ``{"type": "sync"}`` is sent by every new view; if cells were
+        patched with :meth:`update_cells` it gets the current matrix.
+
+        The view sends ``{"type": "tiles", "level": L, "tiles": [[tx, ty], ...]}``
+        and receives one ``{"type": "tile", ...}`` message per tile with
+        the cells as a row-major ``float32`` buffer.
+        """
+        if not isinstance(content, dict):
+            return
+        if content.get("type") == "sync":
+            # vista nueva después de update_cells: el traitlet `values` está desfasado
+            if self._patched and self._matrix is not None:
+                self.send({"type": "matrix"}, buffers=[self._matrix.tobytes()])
+            return
+        if content.get("type") != "tiles":
+            return
+        level = int(content.get("level", 0))
+        if not 0 <= level < len(self._levels):
+            return
+        mat = self._levels[level]
+        ts = self._tile_size
+        for tx, ty in content.get("tiles", []):
+            tile = np.ascontiguousarray(mat[ty * ts:(ty + 1) * ts, tx * ts:(tx + 1) * ts])
+            if not tile.size:
+                continue
+            self.send(
+                {"type": "tile", "level": level, "tx": tx, "ty": ty, "shape": list(tile.shape)},
+                buffers=[tile.tobytes()],
+            )
\ No newline at end of file
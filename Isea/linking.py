@@ -0,0 +1,219 @@
+"""
+Browser-side linking between Isea widgets.
+
+:class:`~Isea.scatter.ScatterBrush`, :class:`~Isea.parallel.ParallelEnergy`,
+:class:`~Isea.energy_quad.EnergyQuad` and
+:class:`~Isea.worldmaplinechart.WorldMapLineChart` share selections
+through ``window.IseaBus`` (see :func:`Isea.widgets.ensure_bus`). Views
+with the same ``link_group`` highlight each other's selections and
+brush filters directly in the browser, matched by key: country label,
+ISO3 code or the scatter's ``key`` column. Nothing travels through the
+kernel while the user brushes.
+
+Python still receives each view's own selection in ``selection``. With
+``sync_selection=False`` it is only sent when asked for, with
+:meth:`LinkedSelection.pull_selection`::
+
+    g = link_views(scatter, parallel, world, sync_selection=False)
+    ...                           # brush / click in any of the views
+    parallel.pull_selection()     # parallel.selection is updated shortly after
+
+Linking needs the views to share one page. Classic Jupyter, JupyterLab
+and VS Code do this. Colab renders each output in its own frame, so
+there each widget only sees its own events.
+
+When Python has to sit between views (translating keys, or in Colab),
+:func:`link` forwards a source's selection to targets as a key list in
+``filter_keys``, instead of re-serialising the selected rows::
+
+    lg = link(world, [scatter, parallel], on=wide.set_index("iso3")["Country"])
+"""
+import asyncio
+import uuid
+from collections.abc import Mapping
+from pathlib import Path
+
+import traitlets as T
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+_BUS_JS = Path(__file__).parent / "assets" / "bus.js"
+
+
+def _linked_esm(js_text):
+    """Prepend the shared bus helpers (``assets/bus.js``) to a view module."""
+    return _BUS_JS.read_text(encoding="utf-8") + js_text
+
+
+class LinkedSelection(T.HasTraits):
+    """
+    Mixin for widgets whose views take part in IseaBus linking.
+
+    The JavaScript side of the widget publishes its selections (and, for
+    parallel coordinates, its brush filters) to the views of the same
+    ``link_group`` and highlights the ones it receives.
+    """
+
+    link_group = T.Unicode("").tag(sync=True)
+    sync_selection = T.Bool(True).tag(sync=True)
+    # claves visibles puestas desde Python (Isea.link); None = sin filtro
+    filter_keys = T.List(default_value=None, allow_none=True).tag(sync=True)
+
+    def pull_selection(self):
+        """
+        Ask the views to send their current selection to ``selection``.
+
+        The selection includes the keys received from linked views. The
+        request is asynchronous: observe ``selection`` (or read it in a
+        later cell) to get the result. Only needed with
+        ``sync_selection=False``.
+        """
+        self.send({"type": "pull_selection"})
+
+
+def link_views(*widgets, group=None, sync_selection=None):
+    """
+    Put widgets in the same link group.
+
+    Parameters
+    ----------
+    *widgets : LinkedSelection
+        Widgets to link.
+    group : str, optional
+        Group id. A new random id is used when omitted. Pass an existing
+        id to add widgets to a group.
+    sync_selection : bool, optional
+        If given, set ``sync_selection`` on every widget. ``False`` keeps
+        brushing entirely in the browser until
+        :meth:`LinkedSelection.pull_selection` is called.
+
+    Returns
+    -------
+    str
+        The group id.
+    """
+    group = group or uuid.uuid4().hex[:12]
+    for w in widgets:
+        if not isinstance(w, LinkedSelection):
+            raise TypeError(f"{type(w).__name__} does not support IseaBus linking")
+        with w.hold_sync():
+            w.link_group = group
+            if sync_selection is not None:
+                w.sync_selection = bool(sync_selection)
+    return group
+
+
+def _selection_keys(selection):
+    """Keys of a widget selection (``keys``, or ``iso3s`` for the map); None if empty."""
+    keys = selection.get("keys") or selection.get("iso3s") or []
+    return [str(k) for k in keys] or None
+
+
+def _key_index(on):
+    """Prebuilt ``source key -> [target keys]`` index, or None to pass keys through."""
+    if isinstance(on, str):
+        if on != "key":
+            raise ValueError("on must be 'key', a mapping or a pandas Series")
+        return None
+    if pd is not None and isinstance(on, pd.Series):
+        grouped = on.astype(str).groupby(on.index.astype(str), sort=False)
+        return {k: list(dict.fromkeys(v)) for k, v in grouped}
+    if isinstance(on, Mapping):
+        return {
+            str(k): [str(x) for x in v] if isinstance(v, (list, tuple, set)) else [str(v)]
+            for k, v in on.items()
+        }
+    raise TypeError("on must be 'key', a mapping or a pandas Series")
+
+
+class LinkGroup:
+    """
+    Python-side link from one widget's selection to other widgets' filters.
+
+    Created by :func:`link`. Selection events arriving within ``wait``
+    seconds are coalesced, so a brush sends one ``filter_keys`` update per
+    target. The last resolved keys are in :attr:`keys` (``None`` when the
+    source has no selection).
+    """
+
+    def __init__(self, source, targets, on="key", wait=0.05):
+        for w in targets:
+            if not isinstance(w, LinkedSelection):
+                raise TypeError(f"{type(w).__name__} does not support linked filters")
+        self.source = source
+        self.targets = list(targets)
+        self.wait = float(wait)
+        self.keys = None
+        self._index = _key_index(on)
+        self._pending = None
+        self._timer = None
+        source.observe(self._on_selection, names="selection")
+
+    def _on_selection(self, change):
+        self._pending = change["new"] or {}
+        if self._timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # sin bucle de eventos (script): aplicar al momento
+            self.flush()
+            return
+        self._timer = loop.call_later(self.wait, self.flush)
+
+    def flush(self):
+        """Apply the pending selection now."""
+        self._timer = None
+        if self._pending is None:
+            return
+        keys = _selection_keys(self._pending)
+        self._pending = None
+        if keys is not None and self._index is not None:
+            keys = list(dict.fromkeys(t for k in keys for t in self._index.get(k, ())))
+        self.keys = keys
+        for w in self.targets:
+            with w.hold_sync():
+                w.filter_keys = keys
+
+    def unlink(self):
+        """Stop forwarding and clear the targets' filters."""
+        self.source.unobserve(self._on_selection, names="selection")
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = None
+        for w in self.targets:
+            w.filter_keys = None
+
+
+def link(source, targets, on="key", *, wait=0.05):
+    """
+    Filter ``targets`` by the keys selected in ``source``.
+
+    Parameters
+    ----------
+    source : widget
+        Any Isea widget with a ``selection`` trait holding ``keys`` (or
+        ``iso3s``, for :class:`~Isea.worldmaplinechart.WorldMapLineChart`).
+    targets : LinkedSelection or sequence of them
+        Widgets whose views show only the resolved keys.
+    on : "key", mapping or pandas.Series, default "key"
+        How source keys become target keys. ``"key"`` passes them
+        through; a mapping or Series (index: source key, values: target
+        key, one-to-many allowed) is turned into an index once, e.g.
+        ``wide.set_index("iso3")["Country"]`` to drive country-label
+        views from the map.
+    wait : float, default 0.05
+        Seconds during which consecutive selection events are coalesced.
+
+    Returns
+    -------
+    LinkGroup
+        Call :meth:`LinkGroup.unlink` to stop.
+    """
+    if isinstance(targets, LinkedSelection):
+        targets = [targets]
+    return LinkGroup(source, targets, on=on, wait=wait)
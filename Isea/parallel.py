@@ -1,12 +1,119 @@
 # Isea/parallel.py
 import anywidget
 import traitlets as T
+import numpy as np
 import pandas as pd
 from pathlib import Path
 from typing import Sequence, Optional
 
+from .animation import Animated, _anim_esm
+from .background import BackgroundBuild, default_executor
+from .compute import _compute_esm
+from .encoding import encode_series, resolve_digits, round_sig
+from .linking import LinkedSelection, _linked_esm
+from .sources import DataSource, PandasSource, as_source, normalize_where
 
-class ParallelEnergy(anywidget.AnyWidget):
+
+def _year_extents(cube, dims):
+    """
+    Per-year extents of a ``(labels, dims, years)`` value cube.
+
+    Returns a dict keyed by dimension with three lists aligned with the
+    year axis: ``"min"``, ``"max"`` and ``"min_pos"`` (smallest strictly
+    positive value, or ``None`` when a year has none; used as the lower
+    bound of log axes). The JS view uses these directly instead of
+    rescanning the records on every slider move.
+    """
+    if cube.shape[0] == 0:
+        zeros = [0.0] * cube.shape[2]
+        return {t: {"min": zeros, "max": zeros, "min_pos": [None] * cube.shape[2]} for t in dims}
+    mins = cube.min(axis=0)
+    maxs = cube.max(axis=0)
+    pos = np.where(cube > 0, cube, np.inf).min(axis=0)
+    out = {}
+    for i, t in enumerate(dims):
+        out[t] = {
+            "min": mins[i].tolist(),
+            "max": maxs[i].tolist(),
+            "min_pos": [float(v) if np.isfinite(v) else None for v in pos[i]],
+        }
+    return out
+
+
+def _project(df, cols):
+    """
+    Keep only ``cols`` of ``df`` (missing ones skipped, duplicates dropped).
+
+    Widgets store this projection of their source frame instead of
+    ``df.copy()``. Selecting columns never copies the unused ones: with
+    pandas copy-on-write it is a lazy view, otherwise only the projected
+    columns are copied.
+    """
+    return df.loc[:, list(dict.fromkeys(c for c in cols if c in df.columns))]
+
+
+def _prepare_parallel(df, years, tech_col, label_col, dims, digits=None, delta=False):
+    """
+    Aggregate a long-format DataFrame into the ``data`` pack of
+    :class:`ParallelEnergy` / :class:`~Isea.energy_quad.EnergyQuad`.
+
+    Values are rounded to ``digits`` significant digits (``None`` keeps
+    full precision) and, with ``delta=True``, each year series is sent
+    delta-encoded (see :mod:`Isea.encoding`). Extents are computed from
+    the rounded values, so they match what the view decodes.
+
+    Pure function of its arguments (no widget state), kept at module
+    level so :meth:`ParallelEnergy.build_async` can run it in a thread or
+    process pool.
+    """
+    dims = list(dims)
+    # solo las filas/columnas usadas; sin copiar el frame completo
+    sub = df.loc[df[tech_col].isin(dims), [label_col, tech_col, *years]]
+    block = sub[years]
+    if any(block[y].dtype.kind not in "iufb" for y in years):
+        block = block.apply(pd.to_numeric, errors="coerce")
+    agg = block.groupby([sub[label_col], sub[tech_col]]).sum(min_count=1)
+
+    # (labels, dims, years) cube; missing technologies and NaN become 0.0
+    labels = sorted(agg.index.get_level_values(0).unique())
+    full = pd.MultiIndex.from_product([labels, dims], names=[label_col, tech_col])
+    cube = (
+        agg.reindex(full)
+        .to_numpy(dtype=float)
+        .reshape(len(labels), len(dims), len(years))
+    )
+    cube = round_sig(np.nan_to_num(cube, nan=0.0), digits)
+
+    recs = []
+    for i, country in enumerate(labels):
+        item = {"label": country}
+        for j, t in enumerate(dims):
+            item[t] = encode_series(cube[i, j], digits, delta) if (digits or delta) else cube[i, j].tolist()
+        recs.append(item)
+
+    return {
+        "years": list(years),
+        "dims": dims,
+        "records": recs,
+        "label": label_col,
+        "extents": _year_extents(cube, dims),
+    }
+
+
+def _prepare_source(source, years, tech_col, label_col, dims, digits=None, delta=False):
+    """
+    :func:`_prepare_parallel` for a :class:`~Isea.sources.DataSource`.
+
+    The technology filter and the per-(label, technology) sums run in the
+    source (Arrow scan, SQL ``GROUP BY``); only the aggregate, one row per
+    label and technology, becomes a pandas frame.
+    """
+    agg = source.aggregate([label_col, tech_col], years, "sum",
+                           where=[(tech_col, "in", list(dims))])
+    return _prepare_parallel(agg, years, tech_col, label_col, dims, digits, delta)
+
+
+class ParallelEnergy(Animated, BackgroundBuild, LinkedSelection, anywidget.AnyWidget):
     """
     Interactive parallel-coordinates widget for energy-style data.
 
@@ -39,11 +146,26 @@ class ParallelEnergy(anywidget.AnyWidget):
                 ...
             ],
             "label": "Country",  # name of the label column in the source df
+            "extents": {
+                "Solar": {"min": [...], "max": [...], "min_pos": [...]},
+                ...
+            },
         }
 
+    ``extents`` holds per-year, per-dimension bounds over all records
+    (``min_pos`` is the smallest positive value, for log axes). It is
+    optional: packs built by hand without it still render, the frontend
+    then derives the same bounds once when the data is loaded.
+
     The corresponding JavaScript module (``assets/parallel.js``) reads
     this object and draws the parallel-coordinates view with D3.
 
+    The aggregation can run off the kernel thread:
+    ``ParallelEnergy.build_async(df, years, ...)`` returns the widget at
+    once (it shows a loading placeholder until the data is ready) and
+    :meth:`update_async` swaps in a new DataFrame in the background. See
+    :mod:`Isea.background`.
+
     Synced traitlets
     ----------------
     data : dict
@@ -77,9 +199,10 @@ class ParallelEnergy(anywidget.AnyWidget):
 
     def __init__(
         self,
-        df: pd.DataFrame,
+        df: "pd.DataFrame | DataSource",
         years: Sequence[str],
         *,
+        where=None,
         tech_col: str = "Technology_std",
         label_col: str = "Country",
         dims: Sequence[str] = ("Solar", "Wind", "Hydro", "Bio", "Fossil"),
@@ -94,6 +217,13 @@ class ParallelEnergy(anywidget.AnyWidget):
         panel_position: str = "right",            # "right" | "bottom"
         panel_width: int = 340,
         panel_height: int = 260,
+        # transport
+        precision: Optional[int] = None,
+        dtype: Optional[str] = None,
+        delta: bool = False,
+        # linking
+        link_group: Optional[str] = None,
+        sync_selection: bool = True,
     ):
         """
         Construct a parallel-coordinates chart from a long-format DataFrame.
@@ -119,11 +249,22 @@ class ParallelEnergy(anywidget.AnyWidget):
             - ``Technology_std`` (tech_col)
             - ``2010``, ``2015``, ``2020`` (year columns)
 
+            A :class:`~Isea.sources.DataSource` (Parquet files, a SQLite
+            or DuckDB table, ...) with the same columns can be given
+            instead. Its rows are never loaded: the source returns the
+            per-(label, technology) sums of the year columns, see
+            :func:`_prepare_source`.
+
         years : Sequence[str]
             List of column names in ``df`` that represent time. The
             constructor filters this list to those present in
             ``df.columns``; if none remain, a ``ValueError`` is raised.
 
+        where : filter, optional
+            Rows to keep, as ``(column, op, value)`` predicates or a
+            ``{column: value}`` mapping (see :mod:`Isea.sources`). With a
+            source the filter runs in the source.
+
         tech_col : str, default "Technology_std"
             Name of the column in ``df`` that encodes the technology /
             dimension categories. Only rows whose value is in ``dims``
@@ -184,6 +325,27 @@ class ParallelEnergy(anywidget.AnyWidget):
         panel_height : int, default 260
             Suggested height in pixels for the side panel, if used.
 
+        precision : int, optional
+            Significant digits kept for the values sent to the browser
+            (e.g. ``4`` for GWh totals). ``None`` sends full precision.
+
+        dtype : {None, "float64", "float32"}, optional
+            ``"float32"`` rounds values to float32 precision (7 digits).
+
+        delta : bool, default False
+            Send each per-year series delta-encoded as scaled integers,
+            which is much shorter for smooth series. See
+            :mod:`Isea.encoding`.
+
+        link_group : str, optional
+            Views with the same group highlight each other's selections
+            and brush filters in the browser, matched by ``label_col``
+            value (see :mod:`Isea.linking`).
+
+        sync_selection : bool, default True
+            Send every selection change to ``self.selection``. With
+            ``False`` it is only sent on :meth:`pull_selection`.
+
         Notes
         -----
         Internally, the constructor:
@@ -196,42 +358,30 @@ class ParallelEnergy(anywidget.AnyWidget):
         4. Stores the result in ``self.data`` and layout/behaviour
            options in ``self.options``, which the JavaScript code in
            ``assets/parallel.js`` uses to draw the chart.
+
+        Steps 1-3 are done by :func:`_prepare_parallel`, in a background
+        executor when the widget is created with ``build_async``.
         """
         super().__init__()
-        self._esm = (Path(__file__).parent / "assets" / "parallel.js").read_text()
+        self._esm = _anim_esm(_compute_esm(_linked_esm((Path(__file__).parent / "assets" / "parallel.js").read_text())))
+        self.link_group = link_group or ""
+        self.sync_selection = bool(sync_selection)
 
-        years = [c for c in years if c in df.columns]
+        source = as_source(df)
+        columns = source.columns if source is not None else df.columns
+        years = [c for c in years if c in columns]
         if not years:
             raise ValueError("years does not match dataframe columns.")
 
-        dfn = df.copy()
-        for y in years:
-            dfn[y] = pd.to_numeric(dfn[y], errors="coerce")
-
-        if tech_col not in dfn.columns or label_col not in dfn.columns:
+        if tech_col not in columns or label_col not in columns:
             raise KeyError("Required columns are missing.")
+        # se guarda normalizado: update_async lo vuelve a aplicar a los datos nuevos
+        self._where = normalize_where(where)
+        if source is None and self._where:
+            df = PandasSource(df, self._where).scan([label_col, tech_col, *years])
 
         dims = list(dims)
-        agg = (
-            dfn[dfn[tech_col].isin(dims)]
-            .groupby([label_col, tech_col])[years]
-            .sum(min_count=1)
-            .reset_index()
-        )
-
-        recs = []
-        for country, block in agg.groupby(label_col):
-            item = {"label": country}
-            for t in dims:
-                row = block[block[tech_col] == t]
-                if row.empty:
-                    item[t] = [0.0] * len(years)
-                else:
-                    r = row.iloc[0]
-                    item[t] = [float(r[y]) if pd.notna(r[y]) else 0.0 for y in years]
-            recs.append(item)
-
-        self.data = {"years": list(years), "dims": dims, "records": recs, "label": label_col}
+        digits = resolve_digits(precision, dtype)
 
         # base options
         self.options = {
@@ -255,14 +405,81 @@ class ParallelEnergy(anywidget.AnyWidget):
                 "left":   margin.get("left",   margin.get("l", 60)),
             }
 
-        # save state to clone later
-        self._df_raw = df.copy()
+        # save state to clone later (only the columns a rebuild needs; with a
+        # source, the filtered source itself)
+        self._source = source.filter(self._where) if source is not None else None
+        self._df_raw = _project(df, [label_col, tech_col, *years]) if source is None else None
         self._years = list(years)
         self._tech_col = tech_col
         self._label_col = label_col
         self._dims = tuple(dims)
+        self._transport = {"precision": precision, "dtype": dtype, "delta": bool(delta)}
 
         self.selection = {}
+        if self._source is not None:
+            self._run_build(
+                _prepare_source, self._source, self._years, tech_col, label_col, self._dims, digits,
+                bool(delta), apply=self._set_pack,
+            )
+            return
+        self._run_build(
+            _prepare_parallel, df, self._years, tech_col, label_col, self._dims, digits, bool(delta),
+            apply=self._set_pack,
+        )
+
+    def _set_pack(self, pack):
+        self.data = pack
+
+    def update_async(self, df, years=None, *, executor=None):
+        """
+        Rebuild the chart from a new DataFrame without blocking the kernel.
+
+        The aggregation runs in ``executor`` (default: the shared Isea
+        thread pool) while the view keeps showing the current data under a
+        loading overlay. Calling it again before the previous call finished
+        supersedes it: only the latest DataFrame is ever displayed. Options
+        and the current selection are left unchanged.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame or DataSource
+            New long-format dataset with the same schema as the one given
+            to the constructor.
+        years : Sequence[str], optional
+            Year columns to use; defaults to the current ones.
+            The constructor's ``where`` filter applies to the new data too.
+        executor : concurrent.futures.Executor, optional
+            Where the aggregation runs.
+
+        Returns
+        -------
+        asyncio.Future
+            Resolves to the new data pack once it has been applied.
+        """
+        source = as_source(df)
+        years = [c for c in (years or self._years)
+                 if c in (source.columns if source is not None else df.columns)]
+        if not years:
+            raise ValueError("years does not match dataframe columns.")
+        if source is not None:
+            source = source.filter(self._where)
+        elif self._where:
+            df = PandasSource(df, self._where).scan([self._label_col, self._tech_col, *years])
+
+        def apply(pack):
+            self._source = source
+            self._df_raw = None if source is not None else _project(
+                df, [self._label_col, self._tech_col, *years])
+            self._years = list(years)
+            self._set_pack(pack)
+
+        t = self._transport
+        return self._run_build(
+            _prepare_parallel if source is None else _prepare_source,
+            df if source is None else source, years, self._tech_col, self._label_col, self._dims,
+            resolve_digits(t["precision"], t["dtype"]), t["delta"],
+            apply=apply, executor=executor or default_executor(),
+        )
 
     # ------------ helpers PY ------------
     # --- helpers Python-side ---
@@ -333,7 +550,10 @@ class ParallelEnergy(anywidget.AnyWidget):
         This helper reads the current ``selection["keys"]`` (a list of
         labels, e.g. country names), filters the original DataFrame that
         was used to build the widget, and constructs a **new** instance
-        of :class:`ParallelEnergy` using only those rows.
+        of :class:`ParallelEnergy` using only those rows. A widget built
+        from a :class:`~Isea.sources.DataSource` passes the source on with
+        the selected labels as one more filter, so the selection is pushed
+        down instead of filtering rows in Python.
 
         The new instance inherits the current configuration, but you can
         override any of the constructor keyword arguments via
@@ -368,6 +588,7 @@ class ParallelEnergy(anywidget.AnyWidget):
                     panel_position=self.options.get("panel_position", "right"),
                     panel_width=self.options.get("panel_width", 340),
                     panel_height=self.options.get("panel_height", 260),
+                    precision=..., dtype=..., delta=...,  # as given to this widget
                     **overrides,
                 )
 
@@ -386,7 +607,10 @@ class ParallelEnergy(anywidget.AnyWidget):
         keys = list(map(str, self.selection.get("keys", [])))
         if not keys:
             raise ValueError("No selection (keys is empty).")
-        sub = self._df_raw[self._df_raw[self._label_col].astype(str).isin(keys)].copy()
+        if self._source is not None:
+            sub = self._source.filter([(self._label_col, "in", keys)])
+        else:
+            sub = self._df_raw[self._df_raw[self._label_col].astype(str).isin(keys)]
 
         # take defaults from current chart; overrides wins
         kw = {
@@ -403,6 +627,7 @@ class ParallelEnergy(anywidget.AnyWidget):
             "panel_position": self.options.get("panel_position", "right"),
             "panel_width": self.options.get("panel_width", 340),
             "panel_height": self.options.get("panel_height", 260),
+            **self._transport,
         }
         kw.update(overrides)  # overrides wins
         return self.__class__(sub, self._years, **kw)
@@ -4,6 +4,14 @@ import traitlets as T
 from pathlib import Path
 from typing import Optional, Sequence, Mapping, Any
 import json
+import re
+
+from .animation import Animated, _anim_esm
+from .compute import _compute_esm
+from .encoding import resolve_digits, round_frame, round_records
+from .linking import LinkedSelection, _linked_esm
+from .sources import DataSource, PandasSource, as_source, normalize_where
+from .store import DataStore, StoreView, _store_esm
 
 try:
     import pandas as pd  # optional
@@ -11,7 +19,7 @@ except Exception:
     pd = None
 
 
-class ScatterBrush(anywidget.AnyWidget):
+class ScatterBrush(Animated, LinkedSelection, StoreView, anywidget.AnyWidget):
     """
     Interactive 2D scatterplot widget with brushing, tooltips and two-way binding.
 
@@ -64,7 +72,7 @@ class ScatterBrush(anywidget.AnyWidget):
 
     def __init__(
         self,
-        data: "pd.DataFrame | Sequence[Mapping[str, Any]]",
+        data: "pd.DataFrame | DataStore | DataSource | Sequence[Mapping[str, Any]]",
         *,
         # encodings
         x: Optional[str] = None,
@@ -91,6 +99,13 @@ class ScatterBrush(anywidget.AnyWidget):
         y_ticks: Optional[int] = None,
         log_x: bool = False,
         log_y: bool = False,
+        # transport
+        precision: Optional[int] = None,
+        dtype: Optional[str] = None,
+        where=None,
+        # linking
+        link_group: Optional[str] = None,
+        sync_selection: bool = True,
         # dynamic XY candidates via XY_var* kwargs + any other overrides
         **overrides,
     ):
@@ -104,6 +119,16 @@ class ScatterBrush(anywidget.AnyWidget):
 
             - A :class:`pandas.DataFrame` with one row per point, or
             - A sequence of dict-like records (e.g. ``[{"x": ..., "y": ...}, ...]``).
+            - A :class:`~Isea.store.DataStore`. The rows are then read in
+              the browser from the store shared with other views, and
+              nothing but the options is sent for this widget. Store
+              updates redraw the scatter; ``precision``/``dtype`` are
+              those of the store.
+            - A :class:`~Isea.sources.DataSource` (Parquet, SQLite,
+              DuckDB...). Only the columns the scatter uses are read: the
+              encodings, and for ``XY_var*`` variables their
+              ``<var>__FYYYY`` columns between ``YearMin`` and ``YearMax``.
+              :meth:`set_viewport` and :meth:`subset` filter in the source.
 
             If a DataFrame is provided, it is converted to a list of JSON-like
             dicts using ``data.to_json(orient="records")``. All values must be
@@ -184,6 +209,28 @@ class ScatterBrush(anywidget.AnyWidget):
             If True, the corresponding axis uses a logarithmic scale where
             possible; if False, a linear scale is used.
 
+        precision : int, optional
+            Significant digits kept for float values sent to the browser
+            (e.g. ``3`` for shares). ``None`` sends them unchanged.
+
+        dtype : {None, "float64", "float32"}, optional
+            ``"float32"`` rounds float values to float32 precision
+            (7 significant digits). See :mod:`Isea.encoding`.
+
+        where : filter, optional
+            Points to show, as ``(column, op, value)`` predicates or a
+            ``{column: value}`` mapping (see :mod:`Isea.sources`). Needs a
+            DataFrame or a source; with a source the filter runs there.
+            :meth:`set_data` applies it to the new rows too.
+
+        link_group : str, optional
+            Views with the same group highlight each other's selections in
+            the browser, matched by ``key`` (see :mod:`Isea.linking`).
+
+        sync_selection : bool, default True
+            Send every selection change to ``self.selection``. With
+            ``False`` it is only sent on :meth:`pull_selection`.
+
         **overrides :
             Extra options forwarded directly into ``self.options``. Two
             special patterns are recognised:
@@ -218,14 +265,24 @@ class ScatterBrush(anywidget.AnyWidget):
           frontend when the user selects points.
         """
         super().__init__()
-        self._esm = (Path(__file__).parent / "assets" / "scatter.js").read_text(encoding="utf-8")
+        self._esm = _anim_esm(_compute_esm(_store_esm(_linked_esm((Path(__file__).parent / "assets" / "scatter.js").read_text(encoding="utf-8")))))
+        self.link_group = link_group or ""
+        self.sync_selection = bool(sync_selection)
 
         # ---- data -> list[dict]
-        if pd is not None and isinstance(data, pd.DataFrame):
-            payload = json.loads(data.to_json(orient="records"))
+        self.source = None
+        self._digits = resolve_digits(precision, dtype)
+        self._viewport = ()
+        # se guarda normalizado: set_data lo vuelve a aplicar a los datos nuevos
+        self._where = normalize_where(where)
+        if isinstance(data, DataStore):
+            if self._where:
+                raise ValueError("where needs a DataFrame or a DataSource")
+            self.store = data
+            self.data = []
         else:
-            payload = list(data)
-        self.data = payload
+            # con una fuente se lee al final, cuando se conocen las columnas que usan las opciones
+            self.data = self._payload(data)
 
         # ---- options
         o: dict[str, Any] = {}
@@ -292,8 +349,119 @@ class ScatterBrush(anywidget.AnyWidget):
 
         self.options = o
         self.selection = {}
+        if self.source is not None:
+            self._load_source()
+
+    def _payload(self, data):
+        """Records of ``data`` for the ``data`` trait, filtered by ``where``; sets ``self.source``."""
+        source = as_source(data)
+        if source is not None:
+            self.source = source.filter(self._where)
+            return []
+        self.source = None
+        if pd is not None and isinstance(data, pd.DataFrame):
+            if self._where:
+                data = PandasSource(data, self._where).scan()
+            return json.loads(round_frame(data, self._digits).to_json(orient="records"))
+        if self._where:
+            raise ValueError("where needs a DataFrame or a DataSource")
+        return round_records(list(data), self._digits)
+
+    def set_data(self, data):
+        """
+        Replace the points, keeping the options, the selection and ``where``.
+
+        Parameters
+        ----------
+        data : pandas.DataFrame, DataSource or sequence of records
+            New rows, as for the constructor. The ``where`` filter given
+            to the constructor is applied to them, so records are
+            rejected when there is one. A :class:`~Isea.store.DataStore`
+            is not accepted: update the store instead.
 
-    def subset(self, df: "pd.DataFrame"):
+        Raises
+        ------
+        TypeError
+            If ``data`` is a :class:`~Isea.store.DataStore` or the widget
+            reads from one.
+        ValueError
+            If ``where`` was given and ``data`` is a list of records.
+        """
+        if isinstance(data, DataStore) or self.store is not None:
+            raise TypeError("set_data() does not work with a DataStore; use DataStore.update()")
+        payload = self._payload(data)
+        self._viewport = ()
+        if self.source is not None:
+            self._load_source()
+        else:
+            self.data = payload
+
+    # ------------------------------------------------------------------
+    # DataSource
+    # ------------------------------------------------------------------
+    def _source_columns(self):
+        """Columns of the source the view uses (see ``data`` in :meth:`__init__`)."""
+        o = self.options
+        names = self.source.columns
+        known = set(names)
+        wanted = [o.get("x", "x"), o.get("y", "y"), o.get("key", "id"),
+                  o.get("label"), o.get("color"), o.get("size")]
+        xy = set(o.get("xyVars") or [])
+        lo, hi = o.get("yearMin"), o.get("yearMax")
+        for c in names:
+            m = re.match(r"^(.*)__F(\d{4})$", c)
+            if m and m.group(1) in xy and (lo is None or int(m.group(2)) >= lo) \
+                    and (hi is None or int(m.group(2)) <= hi):
+                wanted.append(c)
+        wanted += sorted(xy)
+        return [c for c in dict.fromkeys(wanted) if c in known]
+
+    def _load_source(self):
+        df = self.source.scan(self._source_columns(), where=self._viewport)
+        self.data = json.loads(round_frame(df, self._digits).to_json(orient="records"))
+
+    def _axis_column(self, axis, year):
+        col = self.options.get(axis, axis)
+        names = set(self.source.columns)
+        if col in names:
+            return col
+        # variable XY_var: su columna del año
+        year = year if year is not None else self.options.get("yearMax")
+        if year is not None and f"{col}__F{int(year)}" in names:
+            return f"{col}__F{int(year)}"
+        raise ValueError(f"{axis} column {col!r} is not in the source")
+
+    def set_viewport(self, x=None, y=None, *, year=None):
+        """
+        Reload only the points inside a data range, filtered in the source.
+
+        Parameters
+        ----------
+        x, y : (lo, hi), optional
+            Range of the x / y encodings, both ends included. ``None``
+            leaves that axis unfiltered; ``set_viewport()`` shows every
+            point again.
+        year : int, optional
+            For ``XY_var*`` axes, the year whose ``<var>__FYYYY`` column
+            is filtered (default ``YearMax``).
+
+        Raises
+        ------
+        ValueError
+            If the widget was not built from a
+            :class:`~Isea.sources.DataSource`.
+        """
+        if self.source is None:
+            raise ValueError("set_viewport() needs a widget built from a DataSource")
+        preds = []
+        for axis, rng in (("x", x), ("y", y)):
+            if rng is not None:
+                lo, hi = rng
+                preds.append((self._axis_column(axis, year), "between", (lo, hi)))
+        self._viewport = tuple(preds)
+        self._load_source()
+
+    def subset(self, df: "Optional[pd.DataFrame]" = None):
         """
         Return a filtered copy of ``df`` based on the current selection keys.
 
@@ -310,9 +478,12 @@ class ScatterBrush(anywidget.AnyWidget):
 
         Parameters
         ----------
-        df : pandas.DataFrame
-            Source DataFrame that contains at least one of the following
-            columns:
+        df : pandas.DataFrame, optional
+            Source DataFrame (defaults to the store's frame when the
+            widget reads from a :class:`~Isea.store.DataStore`). For a
+            widget built from a :class:`~Isea.sources.DataSource` the
+            selected keys are looked up in the source, all columns. It must
+            contain at least one of the following columns:
 
             - The column whose name you passed as ``key`` when constructing
               the widget, or
@@ -353,10 +524,26 @@ class ScatterBrush(anywidget.AnyWidget):
         """
         if pd is None:
             raise RuntimeError("pandas is required for subset().")
+        if df is None and self.source is not None:
+            return self._source_subset()
+        if df is None:
+            if self.store is None:
+                raise ValueError("subset(): pass the DataFrame the widget was built from.")
+            df = self.store.frame
         keys = list(map(str, self.selection.get("keys", [])))
         if not keys:
             return df.iloc[0:0].copy()
         key_col = self.options.get("key") or self.options.get("label")
         if key_col is None:
             raise ValueError("subset(): need `key` or `label` to be set.")
-        return df[df[key_col].astype(str).isin(keys)].copy()
\ No newline at end of file
+        return df[df[key_col].astype(str).isin(keys)].copy()
+
+    def _source_subset(self):
+        key_col = self.options.get("key") or self.options.get("label")
+        if key_col is None:
+            raise ValueError("subset(): need `key` or `label` to be set.")
+        keys = list(map(str, self.selection.get("keys", [])))
+        if keys and pd.api.types.is_numeric_dtype(self.source.scan([key_col], limit=1)[key_col]):
+            # las claves llegan como texto desde JS
+            keys = pd.to_numeric(pd.Series(keys), errors="coerce").dropna().tolist()
+        return self.source.scan(where=[(key_col, "in", keys)])
\ No newline at end of file
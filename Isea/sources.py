@@ -0,0 +1,500 @@
+"""
+Out-of-core data sources for the widgets.
+
+:class:`~Isea.scatter.ScatterBrush`,
+:class:`~Isea.worldmaplinechart.WorldMapLineChart` and
+:class:`~Isea.parallel.ParallelEnergy` accept a :class:`DataSource`
+instead of a DataFrame. They then ask the source only for what they
+show:
+
+- the columns they use (the scatter's encodings, one metric's years);
+- the rows left by their filters (``where=``, a viewport, the selection);
+- the aggregate they draw (parallel coordinates sum per label and
+  technology).
+
+The filtering and aggregation run in the source (Arrow scan, SQL query).
+Only the result becomes a pandas frame in the kernel::
+
+    from Isea.sources import ParquetSource, SQLSource
+
+    src = ParquetSource("irena/*.parquet")
+    pe = ParallelEnergy(src, years, where=[("Region", "==", "Europe")])
+    sc = ScatterBrush(SQLSource("wide.duckdb", "wide"), x="Sales", y="Stock", key="Country")
+    sc.set_viewport(x=(0, 50))
+
+Filters are a list of ``(column, op, value)`` predicates combined with
+AND. ``op`` is one of ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``,
+``in``, ``not in`` or ``between`` (``value`` is ``(lo, hi)``, both
+included). A mapping ``{column: value}`` is shorthand for ``==``, or for
+``in`` when the value is a list, tuple or set.
+
+Adapters: :class:`PandasSource`, :class:`ArrowSource` /
+:class:`ParquetSource` (needs ``pyarrow``) and :class:`SQLSource`
+(SQLite through :mod:`sqlite3`, DuckDB with ``duckdb``).
+"""
+import sqlite3
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as pads
+except ImportError:
+    pa = pads = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+OPS = ("==", "!=", "<", "<=", ">", ">=", "in", "not in", "between")
+AGGS = ("sum", "mean", "min", "max", "count")
+
+
+def normalize_where(where):
+    """
+    ``where`` as a tuple of ``(column, op, value)`` predicates.
+
+    Accepts ``None``, a mapping (see the module docstring) or a sequence
+    of 3-tuples. Raises ``ValueError`` for unknown operators.
+    """
+    if where is None:
+        return ()
+    if isinstance(where, Mapping):
+        where = [
+            (c, "in", list(v)) if isinstance(v, (list, tuple, set, frozenset)) else (c, "==", v)
+            for c, v in where.items()
+        ]
+    out = []
+    for pred in where:
+        if len(pred) != 3:
+            raise ValueError(f"filter predicates are (column, op, value), got {pred!r}")
+        col, op, value = pred
+        if op not in OPS:
+            raise ValueError(f"op must be one of {OPS}, got {op!r}")
+        if op in ("in", "not in"):
+            value = list(value)
+        elif op == "between":
+            lo, hi = value
+            value = (lo, hi)
+        out.append((str(col), op, value))
+    return tuple(out)
+
+
+def _py(v):
+    """numpy scalar -> Python scalar (for SQL parameters and Arrow scalars)."""
+    return v.item() if isinstance(v, np.generic) else v
+
+
+class DataSource:
+    """
+    A table the widgets query lazily.
+
+    Subclasses implement :attr:`columns` and ``_scan``. They override
+    :meth:`aggregate`, :meth:`distinct` and :meth:`count` when the
+    backend can compute them without returning the rows; the fallbacks
+    here scan the projected, filtered rows and finish in pandas.
+
+    :meth:`filter` returns a view of the source with more predicates,
+    which is how a widget hands a narrowed source to a new widget.
+    """
+
+    def __init__(self, where=None):
+        self.where = normalize_where(where)
+
+    # ----------------------------------------------------------- backend
+    @property
+    def columns(self):
+        """Column names, in order."""
+        raise NotImplementedError
+
+    def _scan(self, columns, where, limit):
+        raise NotImplementedError
+
+    def _aggregate(self, by, columns, how, where):
+        df = self._scan(list(dict.fromkeys([*by, *columns])), where, None)
+        return _pandas_aggregate(df, by, columns, how)
+
+    # ----------------------------------------------------------- public
+    def scan(self, columns=None, where=None, limit=None):
+        """
+        Rows of the source as a DataFrame.
+
+        Parameters
+        ----------
+        columns : sequence of str, optional
+            Columns to read (default: all). Missing ones raise ``KeyError``.
+        where : filter, optional
+            Added to the source's own predicates.
+        limit : int, optional
+            Return at most this many rows.
+        """
+        cols = self.columns if columns is None else self._check(columns)
+        return self._scan(cols, self.where + normalize_where(where), limit)
+
+    def aggregate(self, by, columns, how="sum", where=None):
+        """
+        One row per distinct ``by`` combination, with ``how`` of ``columns``.
+
+        ``by`` columns come first, as ordinary columns (not the index).
+        With ``"sum"`` a group whose values are all null stays null.
+        """
+        if how not in AGGS:
+            raise ValueError(f"how must be one of {AGGS}")
+        by = self._check([by] if isinstance(by, str) else by)
+        columns = self._check(columns)
+        return self._aggregate(by, columns, how, self.where + normalize_where(where))
+
+    def distinct(self, column, where=None):
+        """Distinct non-null values of ``column``, sorted."""
+        (column,) = self._check([column])
+        df = self.aggregate([column], [], "count", where)
+        return sorted(df[column].dropna().tolist())
+
+    def count(self, where=None):
+        """Number of rows left by the filters."""
+        cols = self.columns[:1]
+        return len(self._scan(cols, self.where + normalize_where(where), None))
+
+    def filter(self, where):
+        """A copy of the source with ``where`` added to its predicates."""
+        view = object.__new__(type(self))
+        view.__dict__.update(self.__dict__)
+        view.where = self.where + normalize_where(where)
+        return view
+
+    def _check(self, columns):
+        columns = [str(c) for c in columns]
+        known = set(self.columns)
+        missing = [c for c in columns if c not in known]
+        if missing:
+            raise KeyError(f"Columns not in the source: {missing}")
+        return list(dict.fromkeys(columns))
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self.columns)} columns, {len(self.where)} filters)"
+
+
+def _pandas_aggregate(df, by, columns, how):
+    if not columns:
+        return df[by].drop_duplicates().dropna().reset_index(drop=True)
+    g = df.groupby(by, sort=True, dropna=True)[columns]
+    out = g.sum(min_count=1) if how == "sum" else getattr(g, how)()
+    return out.reset_index()
+
+
+# --------------------------------------------------------------- pandas
+def _mask(df, where):
+    mask = np.ones(len(df), dtype=bool)
+    for col, op, value in where:
+        s = df[col]
+        if op == "==":
+            m = s == value
+        elif op == "!=":
+            m = s != value
+        elif op == "<":
+            m = s < value
+        elif op == "<=":
+            m = s <= value
+        elif op == ">":
+            m = s > value
+        elif op == ">=":
+            m = s >= value
+        elif op == "in":
+            m = s.isin(value)
+        elif op == "not in":
+            m = ~s.isin(value)
+        else:
+            m = s.between(*value)
+        mask &= m.to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+class PandasSource(DataSource):
+    """
+    A DataFrame in memory, behind the :class:`DataSource` interface.
+
+    Widgets given a DataFrame use it directly; this adapter is for code
+    written against sources, and applies ``where=`` to in-memory frames.
+    """
+
+    def __init__(self, df: pd.DataFrame, where=None):
+        super().__init__(where)
+        self.df = df.rename(columns=str)
+
+    @property
+    def columns(self):
+        return list(self.df.columns)
+
+    def _scan(self, columns, where, limit):
+        df = self.df
+        if where:
+            df = df[_mask(df, where)]
+        df = df.loc[:, columns]
+        return df.head(limit) if limit is not None else df
+
+
+# --------------------------------------------------------------- Arrow
+def _arrow_filter(where):
+    expr = None
+    for col, op, value in where:
+        f = pads.field(col)
+        if op == "==":
+            e = f == _py(value)
+        elif op == "!=":
+            e = f != _py(value)
+        elif op == "<":
+            e = f < _py(value)
+        elif op == "<=":
+            e = f <= _py(value)
+        elif op == ">":
+            e = f > _py(value)
+        elif op == ">=":
+            e = f >= _py(value)
+        elif op == "in":
+            e = f.isin([_py(v) for v in value])
+        elif op == "not in":
+            e = ~f.isin([_py(v) for v in value])
+        else:
+            e = (f >= _py(value[0])) & (f <= _py(value[1]))
+        expr = e if expr is None else expr & e
+    return expr
+
+
+class ArrowSource(DataSource):
+    """
+    A :mod:`pyarrow.dataset` dataset: Parquet, Feather/IPC or CSV files.
+
+    Only the requested columns are read, and filters are pushed into the
+    scan, so Parquet row groups whose statistics exclude the filter are
+    skipped. Groups are summed by Arrow before the result becomes pandas.
+
+    Parameters
+    ----------
+    data : str, path, list of paths, pyarrow.dataset.Dataset or pyarrow.Table
+        Files or directory (hive partitions are recognised), or an
+        already opened dataset.
+    format : str, default "parquet"
+        File format for paths (``"parquet"``, ``"ipc"``, ``"csv"``).
+    where : filter, optional
+        Predicates applied to every query.
+    """
+
+    def __init__(self, data, format="parquet", where=None):
+        if pads is None:
+            raise ImportError("pyarrow es necesario para ArrowSource")
+        super().__init__(where)
+        if isinstance(data, pa.Table):
+            data = pads.dataset(data)
+        elif not isinstance(data, pads.Dataset):
+            data = pads.dataset(data, format=format, partitioning="hive")
+        self.dataset = data
+
+    @property
+    def columns(self):
+        return list(self.dataset.schema.names)
+
+    def _scan(self, columns, where, limit):
+        expr = _arrow_filter(where)
+        if limit is not None:
+            table = self.dataset.head(limit, columns=columns, filter=expr)
+        else:
+            table = self.dataset.to_table(columns=columns, filter=expr)
+        return table.to_pandas()
+
+    def _aggregate(self, by, columns, how, where):
+        table = self.dataset.to_table(columns=list(dict.fromkeys([*by, *columns])),
+                                      filter=_arrow_filter(where))
+        if not columns:
+            out = table.group_by(by).aggregate([]).to_pandas()
+            return out.dropna().sort_values(by).reset_index(drop=True)
+        fn = {"sum": "sum", "mean": "mean", "min": "min", "max": "max", "count": "count"}[how]
+        # min_count=1: un grupo sin valores queda nulo, como en pandas/SQL
+        aggs = [(c, fn, _agg_options(fn)) for c in columns]
+        out = table.group_by(by).aggregate(aggs).to_pandas()
+        out = out.rename(columns={f"{c}_{fn}": c for c in columns})
+        out = out.dropna(subset=by).sort_values(by).reset_index(drop=True)
+        return out[[*by, *columns]]
+
+    def count(self, where=None):
+        return self.dataset.count_rows(filter=_arrow_filter(self.where + normalize_where(where)))
+
+
+def _agg_options(fn):
+    """Aggregation options matching pandas/SQL null handling."""
+    import pyarrow.compute as pc
+
+    if fn == "sum":
+        return pc.ScalarAggregateOptions(skip_nulls=True, min_count=1)
+    if fn == "count":
+        return pc.CountOptions(mode="only_valid")
+    return pc.ScalarAggregateOptions(skip_nulls=True)
+
+
+def ParquetSource(path, where=None):
+    """:class:`ArrowSource` over Parquet file(s) or a directory."""
+    return ArrowSource(path, format="parquet", where=where)
+
+
+# --------------------------------------------------------------- SQL
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_where(where):
+    parts, params = [], []
+    for col, op, value in where:
+        c = _quote(col)
+        if op in ("in", "not in"):
+            if not value:
+                parts.append("1 = 0" if op == "in" else "1 = 1")
+                continue
+            parts.append(f"{c} {op.upper()} ({', '.join('?' * len(value))})")
+            params += [_py(v) for v in value]
+        elif op == "between":
+            parts.append(f"{c} BETWEEN ? AND ?")
+            params += [_py(value[0]), _py(value[1])]
+        else:
+            parts.append(f"{c} {'=' if op == '==' else op} ?")
+            params.append(_py(value))
+    return (" WHERE " + " AND ".join(parts) if parts else ""), params
+
+
+class SQLSource(DataSource):
+    """
+    A table (or view) in a local SQLite or DuckDB file.
+
+    Projections, filters and ``GROUP BY`` aggregates become one SQL query
+    per request; only its result is loaded into pandas.
+
+    Parameters
+    ----------
+    path : str or path
+        Database file. ``":memory:"`` works for tests.
+    table : str
+        Table or view name.
+    engine : {None, "sqlite", "duckdb"}, optional
+        Default: ``"duckdb"`` for ``.duckdb`` / ``.ddb`` files, else
+        ``"sqlite"``.
+    where : filter, optional
+        Predicates applied to every query.
+    connection : optional
+        An open ``sqlite3`` / ``duckdb`` connection to use instead of
+        opening ``path``.
+
+    Queries may come from several threads (background builds run in a
+    pool) and :meth:`filter` views share the source's connections, so
+    every thread gets its own: a DuckDB cursor of ``connection``, or a
+    new SQLite connection to ``path``. An external SQLite connection and
+    in-memory SQLite databases cannot be reopened per thread; their
+    queries are serialised instead.
+    """
+
+    def __init__(self, path, table, engine=None, where=None, connection=None):
+        super().__init__(where)
+        path = str(path)
+        if engine is None:
+            engine = "duckdb" if path.endswith((".duckdb", ".ddb")) else "sqlite"
+        if engine not in ("sqlite", "duckdb"):
+            raise ValueError("engine must be 'sqlite' or 'duckdb'")
+        if engine == "duckdb" and duckdb is None and connection is None:
+            raise ImportError("duckdb es necesario para SQLSource(engine='duckdb')")
+        self.engine = engine
+        self.table = str(table)
+        self.path = path
+        self._owned = connection is None
+        self.connection = self._connect() if self._owned else connection
+        self._columns = None
+        self._threads()
+
+    def _threads(self):
+        # conexiones por hilo; las vistas de filter() comparten este estado
+        self._local = threading.local()
+        self._local.connection = self.connection
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # para ProcessPoolExecutor / Isea.batch: la conexión se reabre en el worker
+        if not self._owned:
+            raise TypeError("SQLSource with an external connection cannot be pickled")
+        state = dict(self.__dict__)
+        for name in ("connection", "_local", "_lock"):
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.connection = self._connect()
+        self._threads()
+
+    def _connect(self):
+        if self.engine == "duckdb":
+            return duckdb.connect(self.path, read_only=True)
+        return sqlite3.connect(self.path, check_same_thread=False)
+
+    def _shared(self):
+        """True when every thread has to use ``self.connection`` (under ``self._lock``)."""
+        return self.engine == "sqlite" and (not self._owned or self.path == ":memory:"
+                                            or self.path.startswith("file::memory:"))
+
+    def _thread_connection(self):
+        conn = getattr(self._local, "connection", None)
+        if conn is None:
+            conn = self.connection.cursor() if self.engine == "duckdb" else self._connect()
+            self._local.connection = conn
+        return conn
+
+    def _query(self, sql, params=()):
+        if self._shared():
+            with self._lock:
+                return pd.read_sql_query(sql, self.connection, params=list(params))
+        conn = self._thread_connection()
+        if self.engine == "duckdb":
+            return conn.execute(sql, list(params)).df()
+        return pd.read_sql_query(sql, conn, params=list(params))
+
+    @property
+    def columns(self):
+        if self._columns is None:
+            self._columns = [str(c) for c in self._query(f"SELECT * FROM {_quote(self.table)} LIMIT 0").columns]
+        return self._columns
+
+    def _scan(self, columns, where, limit):
+        clause, params = _sql_where(where)
+        sql = f"SELECT {', '.join(map(_quote, columns))} FROM {_quote(self.table)}{clause}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self._query(sql, params)
+
+    def _aggregate(self, by, columns, how, where):
+        clause, params = _sql_where(where)
+        keys = ", ".join(map(_quote, by))
+        fn = {"mean": "AVG"}.get(how, how.upper())
+        aggs = "".join(f", {fn}({_quote(c)}) AS {_quote(c)}" for c in columns)
+        not_null = " AND ".join(f"{_quote(b)} IS NOT NULL" for b in by)
+        clause = f"{clause} AND {not_null}" if clause else f" WHERE {not_null}"
+        sql = (f"SELECT {keys}{aggs} FROM {_quote(self.table)}{clause} "
+               f"GROUP BY {keys} ORDER BY {keys}")
+        return self._query(sql, params)
+
+    def count(self, where=None):
+        clause, params = _sql_where(self.where + normalize_where(where))
+        return int(self._query(f"SELECT COUNT(*) AS n FROM {_quote(self.table)}{clause}", params)["n"][0])
+
+
+def as_source(data):
+    """
+    ``data`` as a :class:`DataSource`, or ``None`` if it is not one.
+
+    Sources pass through; pyarrow tables and datasets are wrapped in an
+    :class:`ArrowSource`. DataFrames and record lists return ``None``:
+    widgets keep their in-memory path for them.
+    """
+    if isinstance(data, DataSource):
+        return data
+    if pads is not None and isinstance(data, (pa.Table, pads.Dataset)):
+        return ArrowSource(data)
+    return None
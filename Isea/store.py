@@ -0,0 +1,321 @@
+"""
+A frame shared by several views in the browser.
+
+Building a scatter, a world map and a linked scatter from the same wide
+frame normally ships three copies of it. A :class:`DataStore` sends the
+frame once, as binary columns. The views that accept a store instead of
+a DataFrame (:class:`~Isea.scatter.ScatterBrush`,
+:class:`~Isea.worldmaplinechart.WorldMapLineChart`) only send their
+options and read the columns from the decoded copy shared by the page::
+
+    store = DataStore(wide, precision=4)
+    sc = ScatterBrush(store, x="EV_sales_share", y="EV_stock_share", key="Country")
+    wm = WorldMapLineChart(store, "StockShare", region_col="Country", label_col="Country")
+
+Column encodings:
+
+- Floats are sent as float64, or float32 with ``dtype="float32"``.
+  ``precision`` rounds them first (see :mod:`Isea.encoding`).
+- Integers that fit in 32 bits are sent as int32. Larger integers and
+  integers with missing values go as float64, unrounded.
+- Booleans are sent as uint8. Datetimes become float milliseconds since
+  the epoch.
+- Everything else is dictionary-encoded: int32 codes plus the list of
+  distinct values as strings. A code of ``-1`` is null.
+
+:meth:`DataStore.update` and :meth:`DataStore.append` send only the
+changed cells or the new rows. The views apply the patch without
+receiving the frame again.
+"""
+import anywidget
+import numpy as np
+import pandas as pd
+import traitlets as T
+from ipywidgets import widget_serialization
+from pathlib import Path
+
+from .encoding import resolve_digits, round_sig
+
+_ASSETS = Path(__file__).parent / "assets"
+
+
+def _store_esm(js_text):
+    """Prepend the DataStore reader helpers (``assets/store.js``) to a view module."""
+    return (_ASSETS / "store.js").read_text(encoding="utf-8") + js_text
+
+
+def _encode(s, digits=None, float32=False, dictionary=None):
+    """
+    Encode one column.
+
+    Returns ``(kind, array, dictionary)``. ``dictionary`` is the list of
+    values of a ``"dict"`` column. An existing list passed in is extended
+    in place, so codes stay stable across updates.
+    """
+    dt = s.dtype
+    if pd.api.types.is_bool_dtype(dt) and not s.isna().any():
+        return "u1", s.to_numpy(dtype=np.uint8), None
+    if pd.api.types.is_integer_dtype(dt) and not s.isna().any():
+        a = s.to_numpy(dtype=np.int64)
+        if a.size == 0 or (a.min() >= -2**31 and a.max() < 2**31):
+            return "i4", a.astype(np.int32), None
+    if pd.api.types.is_datetime64_any_dtype(dt):
+        if s.dt.tz is not None:
+            s = s.dt.tz_convert(None)
+        ms = ((s - pd.Timestamp(0)) / pd.Timedelta(milliseconds=1)).to_numpy(dtype=float, na_value=np.nan)
+        return "f8", ms, None
+    if pd.api.types.is_numeric_dtype(dt):
+        a = s.to_numpy(dtype=float, na_value=np.nan)
+        if pd.api.types.is_float_dtype(dt):
+            # solo las columnas float se redondean (no enteros grandes ni fechas)
+            a = round_sig(a, digits)
+            if float32:
+                return "f4", a.astype(np.float32), None
+        return "f8", a, None
+
+    values = [] if dictionary is None else dictionary
+    obj = s.astype(object)
+    mask = obj.isna().to_numpy()
+    strs = obj[~mask].astype(str)
+    known = set(values)
+    values.extend(v for v in pd.unique(strs) if v not in known)
+    codes = np.full(len(s), -1, dtype=np.int32)
+    codes[~mask] = pd.Index(values).get_indexer(strs)
+    return "dict", codes, values
+
+
+def _changed(old, new):
+    """Boolean mask of positions where two encoded columns differ."""
+    if old.dtype.kind == "f":
+        return ~((old == new) | (np.isnan(old) & np.isnan(new)))
+    return old != new
+
+
+class _Column:
+    __slots__ = ("kind", "array", "values")
+
+    def __init__(self, kind, array, values):
+        self.kind, self.array, self.values = kind, array, values
+
+
+class DataStore(anywidget.AnyWidget):
+    """
+    A DataFrame held once in the browser and shared by several views.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Source frame. Column names are converted to strings.
+    columns : sequence of str, optional
+        Keep only these columns. Defaults to all of them.
+    precision : int, optional
+        Significant digits kept for float columns.
+    dtype : {None, "float64", "float32"}, optional
+        ``"float32"`` sends float columns as float32.
+
+    Displaying the store itself shows a one-line summary.
+    """
+
+    table = T.Dict(default_value={}).tag(sync=True)
+    version = T.Int(0).tag(sync=True)
+
+    def __init__(self, df: pd.DataFrame, columns=None, *, precision=None, dtype=None, **kwargs):
+        super().__init__(**kwargs)
+        self._esm = (_ASSETS / "datastore.js").read_text(encoding="utf-8")
+        self._digits = resolve_digits(precision, dtype)
+        self._float32 = dtype == "float32"
+        self._keep = None if columns is None else [str(c) for c in columns]
+        self.on_msg(self._handle_msg)
+        self.reset(df)
+
+    # ---------------------------------------------------------------
+    @property
+    def frame(self) -> pd.DataFrame:
+        """Current contents (do not modify in place; use :meth:`update`)."""
+        return self._frame
+
+    @property
+    def columns(self):
+        """Column names, in order."""
+        return list(self._frame.columns)
+
+    def __len__(self):
+        return len(self._frame)
+
+    def _select(self, df):
+        df = df.rename(columns=str)
+        if self._keep is not None:
+            df = df.loc[:, [c for c in self._keep if c in df.columns]]
+        return df
+
+    def _encode_frame(self, df):
+        self._cols = {}
+        for name, s in df.items():
+            self._cols[name] = _Column(*_encode(s, self._digits, self._float32))
+
+    def _snapshot(self):
+        columns = {}
+        for name, c in self._cols.items():
+            meta = {"kind": c.kind, "data": c.array.tobytes()}
+            if c.values is not None:
+                meta["values"] = list(c.values)
+            columns[name] = meta
+        return {
+            "version": self.version,
+            "n": len(self._frame),
+            "order": list(self._cols),
+            "columns": columns,
+        }
+
+    def _handle_msg(self, _, content, buffers):
+        # una vista encontró su copia desfasada (p. ej. tras recargar la página)
+        if content.get("type") != "resync":
+            return
+        snap = self._snapshot()
+        if snap == self.table:
+            self.send_state("table")
+        else:
+            self.table = snap
+
+    def _send_patch(self, cols, buffers):
+        base = self.version
+        self.send({
+            "type": "patch",
+            "base": base,
+            "version": base + 1,
+            "n": len(self._frame),
+            "cols": cols,
+        }, buffers=buffers)
+        self.version = base + 1
+
+    # ---------------------------------------------------------------
+    def reset(self, df: pd.DataFrame):
+        """Replace the whole contents (sent in full)."""
+        df = self._select(df)
+        self._frame = df
+        self._encode_frame(df)
+        with self.hold_sync():
+            self.version += 1
+            self.table = self._snapshot()
+
+    def update(self, df: pd.DataFrame):
+        """
+        Update values and send only what changed.
+
+        ``df`` has the same rows (same index, same order) as the store and
+        any subset of its columns; new columns are added. Cells are
+        compared after rounding, so changes below ``precision`` are not
+        sent. Use :meth:`append` to add rows and :meth:`reset` for a
+        frame with different rows.
+
+        Returns
+        -------
+        int
+            Number of changed cells.
+        """
+        df = self._select(df)
+        if not df.index.equals(self._frame.index):
+            raise ValueError("update() needs the same rows as the store; use append() or reset()")
+
+        cols, buffers, count = {}, [], 0
+        frame = self._frame.copy(deep=False)
+        for name, s in df.items():
+            old = self._cols.get(name)
+            dictionary = list(old.values) if old is not None and old.values is not None else None
+            kind, arr, values = _encode(s, self._digits, self._float32, dictionary)
+            frame[name] = s.to_numpy()
+
+            if old is None or old.kind != kind:
+                meta = {"op": "replace", "kind": kind, "data": len(buffers)}
+                buffers.append(arr.tobytes())
+                if values is not None:
+                    meta["values"] = list(values)
+                if old is None:
+                    meta["new"] = True
+                cols[name] = meta
+                self._cols[name] = _Column(kind, arr, values)
+                count += len(arr)
+                continue
+
+            idx = np.flatnonzero(_changed(old.array, arr)).astype(np.int32)
+            if not idx.size:
+                continue
+            count += int(idx.size)
+            meta = {"op": "set"}
+            if values is not None and len(values) > len(old.values):
+                meta["values_add"] = values[len(old.values):]
+            if idx.size * (4 + arr.itemsize) >= arr.nbytes:
+                meta = {"op": "replace", "kind": kind, "data": len(buffers)}
+                buffers.append(arr.tobytes())
+                if values is not None:
+                    meta["values"] = list(values)
+            else:
+                meta["rows"] = len(buffers)
+                meta["data"] = len(buffers) + 1
+                buffers += [idx.tobytes(), arr[idx].tobytes()]
+            cols[name] = meta
+            self._cols[name] = _Column(kind, arr, values)
+
+        self._frame = frame
+        if cols:
+            self._send_patch(cols, buffers)
+        return count
+
+    def append(self, df: pd.DataFrame):
+        """
+        Append rows and send only the new ones.
+
+        ``df`` is aligned to the store's columns; missing columns are
+        null, extra columns are ignored. With the default ``RangeIndex``
+        the new rows are numbered after the existing ones; any other
+        index must stay unique, so that :meth:`update` can match rows.
+
+        Raises
+        ------
+        ValueError
+            If the new rows repeat index labels of the store.
+        """
+        df = self._select(df).reindex(columns=self._frame.columns)
+        if not len(df):
+            return
+        n0 = len(self._frame)
+        index = self._frame.index
+        if isinstance(index, pd.RangeIndex) and index.step == 1:
+            df = df.set_axis(pd.RangeIndex(index.start + n0, index.start + n0 + len(df)))
+        try:
+            frame = pd.concat([self._frame, df], verify_integrity=True)
+        except ValueError:
+            raise ValueError("append() would repeat index labels of the store; use reset()") from None
+
+        cols, buffers = {}, []
+        for name, s in df.items():
+            old = self._cols[name]
+            dictionary = list(old.values) if old.values is not None else None
+            # solo se codifican las filas nuevas; la columna entera solo si cambia de tipo
+            kind, arr, values = _encode(s, self._digits, self._float32, dictionary)
+            if kind == old.kind:
+                arr = np.concatenate([old.array, arr])
+            else:
+                kind, arr, values = _encode(frame[name], self._digits, self._float32,
+                                            None if dictionary is None else list(old.values))
+            if kind != old.kind:
+                meta = {"op": "replace", "kind": kind, "data": len(buffers)}
+                buffers.append(arr.tobytes())
+                if values is not None:
+                    meta["values"] = list(values)
+            else:
+                meta = {"op": "append", "data": len(buffers)}
+                buffers.append(arr[n0:].tobytes())
+                if values is not None and len(values) > len(old.values):
+                    meta["values_add"] = values[len(old.values):]
+            cols[name] = meta
+            self._cols[name] = _Column(kind, arr, values)
+
+        self._frame = frame
+        self._send_patch(cols, buffers)
+
+
+class StoreView(T.HasTraits):
+    """Mixin for widgets that can read their rows from a :class:`DataStore`."""
+
+    store = T.Instance(DataStore, allow_none=True).tag(sync=True, **widget_serialization)
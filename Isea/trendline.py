@@ -3,6 +3,94 @@ import traitlets as T
 from pathlib import Path
 import numpy as np
 
+from .encoding import encode_series, resolve_digits, to_list
+
+
+def _clean_xy(xs, ys):
+    """
+    Turn a pair of array-likes into float arrays without NaN ``y`` values.
+
+    Both inputs are truncated to the shorter length (as ``zip`` would),
+    points whose ``y`` is NaN/``None`` are dropped with a single mask and
+    the result is sorted by ``x`` so it can be sliced and bisected.
+    """
+    if xs is None or ys is None:
+        return np.empty(0), np.empty(0)
+    x = np.asarray(xs, dtype=float).ravel()
+    y = np.asarray(ys, dtype=float).ravel()
+    n = min(len(x), len(y))
+    x, y = x[:n], y[:n]
+    keep = ~np.isnan(y)
+    x, y = x[keep], y[keep]
+    if len(x) > 1 and np.any(np.diff(x) < 0):
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+    return x, y
+
+
+def _lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, for each of the ``n_out - 2``
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket. Series that
+    already have ``n_out`` points or fewer are returned unchanged.
+    """
+    n = len(x)
+    if n_out < 3 or n <= n_out:
+        return x, y
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    idx = np.empty(n_out, dtype=np.intp)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+    return x[idx], y[idx]
+
+
+class _RingBuffer:
+    """
+    Fixed-capacity x/y buffer used by :meth:`D3TrendLine.append`.
+
+    Storage is allocated once; once full, new points overwrite the oldest
+    ones, so memory stays constant however long a series is streamed.
+    """
+
+    def __init__(self, capacity):
+        self.x = np.empty(int(capacity))
+        self.y = np.empty(int(capacity))
+        self.start = 0
+        self.size = 0
+
+    def extend(self, xs, ys):
+        cap = len(self.x)
+        if len(xs) >= cap:
+            xs, ys = xs[-cap:], ys[-cap:]
+            self.start, self.size = 0, 0
+        n = len(xs)
+        idx = (self.start + self.size + np.arange(n)) % cap
+        self.x[idx] = xs
+        self.y[idx] = ys
+        overflow = max(0, self.size + n - cap)
+        self.start = (self.start + overflow) % cap
+        self.size = min(cap, self.size + n)
+
+    def last_x(self):
+        """Return the x of the newest point (``None`` when empty)."""
+        return self.x[(self.start + self.size - 1) % len(self.x)] if self.size else None
+
+    def arrays(self):
+        """Return the buffered points, oldest first, as ``(x, y)``."""
+        idx = (self.start + np.arange(self.size)) % len(self.x)
+        return self.x[idx], self.y[idx]
+
+
 class D3TrendLine(anywidget.AnyWidget):
     """
     Interactive multi-series trend line widget with optional predictions.
@@ -27,10 +115,19 @@ class D3TrendLine(anywidget.AnyWidget):
           {
               "id": "<series_label>",
               "color": "<CSS_color_or_None>",
-              "history": [{"x": <num>, "y": <num>}, ...],
-              "prediction": [{"x": <num>, "y": <num>}, ...],
+              "history": {"x": [<num>, ...], "y": [<num>, ...]},
+              "prediction": {"x": [<num>, ...], "y": [<num>, ...]},
           }
 
+    - With ``downsample`` enabled, each segment is reduced with
+      Largest-Triangle-Three-Buckets (LTTB) to about one point per pixel
+      of plot width. The full-resolution arrays stay in Python; when the
+      user zooms (mouse wheel / drag on the plot) the JS view asks for the
+      visible x-range and receives it re-sampled from the full data.
+    - For live metrics, :meth:`append` adds points to a series without
+      resending anything else: each series keeps its last ``window``
+      points in a fixed-size NumPy ring buffer and only the new points
+      travel to the browser, where the path is extended in place.
     - The JavaScript module in ``assets/trendline.js`` reads
       ``model.get("data")`` and ``model.get("options")`` to draw the
       chart with D3, including axes, legend, tooltips and series toggling.
@@ -49,6 +146,8 @@ class D3TrendLine(anywidget.AnyWidget):
         - ``margin``: dict with ``top``, ``right``, ``bottom``, ``left``.
         - ``xLabel``: label for the x-axis (e.g. "Year").
         - ``yLabel``: label for the y-axis (e.g. "TWh").
+        - ``downsample``: whether the view should request re-sampled
+          ranges from Python when zooming.
 
         Any extra keys supplied via ``**kwargs`` in ``__init__`` are
         forwarded unchanged and can be used to extend the JS API.
@@ -56,7 +155,9 @@ class D3TrendLine(anywidget.AnyWidget):
     data = T.List(default_value=[]).tag(sync=True)
     options = T.Dict(default_value={}).tag(sync=True)
     
-    def __init__(self, data=None, title="Trend Analysis", width=800, height=400, **kwargs):
+    def __init__(self, data=None, title="Trend Analysis", width=800, height=400,
+                 downsample=None, window=10_000, precision=None, dtype=None,
+                 delta=False, **kwargs):
         """
         Initialise a D3TrendLine widget and optionally load time series data.
 
@@ -81,8 +182,8 @@ class D3TrendLine(anywidget.AnyWidget):
               ``"steelblue"``). If omitted, the JS side picks a colour.
 
             The x/y arrays can be plain Python lists, NumPy arrays or
-            pandas Series; :meth:`set_data` will convert them to lists and
-            drop any points where ``y`` is NaN.
+            pandas Series; :meth:`set_data` will convert them to NumPy
+            arrays and drop any points where ``y`` is NaN.
 
             If ``data`` is provided, :meth:`set_data` is called
             immediately to populate ``self.data``. If ``None``, the
@@ -97,6 +198,30 @@ class D3TrendLine(anywidget.AnyWidget):
         height : int, default 400
             Total height of the SVG, in pixels.
 
+        downsample : bool, int or None, default None
+            Optional LTTB downsampling for long series. ``True`` keeps
+            about one point per pixel of plot width; an ``int`` sets the
+            number of points per segment explicitly. ``None``/``False``
+            sends every point.
+
+        window : int, default 10000
+            Maximum number of history points kept per series by
+            :meth:`append`. The Python ring buffer and the browser copy
+            both keep the last ``window`` points; older ones are dropped.
+
+        precision : int, optional
+            Significant digits kept for the ``y`` values sent to the
+            browser. ``x`` values (years, timestamps) are never rounded.
+
+        dtype : {None, "float64", "float32"}, optional
+            ``"float32"`` rounds ``y`` values to float32 precision
+            (7 digits).
+
+        delta : bool, default False
+            Send segment arrays delta-encoded (``{"e": k, "d": [...]}``,
+            see :mod:`Isea.encoding`). Evenly spaced years become
+            ``[2010, 1, 1, ...]``.
+
         **kwargs :
             Additional configuration options forwarded to ``self.options``.
             Typical keys include:
@@ -116,6 +241,13 @@ class D3TrendLine(anywidget.AnyWidget):
           than giving it a raw DataFrame.
         """
         super().__init__()
+        self._downsample = downsample
+        self._window = int(window)
+        self._digits = resolve_digits(precision, dtype)
+        self._delta = bool(delta)
+        self._series = []
+        self._streamed = False
+        self.on_msg(self._handle_msg)
 
         js_path = Path(__file__).parent / "assets" / "trendline.js"
         if js_path.exists():
@@ -134,6 +266,7 @@ class D3TrendLine(anywidget.AnyWidget):
             "margin": {"top": 50, "right": 150, "bottom": 50, "left": 60},
             "yLabel": kwargs.get("yLabel", "Value"),
             "xLabel": kwargs.get("xLabel", "Year"),
+            "downsample": bool(downsample),
             **kwargs
         }
         
@@ -146,7 +279,7 @@ class D3TrendLine(anywidget.AnyWidget):
 
         This method takes a list of **raw series definitions** and
         converts them into the clean structure expected by the frontend
-        (history + prediction segments with ``x``/``y`` pairs).
+        (history + prediction segments as parallel ``x``/``y`` arrays).
 
         Parameters
         ----------
@@ -165,65 +298,154 @@ class D3TrendLine(anywidget.AnyWidget):
             - ``"label"``: string label for the series (used as ``"id"``).
             - ``"color"``: optional CSS colour string.
 
-            The x/y arrays may be:
-
-            - Python lists,
-            - NumPy arrays,
-            - pandas Series,
-            - or any iterable. 
-
-            Internally they are converted to lists via a small helper
-            that first tries ``.tolist()`` and otherwise wraps with
-            ``list(...)``. For each segment, points where ``y`` is NaN
-            (according to :func:`numpy.isnan`) are dropped.
+            The x/y arrays may be Python lists, NumPy arrays, pandas
+            Series or anything :func:`numpy.asarray` accepts; values must
+            be numeric (``None`` counts as missing).
 
         Behaviour
         ---------
-        For every series ``s`` in ``series_list`` this method builds:
+        Each segment is cleaned with NumPy in one pass: ``x`` and ``y``
+        are cast to float, truncated to a common length, points where
+        ``y`` is NaN are dropped with a boolean mask and the points are
+        sorted by ``x``. The cleaned full-resolution arrays are kept on
+        the widget; ``self.data`` receives them (LTTB-reduced when
+        ``downsample`` is enabled) as:
 
         .. code-block:: python
 
-            hist = [
-                {"x": x, "y": y}
-                for x, y in zip(history_x, history_y)
-                if not np.isnan(y)
-            ]
-
-            pred = [
-                {"x": x, "y": y}
-                for x, y in zip(pred_x, pred_y)
-                if not np.isnan(y)
-            ]
-
-            clean_data.append({
+            {
                 "id": s.get("label", "Unknown"),
                 "color": s.get("color"),
-                "history": hist,
-                "prediction": pred,
-            })
-
-        and finally assigns ``self.data = clean_data``.
+                "history": {"x": [...], "y": [...]},
+                "prediction": {"x": [...], "y": [...]},
+            }
 
         Notes
         -----
-        - Only y-values are checked for NaN; x-values are kept as-is.
+        - Only y-values are checked for NaN; points are never dropped
+          for their x-value, only reordered so that x is increasing.
         - After calling this method, ``self.data`` is ready to be
           consumed by the D3 code in ``trendline.js`` without further
           transformation.
         """
-        def to_list(arr):
-            if hasattr(arr, "tolist"):
-                return arr.tolist()
-            return list(arr) if arr is not None else []
-
-        clean_data = []
-        for s in series_list:
-            hist = [{"x": x, "y": y} for x, y in zip(to_list(s.get("history_x")), to_list(s.get("history_y"))) if not np.isnan(y)]
-            pred = [{"x": x, "y": y} for x, y in zip(to_list(s.get("pred_x")), to_list(s.get("pred_y"))) if not np.isnan(y)]
-            clean_data.append({
+        self._series = [
+            {
                 "id": s.get("label", "Unknown"),
                 "color": s.get("color"),
-                "history": hist,
-                "prediction": pred
-            })
-        self.data = clean_data
\ No newline at end of file
+                "history": _clean_xy(s.get("history_x"), s.get("history_y")),
+                "prediction": _clean_xy(s.get("pred_x"), s.get("pred_y")),
+            }
+            for s in series_list
+        ]
+        self._streamed = False
+        self.data = self._payload()
+
+    def append(self, label, xs, ys, color=None):
+        """
+        Stream new points into the history of one series.
+
+        Parameters
+        ----------
+        label : str
+            Series id. A new series is created if it does not exist yet.
+        xs, ys : array-like or scalar
+            New x/y values, in increasing ``x`` order after the existing
+            points. Points with NaN ``y`` are dropped.
+        color : str, optional
+            CSS colour, only used when the series is created.
+
+        Raises
+        ------
+        ValueError
+            If the new points start before the last point of the series.
+
+        Notes
+        -----
+        The series history is kept in a ring buffer of ``window`` points.
+        Only the new points are sent to the browser (as a custom message);
+        ``self.data`` is not reassigned, so there is no full resync. Views
+        displayed later ask for a snapshot of the current buffers.
+        """
+        x, y = _clean_xy(np.atleast_1d(xs), np.atleast_1d(ys))
+        series = next((s for s in self._series if s["id"] == label), None)
+        if series is None:
+            series = {"id": label, "color": color,
+                      "history": _RingBuffer(self._window),
+                      "prediction": (np.empty(0), np.empty(0))}
+            self._series.append(series)
+        elif not isinstance(series["history"], _RingBuffer):
+            ring = _RingBuffer(self._window)
+            ring.extend(*series["history"])
+            series["history"] = ring
+        if not len(x):
+            return
+        last = series["history"].last_x()
+        if last is not None and x[0] < last:
+            # el buffer y las búsquedas binarias (Python y JS) suponen x creciente
+            raise ValueError(f"append(): x={x[0]:g} comes before the last point of {label!r} (x={last:g})")
+        series["history"].extend(x, y)
+        self._streamed = True
+        self.send({"type": "append", "id": label, "color": series["color"],
+                   "x": x.tolist(), "y": to_list(y, self._digits), "window": self._window})
+
+    def _target_points(self):
+        """Number of points per segment after LTTB, or ``None`` if off."""
+        ds = self._downsample
+        if not ds:
+            return None
+        if ds is not True:
+            return int(ds)
+        m = self.options.get("margin") or {}
+        width = self.options.get("width", 800)
+        return max(3, int(width - m.get("left", 0) - m.get("right", 0)))
+
+    def _payload(self, x0=None, x1=None):
+        """
+        Build the JSON payload, optionally limited to ``[x0, x1]``.
+
+        Range slices keep one point on each side so lines continue to the
+        edge of the plot; each slice is LTTB-reduced when downsampling.
+        """
+        n_out = self._target_points()
+
+        def segment(xy):
+            x, y = xy.arrays() if isinstance(xy, _RingBuffer) else xy
+            if x0 is not None and x1 is not None and len(x):
+                lo = max(0, int(np.searchsorted(x, x0, side="left")) - 1)
+                hi = min(len(x), int(np.searchsorted(x, x1, side="right")) + 1)
+                x, y = x[lo:hi], y[lo:hi]
+            if n_out:
+                x, y = _lttb(x, y, n_out)
+            return {"x": encode_series(x, None, self._delta),
+                    "y": encode_series(y, self._digits, self._delta)}
+
+        return [
+            {
+                "id": s["id"],
+                "color": s["color"],
+                "history": segment(s["history"]),
+                "prediction": segment(s["prediction"]),
+            }
+            for s in self._series
+        ]
+
+    def _handle_msg(self, _widget, content, _buffers):
+        """
+        Answer zoom and sync requests from the JS view.
+
+        ``{"type": "sync"}`` (sent when a view is rendered) is answered
+        with a snapshot of the streamed series. For zoom, the view sends ``{"type": "range", "x0": ..., "x1": ..., "seq": n}``
+        and gets back ``{"type": "range", "seq": n, "data": [...]}`` with
+        every series re-sampled from the points inside that range.
+        """
+        if not isinstance(content, dict):
+            return
+        if content.get("type") == "sync":
+            # vista nueva: enviar el estado actual de los buffers de streaming
+            if self._streamed:
+                self.send({"type": "snapshot", "data": self._payload()})
+            return
+        if content.get("type") != "range":
+            return
+        x0, x1 = float(content["x0"]), float(content["x1"])
+        self.send({"type": "range", "seq": content.get("seq"), "data": self._payload(x0, x1)})
\ No newline at end of file
@@ -41,7 +41,10 @@ def ensure_bus():
 
     The JavaScript parts of the Isea visualisations can then use
     ``window.IseaBus`` to coordinate interactions (e.g. selecting a
-    country in one view and reacting in another).
+    country in one view and reacting in another). Widgets with a
+    ``link_group`` publish ``isea:select`` / ``isea:filter`` events on it
+    (and create the bus themselves if this function was not called); see
+    :mod:`Isea.linking`.
     """
     display(Javascript(r"""
     (function(){
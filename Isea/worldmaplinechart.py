@@ -8,8 +8,18 @@ import pandas as pd
 import anywidget
 import traitlets as T
 from pathlib import Path
+from functools import lru_cache
 from importlib.resources import files
 
+from .animation import Animated, _anim_esm
+from .background import BackgroundBuild, default_executor
+from .compute import _compute_esm
+from .encoding import encode_series, resolve_digits, round_sig
+from .geo import feature_iso3, resolve_iso3, world_join
+from .linking import LinkedSelection, _linked_esm
+from .sources import DataSource, PandasSource, as_source
+from .store import DataStore, StoreView, _store_esm
+
 # ---------------------------------------------------------------
 # ISO3 mapping
 # ---------------------------------------------------------------
@@ -70,8 +80,142 @@ ISO3_MAP = {
 }
 
 
+def _metric_records(df, metric, year_prefix, iso3_col, label_col, region_col=None,
+                    digits=None, delta=False):
+    """
+    Build the ``records`` list and sorted year list for one metric.
+
+    Module-level and free of widget state so it can run in a background
+    executor or a worker process; see
+    :meth:`WorldMapLineChart._rebuild_records` for the record format.
+    When ``iso3_col`` is ``None`` the codes are derived from
+    ``region_col`` with :func:`Isea.geo.resolve_iso3`. ``digits`` / ``delta`` control the
+    encoding of each ``values`` series (see :mod:`Isea.encoding`).
+    """
+    pat = re.compile(rf"^{metric}{year_prefix}(\d{{4}})$")
+    years = []
+
+    for col in df.columns:
+        m = pat.match(str(col))
+        if m:
+            years.append(int(m.group(1)))
+
+    years = sorted(years)
+    if not years:
+        raise ValueError(f"No columns found for metric: {metric}")
+
+    if iso3_col is None:
+        iso3 = resolve_iso3(df[region_col])
+    else:
+        iso3 = df[iso3_col]
+
+    cols = [f"{metric}{year_prefix}{y}" for y in years]
+    block = round_sig(df[cols].astype(float).to_numpy(), digits)
+    if delta:
+        series = [encode_series(row, digits, True) for row in block]
+    else:
+        series = [[None if v != v else v for v in row] for row in block.tolist()]
+
+    records = []
+    for code, name, values in zip(iso3.astype(str), df[label_col].astype(str), series):
+        records.append({
+            "iso3": code,
+            "name": name,
+            "values": values
+        })
+
+    return records, years
+
+
+def _world_pack(df, metric, year_prefix, iso3_col, label_col, region_col=None,
+                digits=None, delta=False):
+    """
+    ``data`` package for :class:`WorldMapLineChart`, without the world
+    GeoJSON (which the widget attaches itself, see :func:`_world_geojson`).
+    """
+    records, years = _metric_records(df, metric, year_prefix, iso3_col, label_col, region_col,
+                                     digits, delta)
+    return {
+        "years": [f"F{y}" for y in years],
+        "years_num": years,
+        "records": records,
+        **_join_pack(records),
+    }
+
+
+def _join_pack(records):
+    """
+    Map feature -> record index (``-1``: no data), so the view never looks
+    records up by ISO3 while drawing. ``n_records`` lets it check the join
+    still matches the records it has.
+    """
+    feature_rows, _ = world_join([r["iso3"] for r in records])
+    return {"feature_rows": feature_rows.tolist(), "n_records": len(records)}
+
+
+def _source_pack(source, metric, year_prefix, iso3_col, label_col, region_col=None,
+                 digits=None, delta=False):
+    """
+    :func:`_world_pack` for a :class:`~Isea.sources.DataSource`.
+
+    Only the key columns and the year columns of ``metric`` are read, with
+    the source's own filters, so switching metric reads one metric at a
+    time instead of keeping every metric-year column in the kernel.
+    """
+    pat = re.compile(rf"^{metric}{year_prefix}(\d{{4}})$")
+    years = [c for c in source.columns if pat.match(c)]
+    if not years:
+        raise ValueError(f"No columns found for metric: {metric}")
+    keys = [c for c in (iso3_col or region_col, label_col) if c is not None]
+    df = source.scan([*keys, *years])
+    return _world_pack(df, metric, year_prefix, iso3_col, label_col, region_col, digits, delta)
+
+
+def _store_pack(columns, metric, year_prefix, iso3_col, label_col, region_col=None,
+                regions=None):
+    """
+    ``data`` package for a map that reads its rows from a
+    :class:`~Isea.store.DataStore`: years plus the column names the view
+    reads from the store, instead of ``records``. Without ``iso3_col`` the
+    view maps ``region_col`` through ``iso3_map``, resolved here for the
+    distinct ``regions``. Store rows can change in the browser, so the view
+    joins them to the map features itself, using ``feature_iso3``.
+    """
+    pat = re.compile(rf"^{metric}{year_prefix}(\d{{4}})$")
+    years = sorted(int(m.group(1)) for m in map(pat.match, map(str, columns)) if m)
+    if not years:
+        raise ValueError(f"No columns found for metric: {metric}")
+
+    pack = {
+        "years": [f"F{y}" for y in years],
+        "years_num": years,
+        "columns": [f"{metric}{year_prefix}{y}" for y in years],
+        "label_col": label_col,
+    }
+    if iso3_col is None:
+        names = pd.unique(pd.Series(regions if regions is not None else [], dtype=object).dropna())
+        pack["region_col"] = region_col
+        # ISO3_MAP too, for rows appended to the store later
+        pack["iso3_map"] = {**ISO3_MAP, **dict(zip(map(str, names), resolve_iso3(names)))}
+    else:
+        pack["iso3_col"] = iso3_col
+    pack["feature_iso3"] = feature_iso3()
+    return pack
+
+
+@lru_cache(maxsize=1)
+def _world_geojson():
+    """World GeoJSON from ``Isea.assets/world.geojson``, parsed once per process."""
+    return json.loads((files("Isea.assets") / "world.geojson").read_text())
+
+
+def _geometry_esm(js_text):
+    """Prepend the canvas map geometry cache (``assets/geometry.js``) to a view module."""
+    return (files("Isea.assets") / "geometry.js").read_text(encoding="utf-8") + js_text
+
+
 # ---------------------------------------------------------------
-class WorldMapLineChart(anywidget.AnyWidget):
+class WorldMapLineChart(Animated, BackgroundBuild, LinkedSelection, StoreView, anywidget.AnyWidget):
     """
     Linked world map + line chart for EV metrics with year slider and metric switch.
 
@@ -158,7 +302,7 @@ class WorldMapLineChart(anywidget.AnyWidget):
     # ================================
     def __init__(
         self,
-        df: pd.DataFrame,
+        df: "pd.DataFrame | DataStore | DataSource",
         metric: str,
         region_col="region",
         label_col="label",
@@ -169,6 +313,11 @@ class WorldMapLineChart(anywidget.AnyWidget):
         height=650,
         title="",
         subtitle="",
+        precision=None,
+        dtype=None,
+        delta=False,
+        map_mode="svg",
+        where=None,
         **kwargs
     ):
         """
@@ -176,9 +325,17 @@ class WorldMapLineChart(anywidget.AnyWidget):
 
         Parameters
         ----------
-        df : pandas.DataFrame
+        df : pandas.DataFrame or DataStore
             Source table containing one row per country (or region) and
-            one column per metric-year combination. It must include:
+            one column per metric-year combination. A
+            :class:`~Isea.store.DataStore` is read in the browser from the
+            copy shared with other views: only the column names are sent
+            for this widget, store updates recolour the map, and
+            ``precision``/``dtype``/``delta`` are those of the store. A
+            :class:`~Isea.sources.DataSource` (Parquet, SQLite, DuckDB...)
+            is queried for the key columns and the year columns of the
+            current metric only, again on every metric switch. It must
+            include:
 
             - ``region_col`` (default ``"region"``):
               human-readable country/region name, e.g. "Netherlands",
@@ -224,12 +381,14 @@ class WorldMapLineChart(anywidget.AnyWidget):
             If provided, this column must contain ISO3 codes (e.g. "NLD",
             "NOR"). If ``None``, the constructor will:
 
-            - Map ``df[region_col]`` to ISO3 using the built-in ``ISO3_MAP``.
+            - Map ``df[region_col]`` to ISO3 with
+              :func:`Isea.geo.resolve_iso3` (``ISO3_MAP`` plus a large
+              alias table).
             - Store the result in a temporary column ``"_iso3"``.
             - Use that as ``self.iso3_col`` for the rest of the widget.
 
-            Any region names not found in ``ISO3_MAP`` are mapped to
-            ``"UNK"`` and will not match countries in the world GeoJSON.
+            Region names that cannot be resolved are mapped to ``"UNK"``
+            and will not match countries in the world GeoJSON.
 
         year_prefix : str, default "__F"
             Separator between the metric name and the 4-digit year in the
@@ -249,79 +408,158 @@ class WorldMapLineChart(anywidget.AnyWidget):
         subtitle : str, optional
             Subtitle or explanatory text displayed under the main title.
 
+        precision : int, optional
+            Significant digits kept for the values sent to the browser.
+            ``None`` sends full precision.
+
+        dtype : {None, "float64", "float32"}, optional
+            ``"float32"`` rounds values to float32 precision (7 digits).
+
+        delta : bool, default False
+            Send each country's ``values`` as a delta-encoded series
+            (``{"e": k, "d": [...]}``, see :mod:`Isea.encoding`) instead
+            of a list. The JS view decodes it on load.
+
+        map_mode : {"svg", "canvas"}, default "svg"
+            How the choropleth is drawn. ``"svg"`` creates one path per
+            country. ``"canvas"`` paints every country on one canvas from
+            projected ``Path2D`` shapes that are cached per size and shared
+            by the maps on the page, and resolves hover/click on an
+            offscreen colour-ID canvas. Moving the year slider then only
+            repaints fills, which keeps several maps on one page fluid.
+
+        where : filter, optional
+            Rows to show, as ``(column, op, value)`` predicates or a
+            ``{column: value}`` mapping (see :mod:`Isea.sources`). With a
+            source the filter runs in the source. Not supported with a
+            ``DataStore``.
+
         **kwargs :
             Additional keyword arguments forwarded to ``anywidget.AnyWidget``,
-            such as ``_model_name`` or internal traits. They are passed to
+            such as ``_model_name`` or internal traits, and the linking
+            traits ``link_group`` / ``sync_selection``: views of the same
+            group share selections in the browser, matched by ISO3 code or
+            country name (see :mod:`Isea.linking`). They are passed to
             ``super().__init__(**kwargs)`` unchanged.
 
         Behaviour
         ---------
         The constructor:
 
-        1. Copies ``df`` internally (``self.df``) and stores column
-           name parameters as attributes.
+        1. Stores a column projection of ``df`` (``self.df``: the
+           region/label/id/ISO3 columns plus every ``*{year_prefix}YYYY``
+           column) and the column name parameters as attributes. A
+           :class:`~Isea.sources.DataSource` is kept as ``self.source``
+           instead, and nothing is read from it yet.
         2. If ``iso3_col`` is ``None``, maps ``region_col`` to ISO3 codes
-           using ``ISO3_MAP``.
+           with :func:`Isea.geo.resolve_iso3`.
         3. Calls :meth:`_rebuild_records(self.metric)` to build the
            ``records`` list and the sorted list of numeric years.
         4. Loads the world GeoJSON from ``Isea.assets/world.geojson``.
         5. Stores the result in ``self.data`` and sets initial options
            in ``self.options`` (metric, width/height, current year index,
-           title, subtitle).
+           title, subtitle, map mode).
         6. Loads the JavaScript implementation from
            ``assets/worldmaplinechart.js`` into ``self._esm`` (stripping
            a UTF-8 BOM if present).
+
+        Step 3 is done by :func:`_world_pack` (:func:`_source_pack` for a
+        source). When the widget is
+        created with ``WorldMapLineChart.build_async(df, metric, ...)``
+        they run in a background executor and the view shows a loading
+        placeholder until the data arrives.
         """
+        if map_mode not in ("svg", "canvas"):
+            raise ValueError("map_mode must be 'svg' or 'canvas'")
+        if where is not None and isinstance(df, DataStore):
+            raise ValueError("where is not supported with a DataStore")
         super().__init__(**kwargs)
 
-        self.df = df.copy()
         self.region_col = region_col
         self.label_col = label_col
         self.id_col = id_col
         self.year_prefix = year_prefix
 
-        if iso3_col is None:
-            self.df["_iso3"] = self.df[region_col].map(ISO3_MAP).fillna("UNK")
-            self.iso3_col = "_iso3"
-        else:
+        source = as_source(df)
+        if source is None and where is not None and not isinstance(df, DataStore):
+            df = PandasSource(df, where).scan()
+        self.source = source.filter(where) if source is not None else None
+
+        # Keep only the key columns and the metric-year columns any
+        # set_metric() call could need, instead of a full copy of df
+        if self.source is not None:
+            # filas en la fuente: se leen por métrica, ver _source_pack
+            self.df = None
+            self.iso3_col = iso3_col
+        elif isinstance(df, DataStore):
+            # filas en un DataStore compartido: el navegador lee sus columnas
+            self.store = df
+            self.df = None
             self.iso3_col = iso3_col
+        else:
+            year_pat = re.compile(rf"{re.escape(year_prefix)}\d{{4}}$")
+            keep = [region_col, label_col, id_col, iso3_col]
+            keep += [c for c in df.columns if year_pat.search(str(c))]
+            cols = {c: df[c] for c in dict.fromkeys(keep) if c is not None and c in df.columns}
+
+            if iso3_col is None:
+                cols["_iso3"] = resolve_iso3(df[region_col])
+                self.iso3_col = "_iso3"
+            else:
+                self.iso3_col = iso3_col
+            self.df = pd.DataFrame(cols, index=df.index)
 
         self.metric = metric
         self.width = width
         self.height = height
         self.title = title or metric
         self.subtitle = subtitle
-
-        # Build initial records
-        data_dict, years = self._rebuild_records(self.metric)
-
-        # Load world geojson
-        world_text = (files("Isea.assets") / "world.geojson").read_text()
-        world_obj = json.loads(world_text)
-
-        # Push to JS
-        self.data = {
-            "years": [f"F{y}" for y in years],
-            "years_num": years,
-            "records": data_dict,
-            "world": world_obj,
-        }
+        self._digits = resolve_digits(precision, dtype)
+        self._delta = bool(delta)
 
         self.options = {
             "metric": self.metric,
             "width": width,
             "height": height,
-            "idx_now": len(years) - 1,
+            "idx_now": None,
             "title": self.title,
             "subtitle": self.subtitle,
+            "map_mode": map_mode,
         }
 
+        # Build initial records + world geojson and push to JS
+        if self.store is not None:
+            self._set_pack(self._store_pack(self.metric))
+        elif self.source is not None:
+            self._run_build(
+                _source_pack, self.source, self.metric, self.year_prefix, iso3_col, self.label_col,
+                region_col, self._digits, self._delta,
+                apply=self._set_pack,
+            )
+        else:
+            self._run_build(
+                _world_pack, df, self.metric, self.year_prefix, iso3_col, self.label_col, region_col,
+                self._digits, self._delta,
+                apply=self._set_pack,
+            )
+
         js_path = Path(__file__).parent / "assets" / "worldmaplinechart.js"
         # Read JS and strip a possible UTF-8 BOM so anywidget doesn't choke on it
         js_text = js_path.read_text(encoding="utf-8")
         if js_text.startswith("\ufeff"):
             js_text = js_text.lstrip("\ufeff")
-        self._esm = js_text
+        self._esm = _anim_esm(_compute_esm(_store_esm(_linked_esm(_geometry_esm(js_text)))))
+
+    def _store_pack(self, metric):
+        regions = None
+        if self.iso3_col is None and self.region_col in self.store.columns:
+            regions = self.store.frame[self.region_col]
+        return _store_pack(self.store.columns, metric, self.year_prefix, self.iso3_col,
+                           self.label_col, self.region_col, regions)
+
+    def _set_pack(self, pack):
+        self.data = {**pack, "world": _world_geojson()}
+        self.options = {**self.options, "idx_now": len(pack["years_num"]) - 1}
 
 
     # ============================================================
@@ -376,36 +614,12 @@ class WorldMapLineChart(anywidget.AnyWidget):
         ValueError
             If no columns in ``self.df`` match the metric/year pattern.
         """
-        pat = re.compile(rf"^{metric}{self.year_prefix}(\d{{4}})$")
-        years = []
-
-        for col in self.df.columns:
-            m = pat.match(str(col))
-            if m:
-                years.append(int(m.group(1)))
-
-        years = sorted(years)
-        if not years:
-            raise ValueError(f"No columns found for metric: {metric}")
-
-        records = []
-        for _, row in self.df.iterrows():
-            iso3 = str(row[self.iso3_col])
-            name = str(row[self.label_col])
-
-            values = []
-            for y in years:
-                col = f"{metric}{self.year_prefix}{y}"
-                v = row.get(col, None)
-                values.append(None if v is None or pd.isna(v) else float(v))
-
-            records.append({
-                "iso3": iso3,
-                "name": name,
-                "values": values
-            })
-
-        return records, years
+        if self.source is not None:
+            pack = _source_pack(self.source, metric, self.year_prefix, self.iso3_col,
+                                self.label_col, self.region_col, self._digits, self._delta)
+            return pack["records"], pack["years_num"]
+        return _metric_records(self.df, metric, self.year_prefix, self.iso3_col, self.label_col,
+                               None, self._digits, self._delta)
 
     # ============================================================
     # PUBLIC: UPDATE METRIC (called by dropdown)
@@ -446,6 +660,14 @@ class WorldMapLineChart(anywidget.AnyWidget):
         """
         self.metric = new_metric
 
+        if self.store is not None:
+            pack = self._store_pack(new_metric)
+            with self.hold_sync():
+                self.data = {**pack, "world": self.data["world"]}
+                self.options = {**self.options, "metric": new_metric,
+                                "idx_now": len(pack["years_num"]) - 1}
+            return
+
         records, years = self._rebuild_records(new_metric)
 
         # Update data for JS
@@ -453,6 +675,7 @@ class WorldMapLineChart(anywidget.AnyWidget):
             "years": [f"F{y}" for y in years],
             "years_num": years,
             "records": records,
+            **_join_pack(records),
             "world": self.data["world"],  # unchanged
         }
 
@@ -462,3 +685,45 @@ class WorldMapLineChart(anywidget.AnyWidget):
             "metric": new_metric,
             "idx_now": len(years) - 1,
         }
+
+    def update_async(self, new_metric, *, executor=None):
+        """
+        Non-blocking version of :meth:`set_metric`.
+
+        The records for ``new_metric`` are rebuilt in ``executor``
+        (default: the shared Isea thread pool) while the map keeps showing
+        the current metric under a loading overlay. If the dropdown fires
+        again before the rebuild finished, the older request is superseded
+        and only the latest metric is displayed.
+
+        Returns
+        -------
+        asyncio.Future
+            Resolves to the new data package once it has been applied.
+        """
+        def apply(pack):
+            self.metric = new_metric
+            self.data = {**pack, "world": self.data.get("world") or _world_geojson()}
+            self.options = {
+                **self.options,
+                "metric": new_metric,
+                "idx_now": len(pack["years_num"]) - 1,
+            }
+
+        if self.store is not None:
+            # nada pesado que preparar: solo nombres de columnas
+            return self._run_build(
+                self._store_pack, new_metric,
+                apply=apply, executor=executor or default_executor(),
+            )
+        if self.source is not None:
+            return self._run_build(
+                _source_pack, self.source, new_metric, self.year_prefix, self.iso3_col,
+                self.label_col, self.region_col, self._digits, self._delta,
+                apply=apply, executor=executor or default_executor(),
+            )
+        return self._run_build(
+            _world_pack, self.df, new_metric, self.year_prefix, self.iso3_col, self.label_col,
+            None, self._digits, self._delta,
+            apply=apply, executor=executor or default_executor(),
+        )
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+import traitlets as T
+
+from Isea.analysis import AnalysisEngine, RunningCorrelation
+from Isea.heatmap import D3Heatmap
+
+
+class _Source(T.HasTraits):
+    selection = T.Dict()
+
+
+def test_string_and_int_keys_select_the_same_rows():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"id": range(20), **{c: rng.random(20) for c in "abc"}})
+    engine = AnalysisEngine(df, ["a", "b", "c"], workers=0)
+    as_str = engine.correlation([str(i) for i in range(10)])["corr"]
+    as_int = engine.correlation(list(range(10)))["corr"]
+    assert not as_str.isna().to_numpy().any()
+    assert as_str.equals(as_int)
+
+
+def _blobs():
+    rng = np.random.default_rng(1)
+    a = rng.normal(0.0, 1.0, (200, 2))
+    b = rng.normal(50.0, 1.0, (200, 2))
+    return pd.DataFrame({"id": range(400), "x": np.r_[a[:, 0], b[:, 0]], "y": np.r_[a[:, 1], b[:, 1]]})
+
+
+def test_warm_start_from_another_selection_keeps_every_cluster():
+    engine = AnalysisEngine(_blobs(), ["x", "y"], workers=0)
+    assert engine.clusters(None, 4)["labels"].nunique() == 4
+    sub = engine.clusters(list(range(200)), 4)
+    assert sub["labels"].nunique() == 4
+    assert len(sub["stats"]) == 4
+
+
+def test_k_sweep_reuses_one_pool():
+    engine = AnalysisEngine(_blobs(), ["x", "y"], workers=2)
+    try:
+        first = engine.k_sweep(list(range(100)), range(2, 4))
+        pool = engine._pool
+        engine.k_sweep(list(range(150)), range(2, 4))
+        assert engine._pool is pool
+        assert set(first["inertias"]) == {2, 3}
+    finally:
+        engine.close()
+    assert engine._pool is None
+
+
+def test_silhouette_is_sampled_above_the_row_limit():
+    from Isea.analysis import _silhouette
+
+    X = _blobs()[["x", "y"]].to_numpy()
+    labels = (X[:, 0] > 25).astype(int)
+    assert _silhouette(X, labels, max_rows=50) == pytest.approx(_silhouette(X, labels), abs=0.05)
+
+
+def _wide(n=60, seed=2):
+    rng = np.random.default_rng(seed)
+    a = rng.normal(size=n)
+    return pd.DataFrame({"id": np.arange(n) % 40, "a": a, "b": a + rng.normal(size=n), "c": rng.normal(size=n)})
+
+
+def test_running_correlation_matches_corrcoef():
+    df = _wide()
+    rc = RunningCorrelation(df, ["a", "b", "c"])
+    rc.add(range(30))
+    rc.remove(range(10, 20))
+    rc.add([35, 36, 5])
+    rc.remove([0, 99])
+    keys = list(range(5, 25))
+    got = rc.set_selection(keys).to_numpy()
+    rows = df["id"].isin(keys).to_numpy()
+    assert rows.sum() > len(keys)
+    np.testing.assert_allclose(got, np.corrcoef(df.loc[rows, ["a", "b", "c"]].to_numpy(), rowvar=False))
+
+
+def test_repeated_keys_select_the_same_rows_as_the_engine():
+    df = _wide()
+    keys = [1, 2, 3, 4, 5, 6]
+    rc = RunningCorrelation(df, ["a", "b", "c"]).set_selection(keys)
+    engine = AnalysisEngine(df, ["a", "b", "c"], workers=0).correlation(keys)["corr"]
+    np.testing.assert_allclose(rc.to_numpy(), engine.to_numpy())
+
+
+def test_link_sends_only_the_changed_cells():
+    df = _wide()
+    rc = RunningCorrelation(df, ["a", "b", "c"])
+    hm = D3Heatmap(rc.set_selection([]), cmap="coolwarm")
+    src = _Source()
+    rc.link(src, hm)
+    sent = []
+    hm.send = lambda content, buffers=None: sent.append((content, buffers))
+
+    old = hm._matrix.copy()
+    src.selection = {"keys": list(range(20))}
+    new = np.asarray(rc.corr().to_numpy(), dtype=np.float32)
+    (content, (idx, vals)), = sent
+    idx = np.frombuffer(idx, dtype=np.int32)
+    expected = np.flatnonzero(np.abs(new - old).ravel() > 1e-6)
+    np.testing.assert_array_equal(idx, expected)
+    assert 0 < content["count"] == len(expected) < new.size
+    np.testing.assert_array_equal(np.frombuffer(vals, dtype=np.float32), new.ravel()[expected])
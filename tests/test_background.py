@@ -0,0 +1,54 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import anywidget
+import pytest
+import traitlets as T
+
+from Isea.background import BackgroundBuild
+
+
+class _Widget(BackgroundBuild, anywidget.AnyWidget):
+    _esm = "export default {}"
+    data = T.Any()
+
+    def build(self, prepare, executor=None):
+        return self._run_build(prepare, apply=lambda p: setattr(self, "data", p), executor=executor)
+
+
+def _fail():
+    raise RuntimeError("bad prepare")
+
+
+def test_failed_background_build_is_logged_and_raised(caplog):
+    async def main():
+        w = _Widget()
+        w.build(_fail, ThreadPoolExecutor(1))
+        with caplog.at_level(logging.ERROR, logger="Isea.background"):
+            with pytest.raises(RuntimeError, match="bad prepare"):
+                await w
+        assert not w.loading
+        assert "failed" in caplog.text
+
+    asyncio.run(main())
+
+
+def test_inline_build_supersedes_pending_background_build():
+    release = threading.Event()
+
+    def old():
+        release.wait(2)
+        return "old"
+
+    async def main():
+        w = _Widget()
+        w.build(old, ThreadPoolExecutor(1))
+        w.build(lambda: "new")
+        release.set()
+        await asyncio.sleep(0.05)
+        assert w.data == "new" and not w.loading
+        await w
+
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+import json
+
+from Isea.bubble import D3Bubble
+
+
+def test_missing_string_value_becomes_none():
+    w = D3Bubble()
+    w.set_data([
+        {"id": "a", "group": "g1", "x": 1.0, "y": 2.0, "r": 3.0},
+        {"id": "b", "group": None, "x": float("nan"), "y": 1.0, "r": 1.0},
+    ])
+    assert w.data[1]["group"] is None
+    assert w.data[1]["x"] == 0
+    json.dumps(w.data, allow_nan=False)
+
+
+def test_layout_follows_size_changes():
+    w = D3Bubble([{"id": "a", "x": 10.0, "y": 5.0, "r": 1.0}], width=700, layout="scale")
+    px = w.data[0]["px"]
+    w.options = {**w.options, "width": 1400}
+    assert w.data[0]["px"] > px
+    w.options = {**w.options, "title": "t"}
+    assert w.options["layout"] == {"xMax": 10.0, "yMax": 5.0, "rMax": 1.0}
+
+
+def test_generator_and_empty_data():
+    w = D3Bubble(({"id": i, "x": i, "y": i, "r": 1.0} for i in range(3)))
+    assert [r["id"] for r in w.data] == [0, 1, 2]
+    assert D3Bubble([], layout="collide").data == []
@@ -0,0 +1,65 @@
+import math
+
+import numpy as np
+import pytest
+
+from Isea.encoding import encode_series, resolve_digits, round_sig, to_list
+
+
+def _decode(enc):
+    """Python copy of the decoder in the views (``cumsum(d) / 10**e``)."""
+    if isinstance(enc, list):
+        return enc
+    f, acc, out = 10 ** abs(enc["e"]), 0, []
+    for v in enc["d"]:
+        if v is None:
+            out.append(None)
+            continue
+        acc += v
+        out.append(acc / f if enc["e"] >= 0 else acc * f)
+    return out
+
+
+def test_delta_round_trip_with_negative_exponent():
+    values = [123_000.0, 456_000.0, 789_000.0, 1_200_000.0]
+    enc = encode_series(values, digits=3, delta=True)
+    assert enc["e"] < 0
+    assert all(isinstance(v, int) for v in enc["d"])
+    assert _decode(enc) == values
+
+
+def test_delta_round_trip_with_positive_exponent():
+    values = [0.125, 0.5, 1.75, 0.0625]
+    enc = encode_series(values, digits=3, delta=True)
+    assert enc["e"] > 0
+    assert _decode(enc) == [round_sig(v, 3).item() for v in values]
+
+
+def test_years_are_sent_as_unit_deltas():
+    assert encode_series(np.arange(2010, 2015), delta=True) == {"e": 0, "d": [2010, 1, 1, 1, 1]}
+
+
+def test_missing_values_pass_through():
+    values = [1.5, float("nan"), None, 4.25, math.inf]
+    assert to_list(values, 3) == [1.5, None, None, 4.25, None]
+    enc = encode_series(values, digits=3, delta=True)
+    assert _decode(enc) == [1.5, None, None, 4.25, None]
+    assert encode_series(values, digits=3) == [1.5, None, None, 4.25, None]
+
+
+def test_float32_caps_the_digits():
+    assert resolve_digits(dtype="float32") == 7
+    assert resolve_digits(12, "float32") == 7
+    assert resolve_digits(3, "float32") == 3
+    assert resolve_digits(12) == 12
+    assert resolve_digits() is None
+    x = np.array([np.pi, 1 / 3, 123456.789])
+    rounded = round_sig(x, resolve_digits(dtype="float32"))
+    np.testing.assert_array_equal(round_sig(x.astype(np.float32), 7), rounded)
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        resolve_digits(0)
+    with pytest.raises(ValueError):
+        resolve_digits(dtype="float16")
@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from Isea import geo
+from Isea.geo import resolve_iso3
+
+DATA = Path(__file__).resolve().parents[1] / "data" / "Renewable_Energy.csv"
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(geo, "_CACHE", None)
+
+
+def test_renewable_energy_countries_match_iso3_column():
+    df = pd.read_csv(DATA, usecols=["Country", "ISO3"]).drop_duplicates()
+    got = resolve_iso3(df["Country"])
+    wrong = df.assign(got=got)[got != df["ISO3"]]
+    assert wrong.empty, wrong.to_string()
+
+
+@pytest.mark.parametrize("name, iso3", [
+    ("Congo, Dem. Rep. of the", "COD"),
+    ("Congo, Rep. of", "COG"),
+    ("Korea, Dem. People's Rep. of", "PRK"),
+    ("Korea, Rep. of", "KOR"),
+    ("China, P.R.: Hong Kong", "HKG"),
+    ("Afghanistan, Islamic Rep. of", "AFG"),
+    ("Netherlands, The", "NLD"),
+])
+def test_comma_forms(name, iso3):
+    assert resolve_iso3([name])[0] == iso3
+
+
+def test_missing_and_unknown_names():
+    out = resolve_iso3(pd.Series(["Germany", None, "Narnia"]), default="UNK")
+    assert out.tolist() == ["DEU", "UNK", "UNK"]
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Isea.heatmap import D3Heatmap
+
+
+def test_data_property_matches_former_records():
+    df = pd.DataFrame({"2020": [1.5, np.nan], "2021": [0.25, 4.0]}, index=["A", "B"])
+    w = D3Heatmap(df)
+    assert w.data == [
+        {"row_id": "A", "col_id": "2020", "value": 1.5},
+        {"row_id": "B", "col_id": "2020", "value": None},
+        {"row_id": "A", "col_id": "2021", "value": 0.25},
+        {"row_id": "B", "col_id": "2021", "value": 4.0},
+    ]
+    w.update_cells(df.fillna(2.0))
+    assert w.data[1]["value"] == 2.0
+    with pytest.raises(AttributeError):
+        w.data = []
+
+
+def test_flush_writes_patched_cells_into_values():
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]}, index=["x", "y"])
+    w = D3Heatmap(df)
+    before = w.values
+    w.update_cells(df * 2)
+    assert w.values == before
+    w.flush()
+    np.testing.assert_array_equal(np.frombuffer(w.values, dtype=np.float32), (df * 2).to_numpy().ravel())
@@ -0,0 +1,37 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from Isea.sources import SQLSource
+
+
+def _db(path):
+    with sqlite3.connect(path) as con:
+        pd.DataFrame({"Country": list("ABCD") * 25, "v": range(100)}).to_sql("t", con, index=False)
+
+
+def test_sqlite_source_uses_one_connection_per_thread(tmp_path):
+    path = str(tmp_path / "w.sqlite")
+    _db(path)
+    src = SQLSource(path, "t")
+    view = src.filter([("Country", "==", "A")])
+
+    def run(_):
+        n = view.count()
+        return n, id(view._thread_connection())
+
+    with ThreadPoolExecutor(4) as pool:
+        out = list(pool.map(run, range(16)))
+    assert {n for n, _ in out} == {25}
+    assert id(src.connection) not in {c for _, c in out}
+    assert src.scan(["v"], where=[("v", ">=", 98)])["v"].tolist() == [98, 99]
+
+
+def test_external_sqlite_connection_is_shared_under_a_lock(tmp_path):
+    path = str(tmp_path / "w.sqlite")
+    _db(path)
+    src = SQLSource(path, "t", connection=sqlite3.connect(path, check_same_thread=False))
+    with ThreadPoolExecutor(4) as pool:
+        counts = list(pool.map(lambda _: src.count([("v", "<", 10)]), range(16)))
+    assert counts == [10] * 16
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Isea.store import DataStore, _encode
+
+
+def _frame(n, start=0):
+    i = np.arange(start, start + n)
+    return pd.DataFrame({
+        "name": [f"c{k % 3}" for k in i],
+        "value": i * 1.123456789,
+        "count": i,
+    })
+
+
+def test_append_then_update():
+    store = DataStore(_frame(3), precision=4)
+    store.append(_frame(2, start=3))
+    assert list(store.frame.index) == [0, 1, 2, 3, 4]
+    assert store.update(store.frame.assign(count=store.frame["count"] + 1)) == 5
+
+
+def test_append_encodes_like_a_full_frame():
+    store = DataStore(_frame(3), precision=4)
+    store.append(_frame(4, start=3).assign(name=["c9", None, "c0", "c1"]))
+    store.append(pd.DataFrame({"name": ["c2"], "value": [np.nan]}))
+    for name, s in store.frame.items():
+        kind, arr, values = _encode(s, store._digits)
+        col = store._cols[name]
+        assert col.kind == kind
+        np.testing.assert_array_equal(col.array, arr)
+        if values is not None:
+            assert [col.values[c] for c in col.array if c >= 0] == [values[c] for c in arr if c >= 0]
+
+
+def test_append_rejects_repeated_labels():
+    store = DataStore(_frame(3).set_index("name", drop=False).iloc[:2])
+    with pytest.raises(ValueError, match="index"):
+        store.append(_frame(1).set_index("name", drop=False))
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from Isea.trendline import D3TrendLine
+
+
+def test_append_rejects_points_before_the_last_one():
+    w = D3TrendLine(window=5)
+    w.append("a", np.arange(4, 9), np.arange(4, 9) * 1.0)
+    with pytest.raises(ValueError, match="before the last point"):
+        w.append("a", [2], [5.0])
+    w.append("a", [8, 9], [1.0, 2.0])
+    x, _ = w._series[0]["history"].arrays()
+    assert x.tolist() == [6, 7, 8, 8, 9]
+
+
+def test_lttb_keeps_the_ends_and_returns_n_out_points():
+    from Isea.trendline import _lttb
+
+    x = np.arange(1000, dtype=float)
+    y = np.sin(x / 30.0)
+    for n_out in (3, 10, 137):
+        dx, dy = _lttb(x, y, n_out)
+        assert len(dx) == len(dy) == n_out
+        assert (dx[0], dx[-1]) == (x[0], x[-1])
+        assert np.all(np.diff(dx) > 0)
+    short_x, _ = _lttb(x[:5], y[:5], 10)
+    assert len(short_x) == 5
+
+
+def test_payload_range_keeps_one_point_past_each_edge():
+    x = np.arange(2000, 2021, dtype=float)
+    w = D3TrendLine([{"label": "a", "history_x": x, "history_y": x - 2000}])
+    hist = w._payload(2005.5, 2010.0)[0]["history"]
+    assert hist["x"] == [2005, 2006, 2007, 2008, 2009, 2010, 2011]
+    assert w._payload(1990, 1995)[0]["history"]["x"] == [2000]
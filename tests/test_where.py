@@ -0,0 +1,40 @@
+import asyncio
+
+import pandas as pd
+
+from Isea.parallel import ParallelEnergy
+from Isea.scatter import ScatterBrush
+from Isea.sources import PandasSource
+
+
+def _energy(countries):
+    return pd.DataFrame({
+        "Country": [c for c in countries for _ in range(2)],
+        "Technology_std": ["Solar", "Wind"] * len(countries),
+        "F2020": [1.0, 2.0] * len(countries),
+        "F2021": [3.0, 4.0] * len(countries),
+    })
+
+
+def test_parallel_update_async_keeps_where():
+    where = {"Country": ["A", "B"]}
+
+    async def main():
+        w = ParallelEnergy(_energy(["A", "B", "C"]), ["F2020", "F2021"], where=where,
+                           dims=("Solar", "Wind"))
+        await w.update_async(_energy(["A", "C", "D"]))
+        assert set(w._df_raw["Country"]) == {"A"}
+        await w.update_async(PandasSource(_energy(["B", "C"])))
+        assert set(w._source.scan(["Country"])["Country"]) == {"B"}
+
+    asyncio.run(main())
+
+
+def test_scatter_set_data_keeps_where():
+    df = pd.DataFrame({"x": [1.0, 2.0, 3.0], "y": [1.0, 2.0, 3.0], "id": ["a", "b", "c"]})
+    w = ScatterBrush(df, key="id", where=[("x", ">=", 2)])
+    assert [r["id"] for r in w.data] == ["b", "c"]
+    w.set_data(df.assign(x=[3.0, 1.0, 0.0]))
+    assert [r["id"] for r in w.data] == ["a"]
+    w.set_data(PandasSource(df))
+    assert [r["id"] for r in w.data] == ["b", "c"]